@@ -11,31 +11,38 @@ from services.field_lines_services.categorizer_executed_catalog_service import C
 from services.field_lines_services.completion_status_service import CompletionStatusService
 from services.field_lines_services.cpi_spi_service import CpiSpiService
 from services.field_lines_services.executed_activities_detail_service import ExecutedActivitiesDetailService
+from services.field_lines_services.executed_cost_categorizer import build_category_table
+from services.field_lines_services.field_report_runner import FieldReportRunner
 from services.field_lines_services.leader_line_service import LeaderLineService
 from services.field_lines_services.planned_activities_catalog_service import PlannedActivitiesCatalogService
-from logic.field_lines.reports.echometer_report import EchometerReport
-from logic.field_lines.reports.field_lead_line_report import FieldLeadLineReport
-from logic.field_lines.reports.field_report import FieldReport
-from logic.field_lines.reports.slick_and_bacheo_report import SlickAndBacheoReport
-from logic.field_lines.reports.varillera_report import VarilleraReport
+from services.field_lines_services.planning_state_store import prefetch_planning_lines
 from utils.comments import load_field_line_comments, save_field_line_comment
 from utils.file_loader import load_field_reports_from_json
 from utils.file_manager import get_planned_activities_catalog_path
-from views.field_views.approved_budget_activities_view import ApprovedBudgetActivitiesView
-from views.field_views.categorizer_executed_catalog_view import CategorizerExecutedCatalogView
-from views.field_views.cpi_spi_view import CpiSpiView
-from views.field_views.executed_activities_detail_view import ExecutedActivitiesDetailView
-from views.field_views.historical_initial_cost_view import HistoricalInitialCostView
-from views.field_views.quote_extractor_view import QuoteExtractorView
-from views.field_views.south_zone_quote_extractor_view import SouthZoneQuoteExtractorView
-from views.field_views.leader_summary_report_view import LeaderSummaryReportView
+from utils.lazy_registry import LazyClass, resolve_class
+from utils.progress import OperationCancelled, ensure_progress
+
+# Vistas de campo (importadas al abrirlas por primera vez; los extractores de
+# cotizaciones arrastran pdfplumber)
+ApprovedBudgetActivitiesView = LazyClass("views.field_views.approved_budget_activities_view.ApprovedBudgetActivitiesView")
+CategorizerExecutedCatalogView = LazyClass("views.field_views.categorizer_executed_catalog_view.CategorizerExecutedCatalogView")
+CpiSpiView = LazyClass("views.field_views.cpi_spi_view.CpiSpiView")
+ExecutedActivitiesDetailView = LazyClass("views.field_views.executed_activities_detail_view.ExecutedActivitiesDetailView")
+HistoricalInitialCostView = LazyClass("views.field_views.historical_initial_cost_view.HistoricalInitialCostView")
+QuoteExtractorView = LazyClass("views.field_views.quote_extractor_view.QuoteExtractorView")
+SouthZoneQuoteExtractorView = LazyClass("views.field_views.south_zone_quote_extractor_view.SouthZoneQuoteExtractorView")
+LeaderSummaryReportView = LazyClass("views.field_views.leader_summary_report_view.LeaderSummaryReportView")
+FieldLeadLineReport = LazyClass("logic.field_lines.reports.field_lead_line_report.FieldLeadLineReport")
 
 class FieldController(QObject):
-    FIELD_REPORT_CLASSES = { 
-        "VarilleraReport": VarilleraReport,
-        "SlickAndBacheoReport": SlickAndBacheoReport,
-        "EchometerReport": EchometerReport,
-        "default": FieldReport
+    # Tipos de reporte de campo por el nombre usado en "class" de
+    # utils/field_lines_report.json. Una configuración también puede indicar
+    # directamente la ruta completa ('paquete.modulo.Clase').
+    FIELD_REPORT_CLASSES = {
+        "VarilleraReport": "logic.field_lines.reports.varillera_report.VarilleraReport",
+        "SlickAndBacheoReport": "logic.field_lines.reports.slick_and_bacheo_report.SlickAndBacheoReport",
+        "EchometerReport": "logic.field_lines.reports.echometer_report.EchometerReport",
+        "default": "logic.field_lines.reports.field_report.FieldReport"
     }
 
     def __init__(self, parent_view=None):
@@ -48,6 +55,7 @@ class FieldController(QObject):
         self.year = 0
         self.load_field_instances()
         self.summary_report_cache = None
+        self.leader_line_service = None
         self.month_map = {name.lower(): i for i, name in enumerate(month_name[1:])}
         self.set_year()
         self.completion_service = CompletionStatusService()
@@ -58,7 +66,11 @@ class FieldController(QObject):
             class_name = cfg.get("class", "default")
             if class_name == "FieldLeadLineReport": # No es un FieldReport comun, por eso lo paso
                 continue
-            report_class = self.FIELD_REPORT_CLASSES.get(class_name, FieldReport)
+            try:
+                report_class = self.get_field_report_class(class_name)
+            except (ImportError, AttributeError) as e:
+                print(f"Error cargando el tipo de reporte {class_name}: {e}")
+                continue
             valid_params = inspect.signature(report_class.__init__).parameters
             kwargs = {k: v for k, v in cfg.items() if k in valid_params and k != 'self'}
             try:
@@ -67,6 +79,13 @@ class FieldController(QObject):
             except Exception as e:
                 print(f"Error instanciando {class_name} con {kwargs}: {e}")
 
+    def get_field_report_class(self, class_name: str):
+        """Clase de reporte para un nombre del JSON (o ruta completa); importa su módulo la primera vez."""
+        dotted_path = self.FIELD_REPORT_CLASSES.get(class_name)
+        if dotted_path is None:
+            dotted_path = class_name if "." in class_name else self.FIELD_REPORT_CLASSES["default"]
+        return resolve_class(dotted_path)
+
     def set_year(self):
         if datetime.now().month == 1:
             self.year = datetime.now().year - 1
@@ -118,10 +137,40 @@ class FieldController(QObject):
         
         save_field_line_comment(self.field_comments_df)
 
-    def generate_field_reports(self):
+    def generate_field_reports(self, progress=None):
+        """
+        Genera los reportes de todas las líneas de campo.
+
+        Los datos de cada línea se preparan en paralelo con FieldReportRunner; los
+        gráficos se construyen y muestran después, en el hilo principal y en el
+        orden de configuración. Un error en una línea no detiene las demás.
+
+        Args:
+            progress (ProgressContext, optional): Contexto de progreso y cancelación.
+        """
+        progress = ensure_progress(progress)
         for field_report_instance in self.field_line_report_instances:
+            field_report_instance.clear_cached_artifacts()
+        prefetch_planning_lines([report.title for report in self.field_line_report_instances])
+        results = FieldReportRunner(self.field_line_report_instances).run(progress.subcontext(0.0, 0.8))
+        if progress.is_cancelled:
+            print("⚠️ Generación de reportes de campo cancelada por el usuario.")
+            return None
+
+        failed_lines = []
+        graphs_progress = progress.subcontext(0.8, 1.0)
+        for i, result in enumerate(results):
+            field_report_instance = result["report"]
+            try:
+                graphs_progress.checkpoint(f"Plotting {result['title']}", i / len(results))
+            except OperationCancelled:
+                print("⚠️ Generación de reportes de campo cancelada por el usuario.")
+                return None
+            print(f"Reporte de campo '{result['title']}' preparado en {result['elapsed']:.2f} s")
             try:
-                graph = field_report_instance.generate_graph()
+                if result["error"] is not None:
+                    raise result["error"]
+                graph = field_report_instance.generate_graph(result["data_sources"])
                 deviations = field_report_instance.generate_deviations()
                 self.parent_view.show_plot_view(
                     graph,
@@ -142,26 +191,40 @@ class FieldController(QObject):
                     "File Not Found",
                     "You must create the file first." + str(e)
                 )
+            except Exception as e:
+                print(f"Error generando el reporte de campo '{result['title']}': {e}")
+                failed_lines.append(result["title"])
+
+        if failed_lines:
+            QMessageBox.warning(
+                self.parent_view,
+                "Report Generation Error",
+                "The following field lines could not be generated:\n\n" + "\n".join(failed_lines)
+            )
     
-    def _create_leader_line_report_object(self):
+    def _create_leader_line_report_object(self, progress=None):
         """
         Método ayudante que centraliza la creación del DataFrame agregado
         y el objeto FieldLeadLineReport.
         """
-        leader_service = LeaderLineService(self.field_line_report_instances, self.completion_service)
-        aggregated_df = leader_service.generate_aggregated_dataframe()
+        self.leader_line_service = LeaderLineService(self.field_line_report_instances, self.completion_service)
+        aggregated_df = self.leader_line_service.generate_aggregated_dataframe(progress)
+        return self._build_leader_line_report(aggregated_df)
 
+    def _build_leader_line_report(self, aggregated_df):
+        """Construye el FieldLeadLineReport a partir de un DataFrame agregado."""
         if aggregated_df.empty:
             return None 
 
         if "RealCost" in aggregated_df.columns:
-            aggregated_df.rename(columns={"RealCost": "TotalRealCost"}, inplace=True)
+            aggregated_df = aggregated_df.rename(columns={"RealCost": "TotalRealCost"})
             
         leader_report = FieldLeadLineReport(aggregated_df, title="Field Leader Line (Consolidated)")
         return leader_report
     
     def generate_summary_to_lead_report(self):
         summary_df = pd.DataFrame()
+        prefetch_planning_lines([report.title for report in self.field_line_report_instances])
         for report in self.field_line_report_instances:
             report_summary = report.generate_summary_data_frame()
             summary_df = pd.concat([summary_df, report_summary], ignore_index=True)
@@ -189,6 +252,8 @@ class FieldController(QObject):
     
     def refresh_leader_summary_data(self):
         """Regenera los datos para el reporte resumen y los devuelve."""
+        for report in self.field_line_report_instances:
+            report.clear_cached_artifacts()
         new_summary_df = self.generate_summary_to_lead_report()
         self.summary_report_cache = new_summary_df  # Actualiza el caché
         return new_summary_df
@@ -225,6 +290,79 @@ class FieldController(QObject):
                 return None, None, "default"
         return None, None, "default"
 
+    def refresh_field_line(self, title, change, thresholds=None):
+        """
+        Refresca de forma diferencial una línea de campo tras un cambio puntual.
+
+        A diferencia de regenerar_reporte_linea_campo, no vuelve a leer el Excel de
+        costos ni las fuentes no afectadas: solo descarta los artefactos que dependen
+        del cambio y parchea el caché del reporte resumen y el agregado de la línea líder.
+
+        Args:
+            title (str): Título de la línea modificada.
+            change (str): 'manual_planning' (CPAE/planificación de un mes),
+                          'approved_budget' (fila del presupuesto aprobado) o
+                          'categorizer_thresholds' (umbrales del categorizador).
+            thresholds (tuple, optional): Nuevos umbrales (categoría 1, 2, 3) cuando
+                                          change es 'categorizer_thresholds'.
+
+        Returns:
+            FieldReport | None: La instancia refrescada, lista para generate_graph(),
+                                o None si la línea no existe.
+        """
+        refreshed = self.refresh_field_lines([title], change, thresholds)
+        return refreshed[0] if refreshed else None
+
+    def refresh_field_lines(self, titles, change, thresholds=None):
+        """
+        Igual que refresh_field_line para varias líneas: primero descarta los
+        artefactos de todas y luego vuelve a sumar el agregado de la línea líder
+        una sola vez.
+
+        Returns:
+            list: Las instancias refrescadas (se omiten los títulos desconocidos).
+        """
+        refreshed = []
+        for title in titles:
+            report_instance = next((r for r in self.field_line_report_instances if r.title == title), None)
+            if report_instance is None:
+                continue
+            if change == "manual_planning":
+                report_instance.reload_manual_planning_service()
+                report_instance.reload_planned_activities_manager()
+            elif change == "approved_budget":
+                report_instance.reload_approved_budget_data()
+            elif change == "categorizer_thresholds":
+                if not hasattr(report_instance, 'set_category_thresholds'):
+                    continue
+                report_instance.set_category_thresholds(*thresholds)
+                report_instance.recalculate_categorized_forecast()
+            else:
+                raise ValueError(f"Tipo de cambio no soportado: {change}")
+            self._patch_summary_report_cache(report_instance)
+            refreshed.append(report_instance)
+
+        if refreshed and self.leader_line_service is not None:
+            self.leader_line_service.refresh_lines(refreshed)
+        return refreshed
+
+    def _patch_summary_report_cache(self, report_instance):
+        """Reemplaza en el caché del reporte resumen solo las filas de la línea indicada."""
+        if self.summary_report_cache is None or self.summary_report_cache.empty:
+            return
+        new_rows = report_instance.generate_summary_data_frame()
+        line_names = new_rows["contractual activity"].astype(str).str.strip().str.lower()
+        cached = self.summary_report_cache
+        mask = cached["contractual activity"].astype(str).str.strip().str.lower().isin(line_names)
+        if not mask.any():
+            self.summary_report_cache = pd.concat([cached, new_rows], ignore_index=True)
+            return
+        position = mask.values.argmax()
+        self.summary_report_cache = pd.concat(
+            [cached.iloc[:position][~mask.iloc[:position]], new_rows, cached.iloc[position:][~mask.iloc[position:]]],
+            ignore_index=True
+        )
+
     def regenerate_report_and_get_data(self, title):
         """
         Regenera un reporte de campo y retorna todos sus datos asociados.
@@ -248,6 +386,7 @@ class FieldController(QObject):
             )
             self.approved_budget_activities_view.setWindowModality(Qt.ApplicationModal)
             self.approved_budget_activities_view.exec_()
+            self.refresh_field_lines(available_line_titles, "approved_budget")
         except FileNotFoundError as e:
             QMessageBox.warning(
                 self.parent_view,
@@ -281,6 +420,7 @@ class FieldController(QObject):
                     self.cpi_spi_service.set_line_title(line_title)
                     self.cpi_spi_service.dataframe = df
                     self.cpi_spi_service.save_to_csv()
+                    report_instance.invalidate_artifacts("cpi_spi")
                 return None
             except RuntimeError as e:
                 return str(e)
@@ -295,22 +435,30 @@ class FieldController(QObject):
         self.categorizer_executed_activities_catalog_view = CategorizerExecutedCatalogView(
             self.categorizer_executed_activities_catalog_service,
             available_line_titles=[selected_line_title],
-            on_calculate_and_save=self.calculate_and_save_categorizer_executed_activities
+            on_calculate_and_save=self.calculate_and_save_categorized_activities
         )
 
         self.categorizer_executed_activities_catalog_view.setWindowModality(Qt.ApplicationModal)
         self.categorizer_executed_activities_catalog_view.exec_()
 
-    def calculate_and_save_categorizer_executed_activities(self, line_title, month):
+    def calculate_and_save_categorized_activities(self, line_title):
+        """
+        Categoriza en una sola pasada todos los meses de una línea con
+        categorizador (Slickline, Bacheo) y registra en su catálogo solo los
+        meses que cambiaron.
+
+        Returns:
+            pd.DataFrame: Tabla larga (Line, Month, Category, Activities, Cost) de la línea.
+        """
         report_instance = next((r for r in self.field_line_report_instances if r.title == line_title), None)
-        if report_instance and hasattr(report_instance, 'get_categorizer_executed_activities_by_month'):
-            df = report_instance.get_categorizer_executed_activities_by_month(month)
-            if df is not None:
-                self.categorizer_executed_activities_catalog_service.set_line_title(line_title)
-                self.categorizer_executed_activities_catalog_service.set_month(month)
-                self.categorizer_executed_activities_catalog_service.dataframe = df
-                self.categorizer_executed_activities_catalog_service.save_to_csv()
-    
+        if report_instance is None or not hasattr(report_instance, 'get_categorized_executed_activities'):
+            return build_category_table([])
+        categorized_df = report_instance.get_categorized_executed_activities()
+        service = CategorizerExecutedCatalogService()
+        service.set_line_title(line_title)
+        service.save_categorized_activities(categorized_df)
+        return build_category_table([categorized_df])
+
     def open_total_executed_activities_view(self, selected_line_title):
         service = ExecutedActivitiesDetailService(selected_line_title)
         self.executed_activities_detail_view = ExecutedActivitiesDetailView(service)
@@ -404,15 +552,20 @@ class FieldController(QObject):
             field_reports=self.field_line_report_instances,
             approved_service=self.approved_service,
             completion_service=self.completion_service,
-            parent_view=self.parent_view
+            parent_view=self.parent_view,
+            on_plan_saved=lambda line_title: self.refresh_field_line(line_title, "manual_planning")
         )
         self.planning_controller.run() 
 
-    def generate_leader_line_report(self):
+    def generate_leader_line_report(self, progress=None):
         """
         Obtiene el reporte líder usando el método ayudante y lo muestra.
         """
-        leader_report = self._create_leader_line_report_object()
+        try:
+            leader_report = self._create_leader_line_report_object(progress)
+        except OperationCancelled:
+            print("⚠️ Generación del reporte líder cancelada por el usuario.")
+            return
         if leader_report is None:
             QMessageBox.information(self.parent_view, "No Data", "No 'Completed' lines found to generate the report.")
             return
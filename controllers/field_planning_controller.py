@@ -1,17 +1,20 @@
+import pandas as pd
 from PyQt5.QtCore import QObject, Qt
 from PyQt5.QtWidgets import QMessageBox
 from services.field_lines_services.approved_budget_activities_service import ApprovedBudgetActivitiesService
 from services.field_lines_services.planning_service_factory import PlanningServiceFactory
 from services.field_lines_services.schedule_with_categorizer_service import ScheduleWithCategorizerService
 from views.field_views.adaptive_planning_view import AdaptivePlanningView
+from views.save_feedback import show_save_result
 
 class FieldPlanningController(QObject):
-    def __init__(self, field_reports, approved_service, completion_service, parent_view=None):
+    def __init__(self, field_reports, approved_service, completion_service, parent_view=None, on_plan_saved=None):
         super().__init__()
         self.field_line_report_instances = field_reports
         self.approved_service = approved_service
         self.completion_service = completion_service
         self.parent_view = parent_view
+        self.on_plan_saved = on_plan_saved
         self.view = None 
 
     def run(self):
@@ -115,7 +118,7 @@ class FieldPlanningController(QObject):
         view = self.view
         service = view.service
         report = view.field_report
-        table = view.table_widget.table 
+        table_widget = view.table_widget
 
         try:
             columns = service.get_columns()
@@ -125,29 +128,31 @@ class FieldPlanningController(QObject):
             last_month_index = view.month_map.get(last_valid_month_name.lower(), -1) if last_valid_month_name else -1
             start_row = last_month_index + 1
 
+            # Meses futuros en el orden de la tabla; los cambios se aplican en un solo lote
+            future_months = table_widget.get_column_texts("Month")[start_row:]
+
             if isinstance(service, ScheduleWithCategorizerService):
                 # Para líneas with_categorizer, calculamos Forecast basado en categorías
                 if hasattr(report, "CATEGORIA_1"):
-                    for row in range(start_row, table.rowCount()):
-                        month = table.item(row, 0).text()
-                        service.update_forecast(
-                            month,
-                            report.CATEGORIA_1,
-                            report.CATEGORIA_2,
-                            report.CATEGORIA_3
-                        )
+                    forecasts = service.calculate_forecasts(
+                        future_months,
+                        report.CATEGORIA_1,
+                        report.CATEGORIA_2,
+                        report.CATEGORIA_3
+                    )
+                    service.update_rows(forecasts)
             else:
                 # Para otras líneas, usamos CPAE * Scheduled Activities
                 cpae_value = report.get_cost_by_activity() or 0
-                scheduled_index = columns.index("Scheduled Activities")
-                forecast_index = columns.index("Forecast")
-
-                for row in range(start_row, table.rowCount()):
-                    month = table.item(row, 0).text()
-                    scheduled_text = table.item(row, scheduled_index).text() or "0"
-                    scheduled = int(float(scheduled_text))
-                    forecast = round(scheduled * cpae_value, 2)
-                    service.update_row(month, "Forecast", forecast)
+                if "Forecast" not in columns:
+                    raise ValueError("This line has no Forecast column.")
+
+                scheduled_texts = [text or "0" for text in table_widget.get_column_texts("Scheduled Activities")[start_row:]]
+                scheduled = pd.to_numeric(pd.Series(scheduled_texts, dtype=object)).astype(float).astype(int)
+                service.update_rows(pd.DataFrame({
+                    "Month": future_months,
+                    "Forecast": (scheduled * cpae_value).round(2).to_numpy(),
+                }))
                     
             self.refresh_adaptive_view()
             QMessageBox.information(view, "Success", "Forecast calculated for future months.")
@@ -200,7 +205,9 @@ class FieldPlanningController(QObject):
             return
 
         service.save_to_csv()
-        QMessageBox.information(view, "Success", f"Data saved successfully for {line_title}.")
+        if self.on_plan_saved is not None:
+            self.on_plan_saved(line_title)
+        show_save_result(view, service.CSV_PATH, "Success", f"Data saved successfully for {line_title}.")
 
     def refresh_adaptive_view(self):
         """
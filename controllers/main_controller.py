@@ -9,54 +9,59 @@ from datetime import datetime, timedelta
 from controllers.field_controller import FieldController
 from data.data_loader import DataLoader
 from logic.activity_data import build_activities_dataframe
+from logic.multi_year_batch import MultiYearBatch
 from logic.operative_capacity_manager import OperativeCapacityManager
-from logic.reports.rig_report import RigReport
-from logic.reports.mi_swaco_report import MISwacoReport
-from logic.reports.completions import CompletionsReport
-from logic.reports.bits_drilling_remedial import BitsDrillingTRemedialReport
-from logic.reports.surface_systems import SurfaceSystemsReport
-from logic.reports.well_services_report import WellServicesReport
-from logic.reports.testing_fluid_analysis import TestingFluidAnalysisReport
-from logic.reports.wireline_report import WirelineReport
-from logic.reports.services import ServicesReport
-from logic.reports.artificial_lift_report import ArtificialLiftReport
-from logic.reports.integrated_services_report import IntegratedServicesReport
-from logic.reports.environment_report import EnvironmentReport    
-from logic.reports.tubulars_report import TubularsReport
-from logic.reports.tanks_and_trunks_report import TanksAndTrunksReport
 from services.capex_config_service import CapexConfigService
 from utils.file_manager import (
     get_catalog_dir, get_forecast_services_path_file, get_forecasted_plan_path, get_operative_capacity_path, get_plan_path, get_budget_opex_path, get_planning_cost_path
 )
-from pptx import Presentation
-from pptx.util import Inches
-from utils.export_ppt import add_slide_to_presentation
 from PyQt5.QtWidgets import QDialog
 
-from views.capex_config_view import CapexConfigDialog
-from views.field_views.avg_days_dialog import AvgDaysDialog
-from views.office_planning_view import OfficePlanningView
-from views.services_forecast_path_view import ServicesForecastPathView
-
+from utils.capabilities import require
 from utils.comments import load_comments, save_comment, load_field_line_comments
+from utils.lazy_registry import LazyClass
+from utils.progress import OperationCancelled, ensure_progress
+from utils.startup_profiler import startup_phase
+from views.save_feedback import show_save_result
 from logic.opex_data_manager import OpexDataManager
-
-# ... (importaciones de nuevas vistas)
-from views.capex_config_view import CapexConfigDialog
-from views.field_views.avg_days_dialog import AvgDaysDialog
-# ...
-from views.tubulars_config import TubularsConfigDialog
-# --- AÑADIDO PARA MI SWACO Y COMPLETIONS ---
-from views.mi_swaco_config_view import MISwacoConfigDialog
-from views.completions_config_view import CompletionsConfigDialog
-
-from views.opex_editor import OpexEditorWindow
 from logic.plan_actividades import PlanAnualActividades
-
-from views.services_resumen_dialog import ServicesResumenDialog
-from views.well_selector import WellSelectorDialog
-from datetime import datetime, timedelta
-from utils.file_manager import get_output_path_for_pptx, get_selected_services_wells_path, get_planned_activities_catalog_path
+from utils.file_manager import get_output_path_for_pptx, get_selected_services_wells_path, get_planned_activities_catalog_path, get_output_path_for_multi_year
+
+# --- Reportes y diálogos (importados en el primer uso) ---
+# Cada módulo arrastra matplotlib, python-pptx o pandas pesados; se cargan
+# recién cuando el usuario genera un reporte o abre el diálogo.
+OFFICE_REPORT_CLASSES = {
+    "RigReport": LazyClass("logic.reports.rig_report.RigReport"),
+    "MISwacoReport": LazyClass("logic.reports.mi_swaco_report.MISwacoReport"),
+    "CompletionsReport": LazyClass("logic.reports.completions.CompletionsReport"),
+    "BitsDrillingTRemedialReport": LazyClass("logic.reports.bits_drilling_remedial.BitsDrillingTRemedialReport"),
+    "SurfaceSystemsReport": LazyClass("logic.reports.surface_systems.SurfaceSystemsReport"),
+    "WellServicesReport": LazyClass("logic.reports.well_services_report.WellServicesReport"),
+    "TestingFluidAnalysisReport": LazyClass("logic.reports.testing_fluid_analysis.TestingFluidAnalysisReport"),
+    "WirelineReport": LazyClass("logic.reports.wireline_report.WirelineReport"),
+    "ServicesReport": LazyClass("logic.reports.services.ServicesReport"),
+    "ArtificialLiftReport": LazyClass("logic.reports.artificial_lift_report.ArtificialLiftReport"),
+    "IntegratedServicesReport": LazyClass("logic.reports.integrated_services_report.IntegratedServicesReport"),
+    "EnvironmentReport": LazyClass("logic.reports.environment_report.EnvironmentReport"),
+    "TubularsReport": LazyClass("logic.reports.tubulars_report.TubularsReport"),
+    "TanksAndTrunksReport": LazyClass("logic.reports.tanks_and_trunks_report.TanksAndTrunksReport"),
+}
+# Reportes que además se usan por nombre (cálculo automático de costos, Services)
+TanksAndTrunksReport = OFFICE_REPORT_CLASSES["TanksAndTrunksReport"]
+TestingFluidAnalysisReport = OFFICE_REPORT_CLASSES["TestingFluidAnalysisReport"]
+WirelineReport = OFFICE_REPORT_CLASSES["WirelineReport"]
+ServicesReport = OFFICE_REPORT_CLASSES["ServicesReport"]
+
+CapexConfigDialog = LazyClass("views.capex_config_view.CapexConfigDialog")
+AvgDaysDialog = LazyClass("views.field_views.avg_days_dialog.AvgDaysDialog")
+OfficePlanningView = LazyClass("views.office_planning_view.OfficePlanningView")
+ServicesForecastPathView = LazyClass("views.services_forecast_path_view.ServicesForecastPathView")
+TubularsConfigDialog = LazyClass("views.tubulars_config.TubularsConfigDialog")
+MISwacoConfigDialog = LazyClass("views.mi_swaco_config_view.MISwacoConfigDialog")
+CompletionsConfigDialog = LazyClass("views.completions_config_view.CompletionsConfigDialog")
+OpexEditorWindow = LazyClass("views.opex_editor.OpexEditorWindow")
+ServicesResumenDialog = LazyClass("views.services_resumen_dialog.ServicesResumenDialog")
+WellSelectorDialog = LazyClass("views.well_selector.WellSelectorDialog")
 
 # --- Clases de Respaldo (Fallback) ---
 # Se usan si los archivos de configuración de oficina no se encuentran,
@@ -68,6 +73,8 @@ class _EmptyCapacityManager:
         self.df = pd.DataFrame()
     def get_total_tentative_opex_wells(self): return 0
     def update_value(self, *args, **kwargs): pass
+    def update_values(self, *args, **kwargs): pass
+    def recalculate_with(self, *args, **kwargs): return self.df
     def save(self, *args, **kwargs): pass
     def export_to(self, *args, **kwargs): pass
 
@@ -92,7 +99,9 @@ class MainController(QObject):
         # -------------------------
         # 🧠 Inicialización general
         # -------------------------
-        self.data_loader = DataLoader()
+        # SQL y CDF se conectan en su primera consulta; aquí solo se crea el cargador
+        with startup_phase("Cargador de datos"):
+            self.data_loader = DataLoader()
         try:
             self.comments_df = load_comments()
         except (FileNotFoundError, pd.errors.EmptyDataError) as e:
@@ -110,11 +119,12 @@ class MainController(QObject):
         # -------------------------
         # 📁 Rutas de archivos
         # -------------------------
-        self.catalog_dir = get_catalog_dir()
-        self.operative_capacity_file = get_operative_capacity_path()
-        self.plan_path = get_plan_path(self.year_actual)
-        self.forecasted_plan_path = get_forecasted_plan_path(self.year_actual)
-        self.budget_path = get_budget_opex_path(self.year_actual)
+        with startup_phase("Rutas de OneDrive"):
+            self.catalog_dir = get_catalog_dir()
+            self.operative_capacity_file = get_operative_capacity_path()
+            self.plan_path = get_plan_path(self.year_actual)
+            self.forecasted_plan_path = get_forecasted_plan_path(self.year_actual)
+            self.budget_path = get_budget_opex_path(self.year_actual)
         self.services_validated_paths = []
 
         self.view = None
@@ -123,11 +133,15 @@ class MainController(QObject):
         # 📊 Carga de gestores
         # -------------------------
         try:
-            self.plan_actividades = PlanAnualActividades(self.data_loader, self.plan_path)
-            self.opex_manager = OpexDataManager(self.data_loader, self.plan_path)
-            self.opex_manager.load_opex_data()
-            self.capacity_manager = OperativeCapacityManager(self.operative_capacity_file)
-            self.cdf_df = self.data_loader.load_cdf_activities(self.data_loader, self.year_actual)
+            with startup_phase("PlanAnualActividades"):
+                self.plan_actividades = PlanAnualActividades(self.data_loader, self.plan_path)
+            with startup_phase("OpexDataManager"):
+                self.opex_manager = OpexDataManager(self.data_loader, self.plan_path)
+                self.opex_manager.load_opex_data()
+            with startup_phase("OperativeCapacityManager"):
+                self.capacity_manager = OperativeCapacityManager(self.operative_capacity_file)
+            with startup_phase("Actividades CDF"):
+                self.cdf_df = self.data_loader.load_cdf_activities(self.data_loader, self.year_actual)
             print("✅ Gestores de datos de oficina cargados correctamente.")
         except (FileNotFoundError, pd.errors.EmptyDataError) as e:
             print(f"⚠️ ADVERTENCIA: No se encontraron o están vacíos los archivos de oficina: {e}.")
@@ -145,20 +159,20 @@ class MainController(QObject):
         # -------------------------
         self.reports = [
 
-            {"class": RigReport, "title": "1.01 WI Rig", "type": "rig_schedule", "params": {"year": self.year_actual, "merged_opex_data": None, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": MISwacoReport, "title": "1.02 MI Swaco", "type": "mi_swaco", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": CompletionsReport, "title": "1.03 Completions", "type": "completions", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": BitsDrillingTRemedialReport, "title": "1.04 Bits, Drilling Tools & Remedial", "type": "bits_d_tools_remedial", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": SurfaceSystemsReport, "title": "1.05 Surface Systems", "type": "surface_systems", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": WirelineReport, "title": "1.06 Wireline Report", "type": "wireline", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": WellServicesReport, "title": "1.07 Well Services", "type": "well_services", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": TestingFluidAnalysisReport, "title": "1.08 Testing and Fluid Analysis", "type": "well_services", "params": {"year": self.year_actual, "operative_capacity": None,  "opex_manager": None, "plan_actividades": None}},
-            {"class": TubularsReport, "title": "1.09 Tubulars Report", "type": "tubulars", "params": {"year": self.year_actual, "operative_capacity": None, "plan_actividades": None, "opex_manager": None}},
-            {"class": ServicesReport, "title": "1.10 Services", "type": "services", "params": {"year": self.year_actual, "operative_capacity": None, "plan_actividades": None, "opex_manager": None}},
-            {"class": EnvironmentReport, "title": "1.11 Environment", "type": "environment", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": ArtificialLiftReport, "title": "1.13 Artificial Lift", "type": "artificial_lift", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": IntegratedServicesReport, "title": "1.14 Integrates Services Management", "type": "well_services", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
-            {"class": TanksAndTrunksReport, "title": "1.15 Tanks and Trunks", "type": "tanks_and_trunks", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["RigReport"], "title": "1.01 WI Rig", "type": "rig_schedule", "params": {"year": self.year_actual, "merged_opex_data": None, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["MISwacoReport"], "title": "1.02 MI Swaco", "type": "mi_swaco", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["CompletionsReport"], "title": "1.03 Completions", "type": "completions", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["BitsDrillingTRemedialReport"], "title": "1.04 Bits, Drilling Tools & Remedial", "type": "bits_d_tools_remedial", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["SurfaceSystemsReport"], "title": "1.05 Surface Systems", "type": "surface_systems", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["WirelineReport"], "title": "1.06 Wireline Report", "type": "wireline", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["WellServicesReport"], "title": "1.07 Well Services", "type": "well_services", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["TestingFluidAnalysisReport"], "title": "1.08 Testing and Fluid Analysis", "type": "well_services", "params": {"year": self.year_actual, "operative_capacity": None,  "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["TubularsReport"], "title": "1.09 Tubulars Report", "type": "tubulars", "params": {"year": self.year_actual, "operative_capacity": None, "plan_actividades": None, "opex_manager": None}},
+            {"class": OFFICE_REPORT_CLASSES["ServicesReport"], "title": "1.10 Services", "type": "services", "params": {"year": self.year_actual, "operative_capacity": None, "plan_actividades": None, "opex_manager": None}},
+            {"class": OFFICE_REPORT_CLASSES["EnvironmentReport"], "title": "1.11 Environment", "type": "environment", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["ArtificialLiftReport"], "title": "1.13 Artificial Lift", "type": "artificial_lift", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["IntegratedServicesReport"], "title": "1.14 Integrates Services Management", "type": "well_services", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
+            {"class": OFFICE_REPORT_CLASSES["TanksAndTrunksReport"], "title": "1.15 Tanks and Trunks", "type": "tanks_and_trunks", "params": {"year": self.year_actual, "operative_capacity": None, "opex_manager": None, "plan_actividades": None}},
 
         ]
         
@@ -167,14 +181,46 @@ class MainController(QObject):
         self.view = view
         self.field_controller = FieldController(self.view)
 
-    def generate_reports(self):
+    def generate_reports(self, progress=None):
+        """
+        Genera y muestra los reportes de oficina.
 
+        Args:
+            progress (ProgressContext, optional): Contexto de progreso y cancelación;
+                la generación se detiene en el siguiente checkpoint si se cancela.
+        """
+        progress = ensure_progress(progress)
+        try:
+            self._generate_reports(progress)
+        except OperationCancelled:
+            print("⚠️ Generación de reportes de oficina cancelada por el usuario.")
+
+    def _run_report_stages(self, report_instance, activities_data, progress):
+        """Ejecuta forecast, presupuesto, desviaciones y gráfico con checkpoints entre etapas."""
+        report_instance.set_progress_context(progress)
+        report_instance.checkpoint("Forecast", 0.0)
+        forecast = report_instance.generate_forecast()
+        report_instance.checkpoint("Budget", 0.25)
+        budget = report_instance.generate_budget()
+        report_instance.checkpoint("Deviations", 0.5)
+        deviations = report_instance.generate_deviations()
+        report_instance.checkpoint("Graph", 0.75)
+        graph = report_instance.generate_graph(forecast, budget, activities_data)
+        report_instance.checkpoint("Done", 1.0)
+        return graph, deviations
+
+    def _generate_reports(self, progress):
+        progress.checkpoint("Recargando Plan Anual de Actividades", 0.0)
         print("Recargando Plan Anual de Actividades (Oficina)...")
         self.plan_actividades = PlanAnualActividades(self.data_loader, self.plan_path)
 
-        activities_data = build_activities_dataframe(self.data_loader, self.plan_actividades, self.year_actual)
+        progress.checkpoint("Construyendo actividades", 0.05)
+        activities_data = build_activities_dataframe(self.data_loader, self.plan_actividades, self.year_actual, progress)
 
-        for report_info in self.reports:
+        total = len(self.reports)
+        for i, report_info in enumerate(self.reports):
+            report_progress = progress.subcontext(0.1 + 0.9 * i / total, 0.1 + 0.9 * (i + 1) / total)
+            report_progress.checkpoint(report_info["title"], 0.0)
             report_class = report_info["class"]
             params = report_info["params"]
 
@@ -203,10 +249,7 @@ class MainController(QObject):
                 if hasattr(self, "services_validated_paths"):
                     report_instance.set_validated_paths(self.services_validated_paths)
 
-            forecast = report_instance.generate_forecast()
-            budget = report_instance.generate_budget()
-            deviations = report_instance.generate_deviations()
-            graph = report_instance.generate_graph(forecast, budget, activities_data)            
+            graph, deviations = self._run_report_stages(report_instance, activities_data, report_progress)
             self.view.show_plot_view(
                 graph,            deviations,
                 title=report_info["title"],
@@ -367,7 +410,7 @@ class MainController(QObject):
 
         Carga la lista de pozos disponibles y muestra una ventana
         para que el usuario seleccione manualmente los pozos que se usarán.
-        La selección se guarda en un archivo Excel.
+        La selección se guarda como texto, un pozo por línea.
         """
         ruta_guardado = get_selected_services_wells_path()
         report = ServicesReport(
@@ -452,19 +495,22 @@ class MainController(QObject):
             print(f"No se pudo traer alguna variable calculada: {str(e)}")
             return None         
 
-    def generate_forecast_by_path(self, id_costo, id_dia):
+    def generate_forecast_by_path(self, id_costo, id_dia, progress=None):
         """
         Genera el forecast usando el método generate_forecast_by_path del ServicesReport.
         
         :param id_costo: ID del método de cálculo de costo
         :param id_dia: ID del método de cálculo de días
+        :param progress: ProgressContext opcional; la cancelación se propaga como OperationCancelled
         :return: DataFrame con el resultado del forecast
         """
         try:
             services_report = self.get_services_report_instance()
-            result_df = services_report.generate_forecast_by_path(id_costo, id_dia)
+            result_df = services_report.generate_forecast_by_path(id_costo, id_dia, progress=progress)
             return result_df
             
+        except OperationCancelled:
+            raise
         except Exception as e:
             print(f"Error en generate_forecast_by_path: {str(e)}")
             return None
@@ -506,7 +552,7 @@ class MainController(QObject):
                 self.opex_manager
             )
 
-            ruta_seleccionados = os.path.join(self.catalog_dir, "selected_services_wells.xlsx")
+            ruta_seleccionados = get_selected_services_wells_path()
             services_report.load_selected_wells(ruta_seleccionados)
             df_budget = services_report.load_available_wells()
             df_durations = self.data_loader.calcular_duracion_promedio()
@@ -719,9 +765,10 @@ class MainController(QObject):
             if dialog.exec_() == QDialog.Accepted:
                 updated_config = dialog.get_updated_config()
                 self.capex_config_service.save_config(updated_config)
-                QMessageBox.information(
-                    None, 
-                    "Configuración Guardada", 
+                show_save_result(
+                    None,
+                    self.capex_config_service.config_path,
+                    "Configuración Guardada",
                     "La configuración de meses CAPEX se ha guardado correctamente."
                 )
         except Exception as e:
@@ -756,13 +803,35 @@ class MainController(QObject):
         self.opex_manager.save_opex_to_excel()
         print("✅ OPEX updated and saved to Excel.")
 
-    def generate_all_slides(self, year_override=None, month_override=None):
+    def generate_all_slides(self, year_override=None, month_override=None, progress=None):
+        """
+        Exporta todos los reportes de oficina a una presentación PowerPoint.
+
+        Si se cancela el contexto de progreso, la exportación se detiene y no se
+        guarda ningún archivo parcial.
+        """
+        progress = ensure_progress(progress)
+        try:
+            self._generate_all_slides(year_override, month_override, progress)
+        except OperationCancelled:
+            print("⚠️ Exportación de slides cancelada por el usuario.")
+
+    def _generate_all_slides(self, year_override, month_override, progress):
+        require("pptx")
+        from pptx import Presentation
+        from pptx.util import Inches
+        from utils.export_ppt import add_slide_to_presentation
+
         prs = Presentation()
         prs.slide_width = Inches(16)
         prs.slide_height = Inches(9)
-        activities_data = build_activities_dataframe(self.data_loader, self.plan_actividades, self.year_actual)
+        progress.checkpoint("Construyendo actividades", 0.0)
+        activities_data = build_activities_dataframe(self.data_loader, self.plan_actividades, self.year_actual, progress)
 
-        for report_info in self.reports:
+        total = len(self.reports)
+        for i, report_info in enumerate(self.reports):
+            report_progress = progress.subcontext(0.05 + 0.9 * i / total, 0.05 + 0.9 * (i + 1) / total)
+            report_progress.checkpoint(report_info["title"], 0.0)
             report_class = report_info["class"]
             params = report_info["params"].copy()
 
@@ -776,10 +845,7 @@ class MainController(QObject):
 
             instance = report_class(self.data_loader, **params)
 
-            forecast = instance.generate_forecast()
-            budget = instance.generate_budget()
-            deviations_df = instance.generate_deviations()
-            graph = instance.generate_graph(forecast, budget, activities_data)
+            graph, deviations_df = self._run_report_stages(instance, activities_data, report_progress)
 
             comments = self.view.get_comments_for_title(report_info["title"])
             if report_info["title"] == "1.13 Artificial Lift":
@@ -792,10 +858,83 @@ class MainController(QObject):
 
             add_slide_to_presentation(prs, graph, deviations_str, comments, title=report_info["title"])
 
+        progress.checkpoint("Guardando presentación", 0.95)
         output_path = get_output_path_for_pptx(year=year_override, month=month_override)
         prs.save(output_path)
         print(f"✅ Presentación exportada en: {output_path}")
 
+    def generate_multi_year_reports(self, years, progress=None):
+        """
+        Genera los reportes de oficina de varios años en una sola pasada y exporta
+        una tabla comparativa (Excel) y un deck con todos los años.
+
+        Args:
+            years (list): Años a comparar.
+            progress (ProgressContext, optional): Contexto de progreso y cancelación.
+
+        Returns:
+            pd.DataFrame | None: La tabla comparativa, o None si se canceló.
+        """
+        require("pptx")
+        from pptx import Presentation
+        from pptx.util import Inches
+        from utils.export_ppt import add_slide_to_presentation, add_table_slide_to_presentation
+        from views.lazy_plot_tab import close_figure
+
+        progress = ensure_progress(progress)
+        services_inputs = None
+        try:
+            # El catálogo se interpreta una sola vez para todos los años
+            services_catalog_path = os.path.join(self.catalog_dir, "catalogo_solo_valores.xlsx")
+            services_inputs = self.get_services_inputs_from_table(pd.read_excel(services_catalog_path, sheet_name="Services"))
+        except Exception as e:
+            print(f"⚠️ No se pudo aplicar duración desde catálogo para Services: {e}")
+
+        batch = MultiYearBatch(
+            self.data_loader,
+            self.reports,
+            operative_capacity=self.capacity_manager.df,
+            services_inputs=services_inputs,
+            services_validated_paths=self.services_validated_paths,
+        )
+        try:
+            results = batch.run(years, progress.subcontext(0.0, 0.7))
+            comparison_df = MultiYearBatch.build_comparison_table(results)
+
+            prs = Presentation()
+            prs.slide_width = Inches(16)
+            prs.slide_height = Inches(9)
+            add_table_slide_to_presentation(prs, comparison_df, title="Comparativo multi-año")
+
+            # Los gráficos se generan aquí, en el hilo principal
+            slides_progress = progress.subcontext(0.7, 1.0)
+            total = sum(len(year_result["reports"]) for year_result in results.values()) or 1
+            done = 0
+            for year, year_result in results.items():
+                for report_result in year_result["reports"]:
+                    done += 1
+                    slides_progress.checkpoint(f"{year}: {report_result['title']}", done / total)
+                    if report_result["error"] is not None:
+                        continue
+                    graph = report_result["instance"].generate_graph(
+                        report_result["forecast"], report_result["budget"], year_result["activities_data"]
+                    )
+                    deviations_df = report_result["deviations"]
+                    deviations_str = "\n".join([str(row.to_dict()) for _, row in deviations_df.iterrows()]) if deviations_df is not None and not deviations_df.empty else "No deviations found."
+                    comments = self.view.get_comments_for_title(report_result["title"]) if self.view else ""
+                    add_slide_to_presentation(prs, graph, deviations_str, comments, title=f"{report_result['title']} ({year})")
+                    # Cada año genera una figura nueva; ya exportada, se libera
+                    close_figure(graph)
+        except OperationCancelled:
+            print("⚠️ Generación multi-año cancelada por el usuario.")
+            return None
+
+        comparison_df.to_excel(get_output_path_for_multi_year(years, "xlsx"), index=False)
+        output_path = get_output_path_for_multi_year(years, "pptx")
+        prs.save(output_path)
+        print(f"✅ Comparativo multi-año exportado en: {output_path}")
+        return comparison_df
+
     def format_closing_month_artificial_lift_deviations(self, deviations, closing_month):
         from utils.dates import normalize_month_names
 
@@ -838,6 +977,21 @@ class MainController(QObject):
         except (IndexError, ValueError) as e:
             print(f"Error actualizando capacidad operativa: {e}")
 
+    def recalculate_capacity_values(self, changes):
+        """
+        Calcula la tabla de capacidad operativa con varias ediciones {(fila, columna): valor}
+        sin modificar el estado actual; puede ejecutarse fuera del hilo de la interfaz.
+        """
+        return self.capacity_manager.recalculate_with(changes)
+
+    def apply_capacity_table(self, df):
+        """
+        Publica una tabla de capacidad operativa ya recalculada y la guarda.
+        """
+        self.capacity_manager.df = df
+        self.save_operative_capacity()
+        self.dataUpdated.emit()
+
     def save_operative_capacity(self, file_path=None):
         """
         Guarda los datos de capacidad operativa a Excel.
@@ -911,12 +1065,12 @@ class MainController(QObject):
         else:
             print("Error: FieldController no ha sido inicializado.")
     
-    def generate_field_reports(self):
+    def generate_field_reports(self, progress=None):
         """Delega la generación de reportes de campo al FieldController."""
         print("Recargando Plan Anual de Actividades (Campo)...")
         self.plan_actividades = PlanAnualActividades(self.data_loader, self.plan_path)
         if self.field_controller:
-            self.field_controller.generate_field_reports()
+            self.field_controller.generate_field_reports(progress)
     
     def open_approved_budget_and_activities(self):
         """Delega la apertura del presupuesto aprobado al FieldController."""
@@ -960,9 +1114,9 @@ class MainController(QObject):
             return self.field_controller.generate_leader_line_report()
         return pd.DataFrame()
     
-    def generate_leader_line_report(self):
+    def generate_leader_line_report(self, progress=None):
         """Delega la generación del reporte líder visual al FieldController."""
         print("Recargando Plan Anual de Actividades (Líder)...")
         self.plan_actividades = PlanAnualActividades(self.data_loader, self.plan_path)
         if self.field_controller:
-            self.field_controller.generate_leader_line_report()
+            self.field_controller.generate_leader_line_report(progress)
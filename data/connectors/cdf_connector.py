@@ -1,29 +1,48 @@
 # cdf_connector.py
+import threading
 from .base_connector import BaseConnector
 import pandas as pd
-from cognite.client import CogniteClient, ClientConfig
-from cognite.client.credentials import OAuthClientCredentials
 from config import COGNITE_CONFIG  # Importa la configuración desde la raíz
+from utils.capabilities import require
 
 class CDFConnector(BaseConnector):
     def __init__(self, config=COGNITE_CONFIG):
-        self.client = None
+        self._client = None
+        self._connect_attempted = False
+        # Los hilos de FieldReportRunner pueden pedir el cliente a la vez: solo uno conecta
+        self._connect_lock = threading.RLock()
         self.project = config['project']
         self.base_url = config['base_url']
         self.client_id = config['client_id']
         self.client_secret = config['client_secret']
         self.token_url = config['token_url']
 
+    @property
+    def client(self):
+        """Cliente de CDF. La conexión (y la importación de cognite-sdk) se hace la primera vez que se usa."""
+        if not self._connect_attempted:
+            with self._connect_lock:
+                if not self._connect_attempted:
+                    self.connect()
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
     def connect(self):
         """
         Establece la conexión con Cognite Data Fusion.
         """
-        try:
-            self.client = self.get_cognite_client_shaya()
-            print("Conexión a Cognite establecida exitosamente")
-        except Exception as e:
-            print(f"Error al conectar a Cognite: {e}")
-            self.client = None
+        with self._connect_lock:
+            try:
+                self.client = self.get_cognite_client_shaya()
+                print("Conexión a Cognite establecida exitosamente")
+            except Exception as e:
+                print(f"Error al conectar a Cognite: {e}")
+                self.client = None
+            finally:
+                self._connect_attempted = True
 
     def fetch_data(self, query):
         """
@@ -53,6 +72,10 @@ class CDFConnector(BaseConnector):
         """
         Configura y retorna un cliente de Cognite Data Fusion utilizando la configuración externalizada.
         """
+        cognite_client = require("cognite")
+        from cognite.client import ClientConfig
+        from cognite.client.credentials import OAuthClientCredentials
+
         creds = OAuthClientCredentials(
             token_url=self.token_url,
             client_id=self.client_id,
@@ -65,5 +88,5 @@ class CDFConnector(BaseConnector):
             credentials=creds,
             base_url=self.base_url,
         )
-        client = CogniteClient(cnf)
+        client = cognite_client.CogniteClient(cnf)
         return client
@@ -1,16 +1,30 @@
 # sql_connector.py
-import pyodbc
+import threading
 import pandas as pd
 from .base_connector import BaseConnector
 from config import DB_CONFIG  # Importa la configuración de SQL
+from utils.capabilities import require
 
 class SQLConnector(BaseConnector):
     def __init__(self, config=DB_CONFIG):
-        self.conn = None
         self.config = config
+        # pyodbc no permite compartir una conexión entre hilos: cada hilo abre la suya
+        self._local = threading.local()
+
+    @property
+    def conn(self):
+        """Conexión del hilo actual. Se abre de forma perezosa la primera vez que un hilo la usa."""
+        if not hasattr(self._local, "conn"):
+            self.connect()
+        return self._local.conn
+
+    @conn.setter
+    def conn(self, value):
+        self._local.conn = value
 
     def connect(self):
         try:
+            pyodbc = require("pyodbc")
             self.conn = pyodbc.connect(
                 f"DRIVER={{SQL Server}};SERVER={self.config['server']};"
                 f"DATABASE={self.config['database']};UID={self.config['username']};PWD={self.config['password']}"
@@ -30,3 +44,14 @@ class SQLConnector(BaseConnector):
         else:
             print("No hay conexión activa a SQL Server")
             return pd.DataFrame()
+
+    def close(self):
+        """Cierra la conexión del hilo actual, si existe, para liberarla de inmediato."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception as e:
+                print(f"Error al cerrar la conexión a SQL Server: {e}")
+        if hasattr(self._local, "conn"):
+            del self._local.conn
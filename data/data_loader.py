@@ -5,6 +5,7 @@ import pandas as pd
 from openpyxl import load_workbook
 import calendar
 import os
+import threading
 
 from data.connectors.cdf_connector import CDFConnector
 from data.connectors.sql_connector import SQLConnector
@@ -14,22 +15,36 @@ from utils.file_manager import get_capex_config_path
 class DataLoader:
     def __init__(self):
         # Inicializar conectores
+        # Cada conector se conecta (e importa pyodbc / cognite-sdk) al usarse por primera vez
         self.sql_connector = SQLConnector()
-        self.sql_connector.connect() # Aquí puedes asignar un conector SQL real
         self.cdf_connector = CDFConnector()
-        self.cdf_connector.connect()
         self._budget_data = None
+        self._budget_range = None
         self._cdf_cache = None
+        # Un lock por caché: quien llega mientras otro hilo carga la misma fuente
+        # espera a esa única lectura en lugar de lanzar otra.
+        self._budget_lock = threading.RLock()
+        self._cdf_lock = threading.RLock()
         self.DIAS_MOVILIZACION = 1
 
     
     # ---------------------------------------------------
     # Métodos SQL
     # ---------------------------------------------------
-    def load_from_sql(self, query):
+    def load_from_sql(self, query, progress=None):
         if self.sql_connector is None:
             raise ValueError("SQL Connector is not initialized")
+        if progress is not None:
+            progress.checkpoint("Consultando SQL Server")
         return self.sql_connector.fetch_data(query)
+
+    def close_thread_connection(self):
+        """
+        Libera la conexión SQL del hilo actual. Los hilos de trabajo deben llamarlo
+        al terminar o al ser cancelados para no dejar conexiones abiertas.
+        """
+        if self.sql_connector is not None:
+            self.sql_connector.close()
     
 
 
@@ -63,7 +78,7 @@ class DataLoader:
         df = self.load_from_sql(query)
         return df
     
-    def fetch_fails_by_year(self, year):
+    def fetch_fails_by_year(self, year, progress=None):
         """
         Conecta a la base de datos y obtiene la suma de fallas (FAILS) agrupadas por mes para el año indicado.
         
@@ -96,19 +111,20 @@ class DataLoader:
             from data.connectors.sql_connector import SQLConnector
             from config import DB_CONFIG
             self.sql_connector = SQLConnector(DB_CONFIG)
-            self.sql_connector.connect()
 
+        if progress is not None:
+            progress.checkpoint("Consultando fallas en SQL Server")
         df = self.sql_connector.fetch_data(query)
         return df
     # ---------------------------------------------------
     # Calcular duración promedio entre START_WO y END_WO
     # ---------------------------------------------------
-    def calcular_duracion_movilizacion(self):
+    def calcular_duracion_movilizacion(self, progress=None):
         query = """
             SELECT ITEM_NAME, START_WO, END_WO, START_RIG_MOV, END_RIG_MOV
             FROM VT_WELLJOBLOG_en_US
         """
-        df = self.load_from_sql(query)
+        df = self.load_from_sql(query, progress)
         print("BOENAS")
         print(list(df.columns))
         df['START_WO'] = pd.to_datetime(df['START_WO'], errors='coerce')
@@ -121,11 +137,11 @@ class DataLoader:
         
         return df_result
 
-    def obtener_pozos_services(self):
+    def obtener_pozos_services(self, progress=None):
         query = """
             SELECT WELL, p_WELLBORE FROM HIERARCHY(GETDATE())
         """
-        df = self.load_from_sql(query)
+        df = self.load_from_sql(query, progress)
         print("COLUMNAS DE LOS POZOS DE SERVICES")
         print(df)
 
@@ -165,17 +181,17 @@ class DataLoader:
         return df_result
         """
         
-    def calcular_duracion_promedio(self):
+    def calcular_duracion_promedio(self, progress=None):
         query = """
         SELECT ITEM_NAME, START_WO, END_WO, START_SUSPEN, END_SUSPEN
         FROM VT_WELLJOBLOG_en_US
         WHERE YEAR(END_WO) = 2025
         AND PLAN_TYPE_TEXT = 'Opex'
         """
-        df = self.load_from_sql(query)
+        df = self.load_from_sql(query, progress)
         print(df)
-        print(self.calcular_duracion_movilizacion())
-        print(self.obtener_pozos_services())
+        print(self.calcular_duracion_movilizacion(progress))
+        print(self.obtener_pozos_services(progress))
 
         # Asegurar que sean tipo datetime
         for col in ['START_WO', 'END_WO', 'START_SUSPEN', 'END_SUSPEN']:
@@ -255,7 +271,9 @@ class DataLoader:
         Carga y procesa el reporte de presupuesto para todos los años (por ejemplo, de 2019 a 2025)
         leyendo una tabla específica del Excel, y lo cachea en self._budget_data.
         
-        Si ya se cargó, retorna el DataFrame cacheado.
+        Si ya se cargó un rango que cubre los años pedidos, retorna el DataFrame
+        cacheado (filtrado al rango). Si se pide un rango más amplio, se vuelve a
+        leer una sola vez cubriendo ambos rangos.
         
         Args:
             start_year (int): Año inicial.
@@ -264,11 +282,28 @@ class DataLoader:
             table_name (str): Nombre de la tabla definida en la hoja.
             
         Returns:
-            pd.DataFrame: DataFrame con los datos filtrados para los años indicados.
-        """
-        if self._budget_data is not None:
-            return self._budget_data
-
+            pd.DataFrame: Copia de los datos filtrados para los años indicados.
+        """
+        with self._budget_lock:
+            read_start, read_end = start_year, end_year
+            if self._budget_range is not None:
+                cached_start, cached_end = self._budget_range
+                if start_year < cached_start or end_year > cached_end:
+                    read_start, read_end = min(start_year, cached_start), max(end_year, cached_end)
+                    self._budget_data = None
+            if self._budget_data is None:
+                self._budget_data = self._read_budget_data_all_years(read_start, read_end, sheet_name, table_name)
+                self._budget_range = (read_start, read_end)
+            budget_data = self._budget_data
+            budget_range = self._budget_range
+
+        # Copias, igual que load_from_cognite: quien modifique el resultado no altera el caché
+        if budget_data.empty or budget_range == (start_year, end_year):
+            return budget_data.copy()
+        return budget_data[(budget_data["YEAR"] >= start_year) & (budget_data["YEAR"] <= end_year)].copy()
+
+    def _read_budget_data_all_years(self, start_year, end_year, sheet_name, table_name):
+        """Lee del Excel la tabla de presupuesto filtrada por años, sin usar el caché."""
         from utils.file_manager import obtener_archivo_reporte_actual  # Asumiendo que definiste load_table_from_excel
 
         archivo_excel = obtener_archivo_reporte_actual()
@@ -279,8 +314,7 @@ class DataLoader:
                 df = self.load_table_from_excel(archivo_excel, sheet_name, table_name)
             except ValueError as e:
                 print(e)
-                self._budget_data = pd.DataFrame()
-                return self._budget_data
+                return pd.DataFrame()
 
             # Convertir a DataFrame (por si load_table_from_excel ya lo devuelve, esto es opcional)
             df = pd.DataFrame(df)
@@ -289,12 +323,10 @@ class DataLoader:
             
             # Filtrar por el rango de años
             df = df[(df["YEAR"] >= start_year) & (df["YEAR"] <= end_year)]
-            self._budget_data = df  # Guardar en cache
             return df
         else:
             print("No se encontró ningún archivo Excel para el presupuesto.")
-            self._budget_data = pd.DataFrame()
-            return self._budget_data
+            return pd.DataFrame()
 
 
     def load_budget_data_per_year(self, year=2025):
@@ -307,7 +339,7 @@ class DataLoader:
         Returns:
             pd.DataFrame: DataFrame filtrado para ese año, con la columna MONTH normalizada.
         """
-        df = self.load_budget_data_all_years()
+        df = self.load_budget_data_all_years(start_year=year, end_year=year)
         if df.empty:
             return df
 
@@ -377,36 +409,40 @@ class DataLoader:
         print(df)
         return df
     
-    def load_from_cognite(self, database='jobs_catalogue', table='jobs_catalogue', limit=None):
+    def load_from_cognite(self, database='jobs_catalogue', table='jobs_catalogue', limit=None, progress=None):
         """
         Carga datos de Cognite usando el conector (CDFConnector) ya creado.
-        Si ya se cargaron previamente, devuelve el cache.
-        """
-        if self._cdf_cache is not None:
-            # Devolver datos cacheados
-            return self._cdf_cache
-
-        # Si aún no se han cargado, se realiza la consulta
-        if not hasattr(self, 'cdf_connector') or self.cdf_connector is None:
-            from data.connectors.cdf_connector import CDFConnector
-            from config import COGNITE_CONFIG
-            self.cdf_connector = CDFConnector(COGNITE_CONFIG)
-            self.cdf_connector.connect()
-
-        query = {'database': database, 'table': table, 'limit': limit}
-        try:
-            df = self.cdf_connector.fetch_data(query)
-            # Convertir la columna 'Start' a datetime si es necesario
-            if 'Start' in df.columns:
-                df['Start'] = pd.to_datetime(df['Start'], errors='coerce')
-            # Cachear el DataFrame para la sesión actual
-            self._cdf_cache = df
-            print("Problema aqui")
-            print(df)
-            return df
-        except Exception as e:
-            print(f"Error al obtener datos de Cognite: {e}")
-            return pd.DataFrame()
+        Si ya se cargaron previamente, devuelve una copia del cache (los
+        consumidores agregan columnas y no deben modificar el DataFrame compartido).
+        """
+        if progress is not None:
+            progress.checkpoint("Consultando Cognite")
+        with self._cdf_lock:
+            if self._cdf_cache is not None:
+                # Devolver datos cacheados
+                return self._cdf_cache.copy()
+
+            # Si aún no se han cargado, se realiza la consulta
+            if not hasattr(self, 'cdf_connector') or self.cdf_connector is None:
+                from data.connectors.cdf_connector import CDFConnector
+                from config import COGNITE_CONFIG
+                self.cdf_connector = CDFConnector(COGNITE_CONFIG)
+                self.cdf_connector.connect()
+
+            query = {'database': database, 'table': table, 'limit': limit}
+            try:
+                df = self.cdf_connector.fetch_data(query)
+                # Convertir la columna 'Start' a datetime si es necesario
+                if 'Start' in df.columns:
+                    df['Start'] = pd.to_datetime(df['Start'], errors='coerce')
+                # Cachear el DataFrame para la sesión actual
+                self._cdf_cache = df
+                print("Problema aqui")
+                print(df)
+                return df.copy()
+            except Exception as e:
+                print(f"Error al obtener datos de Cognite: {e}")
+                return pd.DataFrame()
 
 
     def group_cdf_by_month(self, df: pd.DataFrame, col='activity_type') -> pd.DataFrame:
@@ -422,7 +458,8 @@ class DataLoader:
         """
         Método para limpiar la caché de datos de Cognite, en caso de querer refrescar la información.
         """
-        self._cdf_cache = None
+        with self._cdf_lock:
+            self._cdf_cache = None
         
 
     def fetch_capex_activities_for_year(self, year=None):
@@ -1,6 +1,8 @@
 import calendar
 import pandas as pd
-def build_activities_dataframe(data_loader, plan_actividades, year):
+from utils.progress import OperationCancelled
+
+def build_activities_dataframe(data_loader, plan_actividades, year, progress=None):
     """
     Construye un DataFrame consolidado con:
     - Actividades planificadas (plan_actividades)
@@ -12,6 +14,8 @@ def build_activities_dataframe(data_loader, plan_actividades, year):
     - PLANNED_ACTIVITIES
     - EXECUTED_ACTIVITIES
     - FAILS
+
+    Con progress (ProgressContext) la consulta SQL de fallas se puede cancelar.
     """
     try:
         # 1️⃣ Planificadas desde plan_actividades
@@ -36,7 +40,7 @@ def build_activities_dataframe(data_loader, plan_actividades, year):
         executed_df.columns = executed_df.columns.str.upper()
 
         # 3️⃣ Fallas desde SQL
-        fails_df = data_loader.fetch_fails_by_year(year)
+        fails_df = data_loader.fetch_fails_by_year(year, progress=progress)
         fails_df["MONTH"] = fails_df["Month"].apply(lambda x: calendar.month_name[x])
         fails_df.drop(columns=["Month"], inplace=True)
         fails_df.rename(columns={"TotalFails": "FAILS"}, inplace=True)
@@ -61,6 +65,8 @@ def build_activities_dataframe(data_loader, plan_actividades, year):
 
         return df
 
+    except OperationCancelled:
+        raise
     except Exception as e:
         print(f"❌ Error al construir dataframe de actividades: {e}")
         return pd.DataFrame()
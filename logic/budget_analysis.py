@@ -1,4 +1,5 @@
 import pandas as pd
+from utils.diagnostics import capture_frame
 
 def group_budget(budget_data, line):
     
@@ -155,8 +156,8 @@ def match_jobs_with_budget(cotizacion, budget, group_mapping_budget, group_mappi
 
     grouped_cotizacion = group_data(data=cotizacion, group_mapping=group_mapping_cotizacion, group_by=["WELL", "YEAR", "MONTH"])
     
-    grouped_cotizacion.to_excel(r"summary\als\grouped_cotizacion.xlsx")
-    grouped_budget.to_excel(r"summary\als\grouped_budget.xlsx")
+    capture_frame("als/grouped_cotizacion", grouped_cotizacion)
+    capture_frame("als/grouped_budget", grouped_budget)
 
 
     # Step 4: Merge cotización with budget (on WELL, MONTH, YEAR)
@@ -167,8 +168,7 @@ def match_jobs_with_budget(cotizacion, budget, group_mapping_budget, group_mappi
         suffixes=("_cotizacion", "_budget")
     )
 
-    #exportar a un archivo excel
-    merged.to_excel(r"summary\als\merged.xlsx")
+    capture_frame("als/merged", merged)
 
 
 
@@ -1,7 +1,7 @@
 from calendar import month_name
 from datetime import datetime
 from functools import cached_property
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 import pandas as pd
 from services.field_lines_services.executed_activities_manager import ExecutedActivitiesManager
 from services.field_lines_services.field_activities_coordinator import FieldActivitiesCoordinator
@@ -9,11 +9,13 @@ from services.field_lines_services.anual_pta_loader import AnnualPTALoader
 from services.field_lines_services.field_data_service import FieldDataService
 from services.field_lines_services.manual_planning_service import ManualPlanningService
 from services.field_lines_services.planned_activities_manager import PlannedActivitiesManager
-from services.field_lines_services.field_graph_generator_service import FieldGraphGeneratorService
 from services.field_lines_services.cpi_spi_service import CpiSpiService
 from services.read_excel import get_plan_df_by_line
 from utils.file_loader import load_months_from_file
 
+if TYPE_CHECKING:
+    from services.field_lines_services.field_graph_generator_service import FieldGraphGeneratorService
+
 class FieldReport:
     """
     Clase que encapsula la lógica para generar un reporte completo de una línea de campo.
@@ -22,7 +24,30 @@ class FieldReport:
     actividades planeadas, ejecutadas, presupuestos y proyecciones, actuando como
     una fachada para diversos servicios y gestores de datos.
     """
-    def __init__(self, title: str, service_type: str, zone: str, line_type: str, field_graph_service: Optional[FieldGraphGeneratorService] = None, planned_activities_manager: Optional[PlannedActivitiesManager] = None, executed_activities_manager: Optional[ExecutedActivitiesManager] = None, manual_planning_service: Optional[ManualPlanningService] = None, field_data_service: Optional[FieldDataService] = None, field_activities_coordinator: Optional[FieldActivitiesCoordinator] = None):
+    # Artefactos (DataFrames del resumen mensual y del gráfico) que dependen de
+    # cada fuente de datos. Al cambiar una fuente solo se descartan estos.
+    ARTIFACT_DEPENDENCIES = {
+        "manual_planning": (
+            "forecast", "budget", "planned_activities", "planned_activities_monthly",
+            "scheduled_executed_activities", "scheduled_executed_activities_monthly",
+        ),
+        "approved_budget": ("budget",),
+        "executed_activities": (
+            "forecast", "real_cost_accumulated", "executed_activities",
+            "executed_activities_monthly", "scheduled_executed_activities",
+        ),
+        "categorizer_thresholds": ("forecast",),
+        "cpi_spi": ("cpi_spi_info",),
+    }
+
+    # Orden de merge del resumen mensual (define los sufijos _x/_y del resultado)
+    MONTHLY_SUMMARY_ARTIFACTS = (
+        "forecast", "budget", "real_cost_accumulated", "executed_activities",
+        "executed_activities_monthly", "planned_activities", "planned_activities_monthly",
+        "scheduled_executed_activities", "scheduled_executed_activities_monthly",
+    )
+
+    def __init__(self, title: str, service_type: str, zone: str, line_type: str, field_graph_service: Optional["FieldGraphGeneratorService"] = None, planned_activities_manager: Optional[PlannedActivitiesManager] = None, executed_activities_manager: Optional[ExecutedActivitiesManager] = None, manual_planning_service: Optional[ManualPlanningService] = None, field_data_service: Optional[FieldDataService] = None, field_activities_coordinator: Optional[FieldActivitiesCoordinator] = None):
         """
         Inicializa una instancia de FieldReport.
 
@@ -50,7 +75,9 @@ class FieldReport:
         self._field_activities_coordinator = field_activities_coordinator
         self._approved_budget_activities_cache = None
         self._cost_by_activity_cache = None
+        self._artifacts_cache = {}
         self._year = None
+        self.progress = None
 
     @property
     def manual_planning_service(self) -> ManualPlanningService:
@@ -74,9 +101,11 @@ class FieldReport:
         return self._planned_activities_manager
     
     @property
-    def field_graph_service(self) -> FieldGraphGeneratorService:
+    def field_graph_service(self) -> "FieldGraphGeneratorService":
         """Inicializa y devuelve de forma perezosa el servicio de generación de gráficos."""
         if self._field_graph_service is None:
+            # matplotlib se importa recién al dibujar el primer gráfico
+            from services.field_lines_services.field_graph_generator_service import FieldGraphGeneratorService
             self._field_graph_service = FieldGraphGeneratorService()
         return self._field_graph_service
 
@@ -144,9 +173,14 @@ class FieldReport:
         df_forecast = self.field_activities_coordinator.get_projected_adjusted_data_frame(self.title, self.service_type)
         return df_forecast
     
-    def generate_graph(self):
-        """Genera el gráfico de forecast de la línea utilizando todas las fuentes de datos."""
-        return self.field_graph_service.generate_field_forecast_graph(self.title, **self.get_data_sources())
+    def generate_graph(self, data_sources: Optional[Dict[str, Any]] = None):
+        """
+        Genera el gráfico de forecast de la línea utilizando todas las fuentes de datos.
+        Acepta fuentes ya calculadas (p. ej. por FieldReportRunner) para no recalcularlas.
+        """
+        if data_sources is None:
+            data_sources = self.get_data_sources()
+        return self.field_graph_service.generate_field_forecast_graph(self.title, **data_sources)
     
     def generate_deviations(self):
         """Genera un DataFrame con las desviaciones (actualmente es un placeholder)."""
@@ -157,10 +191,10 @@ class FieldReport:
         summary_df = pd.DataFrame()
         year = self.get_year()
         last_valid_month = self.executed_activities_manager.get_last_index_month_in_excel()
-        real_cost_accumulated_df = self.generate_accumulated_real_cost_data_frame()
-        forecast_df = self.generate_forecast()
+        real_cost_accumulated_df = self._get_artifact("real_cost_accumulated")
+        forecast_df = self._get_artifact("forecast")
         approved_budget_df = self.get_approved_budget_activities()
-        forecast_activities_accumulated_df = self.generate_scheduled_executed_activities_accumulated_data_frame()
+        forecast_activities_accumulated_df = self._get_artifact("scheduled_executed_activities")
         activities_balance, cost_balance = self.get_balances(forecast_activities_accumulated_df.iloc[-1]['Scheduled Activities'], approved_budget_df["Actividades aprobadas"], forecast_df.iloc[-1]['Forecast'], approved_budget_df[f"Presupuesto {year}"])
         summary_df["contractual activity"] = approved_budget_df["line_name"] #bien
         summary_df["approved budget"] = approved_budget_df[f"Presupuesto {year}"] #Budget Aprobado bien
@@ -247,7 +281,7 @@ class FieldReport:
     
     def generate_cpi_dataframe(self):
         """Genera un DataFrame con el Índice de Desempeño de Costos (CPI) mensual."""
-        df_cpi = self.generate_budget().merge(self.generate_accumulated_real_cost_data_frame(), on="Month", how="left")
+        df_cpi = self._get_artifact("budget").merge(self._get_artifact("real_cost_accumulated"), on="Month", how="left")
         df_cpi["CPI"] = df_cpi.apply(
             lambda row: round(row["Budget"] / row["TotalAccumulatedCost"],2) if row["TotalAccumulatedCost"] != 0 else 0, axis=1
         )
@@ -255,7 +289,7 @@ class FieldReport:
     
     def generate_spi_dataframe(self):
         """Genera DataFrame de SPI basado en actividades planeadas y ejecutadas acumuladas"""
-        df_spi = self.generate_accumulated_planned_activities_data_frame().merge(self.generate_accumulated_executed_activities_data_frame(), on="Month", how="left")
+        df_spi = self._get_artifact("planned_activities").merge(self._get_artifact("executed_activities"), on="Month", how="left")
         df_spi["SPI"] = df_spi.apply(
             lambda row: round(row["Executed Activities"] / row["Planned Activities"], 2)  if row["Planned Activities"] != 0 else 0, axis=1
         )
@@ -276,7 +310,7 @@ class FieldReport:
         """
         Obtiene el total de actividades ejecutadas.
         """
-        df_executed = self.generate_accumulated_executed_activities_data_frame()
+        df_executed = self._get_artifact("executed_activities")
         if not df_executed.empty:
             return df_executed['Executed Activities'].iloc[-1]
         return 0
@@ -289,10 +323,13 @@ class FieldReport:
     def reload_planned_activities_manager(self):
         """Recarga el gestor de actividades planeadas para reflejar los datos más recientes."""
         self._planned_activities_manager = PlannedActivitiesManager(get_plan_df_by_line(self.title))
+        self._field_activities_coordinator = None
+        self.invalidate_artifacts("manual_planning")
 
     def reload_manual_planning_service(self):
         """Recarga el servicio de planificación manual desde el archivo CSV."""
         self._manual_planning_service = ManualPlanningService(line_title=self.title)
+        self.invalidate_artifacts("manual_planning")
         
     def reload_approved_budget_data(self):
         """
@@ -302,44 +339,93 @@ class FieldReport:
         self._cost_by_activity_cache = None
         if 'anual_initial_planned_loader' in self.__dict__:
             del self.__dict__['anual_initial_planned_loader']
+        self.invalidate_artifacts("approved_budget")
 
     def reload_executed_activities_manager(self):
         """
         Recarga del gestor de actividades ejecutadas, creando una nueva instancia que leerá los datos más recientes del archivo Excel de origen.
         """
         self._executed_activities_manager = ExecutedActivitiesManager()
+        self._field_activities_coordinator = None
+        self.invalidate_artifacts("executed_activities")
+
+    def set_progress_context(self, progress):
+        """Asigna el contexto de progreso y cancelación (utils.progress.ProgressContext)."""
+        self.progress = progress
+
+    def checkpoint(self, stage: str, fraction: Optional[float] = None):
+        """Informa el avance y se detiene (OperationCancelled) si la operación fue cancelada."""
+        if self.progress is not None:
+            self.progress.checkpoint(stage, fraction)
+
+    def _artifact_builders(self) -> Dict[str, Any]:
+        """Relaciona cada artefacto cacheable con el método que lo genera."""
+        return {
+            "forecast": self.generate_forecast,
+            "budget": self.generate_budget,
+            "real_cost_accumulated": self.generate_accumulated_real_cost_data_frame,
+            "executed_activities": self.generate_accumulated_executed_activities_data_frame,
+            "executed_activities_monthly": self.generate_executed_activities_data_frame_by_month,
+            "planned_activities": self.generate_accumulated_planned_activities_data_frame,
+            "planned_activities_monthly": self.generate_planned_activities_data_frame_by_month,
+            "scheduled_executed_activities": self.generate_scheduled_executed_activities_accumulated_data_frame,
+            "scheduled_executed_activities_monthly": self.generate_scheduled_executed_activities_by_month,
+            "cpi_spi_info": self.get_cpi_spi_info,
+        }
+
+    def _get_artifact(self, name: str):
+        """
+        Devuelve un artefacto cacheado, generándolo solo si no existe o fue invalidado.
+        El objeto devuelto es el del caché: quien lo modifique debe copiarlo antes.
+        """
+        if name not in self._artifacts_cache:
+            self._artifacts_cache[name] = self._artifact_builders()[name]()
+        return self._artifacts_cache[name]
 
-    def get_monthly_summary_dataframe(self) -> pd.DataFrame:
+    def invalidate_artifacts(self, change: str) -> tuple:
+        """
+        Descarta solo los artefactos que dependen del cambio indicado.
+
+        Args:
+            change (str): Fuente modificada (ver ARTIFACT_DEPENDENCIES).
+
+        Returns:
+            tuple: Nombres de los artefactos descartados.
+        """
+        if change not in self.ARTIFACT_DEPENDENCIES:
+            raise ValueError(f"Tipo de cambio no soportado: {change}")
+        invalidated = self.ARTIFACT_DEPENDENCIES[change]
+        for name in invalidated:
+            self._artifacts_cache.pop(name, None)
+        return invalidated
+
+    def clear_cached_artifacts(self):
+        """Descarta todos los artefactos cacheados para forzar una regeneración completa."""
+        self._artifacts_cache = {}
+
+    def get_monthly_summary_dataframe(self, reload: bool = True) -> pd.DataFrame:
         """
         Crea y devuelve un DataFrame con el resumen mensual de todos los datos clave.
         Esta es la base para la agregación del Reporte Líder.
+
+        Args:
+            reload (bool): Si es True recarga todas las fuentes. Con False reutiliza
+                           los artefactos cacheados que sigan vigentes (refresco diferencial).
         """
-        # Forzar recarga de todos los datos para asegurar que estén frescos
-        self.reload_approved_budget_data()
-        self.reload_manual_planning_service()
-        self.reload_executed_activities_manager()
-        self.reload_planned_activities_manager()
-        
-        # Generar todo lo necesario
-        forecast_df = self.generate_forecast()
-        budget_df = self.generate_budget()
-        real_cost_accumulated_df = self.generate_accumulated_real_cost_data_frame()
-        executed_activities_df = self.generate_accumulated_executed_activities_data_frame()
-        executed_activities_monthly_df = self.generate_executed_activities_data_frame_by_month()
-        planned_activities_df = self.generate_accumulated_planned_activities_data_frame()
-        planned_activities_monthly_df = self.generate_planned_activities_data_frame_by_month()
-        scheduled_executed_activities_accumulated_df = self.generate_scheduled_executed_activities_accumulated_data_frame()
-        scheduled_executed_activities_monthly_df = self.generate_scheduled_executed_activities_by_month()
+        if reload:
+            # Forzar recarga de todos los datos para asegurar que estén frescos
+            self.reload_approved_budget_data()
+            self.reload_manual_planning_service()
+            self.reload_executed_activities_manager()
+            self.reload_planned_activities_manager()
 
         # hacer merge en la columna Month de todo
-        merged_df = pd.merge(forecast_df, budget_df, on="Month", how="outer")
-        merged_df = pd.merge(merged_df, real_cost_accumulated_df, on="Month", how="outer")
-        merged_df = pd.merge(merged_df, executed_activities_df, on="Month", how="outer")
-        merged_df = pd.merge(merged_df, executed_activities_monthly_df, on="Month", how="outer")
-        merged_df = pd.merge(merged_df, planned_activities_df, on="Month", how="outer")
-        merged_df = pd.merge(merged_df, planned_activities_monthly_df, on="Month", how="outer")
-        merged_df = pd.merge(merged_df, scheduled_executed_activities_accumulated_df, on="Month", how="outer")
-        merged_df = pd.merge(merged_df, scheduled_executed_activities_monthly_df, on="Month", how="outer")
+        merged_df = None
+        total = len(self.MONTHLY_SUMMARY_ARTIFACTS)
+        for i, name in enumerate(self.MONTHLY_SUMMARY_ARTIFACTS):
+            self.checkpoint(f"{self.title}: {name}", i / total)
+            artifact_df = self._get_artifact(name)
+            merged_df = artifact_df if merged_df is None else pd.merge(merged_df, artifact_df, on="Month", how="outer")
         month_order = [m.lower() for m in month_name[1:]]
         merged_df['Month'] = pd.Categorical(merged_df['Month'].str.lower(), categories=month_order, ordered=True)
         merged_df = merged_df.sort_values('Month').reset_index(drop=True)
@@ -347,17 +433,12 @@ class FieldReport:
 
     def get_data_sources(self) -> Dict[str, Any]:
         """Recopila y devuelve un diccionario con todos los DataFrames necesarios para el reporte."""
-        return {
-            "forecast": self.generate_forecast(),
-            "budget": self.generate_budget(),
-            "real_cost_accumulated": self.generate_accumulated_real_cost_data_frame(),
-            "executed_activities": self.generate_accumulated_executed_activities_data_frame(),
-            "executed_activities_monthly": self.generate_executed_activities_data_frame_by_month(),
-            "planned_activities": self.generate_accumulated_planned_activities_data_frame(),
-            "planned_activities_monthly": self.generate_planned_activities_data_frame_by_month(),
-            "scheduled_executed_activities": self.generate_scheduled_executed_activities_accumulated_data_frame(),
-            "scheduled_executed_activities_monthly": self.generate_scheduled_executed_activities_by_month(),
-            "cpi_spi_info": self.get_cpi_spi_info(),
-        } 
+        # Se devuelven copias: el servicio de gráficos modifica las columnas in situ
+        sources = {}
+        names = list(self._artifact_builders())
+        for i, name in enumerate(names):
+            self.checkpoint(f"{self.title}: {name}", i / len(names))
+            sources[name] = self._get_artifact(name).copy()
+        return sources
     
     
\ No newline at end of file
@@ -1,5 +1,7 @@
 import pandas as pd
 from logic.field_lines.reports.field_report import FieldReport
+from services.field_lines_services.planning_service_factory import PlanningServiceFactory
+from services.field_lines_services.executed_cost_categorizer import categorize_executed_activities
 
 
 class SlickAndBacheoReport(FieldReport):
@@ -28,6 +30,32 @@ class SlickAndBacheoReport(FieldReport):
         self.CATEGORIA_2 = categoria_2
         self.CATEGORIA_3 = categoria_3
 
+    def set_category_thresholds(self, categoria_1: float, categoria_2: float, categoria_3: float):
+        """
+        Actualiza los límites de costo de las categorías y descarta solo los
+        artefactos que dependen de ellos (el forecast).
+        """
+        self.CATEGORIA_1 = categoria_1
+        self.CATEGORIA_2 = categoria_2
+        self.CATEGORIA_3 = categoria_3
+        self.invalidate_artifacts("categorizer_thresholds")
+
+    def recalculate_categorized_forecast(self):
+        """
+        Recalcula y guarda el Forecast de los meses futuros con los límites de
+        categoría vigentes, igual que el cálculo automático de la planificación adaptativa.
+        """
+        service = PlanningServiceFactory.create_service(self.service_type, self.title)
+        if not hasattr(service, "calculate_forecasts"):
+            return
+        df_real_cost_accumulated = self._get_artifact("real_cost_accumulated")
+        non_zero_costs = df_real_cost_accumulated[df_real_cost_accumulated["TotalAccumulatedCost"] != 0]
+        start_row = non_zero_costs.index[-1] + 1 if not non_zero_costs.empty else 0
+        future_months = service.dataframe["Month"].iloc[start_row:].tolist()
+        forecasts = service.calculate_forecasts(future_months, self.CATEGORIA_1, self.CATEGORIA_2, self.CATEGORIA_3)
+        service.update_rows(forecasts, save=True)
+        self.invalidate_artifacts("categorizer_thresholds")
+
     def get_data_sources(self) -> dict:
         """
         Sobrescribe el método base para usar un presupuesto con CPAE estático.
@@ -76,31 +104,34 @@ class SlickAndBacheoReport(FieldReport):
         """
         month = month.strip().lower().title()
         df = self.get_executed_activities_data_frame_by_month(month, self.title)
-        servicios_col = f'{self.title}_Servicios'
-        productos_col = f'{self.title}_Productos'
-
-        if servicios_col not in df.columns:
-            raise ValueError(f'Columna {servicios_col} no encontrada')
-        productos_exists = productos_col in df.columns
-        # Si es Slickline, solo usar servicios_col
-        if self.title.strip().lower() == "item 49 slick line":
-            df["Categoria_Total"] = df[servicios_col].apply(self.clasificar_valor_servicio)
-            return df
-        # Si es Bacheo, sumar servicios y productos si existen
-        def calcular_total(row):
-            servicio = row.get(servicios_col, 0) or 0
-            producto = row.get(productos_col, None) if productos_exists else None
-            if pd.notnull(producto):
-                return servicio + producto
-            else:
-                return servicio
-        df[servicios_col] = df[servicios_col].fillna(0)
-        if productos_exists:
-            df[productos_col] = df[productos_col].fillna(0)
-        df["Costo_Total"] = df.apply(calcular_total, axis=1)
-        df["Categoria_Total"] = df["Costo_Total"].apply(self.clasificar_valor_servicio)
+        return self._categorize(df)
+
+    def get_categorized_executed_activities(self, months=None):
+        """
+        Categoriza en una sola pasada las actividades ejecutadas de varios meses.
+
+        Args:
+            months (list, optional): Meses a incluir; por defecto, todos los del año.
+
+        Returns:
+            pd.DataFrame: Actividades con 'Line', 'Costo_Total' y 'Categoria_Total'.
+        """
+        months = months if months is not None else self._get_months_data()
+        df = self.executed_activities_manager.get_executed_activities_data_frame_by_months(months, self.title)
+        df = self._categorize(df.copy())
+        if "Costo_Total" not in df.columns:
+            df["Costo_Total"] = df[f'{self.title}_Servicios']
+        df["Line"] = self.title
+        df["Month"] = df["Month"].astype(str)
         return df
 
+    def _categorize(self, df):
+        """Agrega la categoría de costo a cada actividad con operaciones vectorizadas."""
+        return categorize_executed_activities(
+            df, self.title, (self.CATEGORIA_1, self.CATEGORIA_2, self.CATEGORIA_3),
+            services_only=self.title.strip().lower() == "item 49 slick line",
+        )
+
     def clasificar_valor_servicio(self, valor):
         """
         Clasifica un valor de costo en una categoría numérica.
@@ -1,5 +1,6 @@
 import pandas as pd
 from logic.field_lines.reports.field_report import FieldReport
+from services.field_lines_services.quote_extractor_service import QUOTE_KEY_COLUMNS
 from services.read_excel import get_data_from_csv
 from utils.file_loader import load_field_reports_from_json, load_months_from_file
 from utils.file_manager import get_specific_schedule_activities_path, get_varillera_schedule_activities_path
@@ -145,7 +146,8 @@ class VarilleraReport(FieldReport):
         Maneja de forma segura el caso en que el archivo no exista.
         """
         path = get_specific_schedule_activities_path(self.title)
-        df = get_data_from_csv(path)
+        # Incluye las cotizaciones guardadas que aún están solo en el diario
+        df = get_data_from_csv(path, key_columns=QUOTE_KEY_COLUMNS)
         #print(f"Reading scheduled activities from: {path}")
         # Si la función de lectura devolvió None o un DataFrame vacío (porque el archivo no existe o está vacío)
         if df is None or df.empty:
@@ -1,6 +1,7 @@
 import pandas as pd
 from datetime import datetime, timedelta
 import re
+from utils.diagnostics import capture_frame
 
 def calculate_duration(jobs_data):
         
@@ -16,7 +17,7 @@ def calculate_duration(jobs_data):
     # Calcular la fecha de finalización
     jobs_data['End'] = jobs_data['Start'] + pd.to_timedelta(jobs_data['duration_days'], unit='d')
     
-    jobs_data.to_excel('forecast_activities_rig.xlsx', index=False)
+    capture_frame('forecast/activities_rig', jobs_data)
     
     return jobs_data
 
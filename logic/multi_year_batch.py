@@ -0,0 +1,174 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import pandas as pd
+
+from logic.activity_data import build_activities_dataframe
+from logic.opex_data_manager import OpexDataManager
+from logic.plan_actividades import PlanAnualActividades
+from utils.file_manager import get_plan_path
+from utils.progress import OperationCancelled, ensure_progress
+
+
+class MultiYearBatch:
+    """
+    Genera los reportes de oficina de varios años en una sola pasada.
+
+    Las fuentes compartidas se leen una sola vez: el presupuesto de todos los años
+    y las actividades de Cognite quedan en el caché del DataLoader, y el catálogo
+    de Services se recibe ya interpretado. Cada año se calcula en su propio hilo;
+    los gráficos se dejan para el hilo principal porque Matplotlib no es thread-safe.
+    """
+    def __init__(self, data_loader, reports: list, operative_capacity=None, services_inputs=None, services_validated_paths=None, max_workers: int = 3):
+        """
+        Args:
+            data_loader (DataLoader): Cargador compartido entre todos los años.
+            reports (list): Configuración de reportes de oficina (MainController.reports).
+            operative_capacity (pd.DataFrame, optional): Capacidad operativa (no depende del año).
+            services_inputs (dict, optional): Duración y costo objetivo leídos del catálogo de Services.
+            services_validated_paths (list, optional): Rutas validadas para el reporte de Services.
+            max_workers (int): Número máximo de años calculados en paralelo.
+        """
+        self.data_loader = data_loader
+        self.reports = reports
+        self.operative_capacity = operative_capacity
+        self.services_inputs = services_inputs
+        self.services_validated_paths = services_validated_paths or []
+        self.max_workers = max_workers
+
+    def run(self, years: list, progress=None) -> dict:
+        """
+        Calcula forecast, presupuesto y desviaciones de todos los reportes para cada año.
+
+        Args:
+            years (list): Años a generar.
+            progress (ProgressContext, optional): Contexto de progreso y cancelación.
+
+        Returns:
+            dict: {año: {"activities_data": DataFrame, "reports": [resultado, ...], "error": excepción o None}}
+                  Cada resultado tiene 'title', 'type', 'instance', 'forecast', 'budget',
+                  'deviations' y 'error'.
+        """
+        progress = ensure_progress(progress)
+        years = sorted(set(years))
+        if not years:
+            return {}
+        # Una sola lectura del presupuesto que cubra todos los años pedidos
+        self.data_loader.load_budget_data_all_years(start_year=min(years), end_year=max(years))
+        workers = max(1, min(self.max_workers, len(years)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="multi-year") as executor:
+            futures = {
+                year: executor.submit(self._run_year, year, progress.subcontext(i / len(years), (i + 1) / len(years)))
+                for i, year in enumerate(years)
+            }
+            pending = set(futures.values())
+            while pending:
+                # Espera corta para que el hilo que llama pueda atender la cancelación
+                _, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                progress.report((len(years) - len(pending)) / len(years), f"Años calculados: {len(years) - len(pending)}/{len(years)}")
+            results = {year: future.result() for year, future in futures.items()}
+        if progress.is_cancelled:
+            raise OperationCancelled("multi-year")
+        return results
+
+    def _run_year(self, year, progress) -> dict:
+        """Carga las fuentes propias del año y calcula sus reportes."""
+        year_result = {"activities_data": pd.DataFrame(), "reports": [], "error": None}
+        try:
+            progress.checkpoint(f"{year}: plan de actividades", 0.0)
+            plan_path = get_plan_path(year)
+            plan_actividades = PlanAnualActividades(self.data_loader, plan_path, sheet_name=f"Plan{year}")
+            opex_manager = OpexDataManager(self.data_loader, plan_path)
+            opex_manager.load_opex_data()
+            year_result["activities_data"] = build_activities_dataframe(self.data_loader, plan_actividades, year, progress)
+
+            for i, report_info in enumerate(self.reports):
+                progress.checkpoint(f"{year}: {report_info['title']}", (i + 1) / (len(self.reports) + 1))
+                report_progress = progress.subcontext((i + 1) / (len(self.reports) + 1), (i + 2) / (len(self.reports) + 1))
+                year_result["reports"].append(self._run_report(report_info, year, plan_actividades, opex_manager, report_progress))
+        except OperationCancelled:
+            year_result["error"] = OperationCancelled(str(year))
+        except Exception as e:
+            print(f"⚠️ No se pudieron cargar las fuentes del año {year}: {e}")
+            year_result["error"] = e
+        finally:
+            self.data_loader.close_thread_connection()
+        return year_result
+
+    def _run_report(self, report_info, year, plan_actividades, opex_manager, progress=None) -> dict:
+        """Calcula un reporte para un año; los errores quedan en el resultado."""
+        result = {
+            "title": report_info["title"],
+            "type": report_info.get("type", "default"),
+            "instance": None,
+            "forecast": None,
+            "budget": None,
+            "deviations": None,
+            "error": None,
+        }
+        try:
+            params = report_info["params"].copy()
+            params["year"] = year
+            if "opex_manager" in params:
+                params["opex_manager"] = opex_manager
+            if "plan_actividades" in params:
+                params["plan_actividades"] = plan_actividades
+            if "operative_capacity" in params:
+                params["operative_capacity"] = self.operative_capacity
+
+            instance = report_info["class"](self.data_loader, **params)
+            if report_info["title"] == "1.10 Services":
+                if self.services_inputs:
+                    instance.set_manual_duration(self.services_inputs["duration"])
+                    instance.set_manual_input_target_cost(self.services_inputs["target_cost"])
+                instance.set_validated_paths(self.services_validated_paths)
+
+            result["instance"] = instance
+            # Las consultas SQL/Cognite del reporte también se detienen al cancelar
+            instance.set_progress_context(progress)
+            try:
+                result["forecast"] = instance.generate_forecast()
+                result["budget"] = instance.generate_budget()
+                result["deviations"] = instance.generate_deviations()
+            finally:
+                instance.set_progress_context(None)
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            print(f"⚠️ Error generando '{report_info['title']}' para {year}: {e}")
+            result["error"] = e
+        return result
+
+    @staticmethod
+    def build_comparison_table(results: dict) -> pd.DataFrame:
+        """
+        Construye la tabla comparativa entre años.
+
+        Por cada reporte y año toma el forecast al cierre del año (suma de la columna
+        BUDGET del forecast, igual que la curva 'Forecast EOY' del gráfico) y el costo
+        real (suma de ACTUAL_COST del presupuesto).
+
+        Returns:
+            pd.DataFrame: Una fila por reporte y columnas '<métrica> <año>'.
+        """
+        rows = []
+        for year, year_result in results.items():
+            for report_result in year_result["reports"]:
+                if report_result["error"] is not None:
+                    continue
+                forecast = report_result["forecast"]
+                budget = report_result["budget"]
+                forecast_eoy = forecast["BUDGET"].fillna(0).sum() if isinstance(forecast, pd.DataFrame) and "BUDGET" in forecast.columns else 0.0
+                actual_cost = budget["ACTUAL_COST"].fillna(0).sum() if isinstance(budget, pd.DataFrame) and "ACTUAL_COST" in budget.columns else 0.0
+                rows.append({
+                    "Report": report_result["title"],
+                    "Year": year,
+                    "Forecast EOY": round(float(forecast_eoy), 2),
+                    "Actual Cost": round(float(actual_cost), 2),
+                    "Deviation": round(float(forecast_eoy - actual_cost), 2),
+                })
+        if not rows:
+            return pd.DataFrame(columns=["Report"])
+
+        long_df = pd.DataFrame(rows)
+        wide_df = long_df.pivot(index="Report", columns="Year", values=["Forecast EOY", "Actual Cost", "Deviation"])
+        wide_df.columns = [f"{metric} {year}" for metric, year in wide_df.columns]
+        return wide_df.reset_index()
@@ -1,9 +1,11 @@
 import os
 import math
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from utils.dates import get_days_in_months, get_month_number
 from utils.file_manager import get_operative_capacity_avg_days_file
+from utils.write_behind import get_write_behind_queue
 
 class OperativeCapacityManager:
     """
@@ -21,7 +23,11 @@ class OperativeCapacityManager:
         """
         Carga el archivo desde Excel o lo genera si no existe.
         """
-        if os.path.exists(self.file_path):
+        # Un guardado aún en cola es más reciente que el archivo
+        pending = get_write_behind_queue().pending_data(self.file_path)
+        if pending is not None:
+            df = pending.copy()
+        elif os.path.exists(self.file_path):
             try:
                 df = pd.read_excel(self.file_path)
                 print(f"✅ Capacidad operativa cargada desde: {self.file_path}")
@@ -122,84 +128,89 @@ class OperativeCapacityManager:
         """
         Recalcula los valores derivados por fila, incluyendo una lógica avanzada para
         el cálculo de pozos OPEX: truncamiento y redistribución del sobrante decimal.
-        """
-        import math
 
+        Las columnas se calculan de una vez con NumPy; solo el reparto del sobrante
+        depende de toda la tabla.
+        """
         current_year = datetime.now().year
         dias_por_mes = get_days_in_months(current_year)
 
-        pozos_truncados = []
-        decimales = []
-        total_real = 0.0
+        meses = [get_month_number(mes) if isinstance(mes, str) else mes for mes in df["Mes"]]
+        valid = np.array([mes in dias_por_mes for mes in meses], dtype=bool)
+        dias_mes = np.array([dias_por_mes.get(mes, 0) for mes in meses])
 
         # 1. Calcular totales OPEX y número de pozos estimado (truncado + decimal)
-        for idx, row in df.iterrows():
-            mes = row["Mes"]
-            mes_num = get_month_number(mes) if isinstance(mes, str) else mes
-            if mes_num not in dias_por_mes:
-                pozos_truncados.append(0)
-                decimales.append(0)
-                continue
-
-            dias_mes = dias_por_mes[mes_num]
-            taladros = row["Taladros"]
-            dias_capex = row["Días CAPEX"]
-            dias_cert = row["Días Certificación"]
-            dias_4to_opex = row.get("Días OPEX 4to Rig", 0)
-            dias_4to_capex = row.get("Días CAPEX 4to Rig", 0)
-
-            # Cálculos base
-            dias_operativos_base = dias_mes * taladros
-            dias_operativos_total = dias_operativos_base + dias_4to_opex + dias_4to_capex
-            total_opex = dias_operativos_base - dias_capex - dias_cert + dias_4to_opex
-
-            # Actualizar valores en DataFrame
-            df.at[idx, "Días Operativos"] = dias_operativos_total
-            df.at[idx, "Total Días OPEX"] = total_opex
-
-            # Cálculo de pozos con duración promedio de 13 días
-            pozo_exacto = total_opex / self.days_avg if total_opex > 0 else 0 ###pozo_exacto = total_opex / 11.9 if total_opex > 0 else 0
-            truncado = math.floor(pozo_exacto)
-            decimal = pozo_exacto - truncado
-
-            pozos_truncados.append(truncado)
-            decimales.append(decimal)
-            total_real += pozo_exacto
-
-        # 2. Redistribuir sobrante decimal como pozos adicionales
-        sobrante_pozo = round(total_real) - sum(pozos_truncados)
-        indices_ordenados = sorted(range(len(decimales)), key=lambda i: decimales[i], reverse=True)
-
-        for i in range(sobrante_pozo):
-            idx = indices_ordenados[i]
-            pozos_truncados[idx] += 1
+        taladros = df["Taladros"].to_numpy()
+        dias_4to_opex = df["Días OPEX 4to Rig"].to_numpy()
+        dias_operativos_base = dias_mes * taladros
+        dias_operativos_total = dias_operativos_base + dias_4to_opex + df["Días CAPEX 4to Rig"].to_numpy()
+        total_opex = dias_operativos_base - df["Días CAPEX"].to_numpy() - df["Días Certificación"].to_numpy() + dias_4to_opex
+
+        # Las filas con mes desconocido conservan sus valores
+        if valid.all():
+            df["Días Operativos"] = dias_operativos_total
+            df["Total Días OPEX"] = total_opex
+        else:
+            df.loc[valid, "Días Operativos"] = dias_operativos_total[valid]
+            df.loc[valid, "Total Días OPEX"] = total_opex[valid]
 
-        # 3. Asignar resultado final al DataFrame
-        for idx, val in enumerate(pozos_truncados):
-            df.at[idx, "Numero tentativo de pozos OPEX"] = val
+        # Cálculo de pozos con duración promedio configurada (days_avg)
+        total_opex = total_opex.astype(float)
+        pozo_exacto = np.divide(total_opex, self.days_avg, out=np.zeros(len(df)), where=valid & (total_opex > 0))
+        pozos_truncados = np.floor(pozo_exacto).astype(int)
+        decimales = pozo_exacto - pozos_truncados
 
-        return df
+        # 2. Redistribuir sobrante decimal como pozos adicionales (mayor decimal primero)
+        sobrante_pozo = max(round(sum(pozo_exacto.tolist())) - int(pozos_truncados.sum()), 0)
+        indices_ordenados = np.argsort(-decimales, kind="stable")
+        pozos_truncados[indices_ordenados[:sobrante_pozo]] += 1
 
+        # 3. Asignar resultado final al DataFrame
+        df["Numero tentativo de pozos OPEX"] = pozos_truncados
+        return df
 
     def update_value(self, row_index, column, value):
         """
         Actualiza un valor y recalcula todos los valores derivados.
         """
-        if row_index < 0 or row_index >= len(self.df):
-            raise IndexError("Índice fuera de rango.")
-        if column not in self.df.columns:
-            raise ValueError(f"Columna {column} no existe.")
+        self.update_values({(row_index, column): value})
 
-        self.df.at[row_index, column] = value
-        self.df = self._recalculate(self.df)  # << Esto recalcula todo lo demás
+    def update_values(self, changes: dict):
+        """
+        Aplica varias ediciones {(fila, columna): valor} y recalcula una sola vez.
+        """
+        self.df = self.recalculate_with(changes)
+
+    def recalculate_with(self, changes: dict) -> pd.DataFrame:
+        """
+        Devuelve una copia de la tabla con las ediciones aplicadas y recalculada.
+
+        No modifica self.df, por lo que puede ejecutarse en un hilo de trabajo;
+        el resultado se publica después asignándolo a self.df.
+        """
+        df = self.df.copy()
+        for (row_index, column), value in changes.items():
+            if row_index < 0 or row_index >= len(df):
+                raise IndexError("Índice fuera de rango.")
+            if column not in df.columns:
+                raise ValueError(f"Columna {column} no existe.")
+            df.at[row_index, column] = value
+        return self._recalculate(df)
 
     def save(self, file_path=None):
         """
         Guarda el archivo al Excel original o a una ruta personalizada.
+
+        El archivo original se escribe en segundo plano mediante la cola de
+        escritura diferida; los guardados seguidos se agrupan en una sola escritura.
         """
-        path = file_path or self.file_path
-        self.df.to_excel(path, index=False)
-        print(f"💾 Capacidad operativa guardada en {path}")
+        if file_path:
+            self.df.to_excel(file_path, index=False)
+            print(f"💾 Capacidad operativa guardada en {file_path}")
+            return
+        df = self.df.copy()
+        get_write_behind_queue().submit(self.file_path, lambda tmp_path: df.to_excel(tmp_path, index=False), data=df)
+        print(f"💾 Capacidad operativa en cola de guardado: {self.file_path}")
 
     def export_to(self, file_path):
         """
@@ -1,5 +1,6 @@
 import pandas as pd
 from openpyxl import load_workbook
+from utils.write_behind import get_write_behind_queue
 
 class OpexDataManager:
     """
@@ -26,6 +27,12 @@ class OpexDataManager:
         if self.opex_data is not None:
             return self.opex_data
 
+        # Un guardado aún en cola es más reciente que el archivo
+        pending = get_write_behind_queue().pending_data(self.file_path)
+        if pending is not None:
+            self.opex_data = pending.copy()
+            return self.opex_data
+
         try:
             print(f"📄 Cargando OPEX desde: {self.file_path}")
             df = self.data_loader.load_budget_data_from_excel(self.file_path, sheet_name="OPEX Budget")
@@ -92,7 +99,14 @@ class OpexDataManager:
         Guarda los cambios realizados en los datos OPEX dentro del archivo Excel original.
 
         La hoja anterior "OPEX Budget" será reemplazada por una nueva hoja con los valores actualizados.
+        El libro se escribe en segundo plano mediante la cola de escritura diferida, de forma
+        atómica; los guardados seguidos se agrupan en una sola escritura.
         """
+        opex_data = self.opex_data.reset_index(drop=True).copy()
+        get_write_behind_queue().submit(self.file_path, lambda tmp_path: self._write_opex_workbook(opex_data, tmp_path), data=opex_data)
+
+    def _write_opex_workbook(self, opex_data, target_path):
+        """Copia el libro original en target_path reemplazando la hoja 'OPEX Budget'."""
         try:
             wb = load_workbook(self.file_path)
 
@@ -106,12 +120,13 @@ class OpexDataManager:
             for col_idx, header in enumerate(headers, start=1):
                 ws.cell(row=1, column=col_idx, value=header)
 
-            for row_idx, row in self.opex_data.iterrows():
+            for row_idx, row in opex_data.iterrows():
                 ws.cell(row=row_idx + 2, column=1, value=row['LINE'])
                 ws.cell(row=row_idx + 2, column=2, value=row['OPEX_BUDGET'])
 
-            wb.save(self.file_path)
+            wb.save(target_path)
             print(f"✅ Cambios guardados en '{self.file_path}' hoja 'OPEX Budget'")
 
         except Exception as e:
             print(f"❌ Error al guardar OPEX en Excel: {e}")
+            raise
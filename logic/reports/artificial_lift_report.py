@@ -12,6 +12,7 @@ from logic.budget_analysis import (
 from logic.deviation_analysis import calculate_deviations
 from services.graph_generator import generate_budget_graph_als
 from utils.dates import normalize_month_names, get_all_months
+from utils.diagnostics import capture_frame
 from utils.file_manager import (
     get_single_excel_file_path,
     get_cotizacion_path,
@@ -82,14 +83,14 @@ class ArtificialLiftReport(LineReport):
         #print(matched_data)
         matched_data['Numero_Mes'] = matched_data['Numero_Mes'].astype(int)
         matched_data = matched_data[~((matched_data['Numero_Mes'] >= mes_actual))]
-        matched_data.to_excel("als-salida.xlsx")
+        capture_frame("als/matched_data", matched_data)
         # Calcular costo real por pozo
         actual_cols = [col for col in matched_data.columns if col.endswith("_Actual")]
         matched_data["RealCost"] = matched_data[actual_cols].sum(axis=1, skipna=True)
         matched_data["N_POZOS"] = 1.0
         matched_data = matched_data[matched_data["RealCost"] > 0]
         matched_data["MONTH"] = normalize_month_names(matched_data["MONTH"])
-        matched_data.to_excel("summary/als/real_costs_als.xlsx", index=False)
+        capture_frame("als/real_costs", matched_data)
 
         # Agrupar datos reales por mes
         real_group = matched_data.groupby("MONTH").agg({
@@ -195,7 +196,7 @@ class ArtificialLiftReport(LineReport):
             group_mapping=BUDGET_GROUP_MAPPING,
             threshold=20000
         )
-        deviations.to_excel("summary/als/deviations.xlsx")
+        capture_frame("als/deviations", deviations)
         return deviations
     
     def get_total_activities(self):
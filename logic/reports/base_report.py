@@ -2,9 +2,24 @@
 from abc import ABC, abstractmethod
 
 class LineReport(ABC):
+    # Contexto de progreso/cancelación (utils.progress.ProgressContext) opcional
+    progress = None
+
     def __init__(self, data_loader):
         self.data_loader = data_loader
 
+    def set_progress_context(self, progress):
+        """Asigna el contexto de progreso y cancelación que usará el reporte."""
+        self.progress = progress
+
+    def checkpoint(self, stage, fraction=None):
+        """
+        Informa el avance del reporte y se detiene (OperationCancelled) si la
+        operación fue cancelada. No hace nada si no hay contexto asignado.
+        """
+        if self.progress is not None:
+            self.progress.checkpoint(stage, fraction)
+
     @abstractmethod
     def generate_forecast(self):
         pass
@@ -1,4 +1,3 @@
-import os
 import pandas as pd
 import re
 from datetime import datetime, timedelta
@@ -8,6 +7,7 @@ from logic.activity_data import build_activities_dataframe
 from logic.reports.base_report import LineReport
 from utils.dates import normalize_month_names, get_month_number, get_all_months, calculate_duration
 from utils.file_manager import get_forecast_services_path_file, get_selected_services_wells_path, get_forecasted_plan_path
+from utils.well_selection import load_selected_wells
 
 
 class ServicesReport(LineReport):
@@ -91,13 +91,13 @@ class ServicesReport(LineReport):
 
     def load_well_durations(self):
         """Carga la duración histórica en días de cada pozo."""
-        return self.data_loader.calcular_duracion_promedio()
+        return self.data_loader.calcular_duracion_promedio(progress=self.progress)
 
     def load_selected_wells(self, file_path):
-        """Carga desde un archivo Excel la lista de pozos seleccionados manualmente por el usuario."""
-        if os.path.exists(file_path):
-            df = pd.read_excel(file_path)
-            self.set_selected_wells(df["WELL"].tolist())
+        """Carga la lista de pozos seleccionados manualmente por el usuario (ver utils.well_selection)."""
+        wells = load_selected_wells(file_path)
+        if wells:
+            self.set_selected_wells(wells)
 
     def set_selected_wells(self, wells: list[str]):
         """Define manualmente la lista de pozos a considerar para el cálculo de costos promedio."""
@@ -155,7 +155,7 @@ class ServicesReport(LineReport):
         mes_actual = datetime.today().month
         mes_siguiente = (datetime.today().replace(day=28) + timedelta(days=4)).month
 
-        cdf = self.data_loader.load_from_cognite()
+        cdf = self.data_loader.load_from_cognite(progress=self.progress)
         cdf = calculate_duration(cdf)
         cdf = cdf[cdf["End"].dt.year == self.year]
         cdf = cdf[cdf["activity_type"].isin([f"C1.{i}" for i in range(1, 17)])]
@@ -364,18 +364,30 @@ class ServicesReport(LineReport):
         monthly_value = opex_budget / 12
         return pd.DataFrame({"MONTH": months, "PLANNED_COST": [monthly_value] * 12})
     
-    def generate_forecast_by_path(self, cost_avarage, day_avarage_override):
+    def generate_forecast_by_path(self, cost_avarage, day_avarage_override, progress=None):
         """
         Genera el forecast mensual para la línea 1.10 Services, usando SIEMPRE los valores enviados
+
+        Args:
+            progress (ProgressContext, optional): Contexto de progreso y cancelación; llega
+                                                  también a las consultas SQL y de Cognite.
         """
         validated = []
         validated.append(cost_avarage)
         validated.append(day_avarage_override)
         self.set_validated_paths(validated)
 
-        # Llama al método estándar
-        df = self.generate_forecast()
-        executed_activities_df = self.get_executed_activities_dataframe()
+        if progress is not None:
+            self.set_progress_context(progress)
+        try:
+            # Llama al método estándar
+            self.checkpoint("Forecast 1.10 Services", 0.0)
+            df = self.generate_forecast()
+            self.checkpoint("Actividades ejecutadas", 0.8)
+            executed_activities_df = self.get_executed_activities_dataframe()
+        finally:
+            if progress is not None:
+                self.set_progress_context(None)
 
         information_df = df.merge(executed_activities_df, on="MONTH", how="left")
 
@@ -386,7 +398,7 @@ class ServicesReport(LineReport):
     def get_executed_activities_dataframe(self):
         # Esta logica se deberia implementar en la clase, no en el controlador o en un archivo de gestion a parte cuando la responsabilidad 
         # es de la propia clase/clases que lo necesiten. En todo caso, generar un servicio, no un archivo .py sin sentido.
-        activities_data_dataframe = build_activities_dataframe(self.data_loader, self.plan_actividades, year=datetime.now().year)
+        activities_data_dataframe = build_activities_dataframe(self.data_loader, self.plan_actividades, year=datetime.now().year, progress=self.progress)
         return activities_data_dataframe[["MONTH", "EXECUTED_ACTIVITIES"]]
          
     def get_total_activities(self):
@@ -1,16 +1,93 @@
 # main.py
+import multiprocessing
+# Antes de cualquier otra importación: en el ejecutable empaquetado, los procesos
+# hijos del pool de lectura de PDF arrancan con este mismo script y freeze_support
+# los desvía al pool sin cargar PyQt5 ni el resto de la aplicación.
+multiprocessing.freeze_support()
+
 import sys
-from PyQt5.QtWidgets import QApplication
-from controllers.main_controller import MainController
-from views.main_window import MainWindow
+from utils.startup_profiler import get_startup_profiler, startup_phase
+
+# Medir desde antes de importar Qt, pandas y el resto de la aplicación
+# (no en los procesos hijos del pool de lectura de PDF)
+if multiprocessing.parent_process() is None:
+    get_startup_profiler().start()
+
+with startup_phase("Importar PyQt5"):
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+with startup_phase("Importar diagnóstico"):
+    from utils.diagnostics import get_diagnostics_sink, DEFAULT_OUTPUT_DIR
+
+def configure_diagnostics(argv):
+    """
+    --diagnostics activa la captura de datos intermedios en memoria;
+    --diagnostics=<carpeta> además los escribe en Parquet en esa carpeta.
+    """
+    for arg in argv[1:]:
+        if arg == "--diagnostics":
+            get_diagnostics_sink().enable()
+        elif arg.startswith("--diagnostics="):
+            get_diagnostics_sink().enable(arg.split("=", 1)[1] or DEFAULT_OUTPUT_DIR)
+
+def configure_planning_store(argv):
+    """
+    --planning-store guarda el estado de planificación de las líneas de campo en
+    un archivo SQLite local (la primera vez importa los CSV actuales); con
+    --planning-store=export además se reescriben los CSV desde el almacén al cerrar.
+    Sin la opción se usa el almacén solo si su archivo ya existe.
+    """
+    for arg in argv[1:]:
+        if arg == "--planning-store" or arg.startswith("--planning-store="):
+            from services.field_lines_services.planning_state_store import enable_planning_state_store
+            store = enable_planning_state_store()
+            if arg.split("=", 1)[-1] == "export":
+                import atexit
+                atexit.register(store.export_csv_files)
+
+def splash_enabled(argv):
+    """
+    La pantalla de inicio se muestra por defecto en el ejecutable empaquetado;
+    --splash la fuerza y --no-splash la desactiva.
+    """
+    if "--no-splash" in argv[1:]:
+        return False
+    return "--splash" in argv[1:] or bool(getattr(sys, "frozen", False))
 
 def main():
+    profiler = get_startup_profiler()
+    configure_diagnostics(sys.argv)
+    with startup_phase("Almacén de planificación"):
+        configure_planning_store(sys.argv)
     app = QApplication(sys.argv)
-    controller = MainController()
-    window = MainWindow(controller)
-    controller.set_view(window)
-    
+
+    splash = None
+    if splash_enabled(sys.argv):
+        from views.startup_splash import StartupSplash
+        splash = StartupSplash()
+        splash.show()
+        profiler.add_listener(splash.show_phase)
+
+    with startup_phase("Importar controladores y vistas"):
+        from controllers.main_controller import MainController
+        from views.main_window import MainWindow
+    with startup_phase("Controlador principal"):
+        controller = MainController()
+    with startup_phase("Ventana principal"):
+        window = MainWindow(controller)
+    with startup_phase("Controlador de campo"):
+        controller.set_view(window)
+
     window.show()
+    if splash is not None:
+        splash.finish(window)
+    # La ventana es usable cuando el ciclo de eventos procesa su primer ciclo
+    def finish_startup():
+        profiler.finish()
+        # Usado por utils.launch_benchmark para medir arranques sin intervención
+        if "--exit-after-startup" in sys.argv[1:]:
+            app.quit()
+    QTimer.singleShot(0, finish_startup)
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
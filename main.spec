@@ -1,12 +1,28 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+sys.path.insert(0, SPECPATH)
+from utils.lazy_registry import find_registered_modules
+from utils.capabilities import OPTIONAL_DEPENDENCIES
 
+# Reportes, diálogos y vistas se importan por ruta (utils/lazy_registry.py);
+# el análisis no los ve y hay que declararlos.
+LAZY_MODULES = find_registered_modules([
+    os.path.join(SPECPATH, path) for path in (
+        'controllers/main_controller.py',
+        'controllers/field_controller.py',
+        'utils/field_lines_report.json',
+    )
+])
+# Dependencias opcionales que se importan con utils.capabilities.require()
+OPTIONAL_MODULES = [module for module, _, _ in OPTIONAL_DEPENDENCIES.values()]
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
     datas=[('utils/field_lines_report.json', 'utils'), ('utils/*.json', 'utils')],
-    hiddenimports=[],
+    hiddenimports=LAZY_MODULES + OPTIONAL_MODULES,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,122 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Variante de arranque rápido (onedir) de main.spec.
+#
+# main.spec genera un único exe que en cada arranque descomprime todo el
+# paquete (pandas, matplotlib, Qt, cognite...) en una carpeta temporal, y el
+# antivirus revisa cada archivo descomprimido. Esta variante:
+#   - deja el paquete ya extraído en dist/main_fast/ (se distribuye la carpeta
+#     completa y se abre dist/main_fast/main_fast.exe);
+#   - no comprime con UPX (descomprimir cada DLL también cuesta al arrancar);
+#   - excluye backends de matplotlib, módulos de Qt y paquetes que la
+#     aplicación no usa;
+#   - compila el bytecode con optimize=1 (sin asserts) dentro del PYZ.
+# Los paquetes pesados opcionales (python-pptx, pdfplumber, cognite-sdk,
+# pyodbc, matplotlib) se siguen incluyendo, pero la aplicación los importa
+# recién al usarlos.
+#
+# Construir:  pyinstaller main_fast.spec
+# Comparar:   python -m utils.launch_benchmark dist/main.exe dist/main_fast/main_fast.exe --runs 5
+#
+# Mediciones (2026-10-19, desde el código, Linux, Python 3.11.7, dependencias
+# de requirements.txt, QT_QPA_PLATFORM=offscreen). Importar
+# controllers.main_controller y views.main_window en un proceso nuevo, mediana
+# de 7 corridas alternadas:
+#   Versión                                          Importación   Módulos cargados
+#   base (812c867)                                       1.95 s          1716
+#   antes de las importaciones diferidas                 1.82 s          1741
+#   actual (reportes y vistas registrados con
+#   LazyClass, dependencias pesadas con require())       0.60 s           861
+# Con la versión actual ya no se cargan al arrancar matplotlib, python-pptx,
+# pdfplumber, cognite-sdk ni pyodbc. Importar PyQt5.QtWidgets (previo) tarda
+# ~0.06 s en las tres versiones.
+# Límites: el entorno de medición no tenía libodbc, así que pyodbc se
+# reemplazó por un módulo vacío en las tres versiones (la importación real
+# suma unos milisegundos solo a las dos primeras). El arranque completo
+# (python main.py --exit-after-startup) y los exe de main.spec/main_fast.spec
+# no se pudieron medir allí: MainController necesita el usuario de Windows y los
+# catálogos de OneDrive. Esas cifras (onefile frente a onedir) deben tomarse
+# con el comando "Comparar" en un equipo de la red.
+import os
+import sys
+sys.path.insert(0, SPECPATH)
+from utils.lazy_registry import find_registered_modules
+from utils.capabilities import OPTIONAL_DEPENDENCIES
+
+LAZY_MODULES = find_registered_modules([
+    os.path.join(SPECPATH, path) for path in (
+        'controllers/main_controller.py',
+        'controllers/field_controller.py',
+        'utils/field_lines_report.json',
+    )
+])
+# Dependencias opcionales que se importan con utils.capabilities.require()
+OPTIONAL_MODULES = [module for module, _, _ in OPTIONAL_DEPENDENCIES.values()]
+
+# Solo se usa el backend Qt5Agg (y Agg para exportar PNG a PowerPoint)
+MATPLOTLIB_EXCLUDES = [
+    'matplotlib.backends.backend_' + name for name in (
+        'cairo', 'gtk3', 'gtk3agg', 'gtk3cairo', 'gtk4', 'gtk4agg', 'gtk4cairo',
+        'macosx', 'nbagg', 'pgf', 'ps', 'qt5cairo', 'qtcairo', 'svg', 'template',
+        'tkagg', 'tkcairo', 'webagg', 'webagg_core', 'wx', 'wxagg', 'wxcairo',
+    )
+]
+
+QT_EXCLUDES = [
+    'PyQt5.' + name for name in (
+        'Qt3DAnimation', 'Qt3DCore', 'Qt3DExtras', 'Qt3DInput', 'Qt3DLogic', 'Qt3DRender',
+        'QtBluetooth', 'QtDBus', 'QtDesigner', 'QtHelp', 'QtLocation', 'QtMultimedia',
+        'QtMultimediaWidgets', 'QtNfc', 'QtOpenGL', 'QtPositioning', 'QtQml', 'QtQuick',
+        'QtQuick3D', 'QtQuickWidgets', 'QtRemoteObjects', 'QtSensors', 'QtSerialPort',
+        'QtSql', 'QtTest', 'QtTextToSpeech', 'QtWebChannel', 'QtWebEngine', 'QtWebEngineCore',
+        'QtWebEngineWidgets', 'QtWebSockets', 'QtXmlPatterns',
+    )
+]
+
+OTHER_EXCLUDES = [
+    'tkinter', '_tkinter', 'IPython', 'jupyter_client', 'notebook', 'pytest', 'behave',
+    'numpy.f2py', 'pandas.tests', 'numpy.tests',
+]
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('utils/field_lines_report.json', 'utils'), ('utils/*.json', 'utils')],
+    hiddenimports=LAZY_MODULES + OPTIONAL_MODULES,
+    hookspath=[],
+    hooksconfig={'matplotlib': {'backends': ['QtAgg', 'Qt5Agg', 'Agg']}},
+    runtime_hooks=[],
+    excludes=MATPLOTLIB_EXCLUDES + QT_EXCLUDES + OTHER_EXCLUDES,
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='main_fast',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=['BudgetTool_icon.ico'],
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='main_fast',
+)
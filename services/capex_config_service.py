@@ -1,6 +1,7 @@
 import pandas as pd
 import os
 from utils.file_manager import get_capex_config_path
+from utils.write_behind import get_write_behind_queue
 
 class CapexConfigService:
     """
@@ -19,6 +20,9 @@ class CapexConfigService:
         Carga la configuración desde el archivo CSV.
         Si el archivo no existe, retorna una configuración por defecto con todos los meses en "No".
         """
+        pending = get_write_behind_queue().pending_data(self.config_path)
+        if pending is not None:
+            return dict(pending)
         if not os.path.exists(self.config_path):
             return {month: "No" for month in self.months}
         
@@ -33,6 +37,9 @@ class CapexConfigService:
     def save_config(self, config_data: dict):
         """
         Guarda el diccionario de configuración en el archivo CSV.
+        La escritura se hace en segundo plano mediante la cola de escritura diferida.
         """
         df = pd.DataFrame(list(config_data.items()), columns=["Month", "Capex"])
-        df.to_csv(self.config_path, index=False)
\ No newline at end of file
+        get_write_behind_queue().submit(
+            self.config_path, lambda tmp_path: df.to_csv(tmp_path, index=False), data=dict(config_data)
+        )
\ No newline at end of file
@@ -91,19 +91,12 @@ class AnnualPTALoader:
 
         Utiliza `HistoricalInitialCostService` para obtener un costo que no depende
         del PTA actual, sino de un valor guardado, y lo formatea en un DataFrame
-        mensual para su visualización.
+        mensual para su visualización. El valor sale de la tabla histórica en caché.
         """
-        historical_initial_cost = HistoricalInitialCostService()
-        df_historical_initial_cost = historical_initial_cost.get_dataframe()
-
         months = [month.lower() for month in month_name[1:]]
         actual_year = datetime.now().year
         try:
-            row = df_historical_initial_cost[df_historical_initial_cost['Year'] == actual_year]
-            if not row.empty:
-                initial_planned_cost = float(row['Initial Cost Approved'].iloc[0])
-            else:
-                initial_planned_cost = 0.0
+            initial_planned_cost = HistoricalInitialCostService.get_initial_cost_for_year(actual_year)
         except (ValueError, TypeError, KeyError, IndexError) as e:
             print(f"❌ Error al convertir valor de Initial Cost Approved a float: {e}")
             initial_planned_cost = 0.0
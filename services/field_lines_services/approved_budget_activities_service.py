@@ -2,8 +2,13 @@ import os
 import pandas as pd
 from datetime import datetime
 from utils.file_manager import get_field_approved_budget_activities_from_file
+from services.field_lines_services.planning_state_store import APPROVED_BUDGET, get_planning_state_store
+from utils.change_journal import ChangeJournal
+from utils.reference_cache import normalize_line_name, reference_data_cache
 
 COLUMNS = ["idx", "year", "budget", "approved_activities", "line_name"]
+JOURNAL_KEYS = ["year", "line_name"]
+REFERENCE_TABLE = "approved_budget_activities"
 
 class ApprovedBudgetActivitiesService:
     """
@@ -21,22 +26,54 @@ class ApprovedBudgetActivitiesService:
         un nuevo archivo con los encabezados correctos si no existe.
         """
         self.csv_path = get_field_approved_budget_activities_from_file()
+        self.journal = ChangeJournal(self.csv_path, key_columns=JOURNAL_KEYS)
         self.dataframe = self._load_or_create_csv()
 
     def _load_or_create_csv(self):
         """
         Carga los datos desde el archivo CSV o crea uno nuevo si no existe.
 
+        La tabla se toma del caché de referencia del proceso y solo se relee si el
+        archivo, su diario o el almacén SQLite cambiaron.
+
         Returns:
             pd.DataFrame: Un DataFrame con los datos cargados o un DataFrame
                           vacío con la estructura de columnas definida.
         """
-        if not os.path.exists(self.csv_path):
+        return self.get_reference_table().dataframe.copy()
+
+    @classmethod
+    def get_reference_table(cls):
+        """Devuelve la tabla de presupuesto aprobado compartida por todo el proceso."""
+        journal = ChangeJournal(get_field_approved_budget_activities_from_file(), key_columns=JOURNAL_KEYS)
+        return reference_data_cache.get(
+            REFERENCE_TABLE,
+            lambda: cls._source_version(journal),
+            lambda: cls._read_table(journal),
+        )
+
+    @classmethod
+    def get_line_records(cls, line_name):
+        """Registros de todas las gestiones de una línea (comparación sin mayúsculas ni espacios extremos)."""
+        return cls.get_reference_table().rows_for("line_name", line_name, normalize_line_name)
+
+    @staticmethod
+    def _source_version(journal):
+        store = get_planning_state_store()
+        return (journal.version(), store.kind_revision(APPROVED_BUDGET) if store is not None else None)
+
+    @staticmethod
+    def _read_table(journal):
+        store = get_planning_state_store()
+        if store is not None:
+            df = store.read_records(APPROVED_BUDGET)
+            if not df.empty:
+                return df.reindex(columns=COLUMNS)
+        if not os.path.exists(journal.csv_path):
             df = pd.DataFrame(columns=COLUMNS)
-            df.to_csv(self.csv_path, index=False)
+            df.to_csv(journal.csv_path, index=False)
             return df
-        df = pd.read_csv(self.csv_path)
-        return df
+        return journal.replay(pd.read_csv(journal.csv_path))
 
     def get_data_as_list(self):
         """
@@ -55,10 +92,18 @@ class ApprovedBudgetActivitiesService:
     def save_to_csv(self):
         """
         Guarda el estado actual del DataFrame en el archivo CSV.
-        Crea el directorio si no existe.
+        Crea el directorio si no existe. Si el almacén SQLite está habilitado,
+        actualiza los registros en él en lugar del CSV.
+
+        Escribe el archivo completo de forma atómica y vacía el diario de cambios;
+        para cambios de un solo registro se usa add_or_update_record.
         """
-        os.makedirs(os.path.dirname(self.csv_path), exist_ok=True)
-        self.dataframe.to_csv(self.csv_path, index=False)
+        reference_data_cache.invalidate(REFERENCE_TABLE)
+        store = get_planning_state_store()
+        if store is not None:
+            store.upsert_records(APPROVED_BUDGET, self.dataframe.to_dict(orient="records"))
+            return
+        self.journal.compact(self.dataframe)
 
     def add_or_update_record(self, budget, approved_activities, line_name):
         """
@@ -66,7 +111,8 @@ class ApprovedBudgetActivitiesService:
 
         Busca un registro que coincida con el año actual y el `line_name`.
         Si lo encuentra, actualiza los valores de presupuesto y actividades.
-        Si no, crea un nuevo registro con un nuevo índice. Finalmente, guarda los cambios.
+        Si no, crea un nuevo registro con un nuevo índice. Finalmente, registra solo
+        ese registro en el diario de cambios (o en el almacén SQLite si está habilitado).
         """
         year = datetime.now().year
         mask = (self.dataframe["year"] == year) & (self.dataframe["line_name"] == line_name)
@@ -75,6 +121,7 @@ class ApprovedBudgetActivitiesService:
             self.dataframe.at[idx, "budget"] = budget
             self.dataframe.at[idx, "approved_activities"] = approved_activities
         else:
+            idx = None
             new_idx = self._get_next_idx()
             new_row = {
                 "idx": new_idx,
@@ -84,7 +131,14 @@ class ApprovedBudgetActivitiesService:
                 "line_name": line_name
             }
             self.dataframe = pd.concat([self.dataframe, pd.DataFrame([new_row])], ignore_index=True)
-        self.save_to_csv()
+            idx = self.dataframe.index[-1]
+        reference_data_cache.invalidate(REFERENCE_TABLE)
+        store = get_planning_state_store()
+        if store is not None:
+            # Solo se escribe el registro modificado
+            store.upsert_records(APPROVED_BUDGET, [self.dataframe.loc[idx].to_dict()])
+            return
+        self.journal.upsert(self.dataframe.loc[idx].to_dict())
 
     def _get_next_idx(self):
         """Calcula el siguiente índice único para un nuevo registro."""
@@ -4,8 +4,67 @@ import pandas as pd
 from calendar import month_name
 from datetime import datetime
 from utils.file_manager import get_manual_planning_path, get_all_manual_planning_files
+from services.field_lines_services.planning_state_store import MANUAL_PLANNING, get_planning_state_store
+from utils.write_behind import get_write_behind_queue
 
-class BasePlanningService(ABC):
+class RowUpdatesMixin:
+    """
+    Edición en bloque de varios meses para los servicios de planificación.
+
+    La clase que lo usa debe tener `dataframe` (con columna 'Month'),
+    get_editable_columns(), _post_update_calculations(month) y save_to_csv().
+    """
+    def update_rows(self, updates, save=False):
+        """
+        Aplica en bloque los valores editados de varios meses.
+
+        Los valores se asignan con una sola operación por columna, los cálculos
+        derivados se ejecutan una vez sobre todos los meses afectados y, si se
+        pide, el CSV se guarda una sola vez al final.
+
+        Args:
+            updates (pd.DataFrame | dict): DataFrame con columna 'Month' y una columna
+                por campo editado, o diccionario {mes: {columna: valor}}. Las celdas
+                vacías (NaN) y las columnas no editables se ignoran.
+            save (bool): Si es True, guarda el CSV después de aplicar los cambios.
+
+        Returns:
+            list: Meses que fueron actualizados.
+        """
+        updates_df = _normalize_updates(updates)
+        columns = [col for col in updates_df.columns if col in self.get_editable_columns()]
+        # Igual que update_row: si un mes se repite, se usa su primera fila
+        row_by_month = pd.Series(self.dataframe.index, index=self.dataframe["Month"])
+        row_by_month = row_by_month[~row_by_month.index.duplicated()]
+        updates_df = updates_df[updates_df.index.isin(row_by_month.index)]
+        if updates_df.empty or not columns:
+            return []
+
+        for column in columns:
+            values = self._cast_column_values(column, updates_df[column].dropna())
+            if not values.empty:
+                self.dataframe.loc[row_by_month.loc[values.index].to_numpy(), column] = values.to_numpy()
+
+        months = list(updates_df.index)
+        self._post_update_rows(months)
+        if save:
+            self.save_to_csv()
+        return months
+
+    def _cast_column_values(self, column, values):
+        """Convierte los valores (sin NaN) de una columna antes de asignarlos; por defecto los deja igual."""
+        return values
+
+    def _post_update_rows(self, months):
+        """
+        Ejecuta los cálculos derivados para varios meses a la vez.
+        Por defecto delega mes a mes en _post_update_calculations.
+        """
+        for month in months:
+            self._post_update_calculations(month)
+
+
+class BasePlanningService(RowUpdatesMixin, ABC):
     """Clase base abstracta para servicios de planificación"""
     
     def __init__(self, line_title=None):
@@ -14,7 +73,15 @@ class BasePlanningService(ABC):
         self.dataframe = self._load_or_create_csv()
 
     def _load_or_create_csv(self):
-        """Carga el CSV existente o crea uno nuevo con la estructura por defecto"""
+        """Carga el CSV existente (o la línea del almacén SQLite si está habilitado) o crea uno nuevo con la estructura por defecto"""
+        store = get_planning_state_store()
+        if store is not None and self.line_title:
+            df = store.read_monthly(MANUAL_PLANNING, self.line_title)
+            if df is not None:
+                return self._validate_and_fix_columns(df)
+        pending = get_write_behind_queue().pending_data(self.CSV_PATH) if self.CSV_PATH else None
+        if pending is not None:
+            return self._validate_and_fix_columns(pending.copy())
         if self.CSV_PATH and os.path.exists(self.CSV_PATH):
             df = pd.read_csv(self.CSV_PATH)
             # Validar que tenga las columnas necesarias
@@ -51,6 +118,9 @@ class BasePlanningService(ABC):
 
     def get_available_lines(self):
         """Retorna una lista de todas las líneas disponibles"""
+        store = get_planning_state_store()
+        if store is not None:
+            return store.list_lines(MANUAL_PLANNING)
         files = get_all_manual_planning_files()
         return [line_title for line_title, _ in files]
 
@@ -69,9 +139,17 @@ class BasePlanningService(ABC):
         pass
 
     def save_to_csv(self):
+        """
+        Guarda la línea en su CSV, o en el almacén SQLite si está habilitado.
+        El CSV se escribe en segundo plano mediante la cola de escritura diferida.
+        """
+        store = get_planning_state_store()
+        if store is not None and self.line_title:
+            store.upsert_monthly(MANUAL_PLANNING, self.line_title, self.dataframe)
+            return
         if self.CSV_PATH:
-            os.makedirs(os.path.dirname(self.CSV_PATH), exist_ok=True)
-            self.dataframe.to_csv(self.CSV_PATH, index=False)
+            snapshot = self.dataframe.copy()
+            get_write_behind_queue().submit(self.CSV_PATH, lambda tmp_path: snapshot.to_csv(tmp_path, index=False), data=snapshot)
 
     def get_data_as_list(self):
         return self.dataframe.to_dict(orient="records")
@@ -87,3 +165,15 @@ class BasePlanningService(ABC):
     def is_month_editable(self, month_index):
         """Determina si un mes es editable (mes actual en adelante)"""
         return month_index >= self.get_current_month_index()
+
+
+def _normalize_updates(updates) -> pd.DataFrame:
+    """
+    Convierte los cambios recibidos por update_rows en un DataFrame indexado por mes.
+    Acepta un DataFrame con columna 'Month' o un diccionario {mes: {columna: valor}}.
+    """
+    if isinstance(updates, pd.DataFrame):
+        if "Month" in updates.columns:
+            return updates.set_index("Month")
+        return updates
+    return pd.DataFrame.from_dict(updates, orient="index")
@@ -1,7 +1,11 @@
 import os
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from utils.file_manager import get_categorizer_executed_catalog_path_by_line_name
+from utils.change_journal import ChangeJournal
+
+CATALOG_KEYS = ["year", "month"]
 
 class CategorizerExecutedCatalogService:
     """
@@ -19,7 +23,10 @@ class CategorizerExecutedCatalogService:
         self.dataframe = None
         self.line_title = None
         self.month = None
-        self.csv_path = None  
+        self.csv_path = None
+        self.journal = None
+        self._catalog = None
+        self._catalog_version = None
 
     def set_line_title(self, line_title):
         """
@@ -30,6 +37,8 @@ class CategorizerExecutedCatalogService:
         """
         self.line_title = line_title
         self.csv_path = self.get_categorizer_executed_catalog_path_by_line_name(line_title)
+        self.journal = ChangeJournal(self.csv_path, key_columns=CATALOG_KEYS)
+        self._catalog = None
 
         if not os.path.exists(self.csv_path):
             pd.DataFrame(columns=self.columns).to_csv(self.csv_path, index=False)
@@ -51,41 +60,56 @@ class CategorizerExecutedCatalogService:
             return
 
         year = datetime.now().year
-        servicios_col = f'{self.line_title}_Servicios'
-        productos_col = f'{self.line_title}_Productos'
-
-        has_serv = servicios_col in self.dataframe.columns
-        has_prod = productos_col in self.dataframe.columns
-
-        records = []
-        for _, row in self.dataframe.iterrows():
-            sum_serv = row.get(servicios_col, 0) if has_serv else 0
-            sum_prod = row.get(productos_col, 0) if has_prod else 0
-            cost_value = sum_serv + sum_prod
-
-            records.append({
-                "month": self.month,
-                "year": year,
-                "Well": row.get("WELL", ""),
-                "Cost by Activity": cost_value,
-                "Category": row.get("Categoria_Total", "")
-            })
-
-        if os.path.exists(self.csv_path):
-            existing_df = pd.read_csv(self.csv_path)
-
-            mask = ~((existing_df["month"] == self.month) & 
-                    (existing_df["year"] == year))
-            existing_df = existing_df[mask]
-        else:
-            existing_df = pd.DataFrame(columns=self.columns)
+        records = self._build_records(self.dataframe, self.month, year)
+        self.replace_months(records)
+        print(f"Guardados {len(records)} registros para {self.line_title} - {self.month}/{year}")
 
-        new_df = pd.DataFrame(records, columns=self.columns)
-        final_df = pd.concat([existing_df, new_df], ignore_index=True)
+    def save_categorized_activities(self, categorized_df):
+        """
+        Guarda de una vez las actividades categorizadas de varios meses.
 
-        final_df.to_csv(self.csv_path, index=False)
-        print(f"Guardados {len(records)} registros para {self.line_title} - {self.month}/{year}")
+        Args:
+            categorized_df (pd.DataFrame): Resultado de
+                SlickAndBacheoReport.get_categorized_executed_activities, con columna 'Month'.
+        """
+        if categorized_df is None or categorized_df.empty:
+            print("No hay datos para guardar")
+            return
+        year = datetime.now().year
+        months = categorized_df["Month"].astype(str).str.strip().str.lower().str.title()
+        records = self._build_records(categorized_df, months, year)
+        self.replace_months(records)
+        print(f"Guardados {len(records)} registros para {self.line_title} - {records['month'].nunique()} meses de {year}")
 
+    def replace_months(self, records):
+        """
+        Reemplaza en el catálogo los (mes, año) presentes en records.
+
+        El catálogo se mantiene en memoria indexado por (year, month). Solo los
+        meses cuyas filas cambiaron se registran en el diario de cambios del CSV
+        (borrado del mes más sus filas nuevas); el archivo completo solo se
+        reescribe al compactar el diario.
+        """
+        catalog = self._get_catalog()
+        new_rows = records.set_index(["year", "month"], drop=False)
+        changed_keys = [
+            key for key in new_rows.index.unique()
+            if key not in catalog.index or not _same_rows(catalog.loc[[key], self.columns], new_rows.loc[[key], self.columns])
+        ]
+        if not changed_keys:
+            return
+        new_rows = new_rows.loc[changed_keys]
+        self.journal.replace_groups(
+            [{"year": year, "month": month} for year, month in changed_keys],
+            new_rows[self.columns].to_dict(orient="records"),
+        )
+        catalog = catalog.drop(index=pd.MultiIndex.from_tuples(changed_keys), errors="ignore")
+        if catalog.empty:
+            catalog = new_rows.sort_index(kind="stable")
+        else:
+            catalog = pd.concat([catalog, new_rows]).sort_index(kind="stable")
+        self._catalog = catalog
+        self._catalog_version = self.journal.version()
 
     def get_records_by_month_and_line(self, month, line_title=None):
         """
@@ -102,16 +126,57 @@ class CategorizerExecutedCatalogService:
         """
         if not os.path.exists(self.csv_path):
             return pd.DataFrame(columns=self.columns)
-        
-        df = pd.read_csv(self.csv_path)
-        year = datetime.now().year
-        
-        filtered_df = df[(df["month"] == month) & (df["year"] == year)]
-        
-        return filtered_df
-    
+
+        catalog = self._get_catalog()
+        key = (datetime.now().year, month)
+        if key not in catalog.index:
+            return pd.DataFrame(columns=self.columns)
+        return catalog.loc[[key], self.columns].reset_index(drop=True)
+
+    def _build_records(self, df, month, year):
+        """Construye las filas del catálogo (month, year, Well, Cost by Activity, Category) sin iterar filas."""
+        cost = pd.Series(0, index=df.index)
+        for col in (f'{self.line_title}_Servicios', f'{self.line_title}_Productos'):
+            if col in df.columns:
+                cost = cost + df[col]
+        records = pd.DataFrame({
+            "month": month,
+            "year": year,
+            "Well": df["WELL"] if "WELL" in df.columns else "",
+            "Cost by Activity": cost,
+            "Category": df["Categoria_Total"] if "Categoria_Total" in df.columns else "",
+        }, index=df.index)
+        return records[self.columns].reset_index(drop=True)
+
+    def _get_catalog(self):
+        """Catálogo completo indexado por (year, month); se relee solo si el archivo cambió."""
+        version = self.journal.version()
+        if self._catalog is None or self._catalog_version != version:
+            df = pd.read_csv(self.csv_path) if os.path.exists(self.csv_path) else pd.DataFrame(columns=self.columns)
+            df = self.journal.replay(df).reindex(columns=self.columns)
+            self._catalog = df.set_index(["year", "month"], drop=False).sort_index(kind="stable")
+            self._catalog_version = version
+        return self._catalog
+
     def get_categorizer_executed_catalog_path_by_line_name(self, line_name):
         """
         Obtiene la ruta del archivo CSV para el catálogo de una línea específica.
         """
         return get_categorizer_executed_catalog_path_by_line_name(line_name)
+
+
+def _same_rows(current: pd.DataFrame, new: pd.DataFrame) -> bool:
+    """Compara dos tramos del catálogo sin depender de los tipos con que se leyó el CSV."""
+    if len(current) != len(new):
+        return False
+    for column in current.columns:
+        left = current[column].reset_index(drop=True)
+        right = new[column].reset_index(drop=True)
+        left_numbers = pd.to_numeric(left, errors="coerce")
+        right_numbers = pd.to_numeric(right, errors="coerce")
+        if left_numbers.notna().all() and right_numbers.notna().all():
+            if not np.allclose(left_numbers.to_numpy(dtype=float), right_numbers.to_numpy(dtype=float)):
+                return False
+        elif not left.astype(str).equals(right.astype(str)):
+            return False
+    return True
@@ -2,15 +2,37 @@
 import pandas as pd
 import os
 from utils.file_manager import get_completion_status_path 
+from services.field_lines_services.planning_state_store import COMPLETION_STATUS, COMPLETION_STATUS_KEYS, get_planning_state_store
+from utils.change_journal import ChangeJournal
+from utils.reference_cache import reference_data_cache
+
+REFERENCE_TABLE = "completion_status"
 
 class CompletionStatusService:
     def __init__(self):
         self.csv_path = get_completion_status_path()
+        self.journal = ChangeJournal(self.csv_path, key_columns=COMPLETION_STATUS_KEYS)
         self.dataframe = self._load_or_create()
 
     def _load_or_create(self):
+        """Toma la tabla del caché de referencia; solo se relee si el archivo, su diario o el almacén cambiaron."""
+        table = reference_data_cache.get(REFERENCE_TABLE, self._source_version, self._read_table)
+        return table.dataframe.copy()
+
+    def _source_version(self):
+        store = get_planning_state_store()
+        return (self.journal.version(), store.kind_revision(COMPLETION_STATUS) if store is not None else None)
+
+    def _read_table(self):
+        store = get_planning_state_store()
+        if store is not None:
+            df = store.read_records(COMPLETION_STATUS)
+            if not df.empty:
+                df = df[["line_name", "completed"]].copy()
+                df['completed'] = df['completed'].astype(bool)
+                return df
         try:
-            df = pd.read_csv(self.csv_path)
+            df = self.journal.replay(pd.read_csv(self.csv_path))
             # Asegurarse de que la columna 'completed' sea de tipo booleano
             if 'completed' in df.columns:
                 df['completed'] = df['completed'].astype(bool)
@@ -29,11 +51,17 @@ class CompletionStatusService:
         return False
 
     def set_status(self, line_name: str, is_completed: bool):
-        """Establece el estado de completado para una línea y guarda el archivo."""
+        """Establece el estado de completado para una línea y registra el cambio en el diario."""
         self.dataframe = self.dataframe[self.dataframe["line_name"] != line_name]
         new_row = pd.DataFrame([{"line_name": line_name, "completed": is_completed}])
         self.dataframe = pd.concat([self.dataframe, new_row], ignore_index=True)
-        self.dataframe.to_csv(self.csv_path, index=False)
+        reference_data_cache.invalidate(REFERENCE_TABLE)
+        store = get_planning_state_store()
+        if store is not None:
+            # Solo se escribe la fila de la línea modificada
+            store.upsert_records(COMPLETION_STATUS, [{"line_name": line_name, "year": 0, "completed": bool(is_completed)}])
+            return
+        self.journal.upsert({"line_name": line_name, "completed": bool(is_completed)})
 
     def get_completed_lines(self) -> list:
         """Devuelve una lista con los nombres de todas las líneas completadas."""
@@ -2,6 +2,7 @@ import os
 import pandas as pd
 from calendar import month_name
 from utils.file_manager import get_cpi_spi_path, get_all_cpi_spi_files
+from services.field_lines_services.planning_state_store import CPI_SPI, get_planning_state_store
 
 class CpiSpiService:
     def __init__(self, line_title=None):
@@ -10,7 +11,12 @@ class CpiSpiService:
         self.dataframe = self._load_or_create_csv()
 
     def _load_or_create_csv(self):
-        """Carga o crea un DataFrame con CPI y SPI inicializados"""
+        """Carga o crea un DataFrame con CPI y SPI inicializados (desde el almacén SQLite si está habilitado)"""
+        store = get_planning_state_store()
+        if store is not None and self.line_title:
+            df = store.read_monthly(CPI_SPI, self.line_title)
+            if df is not None:
+                return df
         if self.CSV_PATH and os.path.exists(self.CSV_PATH):
             try:
                 df = pd.read_csv(self.CSV_PATH)
@@ -39,11 +45,18 @@ class CpiSpiService:
 
     def get_available_lines(self):
         """Retorna una lista de todas las líneas disponibles"""
+        store = get_planning_state_store()
+        if store is not None:
+            return store.list_lines(CPI_SPI)
         files = get_all_cpi_spi_files()
         return [line_title for line_title, _ in files]
 
     def save_to_csv(self):
-        """Guarda el DataFrame actual en CSV"""
+        """Guarda el DataFrame actual en CSV, o en el almacén SQLite si está habilitado"""
+        store = get_planning_state_store()
+        if store is not None and self.line_title:
+            store.upsert_monthly(CPI_SPI, self.line_title, self.dataframe)
+            return
         if self.CSV_PATH:
             # Crear el directorio si no existe
             os.makedirs(os.path.dirname(self.CSV_PATH), exist_ok=True)
@@ -60,6 +60,23 @@ class ExecutedActivitiesManager:
         if b_and_h_col in filtered_df.columns:
             columnas.append(b_and_h_col)
         return filtered_df[columnas]
+
+    def get_executed_activities_data_frame_by_months(self, months, line_name):
+        """
+        Igual que get_executed_activities_data_frame_by_month, pero filtra varios
+        meses con una sola pasada sobre el DataFrame.
+        """
+        months = [m.strip().lower() for m in months]
+        servicios_col = f'{line_name}_Servicios'
+        if self.df.empty or servicios_col not in self.df.columns:
+            return pd.DataFrame(columns=['WELL', 'STATUS', 'Month', servicios_col])
+        conditions = self.get_conditions_to_check_services_and_product(line_name, self.df, months)
+        filtered_df = self.df[conditions]
+        columnas = ['WELL', 'STATUS', 'Month', servicios_col]
+        for col in (f'{line_name}_Productos', f'{line_name}_B&H'):
+            if col in filtered_df.columns:
+                columnas.append(col)
+        return filtered_df[columnas]
     
     def get_last_index_month_in_excel(self):
         """
@@ -245,6 +262,7 @@ class ExecutedActivitiesManager:
 
         Considera una actividad como ejecutada si su estado es 'final', 'pend.' o
         'adicional' y tiene un costo asociado (en servicios, productos o B&H).
+        month puede ser un mes o una lista de meses.
         """
         servicios_col = f'{line_name}_Servicios'
         productos_col = f'{line_name}_Productos'
@@ -255,7 +273,10 @@ class ExecutedActivitiesManager:
         is_final = df['STATUS'].str.strip().str.lower() == 'final' 
         is_aditional = df['STATUS'].str.strip().str.lower() == 'adicional' 
         is_pending = df['STATUS'].str.strip().str.lower() == 'pend.' 
-        is_correct_month = df['Month'] == month
+        if isinstance(month, (list, tuple, set)):
+            is_correct_month = df['Month'].isin(list(month))
+        else:
+            is_correct_month = df['Month'] == month
         valid_servicios = df[servicios_col].notna() & (df[servicios_col] > 0)
         if has_productos and has_b_and_h:
             valid_productos = (
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+
+def categorize_costs(costs, categoria_1: float, categoria_2: float, categoria_3: float) -> np.ndarray:
+    """
+    Clasifica un arreglo de costos en categorías numéricas con operaciones vectorizadas.
+
+    Usa la misma regla que SlickAndBacheoReport.clasificar_valor_servicio:
+    0 si el costo es nulo o cero, 1 hasta categoria_1, 2 hasta categoria_2,
+    3 hasta categoria_3 y 4 por encima.
+
+    Returns:
+        np.ndarray: Categoría (int) de cada costo, en el mismo orden.
+    """
+    values = pd.to_numeric(pd.Series(costs), errors="coerce").to_numpy(dtype=float)
+    empty = np.isnan(values) | (values == 0)
+    return np.select(
+        [empty, values <= categoria_1, values <= categoria_2, values <= categoria_3],
+        [0, 1, 2, 3],
+        default=4,
+    ).astype(int)
+
+
+def categorize_executed_activities(df: pd.DataFrame, line_title: str, thresholds: tuple, services_only: bool = False) -> pd.DataFrame:
+    """
+    Agrega 'Costo_Total' (salvo services_only) y 'Categoria_Total' a las actividades ejecutadas de una línea.
+
+    Args:
+        df (pd.DataFrame): Actividades ejecutadas con las columnas '<línea>_Servicios'
+                           y, opcionalmente, '<línea>_Productos'.
+        line_title (str): Título de la línea.
+        thresholds (tuple): Límites (categoría 1, 2, 3).
+        services_only (bool): Si es True se clasifica solo el costo de servicios (Slickline).
+
+    Returns:
+        pd.DataFrame: El mismo DataFrame con las columnas calculadas.
+    """
+    servicios_col = f'{line_title}_Servicios'
+    productos_col = f'{line_title}_Productos'
+    if servicios_col not in df.columns:
+        raise ValueError(f'Columna {servicios_col} no encontrada')
+
+    if services_only:
+        df["Categoria_Total"] = categorize_costs(df[servicios_col], *thresholds)
+        return df
+
+    df[servicios_col] = df[servicios_col].fillna(0)
+    total = df[servicios_col]
+    if productos_col in df.columns:
+        df[productos_col] = df[productos_col].fillna(0)
+        total = total + df[productos_col]
+    df["Costo_Total"] = total
+    df["Categoria_Total"] = categorize_costs(df["Costo_Total"], *thresholds)
+    return df
+
+
+def summarize_categories(categorized: pd.DataFrame) -> pd.DataFrame:
+    """
+    Resume actividades ya categorizadas en formato largo.
+
+    Args:
+        categorized (pd.DataFrame): Filas con columnas 'Line', 'Month', 'Categoria_Total'
+                                    y el costo clasificado en 'Costo_Total'.
+
+    Returns:
+        pd.DataFrame: Una fila por (Line, Month, Category) con 'Activities' y 'Cost'.
+    """
+    columns = ["Line", "Month", "Category", "Activities", "Cost"]
+    if categorized.empty:
+        return pd.DataFrame(columns=columns)
+    summary = (
+        categorized.rename(columns={"Categoria_Total": "Category"})
+        .groupby(["Line", "Month", "Category"], sort=False)
+        .agg(Activities=("Category", "size"), Cost=("Costo_Total", "sum"))
+        .reset_index()
+    )
+    return summary[columns]
+
+
+def build_category_table(categorized_frames: list) -> pd.DataFrame:
+    """
+    Resume en una sola tabla las actividades categorizadas de varias líneas.
+
+    Args:
+        categorized_frames (list): Resultados de SlickAndBacheoReport.get_categorized_executed_activities.
+
+    Returns:
+        pd.DataFrame: Tabla larga (Line, Month, Category, Activities, Cost).
+    """
+    frames = [frame for frame in categorized_frames if frame is not None and not frame.empty]
+    if not frames:
+        return summarize_categories(pd.DataFrame())
+    return summarize_categories(pd.concat(frames, ignore_index=True))
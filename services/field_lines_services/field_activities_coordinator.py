@@ -1,4 +1,3 @@
-from services.field_lines_services.field_graph_generator_service import FieldGraphGeneratorService
 import pandas as pd
 
 class FieldActivitiesCoordinator():
@@ -19,10 +18,18 @@ class FieldActivitiesCoordinator():
         """
         self.planned_activities_manager = planned_activities_manager
         self.executed_activities_manager = executed_activities_manager
-        self.graph_service = FieldGraphGeneratorService()
+        self._graph_service = None
         self.meses_ordenados = ['ene', 'feb', 'mar', 'abr', 'may', 'jun', 'jul', 'ago', 'sept', 'oct', 'nov', 'dic']
         self.meses_ingles = ['january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september', 'october', 'november', 'december']
 
+    @property
+    def graph_service(self):
+        """Servicio de gráficos, creado (e importado matplotlib) en el primer uso."""
+        if self._graph_service is None:
+            from services.field_lines_services.field_graph_generator_service import FieldGraphGeneratorService
+            self._graph_service = FieldGraphGeneratorService()
+        return self._graph_service
+
     def get_projected_adjusted_data_frame(self, line_name, service_type):
         """
         Orquesta la generación del DataFrame de forecast ajustado.
@@ -1,6 +1,5 @@
-import pandas as pd
 from datetime import datetime
-from services.read_excel import get_field_approved_budget_activities_from_csv
+from services.field_lines_services.approved_budget_activities_service import ApprovedBudgetActivitiesService
 
 class FieldDataService:
     """
@@ -14,8 +13,8 @@ class FieldDataService:
         """
         Obtiene y formatea el DataFrame de actividades y presupuesto aprobados para una línea específica.
 
-        Carga los datos de presupuesto aprobados desde un archivo CSV, filtra las
-        filas que corresponden a la `line_title` proporcionada y al año actual.
+        Toma los registros de la `line_title` proporcionada desde la tabla de
+        presupuesto aprobado en caché (indexada por línea), sin releer el CSV.
         Además, renombra y convierte las columnas relevantes a los tipos de datos
         correctos (int para actividades, float para presupuesto).
 
@@ -27,12 +26,8 @@ class FieldDataService:
             pd.DataFrame: Un DataFrame con las columnas 'Presupuesto {año_actual}',
                           'Actividades aprobadas' y 'line_name' para la línea especificada.
         """
-        df_total_approved_budget_activities = get_field_approved_budget_activities_from_csv()
         actual_year = datetime.now().year
-        df_total_approved_budget_activities = pd.DataFrame(df_total_approved_budget_activities)
-        df_total_approved_budget_activities = df_total_approved_budget_activities[
-            df_total_approved_budget_activities["line_name"].str.strip().str.lower() == line_title.lower()
-        ]
+        df_total_approved_budget_activities = ApprovedBudgetActivitiesService.get_line_records(line_title)
         df_total_approved_budget_activities["Actividades aprobadas"] = df_total_approved_budget_activities["approved_activities"].astype(int)
         df_total_approved_budget_activities["Year"] = df_total_approved_budget_activities["year"].astype(int)
         presupuesto_col = f"Presupuesto {actual_year}"
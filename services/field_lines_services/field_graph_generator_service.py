@@ -1,9 +1,8 @@
-from matplotlib.widgets import Button
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
-from matplotlib.patches import FancyBboxPatch
+from services.field_lines_services.graph_interaction import InteractiveGraphLayer
+from utils.capabilities import require
 
 class FieldGraphGeneratorService:
     """
@@ -35,6 +34,10 @@ class FieldGraphGeneratorService:
             matplotlib.figure.Figure: La figura de Matplotlib que contiene el gráfico generado,
                                       lista para ser mostrada en una interfaz de usuario.
         """
+        # matplotlib se importa recién al dibujar el primer gráfico
+        plt = require("matplotlib")
+        from matplotlib.patches import FancyBboxPatch
+
         forecast_color = '#8e44ad'
         budget_color = '#008FF6'
         real_cost_color = '#27ae60'
@@ -167,12 +170,13 @@ class FieldGraphGeneratorService:
         x_values = np.arange(1, 13)
         
         # Budget line
-        ax1.plot(x_values, df_budget['BUDGET'], label='Planned Cost', color=budget_color, 
-                linestyle='-', marker='x', linewidth=1)
+        budget_line = ax1.plot(x_values, df_budget['BUDGET'], label='Planned Cost', color=budget_color, 
+                linestyle='-', marker='x', linewidth=1)[0]
         
         # Forecast line
-        ax1.plot(x_values, df_forecast['FORECAST'], label='Forecast EOY', color=forecast_color, 
-                linestyle='--', marker='.')
+        forecast_line = ax1.plot(x_values, df_forecast['FORECAST'], label='Forecast EOY', color=forecast_color, 
+                linestyle='--', marker='.')[0]
+        hover_lines = [budget_line, forecast_line]
         
         # Encuentra índices donde ACTUAL COST no es cero
         non_zero_indices = df_real_cost_accumulated[df_real_cost_accumulated['ACTUAL COST'] != 0].index
@@ -192,7 +196,7 @@ class FieldGraphGeneratorService:
             last_valid_idx = non_zero_indices[-1]
             
             # Grafica solo hasta el último valor no nulo (inclusive)
-            ax1.plot(
+            actual_line = ax1.plot(
                 x_values[:last_valid_idx + 1],
                 df_real_cost_accumulated['ACTUAL COST'].iloc[:last_valid_idx + 1],
                 label='Actual Cost',
@@ -200,7 +204,8 @@ class FieldGraphGeneratorService:
                 marker='o',
                 linestyle='-',
                 linewidth=1
-            )
+            )[0]
+            hover_lines.append(actual_line)
             annotate_point(ax1, last_valid_idx + 1, 
                df_real_cost_accumulated['ACTUAL COST'].iloc[last_valid_idx], 
                df_real_cost_accumulated['ACTUAL COST'].iloc[last_valid_idx]/1_000_000, 
@@ -209,34 +214,31 @@ class FieldGraphGeneratorService:
             print("No hay valores no-cero para graficar")
         
         # Initial Planned Cost line (con interactividad)
-        self.initial_line = None  # Referencia para la línea
+        initial_line = None
+        initial_annotation = None
         if "INITIAL APPROVED COST" in graph_data:
             df_initial_planned_cost = graph_data["INITIAL APPROVED COST"]
-            self.initial_line = ax1.plot(
+            initial_line = ax1.plot(
                 x_values, 
                 df_initial_planned_cost['VALUE'],
                 label='Initial Approved Cost', 
                 color='red', 
                 linestyle='-', 
-                linewidth=1,
-                visible=self.initial_cost_visible  # Estado inicial
-            )[0]  # Guardar referencia al objeto Line2D
-            
-            # Anotación solo si está visible
-            if self.initial_cost_visible:
-                last_value = df_initial_planned_cost['VALUE'].iloc[-1]
-                self.initial_annotation = ax1.annotate(
-                    f"{last_value/1_000_000:.2f}M", 
-                    xy=(12, last_value),
-                    xytext=(10, -5), 
-                    textcoords='offset points',
-                    ha='left',
-                    color='red',
-                    fontsize=9,
-                    fontweight='bold'
-                )
-            else:
-                self.initial_annotation = None
+                linewidth=1
+            )[0]
+            hover_lines.append(initial_line)
+            # La anotación se crea siempre; el botón solo cambia su visibilidad
+            last_value = df_initial_planned_cost['VALUE'].iloc[-1]
+            initial_annotation = ax1.annotate(
+                f"{last_value/1_000_000:.2f}M", 
+                xy=(12, last_value),
+                xytext=(10, -5), 
+                textcoords='offset points',
+                ha='left',
+                color='red',
+                fontsize=9,
+                fontweight='bold'
+            )
         # =========================================================================
         # 4. ANOTACIONES (AJUSTADAS A MILLONES)
         # =========================================================================
@@ -523,58 +525,16 @@ class FieldGraphGeneratorService:
         
         plt.title(title, fontsize=14, fontweight='bold', pad=20)
         plt.tight_layout()
-        if "INITIAL APPROVED COST" in graph_data:
-           # Crear eje para el botón (posición más compacta)
-            ax_button = plt.axes([0.85, 0.02, 0.12, 0.04])  # Tamaño más pequeño y posición ajustada
-
-            # Crear el botón con un diseño compacto
-            self.toggle_button = Button(
-                ax_button, 
-                'Hide Approved' if self.initial_cost_visible else 'Show Approved',
-                color="#3d5db6",  # Fondo gris claro
-                hovercolor="#082864"  # Fondo más oscuro al pasar el mouse
-            )
-
-            # Personalizar el texto del botón
-            self.toggle_button.label.set_fontsize(9)  # Tamaño de fuente más pequeño
-            self.toggle_button.label.set_fontweight('bold')  # Negrita
-            self.toggle_button.label.set_color("#FFFFFF")  # Texto negro
-
-            # Conectar función de callback
-            self.toggle_button.on_clicked(self.toggle_initial_cost)
+        # Capa interactiva: botón para la línea aprobada inicial y valores al pasar el cursor
+        toggle_artists = [initial_line, initial_annotation] if initial_line is not None else []
+        button_ax = fig.add_axes([0.85, 0.02, 0.12, 0.04]) if initial_line is not None else None
+        fig.interactive_layer = InteractiveGraphLayer(
+            fig, hover_lines,
+            toggle_artists=toggle_artists,
+            button_ax=button_ax,
+            visible=self.initial_cost_visible,
+            month_labels=months
+        )
+        fig.interactive_layer.connect()
 
         return fig
-        
-    def toggle_initial_cost(self, event):
-        """Función para alternar la visibilidad del costo inicial"""
-        # Cambiar estado
-        self.initial_cost_visible = not self.initial_cost_visible
-        
-        # Actualizar línea
-        self.initial_line.set_visible(self.initial_cost_visible)
-        
-        # Actualizar anotación
-        if self.initial_cost_visible:
-            # Recuperar el último valor (necesitas acceso a los datos aquí)
-            last_value = self.initial_line.get_ydata()[-1]
-            self.initial_annotation = self.initial_line.axes.annotate(
-                f"{last_value/1_000_000:.2f}M", 
-                xy=(12, last_value),
-                xytext=(10, -5), 
-                textcoords='offset points',
-                ha='left',
-                color='red',
-                fontsize=9,
-                fontweight='bold'
-            )
-        elif hasattr(self, 'initial_annotation') and self.initial_annotation:
-            self.initial_annotation.remove()
-            self.initial_annotation = None
-        
-        # Actualizar texto del botón
-        self.toggle_button.label.set_text(
-            'Hide Approved' if self.initial_cost_visible else 'Show Approved'
-        )
-        
-        # Redibujar el canvas
-        plt.draw()
\ No newline at end of file
@@ -0,0 +1,103 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import time
+from utils.progress import OperationCancelled, ensure_progress
+
+
+class FieldReportRunner:
+    """
+    Prepara en paralelo los datos de varios reportes de campo.
+
+    Cada línea lee sus propios CSV de planificación y su propia copia del Excel de
+    costos, por lo que los reportes se procesan en un pool de hilos. Solo se
+    calculan DataFrames: las figuras de Matplotlib deben construirse en el hilo
+    principal a partir de los 'data_sources' devueltos.
+    """
+    def __init__(self, report_instances: list, max_workers: int = 4):
+        """
+        Inicializa el ejecutor.
+
+        Args:
+            report_instances (list): Instancias de FieldReport en el orden de configuración.
+            max_workers (int): Número máximo de hilos del pool.
+        """
+        self.report_instances = report_instances
+        self.max_workers = max_workers
+
+    def run(self, progress=None) -> list:
+        """
+        Procesa todas las líneas y devuelve los resultados en el orden de configuración.
+
+        Un error en una línea queda registrado en su resultado y no interrumpe el lote.
+        Si se cancela el contexto de progreso, las líneas pendientes no se inician y
+        las que están en curso se detienen en su próximo checkpoint.
+
+        Args:
+            progress (ProgressContext, optional): Contexto de progreso y cancelación.
+
+        Returns:
+            list: Un diccionario por línea con las claves 'title', 'report',
+                  'data_sources', 'monthly_summary', 'cpi_spi', 'elapsed' (segundos)
+                  y 'error' (la excepción capturada o None).
+        """
+        if not self.report_instances:
+            return []
+        progress = ensure_progress(progress)
+        total = len(self.report_instances)
+        workers = max(1, min(self.max_workers, total))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="field-report")
+        futures = []
+        for i, report in enumerate(self.report_instances):
+            report.set_progress_context(progress.subcontext(i / total, (i + 1) / total))
+            futures.append(executor.submit(self._prepare_line, report))
+        try:
+            pending = set(futures)
+            while pending:
+                # Espera corta para que el hilo que llama pueda atender la cancelación
+                _, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                progress.report((total - len(pending)) / total, f"Field reports: {total - len(pending)}/{total}")
+                if progress.is_cancelled:
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=progress.is_cancelled)
+            for report in self.report_instances:
+                report.set_progress_context(None)
+
+        # Resultados en el orden de configuración, aunque las líneas terminen en otro orden
+        results = []
+        for report, future in zip(self.report_instances, futures):
+            if future.cancelled():
+                results.append(self._empty_result(report, OperationCancelled(report.title)))
+            else:
+                results.append(future.result())
+        return results
+
+    @staticmethod
+    def _empty_result(report, error=None) -> dict:
+        return {
+            "title": report.title,
+            "report": report,
+            "data_sources": None,
+            "monthly_summary": None,
+            "cpi_spi": None,
+            "elapsed": 0.0,
+            "error": error,
+        }
+
+    @staticmethod
+    def _prepare_line(report) -> dict:
+        """Genera los datos de una sola línea capturando cualquier error."""
+        result = FieldReportRunner._empty_result(report)
+        start = time.perf_counter()
+        try:
+            result["data_sources"] = report.get_data_sources()
+            result["monthly_summary"] = report.get_monthly_summary_dataframe(reload=False)
+            try:
+                result["cpi_spi"] = report.generate_combined_cpi_spi_dataframe()
+            except OperationCancelled:
+                raise
+            except Exception as e:
+                print(f"Advertencia: no se pudo calcular CPI/SPI para '{report.title}': {e}")
+        except Exception as e:
+            result["error"] = e
+        result["elapsed"] = time.perf_counter() - start
+        return result
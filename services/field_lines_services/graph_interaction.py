@@ -0,0 +1,191 @@
+import numpy as np
+
+# Distancia máxima (en píxeles) entre el cursor y un punto para mostrar su valor
+HOVER_RADIUS_PX = 8
+
+
+class InteractiveGraphLayer:
+    """
+    Interacciones de un gráfico de campo dibujadas con blitting.
+
+    El fondo del gráfico (todo lo que no cambia) se guarda en cada dibujo
+    completo; mostrar u ocultar la línea de costo aprobado inicial y la
+    etiqueta de valor bajo el cursor solo restauran ese fondo y redibujan
+    los artistas animados, sin volver a dibujar ejes, barras ni textos.
+
+    La capa se guarda en la figura (figure.interactive_layer) y se puede
+    serializar con ella; al deserializar la figura hay que llamar a connect().
+    """
+    def __init__(self, figure, hover_lines, toggle_artists=(), button_ax=None, visible=True,
+                 month_labels=None):
+        """
+        Args:
+            figure (Figure): Figura del gráfico.
+            hover_lines (list): Líneas cuyos puntos muestran su valor al pasar el cursor.
+            toggle_artists (list): Artistas que alterna el botón (línea y anotación).
+            button_ax (Axes, optional): Eje donde se dibuja el botón; sin eje no hay botón.
+            visible (bool): Estado inicial de los artistas alternables.
+            month_labels (list, optional): Nombre del mes de cada punto (x = 1..12).
+        """
+        self.figure = figure
+        self.hover_lines = list(hover_lines)
+        self.toggle_artists = list(toggle_artists)
+        self.button_ax = button_ax
+        self.visible = visible
+        self.month_labels = list(month_labels or [])
+
+        ax = self.hover_lines[0].axes if self.hover_lines else figure.axes[0]
+        self.hover_annotation = ax.annotate(
+            "", xy=(0, 0), xytext=(12, 12), textcoords="offset points",
+            fontsize=9, bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#2c3e50", alpha=0.9),
+            visible=False
+        )
+        for artist in self.toggle_artists:
+            artist.set_visible(visible)
+        # Los artistas animados no entran en el dibujo completo (sí al exportar con savefig)
+        for artist in self.toggle_artists + [self.hover_annotation]:
+            artist.set_animated(True)
+        self._reset_runtime_state()
+
+    def _reset_runtime_state(self):
+        self._button = None
+        self._cids = []
+        self._background = None
+        self._points = None  # (coordenadas en pantalla, línea, índice) de los puntos visibles
+        self._hover_key = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ("_button", "_cids", "_background", "_points", "_hover_key"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_runtime_state()
+
+    def connect(self):
+        """Conecta los eventos del lienzo y crea el botón."""
+        canvas = self.figure.canvas
+        self.disconnect()
+        self._cids = [
+            canvas.mpl_connect("draw_event", self._on_draw),
+            canvas.mpl_connect("motion_notify_event", self._on_motion),
+        ]
+        if self.button_ax is not None:
+            from matplotlib.widgets import Button
+            # Quitar la etiqueta que haya dejado un botón anterior (figura deserializada)
+            for text in list(self.button_ax.texts):
+                text.remove()
+            self._button = Button(self.button_ax, self._button_text(), color="#3d5db6", hovercolor="#082864")
+            self._button.label.set_fontsize(9)
+            self._button.label.set_fontweight('bold')
+            self._button.label.set_color("#FFFFFF")
+            self._button.on_clicked(self.toggle)
+
+    def disconnect(self):
+        for cid in self._cids:
+            self.figure.canvas.mpl_disconnect(cid)
+        self._cids = []
+        if self._button is not None:
+            self._button.disconnect_events()
+            self._button = None
+
+    def _button_text(self):
+        return 'Hide Approved' if self.visible else 'Show Approved'
+
+    # --- Eventos ---
+
+    def toggle(self, event=None):
+        """Alterna la visibilidad de la línea de costo aprobado inicial."""
+        self.visible = not self.visible
+        for artist in self.toggle_artists:
+            artist.set_visible(self.visible)
+        self._points = None  # La línea alternada entra o sale de la búsqueda del cursor
+        if self._button is None:
+            self._blit()
+            return
+        self._button.label.set_text(self._button_text())
+        self._refresh_button_background()
+        self._blit(extra=[self.button_ax])
+
+    def _on_draw(self, event):
+        canvas = self.figure.canvas
+        self._background = canvas.copy_from_bbox(self.figure.bbox)
+        self._points = None
+        self._draw_animated()
+
+    def _on_motion(self, event):
+        if self._background is None:
+            return
+        hit = self._nearest_point(event.x, event.y) if event.inaxes is not None else None
+        if hit == self._hover_key:
+            return
+        self._hover_key = hit
+        if hit is None:
+            self.hover_annotation.set_visible(False)
+        else:
+            line, index = hit
+            x, y = np.asarray(line.get_xdata())[index], np.asarray(line.get_ydata())[index]
+            month = self.month_labels[index] if index < len(self.month_labels) else f"{x}"
+            self.hover_annotation.xy = (x, y)
+            self.hover_annotation.set_text(f"{line.get_label()}\n{month.capitalize()}: {y / 1_000_000:.2f}M")
+            self.hover_annotation.set_visible(True)
+        self._blit()
+
+    # --- Blitting ---
+
+    def _nearest_point(self, x, y):
+        if self._points is None:
+            self._points = self._visible_points()
+        coords, lines, indices = self._points
+        if not len(coords):
+            return None
+        distances = np.hypot(coords[:, 0] - x, coords[:, 1] - y)
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > HOVER_RADIUS_PX:
+            return None
+        return lines[nearest], indices[nearest]
+
+    def _visible_points(self):
+        coords, lines, indices = [], [], []
+        for line in self.hover_lines:
+            if not line.get_visible():
+                continue
+            data = np.column_stack([np.asarray(line.get_xdata(), dtype=float), np.asarray(line.get_ydata(), dtype=float)])
+            if not len(data):
+                continue
+            coords.append(line.get_transform().transform(data))
+            lines.extend([line] * len(data))
+            indices.extend(range(len(data)))
+        if not coords:
+            return np.empty((0, 2)), [], []
+        return np.vstack(coords), lines, indices
+
+    def _refresh_button_background(self):
+        """Guarda en el fondo el botón con su nuevo texto (y su color normal, no el de cursor encima)."""
+        if self._background is None:
+            return
+        canvas = self.figure.canvas
+        current_color = self.button_ax.get_facecolor()
+        self.button_ax.set_facecolor(self._button.color)
+        canvas.restore_region(self._background)
+        self.figure.draw_artist(self.button_ax)
+        self._background = canvas.copy_from_bbox(self.figure.bbox)
+        self.button_ax.set_facecolor(current_color)
+
+    def _draw_animated(self):
+        for artist in self.toggle_artists + [self.hover_annotation]:
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
+
+    def _blit(self, extra=()):
+        canvas = self.figure.canvas
+        if self._background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        for artist in extra:
+            self.figure.draw_artist(artist)
+        self._draw_animated()
+        canvas.blit(self.figure.bbox)
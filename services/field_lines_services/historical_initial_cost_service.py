@@ -3,6 +3,11 @@ import pandas as pd
 from datetime import datetime
 
 from utils.file_manager import get_historical_initial_cost_approved_path
+from services.field_lines_services.planning_state_store import HISTORICAL_INITIAL_COST, HISTORICAL_INITIAL_COST_KEYS, get_planning_state_store
+from utils.change_journal import ChangeJournal
+from utils.reference_cache import reference_data_cache
+
+REFERENCE_TABLE = "historical_initial_cost"
 
 class HistoricalInitialCostService:
     """
@@ -20,6 +25,7 @@ class HistoricalInitialCostService:
         existentes o crea un nuevo registro si es necesario.
         """
         self.file_path = get_historical_initial_cost_approved_path()
+        self.journal = ChangeJournal(self.file_path, key_columns=HISTORICAL_INITIAL_COST_KEYS)
         self.year = datetime.now().year
         self.df = self._load_or_create()
 
@@ -30,13 +36,50 @@ class HistoricalInitialCostService:
         Si el archivo existe, lo lee. Si el año actual no se encuentra en los
         datos cargados, se añade una nueva fila para él. Si el archivo no existe,
         se crea un DataFrame nuevo con una entrada para el año actual.
+
+        La tabla se toma del caché de referencia del proceso y solo se relee si
+        el archivo, su diario o el almacén SQLite cambiaron.
         """
-        if os.path.exists(self.file_path):
-            df = pd.read_csv(self.file_path)
-            if self.year not in df['Year'].values:
-                df = pd.concat([df, pd.DataFrame({"Year": [self.year], "Initial Cost Approved": [0.0]})], ignore_index=True)
+        df = self.get_reference_table().dataframe.copy()
+        if self.year not in df['Year'].values:
+            df = pd.concat([df, pd.DataFrame({"Year": [self.year], "Initial Cost Approved": [0.0]})], ignore_index=True)
+        return df
+
+    @classmethod
+    def get_reference_table(cls):
+        """Devuelve la tabla histórica de costos iniciales compartida por todo el proceso."""
+        journal = ChangeJournal(get_historical_initial_cost_approved_path(), key_columns=HISTORICAL_INITIAL_COST_KEYS)
+        return reference_data_cache.get(
+            REFERENCE_TABLE,
+            lambda: cls._source_version(journal),
+            lambda: cls._read_table(journal),
+        )
+
+    @classmethod
+    def get_initial_cost_for_year(cls, year) -> float:
+        """Costo inicial aprobado de un año (0.0 si no existe o no es numérico)."""
+        rows = cls.get_reference_table().rows_for("Year", int(year))
+        try:
+            return float(rows['Initial Cost Approved'].iloc[0]) if not rows.empty else 0.0
+        except (ValueError, TypeError):
+            return 0.0
+
+    @staticmethod
+    def _source_version(journal):
+        store = get_planning_state_store()
+        return (journal.version(), store.kind_revision(HISTORICAL_INITIAL_COST) if store is not None else None)
+
+    @staticmethod
+    def _read_table(journal):
+        store = get_planning_state_store()
+        stored_df = store.read_records(HISTORICAL_INITIAL_COST) if store is not None else pd.DataFrame()
+        if not stored_df.empty:
+            df = stored_df.rename(columns={"year": "Year"})[["Year", "Initial Cost Approved"]]
+        elif os.path.exists(journal.csv_path):
+            df = journal.replay(pd.read_csv(journal.csv_path))
         else:
-            df = pd.DataFrame({"Year": [self.year], "Initial Cost Approved": [0.0]})
+            df = pd.DataFrame({"Year": pd.Series(dtype=int), "Initial Cost Approved": pd.Series(dtype=float)})
+        df["Year"] = pd.to_numeric(df["Year"], errors="coerce").fillna(0).astype(int)
         return df
 
     def get_year(self):
@@ -77,9 +120,24 @@ class HistoricalInitialCostService:
 
     def save(self):
         """
-        Guarda el estado actual del DataFrame en el archivo CSV.
+        Guarda el costo inicial del año actual, o todos los años en el almacén
+        SQLite si está habilitado.
+
+        Sin almacén, solo se agrega la fila del año actual al diario de cambios; si
+        el CSV todavía no existe se escribe completo.
         """
-        self.df.to_csv(self.file_path, index=False)
+        reference_data_cache.invalidate(REFERENCE_TABLE)
+        store = get_planning_state_store()
+        if store is not None:
+            store.upsert_records(HISTORICAL_INITIAL_COST, [
+                {"line_name": "", "year": row["Year"], "Initial Cost Approved": row["Initial Cost Approved"]}
+                for row in self.df.to_dict(orient="records")
+            ])
+            return
+        if not os.path.exists(self.file_path):
+            self.journal.compact(self.df)
+            return
+        self.journal.upsert({"Year": self.year, "Initial Cost Approved": self.get_initial_cost()})
 
     def get_dataframe(self):
         """
@@ -1,6 +1,8 @@
 import pandas as pd
 from calendar import month_name
 from services.field_lines_services.planning_service_factory import PlanningServiceFactory
+from services.field_lines_services.planning_state_store import prefetch_planning_lines
+from utils.progress import ensure_progress
 
 class LeaderLineService:
     """
@@ -19,8 +21,10 @@ class LeaderLineService:
         """
         self.all_report_instances = all_report_instances
         self.completion_service = completion_service
+        self.line_summaries = {}
+        self.aggregated_df = None
 
-    def generate_aggregated_dataframe(self) -> pd.DataFrame:
+    def generate_aggregated_dataframe(self, progress=None) -> pd.DataFrame:
         """
         Agrega los resúmenes mensuales de todos los reportes de campo completados en un único DataFrame.
 
@@ -33,31 +37,87 @@ class LeaderLineService:
            creando así los datos agregados de la línea líder.
         6. Ordena el DataFrame final cronológicamente por mes.
 
+        Args:
+            progress (ProgressContext, optional): Contexto de progreso y cancelación; se
+                                                  comprueba antes de procesar cada línea.
+
         Returns:
             pd.DataFrame: Un DataFrame que contiene los datos mensuales agregados para la línea líder.
                           Devuelve un DataFrame vacío si no hay líneas completadas o si no se generan resúmenes.
         """
         completed_lines = self.completion_service.get_completed_lines()
         if not completed_lines:
-            return pd.DataFrame()
+            self.line_summaries = {}
+            self.aggregated_df = pd.DataFrame()
+            return self.aggregated_df
         reports_to_aggregate = [
             report for report in self.all_report_instances
             if report.title in completed_lines
         ]
 
-        all_summaries = []
-        for report in reports_to_aggregate:
-            summary_df = report.get_monthly_summary_dataframe()
-            all_summaries.append(summary_df)
+        prefetch_planning_lines([report.title for report in reports_to_aggregate])
+        progress = ensure_progress(progress)
+        line_summaries = {}
+        for i, report in enumerate(reports_to_aggregate):
+            progress.checkpoint(f"Leader line: {report.title}", i / len(reports_to_aggregate))
+            report.set_progress_context(progress.subcontext(i / len(reports_to_aggregate), (i + 1) / len(reports_to_aggregate)))
+            try:
+                line_summaries[report.title] = report.get_monthly_summary_dataframe()
+            finally:
+                report.set_progress_context(None)
+        self.line_summaries = line_summaries
+        self.aggregated_df = self._aggregate_summaries()
+        return self.aggregated_df
+
+    def refresh_line(self, report) -> pd.DataFrame:
+        """
+        Parchea el agregado de la línea líder tras un cambio en una sola línea.
+
+        Solo se regenera el resumen mensual de la línea indicada (reutilizando sus
+        artefactos vigentes); los resúmenes del resto de líneas se toman del caché.
+
+        Args:
+            report: Instancia del reporte de campo modificado.
+
+        Returns:
+            pd.DataFrame: El DataFrame agregado actualizado.
+        """
+        return self.refresh_lines([report])
+
+    def refresh_lines(self, reports) -> pd.DataFrame:
+        """
+        Parchea el agregado de la línea líder tras cambios en varias líneas.
+
+        Regenera el resumen mensual de cada línea indicada y vuelve a sumar los
+        resúmenes una sola vez al final.
+
+        Args:
+            reports (list): Instancias de los reportes de campo modificados.
+
+        Returns:
+            pd.DataFrame: El DataFrame agregado actualizado.
+        """
+        if self.aggregated_df is None:
+            return self.generate_aggregated_dataframe()
+        completed_lines = self.completion_service.get_completed_lines()
+        for report in reports:
+            if report.title in completed_lines:
+                self.line_summaries[report.title] = report.get_monthly_summary_dataframe(reload=False)
+            else:
+                self.line_summaries.pop(report.title, None)
+        self.aggregated_df = self._aggregate_summaries()
+        return self.aggregated_df
 
-        if not all_summaries:
+    def _aggregate_summaries(self) -> pd.DataFrame:
+        """Suma por mes los resúmenes cacheados de las líneas completadas."""
+        if not self.line_summaries:
             return pd.DataFrame()
 
-        combined_df = pd.concat(all_summaries, ignore_index=True)
+        combined_df = pd.concat(self.line_summaries.values(), ignore_index=True)
         aggregated_df = combined_df.groupby("Month", as_index=False).sum(numeric_only=True)
 
         month_order = [m.lower() for m in month_name[1:]]
         aggregated_df['Month'] = pd.Categorical(aggregated_df['Month'].str.lower(), categories=month_order, ordered=True)
         aggregated_df = aggregated_df.sort_values('Month').reset_index(drop=True)
 
-        return aggregated_df
\ No newline at end of file
+        return aggregated_df
@@ -3,10 +3,13 @@ import pandas as pd
 from calendar import month_name
 from utils.file_loader import load_field_reports_from_json
 from utils.file_manager import get_manual_planning_path, get_all_manual_planning_files
+from services.field_lines_services.base_planning_service import RowUpdatesMixin
+from services.field_lines_services.planning_state_store import MANUAL_PLANNING, get_planning_state_store
+from utils.write_behind import get_write_behind_queue
 
 COLUMNS = ["Month", "Planned Activities"]
 
-class ManualPlanningService:
+class ManualPlanningService(RowUpdatesMixin):
     """
     Gestiona los datos de planificación manual para una línea de campo específica.
 
@@ -37,6 +40,14 @@ class ManualPlanningService:
         Returns:
             pd.DataFrame: El DataFrame con los datos de planificación.
         """
+        store = get_planning_state_store()
+        if store is not None and self.line_title:
+            df = store.read_monthly(MANUAL_PLANNING, self.line_title)
+            if df is not None:
+                return self._validate_and_add_missing_columns(df)
+        pending = get_write_behind_queue().pending_data(self.CSV_PATH) if self.CSV_PATH else None
+        if pending is not None:
+            return self._validate_and_add_missing_columns(pending.copy())
         if self.CSV_PATH and os.path.exists(self.CSV_PATH):
             df = pd.read_csv(self.CSV_PATH)
             df = self._validate_and_add_missing_columns(df)
@@ -82,6 +93,9 @@ class ManualPlanningService:
         """
         Obtiene una lista de todas las líneas que tienen un archivo de planificación manual.
         """
+        store = get_planning_state_store()
+        if store is not None:
+            return store.list_lines(MANUAL_PLANNING)
         files = get_all_manual_planning_files()
         return [line_title for line_title, _ in files]
 
@@ -104,14 +118,29 @@ class ManualPlanningService:
                 self.dataframe.at[idx[0], column] = value
             self._post_update_calculations(month)
 
+    def _cast_column_values(self, column, values):
+        """Las actividades se guardan como enteros y el Forecast como decimal (igual que update_row)."""
+        if column == "Scheduled Activities" or column == "Planned Activities":
+            return pd.to_numeric(values).astype(int)
+        if column == "Forecast":
+            return pd.to_numeric(values).astype(float)
+        return values
+
     def save_to_csv(self):
         """
         Guarda el estado actual del DataFrame en su archivo CSV correspondiente.
-        Crea el directorio si no existe.
+        Crea el directorio si no existe. Si el almacén SQLite está habilitado,
+        actualiza las filas de la línea en él en lugar del CSV.
+
+        El CSV se escribe en segundo plano mediante la cola de escritura diferida.
         """
+        store = get_planning_state_store()
+        if store is not None and self.line_title:
+            store.upsert_monthly(MANUAL_PLANNING, self.line_title, self.dataframe)
+            return
         if self.CSV_PATH:
-            os.makedirs(os.path.dirname(self.CSV_PATH), exist_ok=True)
-            self.dataframe.to_csv(self.CSV_PATH, index=False)
+            snapshot = self.dataframe.copy()
+            get_write_behind_queue().submit(self.CSV_PATH, lambda tmp_path: snapshot.to_csv(tmp_path, index=False), data=snapshot)
 
     def get_data_as_list(self):
         """
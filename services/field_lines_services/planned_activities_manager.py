@@ -73,7 +73,7 @@ class PlannedActivitiesManager():
         """
         Genera un DataFrame de forecast utilizando un servicio de planificación específico.
         """
-        planning_service = PlanningServiceFactory.create_service(service_type, title)
+        planning_service = PlanningServiceFactory.get_service(service_type, title)
         df_planning = planning_service.get_dataframe()
         forecast_df = df_planning[["Month", "Forecast"]].copy()
         forecast_df['Month'] = forecast_df['Month'].str.lower()
@@ -164,7 +164,7 @@ class PlannedActivitiesManager():
         actividades programadas a partir del mes siguiente al último ejecutado
         (`last_index_month`), creando una proyección acumulada para el resto del año.
         """
-        planning_service = PlanningServiceFactory.create_service(service_type, title)
+        planning_service = PlanningServiceFactory.get_service(service_type, title)
         df_planning = planning_service.get_dataframe()
         months = ['january', 'february', 'march', 'april', 'may', 'june', 
                  'july', 'august', 'september', 'october', 'november', 'december']
@@ -246,7 +246,7 @@ class PlannedActivitiesManager():
         Obtiene las actividades programadas desde el mes actual en adelante,
         dejando los meses pasados en cero.
         """
-        planning_service = PlanningServiceFactory.create_service(service_type, title)
+        planning_service = PlanningServiceFactory.get_service(service_type, title)
         df_planning = planning_service.get_dataframe()
         months = ['january', 'february', 'march', 'april', 'may', 'june', 
                  'july', 'august', 'september', 'october', 'november', 'december']
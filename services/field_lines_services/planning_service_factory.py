@@ -1,6 +1,10 @@
+import os
+import threading
 from .schedule_without_categorizer_service import ScheduleWithoutCategorizerService
 from .schedule_with_categorizer_service import ScheduleWithCategorizerService
 from .manual_planning_service import ManualPlanningService
+from .planning_state_store import MANUAL_PLANNING, get_planning_state_store
+from utils.write_behind import get_write_behind_queue
 
 class PlanningServiceFactory:
     """Factory para crear servicios de planificación según el tipo"""
@@ -10,6 +14,10 @@ class PlanningServiceFactory:
         "schedule_with_categorizer": ScheduleWithCategorizerService,
         "default": ManualPlanningService  # Para backward compatibility
     }
+
+    # Registro de instancias de solo lectura: (service_type, line_title) -> (versión de los datos, servicio)
+    _registry = {}
+    _registry_lock = threading.Lock()
     
     @classmethod
     def create_service(cls, service_type: str, line_title: str = None):
@@ -25,6 +33,67 @@ class PlanningServiceFactory:
         """
         service_class = cls.SERVICE_TYPES.get(service_type, ManualPlanningService)
         return service_class(line_title)
+
+    @classmethod
+    def get_service(cls, service_type: str, line_title: str = None):
+        """
+        Devuelve la instancia registrada para (service_type, line_title), creándola
+        solo si no existe o si los datos de la línea (CSV o almacén SQLite) cambiaron
+        desde que se leyeron.
+
+        Pensado para consultas de solo lectura (forecast, actividades programadas):
+        quien necesite editar y guardar debe usar create_service para no compartir
+        cambios sin guardar. Los consumidores deben leer con get_dataframe(), que
+        devuelve una copia.
+        """
+        key = (service_type, line_title)
+        with cls._registry_lock:
+            entry = cls._registry.get(key)
+        if entry is not None:
+            version, service = entry
+            if cls._data_version(service) == version:
+                return service
+        # El CSV se lee fuera del candado para que las líneas distintas se carguen en paralelo
+        service_class = cls.SERVICE_TYPES.get(service_type, ManualPlanningService)
+        service = service_class(line_title)
+        version = cls._data_version(service)
+        with cls._registry_lock:
+            current = cls._registry.get(key)
+            if current is not None and current[0] == version:
+                # Otro hilo cargó la misma versión mientras tanto
+                return current[1]
+            cls._registry[key] = (version, service)
+        return service
+
+    @classmethod
+    def invalidate(cls, line_title: str = None):
+        """Descarta del registro las instancias de una línea (o todas si line_title es None)."""
+        with cls._registry_lock:
+            for key in list(cls._registry):
+                if line_title is None or key[1] == line_title:
+                    del cls._registry[key]
+
+    @classmethod
+    def _data_version(cls, service):
+        """
+        Versión del CSV de la línea, guardados encolados para ese CSV y, si el
+        almacén SQLite está habilitado, su revisión.
+        """
+        store = get_planning_state_store()
+        revision = store.revision(MANUAL_PLANNING, service.line_title) if store is not None else None
+        queued = get_write_behind_queue().generation(service.CSV_PATH) if service.CSV_PATH else 0
+        return (cls._csv_version(service.CSV_PATH), queued, revision)
+
+    @staticmethod
+    def _csv_version(csv_path):
+        """Identifica la versión del archivo por fecha de modificación y tamaño."""
+        if not csv_path:
+            return None
+        try:
+            stat = os.stat(csv_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
     
     @classmethod
     def get_service_type_from_line_reports(cls, line_title: str, field_line_reports: list) -> str:
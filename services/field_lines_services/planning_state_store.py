@@ -0,0 +1,393 @@
+import json
+import os
+import sqlite3
+import threading
+from calendar import month_name
+import pandas as pd
+from utils.change_journal import ChangeJournal, read_journaled_csv
+from utils.file_manager import (
+    get_all_cpi_spi_files,
+    get_all_manual_planning_files,
+    get_budget_year,
+    get_completion_status_path,
+    get_cpi_spi_path,
+    get_field_approved_budget_activities_from_file,
+    get_field_planning_db_path,
+    get_historical_initial_cost_approved_path,
+    get_manual_planning_path,
+)
+
+MONTHS = list(month_name)[1:]
+
+# Tipos de datos mensuales por línea (una fila por mes) y de registros por línea/año
+MANUAL_PLANNING = "manual_planning"
+CPI_SPI = "cpi_spi"
+COMPLETION_STATUS = "completion_status"
+APPROVED_BUDGET = "approved_budget"
+HISTORICAL_INITIAL_COST = "historical_initial_cost"
+
+# Claves de los diarios de cambios de los CSV de registros (ver utils.change_journal)
+COMPLETION_STATUS_KEYS = ["line_name"]
+HISTORICAL_INITIAL_COST_KEYS = ["Year"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS line_month_values (
+    kind TEXT NOT NULL,
+    line_name TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, line_name, year, month)
+);
+CREATE INDEX IF NOT EXISTS idx_line_month_values_line ON line_month_values (line_name, year, month);
+
+CREATE TABLE IF NOT EXISTS line_records (
+    kind TEXT NOT NULL,
+    line_name TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, line_name, year)
+);
+CREATE INDEX IF NOT EXISTS idx_line_records_line ON line_records (line_name, year);
+
+CREATE TABLE IF NOT EXISTS line_revisions (
+    kind TEXT NOT NULL,
+    line_name TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    PRIMARY KEY (kind, line_name)
+);
+"""
+
+
+class PlanningStateStore:
+    """
+    Almacén opcional en un único archivo SQLite para el estado de planificación
+    de las líneas de campo.
+
+    Reemplaza los CSV sueltos (planificación manual, CPI/SPI, estado de completado,
+    presupuesto aprobado y costo inicial histórico) por dos tablas indexadas:
+    - line_month_values: una fila por (tipo, línea, año, mes).
+    - line_records: una fila por (tipo, línea, año).
+    Cada fila guarda sus columnas como JSON, así los servicios conservan la misma
+    estructura de DataFrame que tenían con los CSV.
+
+    Las escrituras son upserts por fila dentro de una transacción y las lecturas
+    de varias líneas se resuelven con una sola consulta. Los CSV pueden importarse
+    y exportarse en cualquier momento para mantener compatibilidad.
+    """
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): Ruta del archivo SQLite; se crea si no existe.
+        """
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._prefetched = {}  # (tipo, año) -> (revisión del tipo, {línea: DataFrame})
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Datos mensuales por línea ---
+
+    def read_monthly(self, kind: str, line_name: str, year: int = None):
+        """
+        Lee los meses guardados de una línea.
+
+        Returns:
+            pd.DataFrame | None: Columnas 'Month' + columnas guardadas, ordenado por mes,
+                                 o None si la línea no tiene datos en el almacén.
+        """
+        year = year or get_budget_year()
+        prefetched = self._prefetched.get((kind, year))
+        if prefetched is not None and line_name in prefetched[1] and prefetched[0] == self.kind_revision(kind):
+            df = prefetched[1][line_name]
+            return None if df is None else df.copy()
+        df = self.read_monthly_lines(kind, [line_name], year)
+        if df.empty:
+            return None
+        return df.drop(columns=["Line"]).reset_index(drop=True)
+
+    def prefetch_monthly(self, kind: str, line_names: list, year: int = None):
+        """
+        Lee con una sola consulta los meses de varias líneas y los guarda para que
+        las siguientes llamadas a read_monthly de esas líneas no consulten la base.
+        Lo guardado se descarta en cuanto cambia la revisión del tipo.
+        """
+        year = year or get_budget_year()
+        revision = self.kind_revision(kind)
+        df = self.read_monthly_lines(kind, list(line_names), year)
+        by_line = {line_name: None for line_name in line_names}
+        for line_name, line_df in df.groupby("Line", sort=False):
+            by_line[line_name] = line_df.drop(columns=["Line"]).reset_index(drop=True)
+        with self._lock:
+            self._prefetched[(kind, year)] = (revision, by_line)
+
+    def read_monthly_lines(self, kind: str, line_names: list = None, year: int = None) -> pd.DataFrame:
+        """
+        Lee en una sola consulta los meses de varias líneas (o de todas si line_names es None).
+
+        Returns:
+            pd.DataFrame: Formato largo con columnas 'Line', 'Month' y las columnas guardadas,
+                          ordenado por línea y mes.
+        """
+        year = year or get_budget_year()
+        query = "SELECT line_name, month, data FROM line_month_values WHERE kind = ? AND year = ?"
+        params = [kind, year]
+        if line_names is not None:
+            if not line_names:
+                return pd.DataFrame(columns=["Line", "Month"])
+            query += f" AND line_name IN ({', '.join('?' for _ in line_names)})"
+            params.extend(line_names)
+        query += " ORDER BY line_name, month"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        records = [
+            {"Line": line_name, "Month": MONTHS[month - 1], **json.loads(data)}
+            for line_name, month, data in rows
+        ]
+        return pd.DataFrame(records, columns=None if records else ["Line", "Month"])
+
+    def upsert_monthly(self, kind: str, line_name: str, df: pd.DataFrame, year: int = None):
+        """
+        Inserta o actualiza las filas de una línea (una por mes) en una sola transacción.
+        Solo se escriben los meses presentes en df.
+        """
+        year = year or get_budget_year()
+        rows = []
+        for record in df.to_dict(orient="records"):
+            month = record.pop("Month", None)
+            if month not in MONTHS:
+                continue
+            rows.append((kind, line_name, year, MONTHS.index(month) + 1, _dumps(record)))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO line_month_values (kind, line_name, year, month, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, line_name, year, month) DO UPDATE SET data = excluded.data",
+                rows,
+            )
+            self._bump_revision(kind, line_name)
+
+    def list_lines(self, kind: str, year: int = None) -> list:
+        """Devuelve las líneas con datos mensuales guardados para un tipo y año."""
+        year = year or get_budget_year()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT line_name FROM line_month_values WHERE kind = ? AND year = ? ORDER BY line_name",
+                (kind, year),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    # --- Registros por línea y año ---
+
+    def read_records(self, kind: str, year: int = None) -> pd.DataFrame:
+        """
+        Lee los registros de un tipo (de todos los años si year es None).
+
+        Returns:
+            pd.DataFrame: Columnas 'line_name', 'year' y las columnas guardadas.
+        """
+        query = "SELECT line_name, year, data FROM line_records WHERE kind = ?"
+        params = [kind]
+        if year is not None:
+            query += " AND year = ?"
+            params.append(year)
+        query += " ORDER BY year, line_name"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        records = [{"line_name": line_name, "year": row_year, **json.loads(data)} for line_name, row_year, data in rows]
+        return pd.DataFrame(records, columns=None if records else ["line_name", "year"])
+
+    def upsert_records(self, kind: str, records: list):
+        """
+        Inserta o actualiza registros en una sola transacción.
+
+        Args:
+            records (list): Diccionarios con 'line_name', 'year' y el resto de columnas a guardar.
+        """
+        rows = []
+        for record in records:
+            record = dict(record)
+            line_name = str(record.pop("line_name", "") or "")
+            year = int(record.pop("year", 0) or 0)
+            rows.append((kind, line_name, year, _dumps(record)))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO line_records (kind, line_name, year, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (kind, line_name, year) DO UPDATE SET data = excluded.data",
+                rows,
+            )
+            for line_name in {row[1] for row in rows}:
+                self._bump_revision(kind, line_name)
+
+    # --- Versiones ---
+
+    def revision(self, kind: str, line_name: str) -> int:
+        """Contador que aumenta con cada escritura de la línea; sirve para invalidar cachés."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT revision FROM line_revisions WHERE kind = ? AND line_name = ?",
+                (kind, line_name or ""),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def kind_revision(self, kind: str) -> int:
+        """Suma de las revisiones de todas las líneas de un tipo; cambia con cualquier escritura del tipo."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(revision), 0) FROM line_revisions WHERE kind = ?", (kind,)
+            ).fetchone()
+        return row[0]
+
+    def _bump_revision(self, kind, line_name):
+        self._conn.execute(
+            "INSERT INTO line_revisions (kind, line_name, revision) VALUES (?, ?, 1) "
+            "ON CONFLICT (kind, line_name) DO UPDATE SET revision = revision + 1",
+            (kind, line_name or ""),
+        )
+
+    # --- Importación y exportación de CSV ---
+
+    def import_csv_files(self, year: int = None):
+        """
+        Copia al almacén el contenido actual de los CSV de planificación, incluidos
+        los cambios pendientes de sus diarios. Los CSV no se modifican.
+        """
+        year = year or get_budget_year()
+        for line_name, path in get_all_manual_planning_files():
+            self.upsert_monthly(MANUAL_PLANNING, line_name, pd.read_csv(path), year)
+        for line_name, path in get_all_cpi_spi_files():
+            try:
+                self.upsert_monthly(CPI_SPI, line_name, pd.read_csv(path), year)
+            except pd.errors.EmptyDataError:
+                continue
+
+        from services.field_lines_services.approved_budget_activities_service import JOURNAL_KEYS as APPROVED_BUDGET_KEYS
+
+        completion_path = get_completion_status_path()
+        if os.path.exists(completion_path):
+            completion_df = read_journaled_csv(completion_path, COMPLETION_STATUS_KEYS)
+            self.upsert_records(COMPLETION_STATUS, [
+                {"line_name": row["line_name"], "year": 0, "completed": bool(row["completed"])}
+                for row in completion_df.to_dict(orient="records")
+            ])
+
+        approved_path = get_field_approved_budget_activities_from_file()
+        if os.path.exists(approved_path):
+            self.upsert_records(APPROVED_BUDGET, read_journaled_csv(approved_path, APPROVED_BUDGET_KEYS).to_dict(orient="records"))
+
+        historical_path = get_historical_initial_cost_approved_path()
+        if os.path.exists(historical_path):
+            historical_df = read_journaled_csv(historical_path, HISTORICAL_INITIAL_COST_KEYS)
+            self.upsert_records(HISTORICAL_INITIAL_COST, [
+                {"line_name": "", "year": row["Year"], "Initial Cost Approved": row["Initial Cost Approved"]}
+                for row in historical_df.to_dict(orient="records")
+            ])
+
+    def export_csv_files(self, year: int = None):
+        """
+        Escribe el contenido del almacén en los CSV originales para compatibilidad.
+        Los CSV con diario de cambios se reescriben compactando el diario, para que
+        sus entradas pendientes no se apliquen sobre lo exportado.
+        """
+        from services.field_lines_services.approved_budget_activities_service import JOURNAL_KEYS as APPROVED_BUDGET_KEYS
+
+        year = year or get_budget_year()
+        for line_name in self.list_lines(MANUAL_PLANNING, year):
+            self.read_monthly(MANUAL_PLANNING, line_name, year).to_csv(get_manual_planning_path(line_name), index=False)
+        for line_name in self.list_lines(CPI_SPI, year):
+            self.read_monthly(CPI_SPI, line_name, year).to_csv(get_cpi_spi_path(line_name), index=False)
+
+        completion_df = self.read_records(COMPLETION_STATUS)
+        if not completion_df.empty:
+            ChangeJournal(get_completion_status_path(), COMPLETION_STATUS_KEYS).compact(completion_df[["line_name", "completed"]])
+
+        approved_df = self.read_records(APPROVED_BUDGET)
+        if not approved_df.empty:
+            columns = ["idx", "year", "budget", "approved_activities", "line_name"]
+            ChangeJournal(get_field_approved_budget_activities_from_file(), APPROVED_BUDGET_KEYS).compact(approved_df.reindex(columns=columns))
+
+        historical_df = self.read_records(HISTORICAL_INITIAL_COST)
+        if not historical_df.empty:
+            historical_df = historical_df.rename(columns={"year": "Year"})
+            ChangeJournal(get_historical_initial_cost_approved_path(), HISTORICAL_INITIAL_COST_KEYS).compact(historical_df[["Year", "Initial Cost Approved"]])
+
+
+def _dumps(record: dict) -> str:
+    """Serializa una fila convirtiendo los escalares de numpy a tipos de Python."""
+    return json.dumps(record, default=lambda value: value.item() if hasattr(value, "item") else str(value))
+
+
+_store = None
+_store_checked = False  # el archivo se busca una sola vez por proceso
+_db_path = None
+_store_lock = threading.Lock()
+
+
+def _planning_db_path():
+    """Ruta del archivo SQLite, calculada una sola vez (resolverla crea carpetas)."""
+    global _db_path
+    if _db_path is None:
+        _db_path = get_field_planning_db_path()
+    return _db_path
+
+
+def get_planning_state_store():
+    """
+    Devuelve el almacén SQLite compartido si está habilitado, o None.
+
+    El almacén se considera habilitado cuando su archivo existe (ver
+    enable_planning_state_store); mientras tanto los servicios siguen usando los CSV.
+    La existencia del archivo se revisa solo en la primera llamada.
+    """
+    global _store, _store_checked
+    if _store is not None or _store_checked:
+        return _store
+    with _store_lock:
+        if _store is None and not _store_checked:
+            db_path = _planning_db_path()
+            if os.path.exists(db_path):
+                _store = PlanningStateStore(db_path)
+            _store_checked = True
+        return _store
+
+
+def enable_planning_state_store(import_csv: bool = True) -> PlanningStateStore:
+    """
+    Crea el archivo SQLite (si no existe) y, si se acaba de crear y import_csv es
+    True, importa los CSV actuales. Desde ese momento los servicios de
+    planificación leen y escriben en el almacén.
+    """
+    global _store, _store_checked
+    created = False
+    with _store_lock:
+        if _store is None:
+            db_path = _planning_db_path()
+            created = not os.path.exists(db_path)
+            _store = PlanningStateStore(db_path)
+        _store_checked = True
+    if import_csv and created:
+        print("💾 Importando los CSV de planificación al almacén SQLite...")
+        _store.import_csv_files()
+    return _store
+
+
+def prefetch_planning_lines(line_names: list):
+    """
+    Si el almacén está habilitado, lee en una consulta por tipo la planificación
+    manual y el CPI/SPI de todas las líneas indicadas, antes de que cada reporte
+    los pida por separado.
+    """
+    store = get_planning_state_store()
+    if store is None or not line_names:
+        return
+    for kind in (MANUAL_PLANNING, CPI_SPI):
+        store.prefetch_monthly(kind, line_names)
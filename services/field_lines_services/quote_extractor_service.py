@@ -1,8 +1,14 @@
+import hashlib
 import os
 import re
-import pdfplumber
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 import pandas as pd
 from datetime import datetime
+from utils.capabilities import MissingDependencyError, is_available, require
+from utils.progress import OperationCancelled, ensure_progress
+from utils.change_journal import ChangeJournal
 from utils.file_manager import get_specific_schedule_activities_path, get_varillera_schedule_activities_path
 
 
@@ -24,9 +30,57 @@ MONTHS = [
 
 VALIDATIONS = ["Pending", "Yes", "No"]
 
+# Columna con la que el diario identifica cada cotización
+QUOTE_KEY_COLUMNS = ["Quote Number"]
+
 # Mantenemos la ruta global para compatibilidad
 CSV_PATH = get_varillera_schedule_activities_path()
 
+# Campos extraídos por (hash del PDF, patrones); se comparte entre servicios del proceso
+_extraction_cache = {}
+_extraction_cache_lock = threading.Lock()
+
+
+def _file_hash(pdf_path):
+    """Hash SHA-256 del contenido del archivo."""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as pdf_file:
+        for chunk in iter(lambda: pdf_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _extract_fields(pdf_path, patterns):
+    """
+    Lee el PDF página a página y aplica los patrones sobre el texto acumulado.
+
+    Deja de leer páginas en cuanto todos los patrones encontraron su valor. Es una
+    función de módulo para poder ejecutarse en un proceso aparte.
+    """
+    pdfplumber = require("pdfplumber")
+    fields = {key: None for key in patterns}
+    pending = dict(patterns)
+    text = ""
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            text = f"{text}\n{page.extract_text() or ''}" if text else (page.extract_text() or "")
+            for field, pattern in list(pending.items()):
+                match = re.search(pattern, text, re.IGNORECASE)
+                if match:
+                    fields[field] = match.group(1).strip()
+                    del pending[field]
+            if not pending:
+                break
+    return fields
+
+
+def _date_as_text(value):
+    """Texto de la fecha tal como queda en el CSV (una fecha sin hora se escribe AAAA-MM-DD)."""
+    if isinstance(value, (pd.Timestamp, datetime)) and not pd.isna(value):
+        timestamp = pd.Timestamp(value)
+        return str(timestamp.date()) if timestamp == timestamp.normalize() else str(timestamp)
+    return str(value)
+
 
 class QuoteExtractorService:
     """Servicio base para extracción de cotizaciones (originalmente para Varillera)"""
@@ -37,12 +91,40 @@ class QuoteExtractorService:
         self.dataframe = self._load_or_create_csv()
 
     def _load_or_create_csv(self):
-        """Carga el CSV existente o crea uno nuevo"""
+        """Carga el CSV existente (aplicando su diario de cambios) o crea uno nuevo"""
+        self.journal = ChangeJournal(self.CSV_PATH, key_columns=QUOTE_KEY_COLUMNS)
+        self._pending_changes = {}
         if os.path.exists(self.CSV_PATH):
             df = pd.read_csv(self.CSV_PATH)
         else:
             df = pd.DataFrame(columns=DEFAULT_COLUMNS)
-        return df
+        return self.journal.replay(df)
+
+    @property
+    def dataframe(self):
+        return self._dataframe
+
+    @dataframe.setter
+    def dataframe(self, df):
+        # Cualquier reemplazo del DataFrame invalida el índice por número de cotización
+        self._dataframe = df
+        self._quote_index = None
+
+    def _get_quote_index(self):
+        """Índice {número de cotización: etiqueta de fila}, construido a demanda."""
+        if self._quote_index is None:
+            if "Quote Number" in self._dataframe.columns:
+                self._quote_index = {
+                    str(quote_number): label
+                    for label, quote_number in zip(self._dataframe.index, self._dataframe["Quote Number"])
+                }
+            else:
+                self._quote_index = {}
+        return self._quote_index
+
+    def has_quote(self, quote_number):
+        """Indica si el registro ya contiene la cotización."""
+        return str(quote_number) in self._get_quote_index()
 
     def get_extraction_patterns(self):
         """
@@ -59,21 +141,114 @@ class QuoteExtractorService:
     def extract_data_from_pdf(self, pdf_path):
         """Extrae datos del PDF usando los patrones definidos"""
         patrones = self.get_extraction_patterns()
-        datos = {key: None for key in patrones}
-        
-        with pdfplumber.open(pdf_path) as pdf:
-            texto = "\n".join([p.extract_text() or "" for p in pdf.pages])
+        cache_key = self._cache_key(pdf_path, patrones)
+        with _extraction_cache_lock:
+            fields = _extraction_cache.get(cache_key)
+        if fields is None:
+            fields = _extract_fields(pdf_path, patrones)
+            with _extraction_cache_lock:
+                _extraction_cache[cache_key] = fields
+        return self._complete_extracted_data(fields)
+
+    def extract_data_from_pdfs(self, pdf_paths, progress=None, max_workers=None):
+        """
+        Extrae los datos de varios PDF en paralelo.
+
+        Los PDF ya procesados (mismo contenido, aunque cambie el nombre) se toman del
+        caché sin volver a abrirlos; el resto se reparte en un pool de procesos.
+
+        Args:
+            pdf_paths (list): Rutas de los PDF.
+            progress (ProgressContext, optional): Avance por archivo y cancelación.
+            max_workers (int, optional): Procesos del pool (por defecto, los del sistema).
 
-        for campo, patron in patrones.items():
-            match = re.search(patron, texto, re.IGNORECASE)
-            if match:
-                datos[campo] = match.group(1).strip()
+        Returns:
+            list: Tuplas (ruta, datos, error) en el orden recibido; 'datos' es None si
+                  el archivo no se pudo leer y 'error' es la excepción correspondiente.
+        """
+        progress = ensure_progress(progress)
+        patrones = self.get_extraction_patterns()
+        total = len(pdf_paths)
+        results = {}
+        to_extract = {}
+        for path in pdf_paths:
+            try:
+                cache_key = self._cache_key(path, patrones)
+            except OSError as e:
+                results[path] = (None, e)
+                continue
+            with _extraction_cache_lock:
+                fields = _extraction_cache.get(cache_key)
+            if fields is not None:
+                results[path] = (fields, None)
+            else:
+                to_extract[path] = cache_key
 
-        # Campos adicionales
+        def report():
+            done = len(results)
+            progress.checkpoint(f"PDFs procesados: {done}/{total}", done / total if total else 1.0)
+
+        if to_extract and not is_available("pdfplumber"):
+            # Sin pdfplumber no vale la pena levantar el pool: cada archivo queda con el error
+            error = MissingDependencyError("La extracción de cotizaciones requiere el paquete 'pdfplumber', que no está instalado.")
+            for path in to_extract:
+                results[path] = (None, error)
+            to_extract = {}
+
+        report()
+        if to_extract:
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {executor.submit(_extract_fields, path, patrones): path for path in to_extract}
+                    pending = set(futures)
+                    try:
+                        while pending:
+                            # Espera corta para que la interfaz pueda atender la cancelación
+                            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                path = futures[future]
+                                try:
+                                    fields = future.result()
+                                    with _extraction_cache_lock:
+                                        _extraction_cache[to_extract[path]] = fields
+                                    results[path] = (fields, None)
+                                except BrokenProcessPool:
+                                    raise
+                                except Exception as e:
+                                    results[path] = (None, e)
+                            report()
+                    except OperationCancelled:
+                        for future in pending:
+                            future.cancel()
+                        raise
+            except BrokenProcessPool:
+                # Sin procesos disponibles (p. ej. entorno restringido): se procesa en este hilo
+                for path in to_extract:
+                    if path in results:
+                        continue
+                    try:
+                        results[path] = (_extract_fields(path, patrones), None)
+                        with _extraction_cache_lock:
+                            _extraction_cache[to_extract[path]] = results[path][0]
+                    except Exception as e:
+                        results[path] = (None, e)
+                    report()
+
+        return [
+            (path, self._complete_extracted_data(results[path][0]) if results[path][0] is not None else None, results[path][1])
+            for path in pdf_paths
+        ]
+
+    @staticmethod
+    def _cache_key(pdf_path, patterns):
+        return (_file_hash(pdf_path), tuple(sorted(patterns.items())))
+
+    def _complete_extracted_data(self, fields):
+        """Agrega a los campos extraídos los campos adicionales del registro."""
+        datos = dict(fields)
         datos["Scheduled Execution Month"] = ""
         datos["Validation"] = ""
         datos["Year"] = self._extract_year(datos.get("Quote Effective Date", ""))
-
         return datos
 
     def _extract_year(self, date_str):
@@ -87,19 +262,80 @@ class QuoteExtractorService:
         """Agrega o actualiza una entrada en el DataFrame"""
         if "Quote Number" not in new_data or not new_data["Quote Number"]:
             return False
+        self.add_or_update_entries([new_data])
+        return True
 
-        existing_index = self.dataframe[self.dataframe["Quote Number"] == new_data["Quote Number"]].index
-        if not existing_index.empty:
-            self.dataframe.loc[existing_index[0]] = new_data
-        else:
-            self.dataframe = pd.concat([self.dataframe, pd.DataFrame([new_data])], ignore_index=True)
+    def add_or_update_entries(self, entries):
+        """
+        Agrega o actualiza varias entradas en una sola pasada.
 
-        return True
+        Las cotizaciones existentes se localizan con el índice por número de
+        cotización y se actualizan en su fila; las nuevas se agregan al final con
+        una sola concatenación. Solo las filas que cambiaron quedan como cambios
+        pendientes para save_changes().
+
+        Args:
+            entries (list): Diccionarios con los campos de cada cotización.
+
+        Returns:
+            int: Número de entradas agregadas o modificadas.
+        """
+        index = self._get_quote_index()
+        new_rows = {}
+        changed = 0
+        for new_data in entries:
+            quote_number = new_data.get("Quote Number")
+            if not quote_number:
+                continue
+            key = str(quote_number)
+            if key in new_rows:
+                new_rows[key] = new_data
+            elif key in index:
+                label = index[key]
+                existing = self._dataframe.loc[label]
+                # Solo se registran en el diario las filas que realmente cambiaron
+                if not any(str(existing.get(column)) != str(value) for column, value in new_data.items()):
+                    continue
+                for column, value in new_data.items():
+                    self._dataframe.loc[label, column] = value
+            else:
+                new_rows[key] = new_data
+            self._pending_changes[quote_number] = {"op": "upsert", "row": dict(new_data)}
+            changed += 1
+
+        if new_rows:
+            first_label = int(self._dataframe.index.max()) + 1 if len(self._dataframe) else 0
+            labels = range(first_label, first_label + len(new_rows))
+            self._dataframe = pd.concat(
+                [self._dataframe, pd.DataFrame(list(new_rows.values()), index=labels)]
+            )
+            index.update(zip(new_rows.keys(), labels))
+        return changed
 
     def delete_rows_by_indexes(self, indexes):
         """Elimina filas por índices"""
-        self.dataframe.drop(indexes, inplace=True)
-        self.dataframe.reset_index(drop=True, inplace=True)
+        self.delete_quotes(self.dataframe.loc[indexes, "Quote Number"].astype(str).tolist())
+
+    def delete_quotes(self, quote_numbers):
+        """Elimina las cotizaciones indicadas y registra su eliminación como cambio pendiente."""
+        mask = self.dataframe["Quote Number"].astype(str).isin(quote_numbers)
+        for quote_number in self.dataframe.loc[mask, "Quote Number"]:
+            self._pending_changes[quote_number] = {"op": "delete", "row": {"Quote Number": quote_number}}
+        self.dataframe = self.dataframe[~mask].reset_index(drop=True)
+
+    def save_changes(self):
+        """
+        Persiste solo los cambios pendientes (altas, modificaciones y bajas)
+        agregándolos al diario del CSV en una sola escritura.
+        """
+        changes = list(self._pending_changes.values())
+        for change in changes:
+            row = change["row"]
+            # La fecha se guarda como texto, no como datetime
+            if "Quote Effective Date" in row:
+                row["Quote Effective Date"] = _date_as_text(row["Quote Effective Date"])
+        self.journal.append(changes)
+        self._pending_changes = {}
 
     def save_to_csv(self):
         """Guarda el DataFrame al archivo CSV"""
@@ -112,7 +348,9 @@ class QuoteExtractorService:
         except Exception as e:
             print("[WARN] No se pudo ordenar por fecha:", e)
 
-        self.dataframe.to_csv(self.CSV_PATH, index=False)
+        # Reescritura completa y atómica; el diario queda vacío
+        self.journal.compact(self.dataframe)
+        self._pending_changes = {}
 
     def get_columns(self):
         """Retorna las columnas del DataFrame o las columnas por defecto"""
@@ -167,4 +405,5 @@ class SouthZoneQuoteExtractorService(QuoteExtractorService):
         except Exception as e:
             print(f"[WARN] No se pudo ordenar por fecha para {self.line_name}:", e)
 
-        self.dataframe.to_csv(self.CSV_PATH, index=False)
\ No newline at end of file
+        self.journal.compact(self.dataframe)
+        self._pending_changes = {}
\ No newline at end of file
@@ -61,6 +61,25 @@ class ScheduleWithCategorizerService(BasePlanningService):
             scheduled_total = cat1 + cat2 + cat3
             self.dataframe.at[row_idx, "Scheduled Activities"] = scheduled_total
 
+    def _post_update_rows(self, months):
+        """Recalcula Scheduled Activities de todos los meses indicados en una sola operación."""
+        mask = self.dataframe["Month"].isin(months)
+        categories = self.dataframe.loc[mask, ["Category 1", "Category 2", "Category 3"]]
+        categories = categories.apply(pd.to_numeric, errors="coerce").fillna(0).astype(int)
+        self.dataframe.loc[mask, "Scheduled Activities"] = categories.sum(axis=1)
+
+    def calculate_forecasts(self, months, cat1_value, cat2_value, cat3_value) -> pd.DataFrame:
+        """
+        Calcula el Forecast de varios meses a partir de las cantidades por categoría.
+
+        Returns:
+            pd.DataFrame: Columnas 'Month' y 'Forecast', listo para update_rows.
+        """
+        rows = self.dataframe[self.dataframe["Month"].isin(months)]
+        categories = rows[["Category 1", "Category 2", "Category 3"]]
+        categories = categories.apply(pd.to_numeric, errors="coerce").fillna(0).astype(int)
+        forecast = categories.mul([cat1_value, cat2_value, cat3_value], axis=1).sum(axis=1).round(2)
+        return pd.DataFrame({"Month": rows["Month"].to_numpy(), "Forecast": forecast.to_numpy()})
     
     def update_forecast(self, month, cat1_value, cat2_value, cat3_value):
         """Actualiza el forecast para un mes específico usando los valores de cada categoría."""
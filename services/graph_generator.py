@@ -1,13 +1,16 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
 from datetime import datetime
-from matplotlib.patches import FancyBboxPatch  # Asegúrate de tenerlo importado arriba
+from utils.capabilities import require
 from utils.dates import get_all_months
 
 
 # Define the function as requested
 def generate_budget_graph_als(forecast, budget_data, activities_data, capacity_df, opex_budget):
+    # matplotlib se importa recién al dibujar el primer gráfico
+    plt = require("matplotlib")
+    from matplotlib.patches import FancyBboxPatch
+
     all_months = pd.DataFrame({
         "month": ["January", "February", "March", "April", "May", "June",
                 "July", "August", "September", "October", "November", "December"]
@@ -226,6 +229,10 @@ def generate_budget_graph_als(forecast, budget_data, activities_data, capacity_d
     return fig
 
 def create_budget_forecast_graph(forecast, budget_data, plan_data, activities_data, title, capacity_data=None):
+    # matplotlib se importa recién al dibujar el primer gráfico
+    plt = require("matplotlib")
+    from matplotlib.patches import FancyBboxPatch
+
     all_months = pd.DataFrame({"MONTH": get_all_months()})
 
     forecast.columns = forecast.columns.str.upper()
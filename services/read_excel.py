@@ -1,7 +1,9 @@
 import pandas as pd
+from utils.change_journal import read_journaled_csv
 from services.field_lines_services.anual_pta_loader import AnnualPTALoader
+from services.field_lines_services.approved_budget_activities_service import ApprovedBudgetActivitiesService
 from services.field_lines_services.manual_planning_service import ManualPlanningService
-from utils.file_manager import get_field_approved_budget_activities_from_file, get_planned_activities_catalog_path
+from utils.file_manager import get_planned_activities_catalog_path
 
 def get_data_from_excel(file_path, sheet_name):
     try:
@@ -15,9 +17,18 @@ def get_data_from_excel(file_path, sheet_name):
         print(f"Error al leer el archivo: {e}")
         return None
     
-def get_data_from_csv(file_path):
+def get_data_from_csv(file_path, key_columns=None):
+    """
+    Lee un CSV de cotizaciones o actividades programadas.
+
+    Con key_columns se aplican también los cambios pendientes del diario del
+    archivo (ver utils.change_journal).
+    """
     try:
-        df = pd.read_csv(file_path, encoding='utf-8')
+        if key_columns:
+            df = read_journaled_csv(file_path, key_columns, encoding='utf-8')
+        else:
+            df = pd.read_csv(file_path, encoding='utf-8')
         if 'Net Total (USD)' in df.columns:
             df['Net Total (USD)'] = (
                 df['Net Total (USD)']
@@ -45,7 +56,8 @@ def get_plan_df_by_line(line_name):
     return service.get_dataframe()  # Devuelve un DataFrame con la distribución de actividades planeadas
     
 def get_field_approved_budget_activities_from_csv():
-    return pd.read_csv(get_field_approved_budget_activities_from_file(), encoding='utf-8')
+    """Presupuesto aprobado con los cambios del diario, o desde el almacén SQLite si está habilitado."""
+    return ApprovedBudgetActivitiesService.get_reference_table().dataframe.copy()
 
 def get_rig_catalog_from_data_frame_from_csv():
     df = pd.read_csv(get_planned_activities_catalog_path(), encoding='utf-8')
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import pandas as pd
+
+from utils.change_journal import ChangeJournal, read_journaled_csv
+
+KEYS = ["line_name", "year"]
+
+
+class ChangeJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "approved.csv")
+        pd.DataFrame(columns=["line_name", "year", "budget"]).to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        return read_journaled_csv(self.csv_path, KEYS)
+
+    def test_replay_applies_upserts_and_deletes(self):
+        journal = ChangeJournal(self.csv_path, KEYS)
+        journal.upsert({"line_name": "A", "year": 2025, "budget": 1})
+        journal.upsert({"line_name": "B", "year": 2025, "budget": 2})
+        journal.upsert({"line_name": "A", "year": 2025, "budget": 3})
+        journal.delete([{"line_name": "B", "year": 2025}])
+
+        df = self.read()
+        self.assertEqual(df.to_dict(orient="records"), [{"line_name": "A", "year": 2025, "budget": 3}])
+
+    def test_concurrent_append_and_compact_keep_every_entry(self):
+        writer = ChangeJournal(self.csv_path, KEYS)
+        compactor = ChangeJournal(self.csv_path, KEYS)
+        done = threading.Event()
+
+        def append_rows():
+            for n in range(400):
+                writer.upsert({"line_name": f"L{n}", "year": 2025, "budget": n})
+            done.set()
+
+        def compact_repeatedly():
+            while not done.is_set():
+                compactor.compact()
+
+        threads = [threading.Thread(target=append_rows), threading.Thread(target=compact_repeatedly)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        compactor.compact()
+
+        df = pd.read_csv(self.csv_path)
+        self.assertFalse(compactor.has_pending_changes)
+        self.assertEqual(sorted(df["budget"]), list(range(400)))
+
+    def test_compact_with_dataframe_keeps_changes_from_other_instances(self):
+        owner = ChangeJournal(self.csv_path, KEYS)
+        owner_df = owner.replay(pd.read_csv(self.csv_path))
+        other = ChangeJournal(self.csv_path, KEYS)
+        other.upsert({"line_name": "B", "year": 2025, "budget": 2})
+
+        owner_df = pd.concat([owner_df, pd.DataFrame([{"line_name": "A", "year": 2025, "budget": 1}])], ignore_index=True)
+        owner.compact(owner_df)
+
+        df = pd.read_csv(self.csv_path).sort_values("line_name")
+        self.assertEqual(df["line_name"].tolist(), ["A", "B"])
+
+    def test_compact_with_dataframe_after_other_compaction(self):
+        owner = ChangeJournal(self.csv_path, KEYS)
+        owner_df = owner.replay(pd.read_csv(self.csv_path))
+        other = ChangeJournal(self.csv_path, KEYS)
+        other.upsert({"line_name": "B", "year": 2025, "budget": 2})
+        other.compact()
+
+        owner_df.loc[len(owner_df)] = {"line_name": "A", "year": 2025, "budget": 1}
+        owner.compact(owner_df)
+
+        df = pd.read_csv(self.csv_path).sort_values("line_name")
+        self.assertEqual(df["line_name"].tolist(), ["A", "B"])
+
+    def test_compact_with_dataframe_keeps_own_in_memory_edits(self):
+        owner = ChangeJournal(self.csv_path, KEYS)
+        owner.upsert({"line_name": "A", "year": 2025, "budget": 1})
+        owner_df = owner.replay(pd.read_csv(self.csv_path))
+
+        owner_df.loc[owner_df["line_name"] == "A", "budget"] = 5
+        owner.compact(owner_df)
+
+        self.assertEqual(pd.read_csv(self.csv_path)["budget"].tolist(), [5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from services.field_lines_services.executed_cost_categorizer import (
+    build_category_table, categorize_costs, categorize_executed_activities,
+)
+
+THRESHOLDS = (15000, 30000, 60000)
+LINE = "ITEM 49 Slick Line"
+
+
+def scalar_category(value, categoria_1, categoria_2, categoria_3):
+    """Regla de SlickAndBacheoReport.clasificar_valor_servicio, valor por valor."""
+    if pd.isna(value) or value == 0:
+        return 0
+    if value <= categoria_1:
+        return 1
+    if value <= categoria_2:
+        return 2
+    if value <= categoria_3:
+        return 3
+    return 4
+
+
+class CategorizeCostsTest(unittest.TestCase):
+    def test_matches_the_scalar_rule_including_boundaries(self):
+        costs = [None, np.nan, 0, -5, 1, 15000, 15000.01, 30000, 45000, 60000, 60000.5, 1e9, "20000", "n/a"]
+        expected = [scalar_category(pd.to_numeric(cost, errors="coerce"), *THRESHOLDS) for cost in costs]
+        self.assertEqual(categorize_costs(costs, *THRESHOLDS).tolist(), expected)
+
+    def test_random_costs(self):
+        costs = np.random.default_rng(1).uniform(0, 90000, 1000).round(-2)
+        expected = [scalar_category(cost, *THRESHOLDS) for cost in costs]
+        self.assertEqual(categorize_costs(costs, *THRESHOLDS).tolist(), expected)
+
+
+class CategorizeExecutedActivitiesTest(unittest.TestCase):
+    def activities(self):
+        return pd.DataFrame({
+            "Month": ["January", "January", "February", "February"],
+            f"{LINE}_Servicios": [10000, np.nan, 20000, 50000],
+            f"{LINE}_Productos": [10000, 5000, np.nan, 20000],
+        })
+
+    def test_total_cost_adds_services_and_products(self):
+        df = categorize_executed_activities(self.activities(), LINE, THRESHOLDS)
+        self.assertEqual(df["Costo_Total"].tolist(), [20000, 5000, 20000, 70000])
+        self.assertEqual(df["Categoria_Total"].tolist(), [2, 1, 2, 4])
+
+    def test_services_only_ignores_products(self):
+        df = categorize_executed_activities(self.activities(), LINE, THRESHOLDS, services_only=True)
+        self.assertNotIn("Costo_Total", df.columns)
+        self.assertEqual(df["Categoria_Total"].tolist(), [1, 0, 2, 3])
+
+    def test_missing_services_column_raises(self):
+        with self.assertRaises(ValueError):
+            categorize_executed_activities(pd.DataFrame({"Month": ["January"]}), LINE, THRESHOLDS)
+
+    def test_category_table_counts_and_sums_per_line_and_month(self):
+        df = categorize_executed_activities(self.activities(), LINE, THRESHOLDS)
+        df["Line"] = LINE
+        other = df.copy()
+        other["Line"] = "ITEM 80 Bacheo"
+
+        table = build_category_table([df, None, pd.DataFrame(), other])
+
+        self.assertEqual(list(table.columns), ["Line", "Month", "Category", "Activities", "Cost"])
+        rows = table[(table["Line"] == LINE) & (table["Month"] == "January")].set_index("Category")
+        self.assertEqual(rows["Activities"].to_dict(), {2: 1, 1: 1})
+        self.assertEqual(rows["Cost"].to_dict(), {2: 20000, 1: 5000})
+        self.assertEqual(len(table), 2 * 4)
+
+    def test_empty_category_table(self):
+        table = build_category_table([])
+        self.assertTrue(table.empty)
+        self.assertEqual(list(table.columns), ["Line", "Month", "Category", "Activities", "Cost"])
+
+
+if __name__ == "__main__":
+    unittest.main()
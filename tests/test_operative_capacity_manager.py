@@ -0,0 +1,123 @@
+import math
+import random
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from logic.operative_capacity_manager import OperativeCapacityManager
+from utils.dates import get_days_in_months, get_month_number
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+RESULT_COLUMNS = ["Días Operativos", "Total Días OPEX", "Numero tentativo de pozos OPEX"]
+
+
+def legacy_recalculate(df, days_avg):
+    """Cálculo fila por fila anterior a la versión vectorizada, como referencia."""
+    dias_por_mes = get_days_in_months(datetime.now().year)
+    pozos_truncados = []
+    decimales = []
+    total_real = 0.0
+    for idx, row in df.iterrows():
+        mes = row["Mes"]
+        mes_num = get_month_number(mes) if isinstance(mes, str) else mes
+        if mes_num not in dias_por_mes:
+            pozos_truncados.append(0)
+            decimales.append(0)
+            continue
+        dias_operativos_base = dias_por_mes[mes_num] * row["Taladros"]
+        dias_4to_opex = row.get("Días OPEX 4to Rig", 0)
+        df.at[idx, "Días Operativos"] = dias_operativos_base + dias_4to_opex + row.get("Días CAPEX 4to Rig", 0)
+        total_opex = dias_operativos_base - row["Días CAPEX"] - row["Días Certificación"] + dias_4to_opex
+        df.at[idx, "Total Días OPEX"] = total_opex
+        pozo_exacto = total_opex / days_avg if total_opex > 0 else 0
+        truncado = math.floor(pozo_exacto)
+        pozos_truncados.append(truncado)
+        decimales.append(pozo_exacto - truncado)
+        total_real += pozo_exacto
+    sobrante_pozo = round(total_real) - sum(pozos_truncados)
+    indices_ordenados = sorted(range(len(decimales)), key=lambda i: decimales[i], reverse=True)
+    for i in range(sobrante_pozo):
+        pozos_truncados[indices_ordenados[i]] += 1
+    for idx, val in enumerate(pozos_truncados):
+        df.at[idx, "Numero tentativo de pozos OPEX"] = val
+    return df
+
+
+def capacity_table(rng, months):
+    return pd.DataFrame({
+        "Mes": months,
+        "Taladros": [rng.randint(0, 4) for _ in months],
+        "Días CAPEX": [rng.randint(0, 60) for _ in months],
+        "Días Certificación": [rng.randint(0, 10) for _ in months],
+        "Días Operativos": [-1] * len(months),
+        "Total Días OPEX": [-1] * len(months),
+        "Numero tentativo de pozos OPEX": [-1] * len(months),
+        "Días OPEX 4to Rig": [rng.randint(0, 31) for _ in months],
+        "Días CAPEX 4to Rig": [rng.randint(0, 31) for _ in months],
+    })
+
+
+class RecalculateTest(unittest.TestCase):
+    def manager(self, days_avg):
+        manager = OperativeCapacityManager.__new__(OperativeCapacityManager)
+        manager.days_avg = days_avg
+        return manager
+
+    def assert_same_as_legacy(self, df, days_avg):
+        expected = legacy_recalculate(df.copy(), days_avg)
+        actual = self.manager(days_avg)._recalculate(df.copy())
+        for column in RESULT_COLUMNS:
+            self.assertEqual(
+                actual[column].astype(float).tolist(), expected[column].astype(float).tolist(),
+                msg=f"{column} con days_avg={days_avg}\n{df}",
+            )
+
+    def test_matches_row_by_row_logic_for_random_tables(self):
+        rng = random.Random(11)
+        for days_avg in (13.0, 11.9, 7.3, 30.0):
+            for _ in range(50):
+                self.assert_same_as_legacy(capacity_table(rng, MONTHS), days_avg)
+
+    def test_unknown_months_keep_their_values_and_get_no_wells(self):
+        rng = random.Random(3)
+        months = ["January", "Total", "March", 13, "Invalid month", "June", 7]
+        for days_avg in (13.0, 9.5):
+            for _ in range(20):
+                self.assert_same_as_legacy(capacity_table(rng, months), days_avg)
+        df = self.manager(13.0)._recalculate(capacity_table(rng, months))
+        self.assertEqual(df.loc[1, "Días Operativos"], -1)
+        self.assertEqual(df.loc[1, "Numero tentativo de pozos OPEX"], 0)
+
+    def test_surplus_goes_to_the_largest_decimals_first(self):
+        df = pd.DataFrame({
+            "Mes": ["January", "February", "March"],
+            "Taladros": [1, 1, 1],
+            "Días CAPEX": [31 - 13 - 6, 28 - 13 - 7, 31 - 13 - 4],
+            "Días Certificación": [0, 0, 0],
+            "Días Operativos": [0, 0, 0],
+            "Total Días OPEX": [0, 0, 0],
+            "Numero tentativo de pozos OPEX": [0, 0, 0],
+            "Días OPEX 4to Rig": [0, 0, 0],
+            "Días CAPEX 4to Rig": [0, 0, 0],
+        })
+        if get_days_in_months(datetime.now().year)[2] == 29:
+            df.loc[1, "Días CAPEX"] += 1
+        # 19/13, 20/13 y 17/13: 1 pozo truncado por mes y 1 de sobrante para febrero
+        result = self.manager(13.0)._recalculate(df.copy())
+        self.assertEqual(result["Numero tentativo de pozos OPEX"].tolist(), [1, 2, 1])
+        self.assert_same_as_legacy(df, 13.0)
+
+    def test_negative_opex_days_count_as_zero_wells(self):
+        rng = random.Random(5)
+        df = capacity_table(rng, MONTHS)
+        df["Días CAPEX"] = 200
+        self.assert_same_as_legacy(df, 13.0)
+        self.assertEqual(self.manager(13.0)._recalculate(df)["Numero tentativo de pozos OPEX"].sum(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
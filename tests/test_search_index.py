@@ -0,0 +1,55 @@
+import random
+import time
+import unittest
+
+import numpy as np
+
+from utils.search_index import NGramIndex
+
+WELL_COUNT = 10000
+KEYSTROKE_BUDGET_SECONDS = 0.05
+
+
+def synthetic_wells(count):
+    rng = random.Random(7)
+    prefixes = ["SHUSHUFINDI", "AGUARICO", "DRAGO", "SACHA", "LIBERTADOR", "CONDORAZO", "VHR", "PICHINCHA"]
+    return [f"{rng.choice(prefixes)}-{rng.randint(1, 999):03d}{rng.choice(['', 'D', 'H', 'S1'])}" for _ in range(count)]
+
+
+class NGramIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.wells = synthetic_wells(WELL_COUNT)
+        cls.index = NGramIndex(cls.wells)
+
+    def naive(self, text):
+        text = text.strip().upper()
+        return np.array([i for i, well in enumerate(self.wells) if text in well], dtype=int)
+
+    def test_search_matches_substring_filter(self):
+        index = NGramIndex(self.wells)
+        for text in ["", "a", "sh", "dra", "drago-1", "CHA-0", "  sacha  ", "zzz", "-00", "H"]:
+            np.testing.assert_array_equal(index.search(text), self.naive(text), err_msg=text)
+
+    def test_incremental_typing_and_backspace(self):
+        index = NGramIndex(self.wells)
+        for text in ["S", "SA", "SAC", "SACH", "SACHA", "SACHA-", "SACHA-1", "SACHA-", "SACH", "LIB"]:
+            np.testing.assert_array_equal(index.search(text), self.naive(text), err_msg=text)
+
+    def test_prefix(self):
+        expected = np.array([i for i, well in enumerate(self.wells) if well.startswith("DRAGO-1")], dtype=int)
+        np.testing.assert_array_equal(self.index.prefix("drago-1"), expected)
+
+    def test_each_keystroke_over_10k_wells_is_under_50_ms(self):
+        index = NGramIndex(self.wells)
+        slowest = 0.0
+        for query in ["SHUSHUFINDI-01", "CONDORAZO-5", "PICH", "VHR-999S1"]:
+            for end in range(1, len(query) + 1):
+                start = time.perf_counter()
+                index.search(query[:end])
+                slowest = max(slowest, time.perf_counter() - start)
+        self.assertLess(slowest, KEYSTROKE_BUDGET_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
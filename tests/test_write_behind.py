@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from utils.write_behind import WriteBehindQueue, write_file_atomic
+
+
+def text_writer(text):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return write
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+class WriteFileAtomicTest(unittest.TestCase):
+    def test_failed_write_keeps_previous_file_and_removes_temp(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "data.csv")
+            write_file_atomic(path, text_writer("old"))
+
+            def broken(tmp_path):
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write("half")
+                raise OSError("disk full")
+
+            with self.assertRaises(OSError):
+                write_file_atomic(path, broken)
+            self.assertEqual(read(path), "old")
+            self.assertEqual(os.listdir(folder), ["data.csv"])
+
+
+class WriteBehindQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "plan.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_saves_of_the_same_file_are_coalesced(self):
+        queue = WriteBehindQueue(delay=0.2)
+        calls = []
+
+        def writer(text):
+            def write(tmp_path):
+                calls.append(text)
+                text_writer(text)(tmp_path)
+            return write
+
+        for n in range(5):
+            queue.submit(self.path, writer(str(n)), data=n)
+        self.assertEqual(queue.pending_data(self.path), 4)
+        self.assertEqual(queue.generation(self.path), 5)
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertEqual(calls, ["4"])
+        self.assertEqual(read(self.path), "4")
+        self.assertIsNone(queue.pending_data(self.path))
+        self.assertFalse(queue.has_pending)
+
+    def test_wait_for_writes_only_that_path_right_away(self):
+        queue = WriteBehindQueue(delay=60)
+        other = os.path.join(self.tmp.name, "other.csv")
+        queue.submit(self.path, text_writer("plan"))
+        queue.submit(other, text_writer("other"))
+
+        self.assertTrue(queue.wait_for(self.path, timeout=5))
+        self.assertEqual(read(self.path), "plan")
+        self.assertFalse(os.path.exists(other))
+        self.assertIsNone(queue.last_error(self.path))
+        self.assertTrue(queue.flush(timeout=5))
+
+    def test_failed_write_is_reported_and_cleared_by_the_next_save(self):
+        queue = WriteBehindQueue(delay=0)
+        errors = []
+        queue.add_listener(lambda pending, current: errors.append(dict(current)))
+
+        def broken(tmp_path):
+            raise ValueError("no se pudo escribir")
+
+        queue.submit(self.path, broken)
+        self.assertTrue(queue.wait_for(self.path, timeout=5))
+        self.assertIsInstance(queue.last_error(self.path), ValueError)
+        self.assertIn(self.path, errors[-1])
+
+        queue.submit(self.path, text_writer("ok"))
+        self.assertTrue(queue.wait_for(self.path, timeout=5))
+        self.assertIsNone(queue.last_error(self.path))
+        self.assertEqual(read(self.path), "ok")
+
+    def test_wait_for_times_out_while_the_write_is_still_running(self):
+        queue = WriteBehindQueue(delay=0)
+        release = threading.Event()
+
+        def slow(tmp_path):
+            release.wait(5)
+            text_writer("done")(tmp_path)
+
+        queue.submit(self.path, slow)
+        self.assertFalse(queue.wait_for(self.path, timeout=0.2))
+        release.set()
+        self.assertTrue(queue.wait_for(self.path, timeout=5))
+        self.assertEqual(read(self.path), "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
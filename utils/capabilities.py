@@ -0,0 +1,133 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+
+# Importaciones que tardan más que esto se informan como lentas
+SLOW_IMPORT_SECONDS = 1.0
+
+# Dependencias pesadas que solo usan algunas funciones:
+# nombre -> (módulo a importar, paquete pip, función que lo necesita)
+OPTIONAL_DEPENDENCIES = {
+    "cognite": ("cognite.client", "cognite-sdk", "Actividades desde Cognite Data Fusion"),
+    "pyodbc": ("pyodbc", "pyodbc", "Consultas a SQL Server"),
+    "pdfplumber": ("pdfplumber", "pdfplumber", "Extracción de cotizaciones desde PDF"),
+    "matplotlib": ("matplotlib.pyplot", "matplotlib", "Gráficos de reportes"),
+    "pptx": ("pptx", "python-pptx", "Exportación a PowerPoint"),
+}
+
+_import_seconds = {}  # nombre -> segundos que tardó la primera importación
+_lock = threading.Lock()
+
+
+class MissingDependencyError(ImportError):
+    """Falta (o no se pudo importar) una dependencia opcional."""
+
+
+def is_available(name: str) -> bool:
+    """Indica si la dependencia está instalada, sin importarla."""
+    module_name = OPTIONAL_DEPENDENCIES[name][0]
+    if module_name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(module_name.split(".")[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def require(name: str):
+    """
+    Importa una dependencia opcional en el momento en que se usa.
+
+    La primera importación se cronometra; si tarda más de SLOW_IMPORT_SECONDS
+    se avisa por consola.
+
+    Args:
+        name (str): Clave de OPTIONAL_DEPENDENCIES, p. ej. 'pyodbc'.
+
+    Returns:
+        module: El módulo importado.
+
+    Raises:
+        MissingDependencyError: Si el paquete no está instalado o falla al importarse.
+    """
+    module_name, package, feature = OPTIONAL_DEPENDENCIES[name]
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    begin = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise MissingDependencyError(
+            f"{feature} requiere el paquete '{package}', que no está disponible: {e}"
+        ) from e
+    elapsed = time.perf_counter() - begin
+    with _lock:
+        _import_seconds.setdefault(name, elapsed)
+    if elapsed > SLOW_IMPORT_SECONDS:
+        print(f"⚠️ Importar {package} tardó {elapsed:.1f} s ({feature})")
+    return module
+
+
+def capability_report() -> list:
+    """
+    Estado de cada dependencia opcional.
+
+    Returns:
+        list: Un dict por dependencia con name, package, feature, available,
+              loaded (ya importada en esta sesión), import_seconds y slow.
+    """
+    rows = []
+    for name, (module_name, package, feature) in OPTIONAL_DEPENDENCIES.items():
+        seconds = _import_seconds.get(name)
+        rows.append({
+            "name": name,
+            "package": package,
+            "feature": feature,
+            "available": is_available(name),
+            "loaded": module_name in sys.modules,
+            "import_seconds": seconds,
+            "slow": seconds is not None and seconds > SLOW_IMPORT_SECONDS,
+        })
+    return rows
+
+
+def format_capability_report(rows=None) -> str:
+    """Texto del reporte de dependencias, una línea por dependencia."""
+    lines = []
+    for row in rows if rows is not None else capability_report():
+        if not row["available"]:
+            status = "❌ no instalado"
+        elif row["import_seconds"] is not None:
+            status = f"{'⚠️' if row['slow'] else '✅'} cargado en {row['import_seconds']:.2f} s"
+        elif row["loaded"]:
+            status = "✅ cargado"
+        else:
+            status = "✅ disponible (sin cargar)"
+        lines.append(f"{row['package']}: {status} — {row['feature']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Revisa las dependencias opcionales.
+
+    Uso: python -m utils.capabilities [--import]
+    Con --import además importa cada una y mide cuánto tarda.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if "--import" in argv:
+        for name in OPTIONAL_DEPENDENCIES:
+            if is_available(name):
+                try:
+                    require(name)
+                except MissingDependencyError as e:
+                    print(f"❌ {e}")
+    print(format_capability_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+import atexit
+import json
+import os
+import threading
+import uuid
+import weakref
+import pandas as pd
+from utils.reference_cache import file_version
+from utils.write_behind import write_file_atomic
+
+
+class ChangeJournal:
+    """
+    Diario de cambios append-only asociado a un CSV.
+
+    En lugar de reescribir el CSV completo por cada modificación, los servicios
+    agregan al diario (archivo '<csv>.journal', una línea JSON por cambio) solo
+    las filas que cambiaron. Al cargar, el CSV se lee como snapshot y se le
+    aplican los cambios del diario en orden.
+
+    Cuando el diario crece se compacta en segundo plano: el snapshot y el diario
+    se combinan, el resultado se escribe en un archivo temporal, se reemplaza el
+    CSV de forma atómica y se vacía el diario. Los diarios pendientes también se
+    compactan al cerrar la aplicación. La compactación solo usa lo ya persistido,
+    nunca el estado en memoria de los servicios.
+
+    Todas las instancias creadas para un mismo CSV comparten un único candado y
+    el registro de los cambios escritos, de modo que agregar y compactar desde
+    instancias distintas no pierde cambios.
+
+    Una línea incompleta (por ejemplo, por un corte durante la escritura) se
+    ignora al reproducir el diario.
+    """
+    COMPACT_THRESHOLD = 200
+
+    def __init__(self, csv_path: str, key_columns: list):
+        """
+        Args:
+            csv_path (str): Ruta del CSV que actúa como snapshot.
+            key_columns (list): Columnas que identifican una fila.
+        """
+        self.csv_path = csv_path
+        self.journal_path = f"{csv_path}.journal"
+        self.key_columns = list(key_columns)
+        self._file = _journal_file(self.journal_path)
+        self._lock = self._file.lock
+        with self._lock:
+            # Lo que ya está en el diario forma parte del estado que el dueño de
+            # esta instancia acaba de cargar
+            self._generation = self._file.generation
+            self._seen = set(self._file.entry_ids)
+        _journals.add(self)
+
+    def replay(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Aplica sobre df los cambios registrados en el diario y devuelve el resultado."""
+        with self._lock:
+            entries = self._read_entries()
+            self._file.entry_ids = [_entry_id(entry) for entry in entries]
+            self._generation = self._file.generation
+            self._seen = set(self._file.entry_ids)
+        return self._apply(df, entries)
+
+    def append(self, changes: list):
+        """
+        Agrega cambios al diario con una sola escritura.
+
+        Args:
+            changes (list): Diccionarios {"op": "upsert" | "delete" | "insert", "row": {...}}.
+                            En 'delete' basta con incluir las columnas clave; 'insert'
+                            agrega la fila sin buscar coincidencias.
+        """
+        if not changes:
+            return
+        changes = [{"id": uuid.uuid4().hex, **change} for change in changes]
+        payload = "".join(json.dumps(change, default=_to_builtin) + "\n" for change in changes)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+            with open(self.journal_path, "a+", encoding="utf-8") as journal:
+                # Si la última escritura quedó cortada, empezamos en una línea nueva
+                if journal.tell() > 0:
+                    journal.seek(journal.tell() - 1)
+                    if journal.read(1) != "\n":
+                        payload = "\n" + payload
+                journal.write(payload)
+                journal.flush()
+                os.fsync(journal.fileno())
+            ids = [change["id"] for change in changes]
+            self._file.entry_ids.extend(ids)
+            self._seen.update(ids)
+            pending = len(self._file.entry_ids)
+        if pending >= self.COMPACT_THRESHOLD:
+            self.compact_in_background()
+
+    def upsert(self, row: dict):
+        """Registra una fila nueva o modificada."""
+        self.append([{"op": "upsert", "row": row}])
+
+    def delete(self, keys: list):
+        """Registra la eliminación de las filas identificadas por cada diccionario de claves."""
+        self.append([{"op": "delete", "row": key} for key in keys])
+
+    def replace_groups(self, keys: list, rows: list):
+        """
+        Reemplaza grupos completos de filas: borra las que coinciden con cada diccionario
+        de claves y agrega rows tal cual, sin buscar coincidencias (varias filas pueden
+        compartir las claves).
+        """
+        self.append([{"op": "delete", "row": key} for key in keys] + [{"op": "insert", "row": row} for row in rows])
+
+    def compact(self, df: pd.DataFrame = None):
+        """
+        Escribe el snapshot completo y vacía el diario.
+
+        Args:
+            df (pd.DataFrame, optional): Estado en memoria del servicio dueño de esta
+                instancia. Antes de guardarlo se le aplican los cambios que otras
+                instancias escribieron y que esta todavía no había visto. Por defecto
+                se combina el CSV actual con el diario.
+        """
+        with self._lock:
+            entries = self._read_entries()
+            if df is None:
+                if not self.has_pending_changes:
+                    return
+                snapshot = pd.read_csv(self.csv_path) if os.path.exists(self.csv_path) else pd.DataFrame()
+                df = self._apply(snapshot, entries)
+            else:
+                df = self._apply(df, self._unseen_entries(entries))
+            write_csv_atomic(df, self.csv_path)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self._file.absorb(entries)
+
+    def compact_in_background(self):
+        """Compacta en un hilo aparte; si ya hay una compactación en curso no hace nada."""
+        with self._lock:
+            if self._file.compacting:
+                return
+            self._file.compacting = True
+        threading.Thread(target=self._compact_safely, name="journal-compaction", daemon=True).start()
+
+    def version(self) -> tuple:
+        """Versión conjunta del snapshot y del diario; cambia con cualquier escritura."""
+        return file_version(self.csv_path, self.journal_path)
+
+    @property
+    def has_pending_changes(self) -> bool:
+        return os.path.exists(self.journal_path)
+
+    def _compact_safely(self):
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"⚠️ No se pudo compactar el diario '{self.journal_path}': {e}")
+        finally:
+            with self._lock:
+                self._file.compacting = False
+
+    def _unseen_entries(self, entries: list) -> list:
+        """
+        Cambios que el estado en memoria de esta instancia no incluye: los escritos por
+        otras instancias en el diario actual y los que otra compactación ya pasó al
+        snapshot después de que esta instancia cargó sus datos.
+        """
+        absorbed = [entry for generation, entry in self._file.absorbed if generation > self._generation]
+        return [entry for entry in absorbed + entries if _entry_id(entry) not in self._seen]
+
+    def _apply(self, df: pd.DataFrame, entries: list) -> pd.DataFrame:
+        inserts = []
+        for entry in entries:
+            row = entry.get("row", {})
+            if entry.get("op") == "insert":
+                # Las inserciones seguidas se agregan con una sola concatenación
+                inserts.append(row)
+                continue
+            df = self._insert(df, inserts)
+            inserts = []
+            if entry.get("op") == "delete":
+                df = df[~self._match(df, row)].reset_index(drop=True)
+            else:
+                df = self._upsert(df, row)
+        return self._insert(df, inserts)
+
+    @staticmethod
+    def _insert(df, rows):
+        if not rows:
+            return df
+        new_rows = pd.DataFrame(rows)
+        if df.empty:
+            return new_rows.reindex(columns=list(dict.fromkeys([*df.columns, *new_rows.columns])))
+        return pd.concat([df, new_rows], ignore_index=True)
+
+    def _read_entries(self) -> list:
+        if not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        with open(self.journal_path, encoding="utf-8") as journal:
+            for line in journal:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+
+    def _match(self, df, row):
+        mask = pd.Series(True, index=df.index)
+        for column in self.key_columns:
+            if column not in df.columns:
+                return pd.Series(False, index=df.index)
+            mask &= df[column].astype(str) == str(row.get(column))
+        return mask
+
+    def _upsert(self, df, row):
+        mask = self._match(df, row)
+        if mask.any():
+            for column, value in row.items():
+                if column not in df.columns:
+                    df[column] = None
+                df.loc[mask, column] = value
+            return df
+        return pd.concat([df, pd.DataFrame([row])], ignore_index=True)
+
+
+class _JournalFile:
+    """Estado compartido por todas las instancias de ChangeJournal de un mismo diario."""
+    ABSORBED_HISTORY = 1000
+
+    def __init__(self, journal_path: str):
+        self.lock = threading.RLock()
+        self.compacting = False
+        # Cada compactación abre una generación nueva del diario
+        self.generation = 0
+        self.entry_ids = []
+        # (generación resultante, cambio) de lo que las compactaciones pasaron al snapshot
+        self.absorbed = []
+        if os.path.exists(journal_path):
+            with open(journal_path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        self.entry_ids.append(_entry_id(json.loads(line)))
+                    except json.JSONDecodeError:
+                        continue
+
+    def absorb(self, entries: list):
+        """Registra una compactación que pasó entries al snapshot."""
+        self.generation += 1
+        self.absorbed.extend((self.generation, entry) for entry in entries)
+        del self.absorbed[:-self.ABSORBED_HISTORY]
+        self.entry_ids = []
+
+
+def _journal_file(journal_path: str) -> _JournalFile:
+    key = os.path.normcase(os.path.abspath(journal_path))
+    with _journal_files_lock:
+        if key not in _journal_files:
+            _journal_files[key] = _JournalFile(journal_path)
+        return _journal_files[key]
+
+
+def _entry_id(entry: dict) -> str:
+    """Identificador de un cambio; los diarios escritos antes de usar ids se identifican por su contenido."""
+    return entry.get("id") or json.dumps(entry, sort_keys=True, default=str)
+
+
+_journal_files = {}
+_journal_files_lock = threading.Lock()
+
+
+def read_journaled_csv(csv_path: str, key_columns: list, **read_kwargs) -> pd.DataFrame:
+    """
+    Lee un CSV aplicando los cambios pendientes de su diario.
+
+    Los lectores que no pasan por el servicio dueño del archivo deben usar esta
+    función en lugar de pd.read_csv: hasta la próxima compactación, los últimos
+    cambios guardados solo están en el diario.
+
+    Args:
+        csv_path (str): Ruta del CSV.
+        key_columns (list): Columnas clave con las que el servicio registra sus cambios.
+        **read_kwargs: Argumentos adicionales para pd.read_csv.
+
+    Returns:
+        pd.DataFrame: El contenido actual (vacío si no existen ni el CSV ni el diario).
+    """
+    df = pd.read_csv(csv_path, **read_kwargs) if os.path.exists(csv_path) else pd.DataFrame()
+    return ChangeJournal(csv_path, key_columns).replay(df)
+
+
+def write_csv_atomic(df: pd.DataFrame, path: str):
+    """Guarda df en path de forma atómica (archivo temporal + os.replace)."""
+    write_file_atomic(path, lambda tmp_path: df.to_csv(tmp_path, index=False))
+
+
+def _to_builtin(value):
+    """Convierte escalares de numpy y fechas de pandas a tipos serializables en JSON."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+_journals = weakref.WeakSet()
+
+
+@atexit.register
+def compact_all_journals():
+    """Compacta los diarios con cambios pendientes; se ejecuta al cerrar la aplicación."""
+    for journal in list(_journals):
+        if journal.has_pending_changes:
+            try:
+                journal.compact()
+            except Exception as e:
+                print(f"⚠️ No se pudo compactar el diario '{journal.journal_path}': {e}")
@@ -1,6 +1,7 @@
 import os
 import pandas as pd
 from utils.file_manager import get_comments_file_path, get_field_line_comments_file_path
+from utils.write_behind import get_write_behind_queue
 
 
 def load_comments() -> pd.DataFrame:
@@ -12,6 +13,9 @@ def load_comments() -> pd.DataFrame:
         Si el archivo no existe, retorna un DataFrame vacío con dichas columnas.
     """
     path = get_comments_file_path()
+    pending = get_write_behind_queue().pending_data(path)
+    if pending is not None:
+        return pending.copy()
     if os.path.exists(path):
         return pd.read_excel(path)
     else:
@@ -21,11 +25,15 @@ def save_comment(df: pd.DataFrame) -> None:
     """
     Guarda el DataFrame de comentarios en la ruta definida.
 
+    La escritura se encola en la cola de escritura diferida: se hace fuera del hilo
+    de la interfaz, de forma atómica, y los guardados seguidos se agrupan.
+
     Args:
         df (pd.DataFrame): DataFrame con los comentarios actualizados que se desea guardar.
     """
     path = get_comments_file_path()
-    df.to_excel(path, index=False)
+    snapshot = df.copy()
+    get_write_behind_queue().submit(path, lambda tmp_path: snapshot.to_excel(tmp_path, index=False), data=snapshot)
 
 
 def load_field_line_comments() -> pd.DataFrame:
@@ -33,6 +41,9 @@ def load_field_line_comments() -> pd.DataFrame:
     Carga los comentarios de líneas de campo desde el archivo CSV.
     """
     path = get_field_line_comments_file_path()
+    pending = get_write_behind_queue().pending_data(path)
+    if pending is not None:
+        return pending.copy()
     if os.path.exists(path):
         return pd.read_csv(path)
     else:
@@ -40,7 +51,9 @@ def load_field_line_comments() -> pd.DataFrame:
 
 def save_field_line_comment(df: pd.DataFrame) -> None:
     """
-    Guarda el DataFrame de comentarios de líneas de campo en el archivo CSV.
+    Guarda el DataFrame de comentarios de líneas de campo en el archivo CSV
+    mediante la cola de escritura diferida.
     """
     path = get_field_line_comments_file_path()
-    df.to_csv(path, index=False)
+    snapshot = df.copy()
+    get_write_behind_queue().submit(path, lambda tmp_path: snapshot.to_csv(tmp_path, index=False), data=snapshot)
@@ -0,0 +1,164 @@
+import importlib.util
+import os
+import re
+import sys
+import threading
+from datetime import datetime
+import pandas as pd
+from utils.write_behind import get_write_behind_queue
+
+# Variable de entorno que activa el diagnóstico al iniciar: "1"/"memory" guarda en
+# memoria; cualquier otra ruta se usa como carpeta de salida en Parquet.
+DIAGNOSTICS_ENV = "BUDGET_TOOL_DIAGNOSTICS"
+DEFAULT_OUTPUT_DIR = os.path.join("summary", "diagnostics")
+
+
+class DiagnosticsSink:
+    """
+    Receptor opcional de DataFrames intermedios para depuración.
+
+    Reemplaza las escrituras de libros Excel de depuración que se hacían durante
+    la generación de reportes. Está desactivado por defecto: capture() no hace
+    nada y no copia datos. Al activarlo, cada captura guarda una copia del
+    DataFrame en memoria (la última por nombre) y, si hay carpeta de salida,
+    la escribe como Parquet en la cola de escritura diferida.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.output_dir = None
+        self._frames = {}  # nombre -> (momento, DataFrame)
+        self._lock = threading.Lock()
+
+    def enable(self, output_dir: str = None):
+        """
+        Activa la captura.
+
+        Args:
+            output_dir (str, optional): Carpeta donde escribir cada captura en Parquet.
+                                        Si es None, las capturas solo quedan en memoria.
+        """
+        if output_dir and not _parquet_available():
+            print("⚠️ No hay motor Parquet (pyarrow o fastparquet); el diagnóstico quedará solo en memoria.")
+            output_dir = None
+        self.output_dir = output_dir
+        self.enabled = True
+
+    def disable(self):
+        """Desactiva la captura; lo ya capturado sigue disponible hasta clear()."""
+        self.enabled = False
+
+    def capture(self, name: str, df: pd.DataFrame):
+        """
+        Registra un DataFrame intermedio bajo name si el diagnóstico está activo.
+
+        Args:
+            name (str): Nombre de la captura, p. ej. 'als/merged'.
+            df (pd.DataFrame): Datos a capturar; se guarda una copia.
+        """
+        if not self.enabled or df is None:
+            return
+        snapshot = df.copy()
+        with self._lock:
+            self._frames[name] = (datetime.now(), snapshot)
+        if self.output_dir:
+            path = os.path.join(self.output_dir, f"{_safe_name(name)}.parquet")
+            get_write_behind_queue().submit(path, lambda tmp_path: _write_parquet(snapshot, tmp_path), snapshot)
+
+    def names(self) -> list:
+        """Nombres capturados, en orden de captura."""
+        with self._lock:
+            return list(self._frames)
+
+    def get(self, name: str) -> pd.DataFrame:
+        """Copia de la última captura de name, o None si no existe."""
+        with self._lock:
+            entry = self._frames.get(name)
+        return entry[1].copy() if entry else None
+
+    def summary(self) -> pd.DataFrame:
+        """Resumen de las capturas: nombre, momento, filas y columnas."""
+        with self._lock:
+            rows = [
+                {"Name": name, "Captured": captured, "Rows": len(df), "Columns": len(df.columns)}
+                for name, (captured, df) in self._frames.items()
+            ]
+        return pd.DataFrame(rows, columns=["Name", "Captured", "Rows", "Columns"])
+
+    def clear(self):
+        """Descarta las capturas en memoria."""
+        with self._lock:
+            self._frames.clear()
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "frame"
+
+
+def _parquet_available() -> bool:
+    return any(importlib.util.find_spec(engine) is not None for engine in ("pyarrow", "fastparquet"))
+
+
+def _write_parquet(df: pd.DataFrame, path: str):
+    # Parquet exige nombres de columna de texto
+    df = df.copy()
+    df.columns = [str(col) for col in df.columns]
+    df.to_parquet(path)
+
+
+_sink = DiagnosticsSink()
+
+
+def get_diagnostics_sink() -> DiagnosticsSink:
+    """Devuelve el receptor de diagnóstico compartido por toda la aplicación."""
+    return _sink
+
+
+def capture_frame(name: str, df: pd.DataFrame):
+    """Atajo para get_diagnostics_sink().capture(name, df)."""
+    _sink.capture(name, df)
+
+
+def configure_from_environment():
+    """Activa el diagnóstico si la variable BUDGET_TOOL_DIAGNOSTICS está definida."""
+    value = os.environ.get(DIAGNOSTICS_ENV, "").strip()
+    if not value or value.lower() in ("0", "false", "off"):
+        return
+    if value.lower() in ("1", "true", "on", "memory"):
+        _sink.enable()
+    else:
+        _sink.enable(value)
+
+
+configure_from_environment()
+
+
+def main(argv=None):
+    """
+    Muestra las capturas escritas en una carpeta de diagnóstico.
+
+    Uso: python -m utils.diagnostics [carpeta] [nombre]
+    Sin nombre lista las capturas; con nombre imprime sus primeras filas.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    folder = argv[0] if argv else DEFAULT_OUTPUT_DIR
+    if not os.path.isdir(folder):
+        print(f"❌ La carpeta de diagnóstico '{folder}' no existe.")
+        return 1
+    files = sorted(f for f in os.listdir(folder) if f.endswith(".parquet"))
+    if len(argv) > 1:
+        target = f"{_safe_name(argv[1])}.parquet"
+        if target not in files:
+            print(f"❌ No existe la captura '{argv[1]}' en '{folder}'.")
+            return 1
+        df = pd.read_parquet(os.path.join(folder, target))
+        print(f"{argv[1]}: {len(df)} filas x {len(df.columns)} columnas")
+        print(df.head(50).to_string())
+        return 0
+    for name in files:
+        df = pd.read_parquet(os.path.join(folder, name))
+        print(f"{name[:-len('.parquet')]}: {len(df)} filas x {len(df.columns)} columnas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,3 +37,28 @@ def add_slide_to_presentation(prs, graph, deviations_text, comments_text, title=
     p.font.size = Pt(15)
     p.font.name = "Arial Narrow"
     frame.word_wrap = True
+
+
+def add_table_slide_to_presentation(prs, df, title='Comparativo'):
+    """Agrega una diapositiva con el contenido de un DataFrame como tabla."""
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+
+    title_box = slide.shapes.title
+    title_box.text = title
+    title_paragraph = title_box.text_frame.paragraphs[0]
+    title_paragraph.font.size = Pt(44)
+    title_paragraph.font.name = "Arial Narrow"
+    title_paragraph.font.color.rgb = RGBColor(0x00, 0x70, 0x64)
+
+    rows, cols = len(df) + 1, len(df.columns)
+    table = slide.shapes.add_table(rows, cols, Inches(0.5), Inches(1.5), Inches(15), Inches(0.3) * rows).table
+    for col_idx, column in enumerate(df.columns):
+        table.cell(0, col_idx).text = str(column)
+    for row_idx, row in enumerate(df.itertuples(index=False), start=1):
+        for col_idx, value in enumerate(row):
+            table.cell(row_idx, col_idx).text = f"{value:,.2f}" if isinstance(value, float) else str(value)
+    for row_cells in table.rows:
+        for cell in row_cells.cells:
+            for paragraph in cell.text_frame.paragraphs:
+                paragraph.font.size = Pt(11)
+                paragraph.font.name = "Arial Narrow"
@@ -29,9 +29,7 @@ def get_user_base_dir():
 
 def get_user_base_dir_rig(): 
     usuario = os.getlogin()
-    now = datetime.now()
-    # Si es enero, el presupuesto corresponde al año anterior.
-    budget_year = now.year - 1 if now.month == 1 else now.year
+    budget_year = get_budget_year()
     
     base_1 = fr"C:/Users/{usuario}/OneDrive - SLB/SHAYA _ INGENIERÍA _ CAMPO - 00. BUDGET" #Socializar esta ruta
     # C:\Users\rgalarraga\OneDrive - Schlumberger\SHAYA _ INGENIERÍA _ CAMPO - 00. BUDGET
@@ -44,6 +42,11 @@ def get_user_base_dir_rig():
     os.makedirs(folder, exist_ok=True)
     return folder
 
+def get_budget_year():
+    """Año del presupuesto en curso; en enero corresponde al año anterior."""
+    now = datetime.now()
+    return now.year - 1 if now.month == 1 else now.year
+
 def get_test_path():
     ruta_3 = fr"C:/"
     os.makedirs(ruta_3, exist_ok=True)
@@ -78,7 +81,7 @@ def get_mi_swaco_config_path(filename="mi_swaco_config.xlsx") -> str:
 def get_completions_config_path(filename="completions_config.xlsx") -> str:
     return os.path.join(get_catalog_dir(), filename)
 
-def get_selected_services_wells_path(filename="selected_services_wells.xlsx") -> str:
+def get_selected_services_wells_path(filename="selected_services_wells.txt") -> str:
     return os.path.join(get_catalog_dir(), filename)
 
 def get_template_path(filename="Plantilla_de_actividades.xlsx") -> str:
@@ -224,6 +227,25 @@ def get_completion_status_path():
     os.makedirs(folder, exist_ok=True)
     return os.path.join(folder, filename)
 
+def get_field_planning_db_path(): #SQLite store
+    """
+    Retorna la ruta del archivo SQLite opcional con el estado de planificación de las líneas de campo.
+
+    El archivo vive en la carpeta local de datos de la aplicación (LOCALAPPDATA) y no
+    en OneDrive: sincronizar una base SQLite abierta y sus archivos de diario puede
+    corromperla o generar copias en conflicto. Los CSV de OneDrive siguen siendo los
+    compartidos entre usuarios (se importan al crear la base y se exportan con
+    --planning-store=export).
+    """
+    filename = f"field_planning_state_{get_budget_year()}.sqlite"
+    base_dir = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    folder = os.path.join(base_dir, "BudgetTool")
+    try:
+        os.makedirs(folder, exist_ok=True)
+    except OSError:
+        folder = get_test_path()
+    return os.path.join(folder, filename)
+
 def get_all_manual_planning_files(): #Manual planning
     """
     Retorna una lista de todos los archivos de planificación manual encontrados.
@@ -342,6 +364,19 @@ def get_output_path_for_pptx(year=None, month=None) -> str:
     os.makedirs(reports_dir, exist_ok=True)
     return os.path.join(reports_dir, "budget_follow.pptx")
 
+def get_output_path_for_multi_year(years, extension="pptx") -> str:
+    """
+    Retorna la ruta de guardado del comparativo multi-año (deck o tabla).
+
+    Args:
+        years (list): Años incluidos en el comparativo.
+        extension (str): 'pptx' para el deck o 'xlsx' para la tabla comparativa.
+    """
+    years = sorted(years)
+    reports_dir = os.path.join(get_user_base_dir(), "06 Budget Tool", "Reports", "Multi-year")
+    os.makedirs(reports_dir, exist_ok=True)
+    return os.path.join(reports_dir, f"budget_follow_{years[0]}-{years[-1]}.{extension}")
+
 
 
 def get_all_cpi_spi_files():
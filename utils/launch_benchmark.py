@@ -0,0 +1,124 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from utils.startup_profiler import STARTUP_LOG_ENV, load_startup_records
+
+# Tiempo máximo que se espera a que una instancia termine de arrancar
+LAUNCH_TIMEOUT = 300
+
+
+def measure_launch(target: str, timeout: float = LAUNCH_TIMEOUT) -> dict:
+    """
+    Arranca la aplicación una vez y mide cuánto tarda en quedar usable.
+
+    La aplicación se lanza con --exit-after-startup y --no-splash, y con el
+    registro de arranque apuntando a un archivo temporal: el tiempo total es
+    desde crear el proceso hasta que aparece su registro. Lo que no mide la
+    propia aplicación (descomprimir el exe onefile, iniciar el intérprete)
+    es la diferencia con el total que registra main.py.
+
+    Args:
+        target (str): Ruta del .exe, o de main.py para medir desde el código.
+        timeout (float): Segundos máximos de espera.
+
+    Returns:
+        dict: wall_seconds, app_seconds, pre_python_seconds y bundle.
+    """
+    target = os.path.abspath(target)
+    command = [sys.executable, target] if target.endswith(".py") else [target]
+    command += ["--exit-after-startup", "--no-splash"]
+
+    fd, log_path = tempfile.mkstemp(prefix="startup_", suffix=".jsonl")
+    os.close(fd)
+    env = dict(os.environ, **{STARTUP_LOG_ENV: log_path})
+    try:
+        begin = time.perf_counter()
+        process = subprocess.Popen(command, cwd=os.path.dirname(target), env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        records = []
+        while not records:
+            if time.perf_counter() - begin > timeout:
+                process.kill()
+                raise TimeoutError(f"{target} no terminó de arrancar en {timeout} s")
+            if process.poll() is not None and not load_startup_records(log_path):
+                raise RuntimeError(f"{target} terminó (código {process.returncode}) sin registrar el arranque")
+            time.sleep(0.05)
+            records = load_startup_records(log_path)
+        wall = time.perf_counter() - begin
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    finally:
+        os.remove(log_path)
+
+    record = records[-1]
+    return {
+        "wall_seconds": wall,
+        "app_seconds": record["total_seconds"],
+        "pre_python_seconds": max(wall - record["total_seconds"], 0.0),
+        "bundle": record.get("bundle", ""),
+    }
+
+
+def compare_launches(targets, runs: int = 5) -> list:
+    """
+    Mide varias variantes alternando las corridas (para repartir el efecto
+    de la caché de disco y del antivirus) y resume con la mediana.
+
+    Returns:
+        list: Un dict por variante con target, bundle y las medianas.
+    """
+    samples = {target: [] for target in targets}
+    for run in range(runs):
+        for target in targets:
+            print(f"▶️ Corrida {run + 1}/{runs}: {target}")
+            samples[target].append(measure_launch(target))
+
+    summary = []
+    for target, results in samples.items():
+        summary.append({
+            "target": target,
+            "bundle": results[-1]["bundle"],
+            "wall_seconds": statistics.median(r["wall_seconds"] for r in results),
+            "app_seconds": statistics.median(r["app_seconds"] for r in results),
+            "pre_python_seconds": statistics.median(r["pre_python_seconds"] for r in results),
+        })
+    return summary
+
+
+def main(argv=None):
+    """
+    Compara el tiempo de arranque de dos o más variantes empaquetadas.
+
+    Uso: python -m utils.launch_benchmark dist/main.exe dist/main_fast/main_fast.exe [--runs N]
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    runs = 5
+    if "--runs" in argv:
+        position = argv.index("--runs")
+        runs = int(argv[position + 1])
+        del argv[position:position + 2]
+    if not argv:
+        print(main.__doc__)
+        return
+
+    summary = compare_launches(argv, runs)
+    print(f"\nMediana de {runs} arranques (segundos):")
+    print(f"{'Variante':<45} {'Tipo':<8} {'Total':>7} {'Antes de Python':>16} {'Aplicación':>11}")
+    for row in summary:
+        print(f"{row['target']:<45} {row['bundle']:<8} {row['wall_seconds']:>7.2f} "
+              f"{row['pre_python_seconds']:>16.2f} {row['app_seconds']:>11.2f}")
+    if len(summary) > 1:
+        baseline = summary[0]["wall_seconds"]
+        for row in summary[1:]:
+            if baseline > 0:
+                change = (row["wall_seconds"] - baseline) / baseline * 100
+                print(f"{row['target']}: {change:+.0f}% frente a {summary[0]['target']}")
+
+
+if __name__ == "__main__":
+    main()
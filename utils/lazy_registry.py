@@ -0,0 +1,83 @@
+import importlib
+import re
+from functools import lru_cache
+
+# Rutas 'paquete.modulo.Clase' escritas como texto en el código o en la
+# configuración (registros de LazyClass, FIELD_REPORT_CLASSES, "class" del JSON)
+_DOTTED_CLASS_PATTERN = re.compile(
+    r"[\"']((?:controllers|data|logic|services|utils|views)(?:\.\w+)+)\.[A-Z]\w*[\"']"
+)
+
+
+@lru_cache(maxsize=None)
+def import_from_path(dotted_path: str):
+    """
+    Importa y devuelve el objeto indicado por su ruta completa.
+
+    Args:
+        dotted_path (str): Ruta 'paquete.modulo.Nombre'.
+
+    Returns:
+        object: La clase o función; el módulo se importa solo la primera vez.
+    """
+    module_path, _, attr = dotted_path.rpartition(".")
+    if not module_path:
+        raise ImportError(f"Ruta inválida (se esperaba 'modulo.Nombre'): {dotted_path}")
+    return getattr(importlib.import_module(module_path), attr)
+
+
+class LazyClass:
+    """
+    Referencia a una clase por su ruta completa, importada en el primer uso.
+
+    Se llama igual que la clase (LazyClass(...)(*args) crea la instancia),
+    así que puede reemplazarla en registros y en los nombres importados por
+    un módulo sin que el código que la usa cambie. Mientras nadie la use, su
+    módulo (y lo que este arrastra: matplotlib, python-pptx, pdfplumber...)
+    no se carga.
+    """
+    def __init__(self, dotted_path: str):
+        self.dotted_path = dotted_path
+
+    @property
+    def __name__(self):
+        return self.dotted_path.rpartition(".")[2]
+
+    def resolve(self):
+        """Importa (si hace falta) y devuelve la clase real."""
+        return import_from_path(self.dotted_path)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyClass({self.dotted_path!r})"
+
+
+def resolve_class(value):
+    """Devuelve la clase real de una LazyClass, de una ruta 'modulo.Nombre' o de la clase misma."""
+    if isinstance(value, LazyClass):
+        return value.resolve()
+    if isinstance(value, str):
+        return import_from_path(value)
+    return value
+
+
+def find_registered_modules(source_files) -> list:
+    """
+    Módulos referenciados por ruta en los archivos dados.
+
+    El análisis de PyInstaller no ve las importaciones por ruta; los .spec
+    usan esta lista como hiddenimports.
+
+    Args:
+        source_files (list): Archivos .py o .json a revisar.
+
+    Returns:
+        list: Módulos ('paquete.modulo'), ordenados y sin repetir.
+    """
+    modules = set()
+    for path in source_files:
+        with open(path, encoding="utf-8") as f:
+            modules.update(_DOTTED_CLASS_PATTERN.findall(f.read()))
+    return sorted(modules)
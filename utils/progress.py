@@ -0,0 +1,81 @@
+import threading
+
+
+class OperationCancelled(Exception):
+    """Se lanza en un checkpoint cuando la operación en curso fue cancelada."""
+
+
+class ProgressContext:
+    """
+    Contexto de progreso y cancelación cooperativa para cálculos largos.
+
+    Se pasa a través de controladores, reportes y servicios. Cada capa informa su
+    avance con `checkpoint(stage, fraction)`; si el usuario canceló, el checkpoint
+    lanza OperationCancelled y la operación se detiene en ese punto.
+
+    La cancelación se comparte entre un contexto y sus subcontextos, por lo que
+    puede pedirse desde cualquier hilo.
+    """
+    def __init__(self, on_progress=None, start: float = 0.0, end: float = 1.0, cancel_event=None):
+        """
+        Args:
+            on_progress (callable, optional): Función (fraction, stage) llamada en cada avance.
+                Puede ejecutarse desde hilos de trabajo.
+            start (float): Inicio del tramo global que representa este contexto.
+            end (float): Fin del tramo global que representa este contexto.
+            cancel_event (threading.Event, optional): Evento de cancelación compartido.
+        """
+        self._on_progress = on_progress
+        self._start = start
+        self._end = end
+        self._cancel_event = cancel_event or threading.Event()
+        self.fraction = start
+        self.stage = ""
+
+    def cancel(self):
+        """Solicita la cancelación; se hará efectiva en el próximo checkpoint."""
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def report(self, fraction: float = None, stage: str = None):
+        """
+        Informa el avance sin comprobar la cancelación.
+
+        Args:
+            fraction (float, optional): Avance local entre 0 y 1 dentro del tramo del contexto.
+            stage (str, optional): Nombre de la etapa en curso.
+        """
+        if fraction is not None:
+            fraction = min(max(fraction, 0.0), 1.0)
+            self.fraction = self._start + (self._end - self._start) * fraction
+        if stage is not None:
+            self.stage = stage
+        if self._on_progress is not None:
+            self._on_progress(self.fraction, self.stage)
+
+    def checkpoint(self, stage: str = None, fraction: float = None):
+        """Informa el avance y lanza OperationCancelled si se pidió la cancelación."""
+        self.report(fraction, stage)
+        if self.is_cancelled:
+            raise OperationCancelled(self.stage)
+
+    def subcontext(self, start: float, end: float) -> "ProgressContext":
+        """
+        Crea un contexto hijo que ocupa el tramo [start, end] (local) de este contexto
+        y comparte su cancelación.
+        """
+        width = self._end - self._start
+        return ProgressContext(
+            on_progress=self._on_progress,
+            start=self._start + width * start,
+            end=self._start + width * end,
+            cancel_event=self._cancel_event,
+        )
+
+
+def ensure_progress(progress) -> ProgressContext:
+    """Devuelve el contexto recibido o uno nuevo sin observadores si es None."""
+    return progress if progress is not None else ProgressContext()
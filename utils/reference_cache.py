@@ -0,0 +1,103 @@
+import os
+import threading
+import pandas as pd
+
+
+def file_version(*paths) -> tuple:
+    """Identifica el estado de uno o varios archivos por fecha de modificación y tamaño."""
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except (OSError, TypeError):
+            version.append(None)
+    return tuple(version)
+
+
+def normalize_line_name(value) -> str:
+    """Clave de búsqueda de una línea: sin espacios extremos y en minúsculas."""
+    return str(value).strip().lower()
+
+
+class ReferenceTable:
+    """
+    Tabla de referencia cargada en memoria con índices construidos a demanda.
+
+    Los índices agrupan las filas por una columna (opcionalmente normalizada),
+    de modo que las búsquedas por línea o por año son accesos a diccionario.
+    """
+    def __init__(self, dataframe: pd.DataFrame, version):
+        self.dataframe = dataframe
+        self.version = version
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def rows_for(self, column: str, value, normalize=None) -> pd.DataFrame:
+        """
+        Devuelve una copia de las filas cuyo valor en column coincide con value.
+
+        Args:
+            column (str): Columna indexada.
+            value: Valor buscado.
+            normalize (callable, optional): Función aplicada a la columna y a value antes de comparar.
+        """
+        index = self._get_index(column, normalize)
+        key = normalize(value) if normalize else value
+        rows = index.get(key)
+        return rows.copy() if rows is not None else self.dataframe.iloc[0:0].copy()
+
+    def _get_index(self, column, normalize):
+        index_key = (column, normalize)
+        with self._lock:
+            if index_key not in self._indexes:
+                if self.dataframe.empty or column not in self.dataframe.columns:
+                    self._indexes[index_key] = {}
+                else:
+                    keys = self.dataframe[column]
+                    if normalize is not None:
+                        keys = keys.map(normalize)
+                    self._indexes[index_key] = {key: rows for key, rows in self.dataframe.groupby(keys, sort=False)}
+            return self._indexes[index_key]
+
+
+class ReferenceDataCache:
+    """
+    Caché de proceso para tablas de referencia pequeñas (presupuesto aprobado,
+    costo inicial histórico, estado de completado).
+
+    Cada tabla se carga una sola vez y se reutiliza mientras su versión (por
+    ejemplo, la fecha de modificación de sus archivos) no cambie. Los servicios
+    que escriben la tabla la invalidan explícitamente.
+    """
+    def __init__(self):
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, version_fn, loader) -> ReferenceTable:
+        """
+        Devuelve la tabla vigente, recargándola si su versión cambió.
+
+        Args:
+            name (str): Nombre de la tabla.
+            version_fn (callable): Devuelve la versión actual de la fuente.
+            loader (callable): Lee la tabla completa y devuelve un DataFrame.
+        """
+        with self._lock:
+            version = version_fn()
+            table = self._tables.get(name)
+            if table is None or table.version != version:
+                table = ReferenceTable(loader(), version)
+                self._tables[name] = table
+            return table
+
+    def invalidate(self, name: str = None):
+        """Descarta una tabla (o todas si name es None) para que se relea en el próximo acceso."""
+        with self._lock:
+            if name is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(name, None)
+
+
+reference_data_cache = ReferenceDataCache()
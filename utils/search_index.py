@@ -0,0 +1,95 @@
+import bisect
+import numpy as np
+
+# Longitud máxima de los fragmentos indexados (1, 2 y 3 caracteres)
+MAX_GRAM = 3
+
+
+def normalize_search_text(value) -> str:
+    """Clave de búsqueda: sin espacios extremos y en mayúsculas."""
+    return str(value).strip().upper()
+
+
+class NGramIndex:
+    """
+    Índice de texto para filtrar listas grandes mientras se escribe.
+
+    Cada clave se indexa por sus fragmentos de 1 a 3 caracteres (listas de
+    posiciones como arreglos NumPy) y por orden alfabético para búsquedas por
+    prefijo. Una consulta de hasta 3 caracteres es un acceso directo; una más
+    larga intersecta las listas de sus trigramas y verifica los candidatos.
+    Si la consulta extiende a la anterior, se filtra sobre su resultado.
+
+    El índice se construye completo al crear la instancia (al abrir el
+    selector), para que la primera tecla no pague ese costo.
+    """
+    def __init__(self, keys):
+        self.keys = [normalize_search_text(key) for key in keys]
+        self._all = np.arange(len(self.keys))
+        self._last_query = ""
+        self._last_result = self._all
+        self._build()
+
+    def _build(self):
+        grams = {}
+        for position, key in enumerate(self.keys):
+            seen = set()
+            for size in range(1, MAX_GRAM + 1):
+                for start in range(len(key) - size + 1):
+                    seen.add(key[start:start + size])
+            for gram in seen:
+                grams.setdefault(gram, []).append(position)
+        self._grams = {gram: np.array(positions, dtype=int) for gram, positions in grams.items()}
+        order = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+        self._sorted = ([self.keys[i] for i in order], np.array(order, dtype=int))
+
+    def search(self, text: str) -> np.ndarray:
+        """
+        Posiciones (en el orden original) de las claves que contienen text.
+
+        Args:
+            text (str): Texto buscado; se normaliza igual que las claves.
+
+        Returns:
+            np.ndarray: Posiciones coincidentes, ordenadas.
+        """
+        query = normalize_search_text(text)
+        if not query:
+            result = self._all
+        else:
+            if self._last_query and query.startswith(self._last_query) and len(self._last_query) >= MAX_GRAM:
+                # Escritura incremental: solo se revisa el resultado anterior
+                result = self._verify(self._last_result, query)
+            elif len(query) <= MAX_GRAM:
+                result = self._grams.get(query, np.empty(0, dtype=int))
+            else:
+                result = self._candidates(query)
+        self._last_query, self._last_result = query, result
+        return result
+
+    def prefix(self, text: str) -> np.ndarray:
+        """Posiciones (ordenadas) de las claves que empiezan con text."""
+        query = normalize_search_text(text)
+        sorted_keys, order = self._sorted
+        start = bisect.bisect_left(sorted_keys, query)
+        end = bisect.bisect_left(sorted_keys, query + "\uffff")
+        return np.sort(order[start:end])
+
+    def _candidates(self, query):
+        postings = []
+        for start in range(len(query) - MAX_GRAM + 1):
+            positions = self._grams.get(query[start:start + MAX_GRAM])
+            if positions is None:
+                return np.empty(0, dtype=int)
+            postings.append(positions)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for positions in postings[1:]:
+            candidates = np.intersect1d(candidates, positions, assume_unique=True)
+            if not len(candidates):
+                break
+        return self._verify(candidates, query)
+
+    def _verify(self, candidates, query):
+        keys = self.keys
+        return np.array([i for i in candidates if query in keys[i]], dtype=int)
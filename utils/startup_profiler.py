@@ -0,0 +1,270 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Registro local (una línea JSON por arranque); la variable de entorno permite
+# cambiar la ruta o desactivarlo con "0".
+STARTUP_LOG_ENV = "BUDGET_TOOL_STARTUP_LOG"
+DEFAULT_LOG_PATH = os.path.join("summary", "startup_times.jsonl")
+# Paquetes más lentos de importar que se guardan en cada registro
+TOP_IMPORTS = 15
+
+
+class StartupProfiler:
+    """
+    Mide las fases del arranque de la aplicación.
+
+    Cada fase (with profiler.phase("nombre"): ...) guarda su duración y su
+    momento de inicio relativo al arranque; las fases pueden anidarse. Mientras
+    está activo, un buscador en sys.meta_path mide el tiempo de importación de
+    cada paquete de primer nivel (sin contar los otros paquetes que este
+    importe). finish() cierra la medición, agrega la línea al registro local y
+    quita el buscador.
+
+    Los oyentes (add_listener) reciben el nombre de cada fase al comenzar, para
+    mostrar el avance en una pantalla de inicio.
+    """
+    def __init__(self):
+        self.started_at = None
+        self.phases = []  # dicts: name, depth, start, seconds
+        self.import_times = {}
+        self.finished = False
+        self._depth = 0
+        self._listeners = []
+        self._import_timer = None
+
+    @property
+    def active(self) -> bool:
+        return self.started_at is not None and not self.finished
+
+    def start(self, time_imports: bool = True):
+        """Inicia la medición; llamar lo antes posible en main.py."""
+        if self.started_at is not None:
+            return
+        self.started_at = time.perf_counter()
+        if time_imports:
+            self._import_timer = _ImportTimer(self.import_times)
+            sys.meta_path.insert(0, self._import_timer)
+
+    def add_listener(self, callback):
+        """callback(nombre_de_fase) se llama al comenzar cada fase."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Mide el bloque como una fase; sin start() previo no registra nada."""
+        if not self.active or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+        entry = {"name": name, "depth": self._depth, "start": self._elapsed(), "seconds": None}
+        self.phases.append(entry)
+        for callback in list(self._listeners):
+            try:
+                callback(name)
+            except Exception as e:
+                print(f"⚠️ Error notificando la fase de arranque '{name}': {e}")
+        self._depth += 1
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry["seconds"] = round(time.perf_counter() - begin, 4)
+
+    def _elapsed(self) -> float:
+        return round(time.perf_counter() - self.started_at, 4)
+
+    def slowest_imports(self, count: int = TOP_IMPORTS) -> list:
+        """Paquetes de primer nivel más lentos de importar: [(paquete, segundos)]."""
+        ranked = sorted(self.import_times.items(), key=lambda item: item[1], reverse=True)
+        return [(name, round(seconds, 4)) for name, seconds in ranked[:count]]
+
+    def finish(self, log_path: str = None) -> dict:
+        """
+        Cierra la medición y agrega el resultado al registro local.
+
+        Args:
+            log_path (str, optional): Archivo de registro; por defecto el de
+                BUDGET_TOOL_STARTUP_LOG o summary/startup_times.jsonl.
+
+        Returns:
+            dict: El registro de este arranque (vacío si no se había iniciado).
+        """
+        if not self.active:
+            return {}
+        self.finished = True
+        if self._import_timer is not None and self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+        self._import_timer = None
+
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "bundle": bundle_layout(),
+            "total_seconds": self._elapsed(),
+            "phases": self.phases,
+            "imports": self.slowest_imports(),
+        }
+        self._listeners.clear()
+        print(f"⏱️ Arranque completo en {record['total_seconds']:.2f} s")
+        for entry in self.phases:
+            if entry["seconds"] is not None:
+                print(f"   {'  ' * entry['depth']}{entry['name']}: {entry['seconds']:.2f} s")
+
+        path = log_path or _log_path_from_environment()
+        if path:
+            try:
+                append_startup_record(path, record)
+            except OSError as e:
+                print(f"⚠️ No se pudo guardar el registro de arranque en {path}: {e}")
+        return record
+
+
+class _ImportTimer:
+    """Buscador de sys.meta_path que envuelve el cargador de cada paquete de primer nivel."""
+    def __init__(self, timings: dict):
+        self.timings = timings
+        self._local = threading.local()
+
+    def find_spec(self, name, path=None, target=None):
+        if "." in name:
+            return None
+        spec = None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _TimedLoader(spec.loader, name, self)
+        return spec
+
+    def stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+
+class _TimedLoader:
+    """Delegado del cargador real que mide exec_module sin contar los paquetes anidados."""
+    def __init__(self, loader, name, timer):
+        self._loader = loader
+        self._name = name
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = self._timer.stack()
+        frame = [0.0]  # tiempo de paquetes anidados, a descontar
+        stack.append(frame)
+        begin = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - begin
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            timings = self._timer.timings
+            timings[self._name] = timings.get(self._name, 0.0) + elapsed - frame[0]
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+def bundle_layout() -> str:
+    """
+    Cómo se está ejecutando la aplicación: 'source' (python main.py),
+    'onefile' (exe que se descomprime en una carpeta temporal) u 'onedir'.
+    """
+    if not getattr(sys, "frozen", False):
+        return "source"
+    bundle_dir = os.path.abspath(getattr(sys, "_MEIPASS", ""))
+    exe_dir = os.path.dirname(os.path.abspath(sys.executable))
+    return "onedir" if bundle_dir.startswith(exe_dir) else "onefile"
+
+
+def _log_path_from_environment():
+    value = os.environ.get(STARTUP_LOG_ENV, "").strip()
+    if value.lower() in ("0", "false", "off"):
+        return None
+    return value or DEFAULT_LOG_PATH
+
+
+def append_startup_record(path: str, record: dict):
+    """Agrega un registro de arranque (una línea JSON) al archivo."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_startup_records(path: str = DEFAULT_LOG_PATH) -> list:
+    """Registros de arranque guardados, del más antiguo al más reciente."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+_profiler = StartupProfiler()
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """Devuelve el medidor de arranque compartido por toda la aplicación."""
+    return _profiler
+
+
+def startup_phase(name: str):
+    """Atajo para get_startup_profiler().phase(name)."""
+    return _profiler.phase(name)
+
+
+def main(argv=None):
+    """
+    Compara los últimos arranques registrados.
+
+    Uso: python -m utils.startup_profiler [registro] [cantidad]
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else DEFAULT_LOG_PATH
+    count = int(argv[1]) if len(argv) > 1 else 5
+    records = load_startup_records(path)[-count:]
+    if not records:
+        print(f"No hay arranques registrados en {path}")
+        return
+    for record in records:
+        kind = record.get("bundle") or ("empaquetado" if record.get("frozen") else "source")
+        print(f"{record['timestamp']} ({kind}): {record['total_seconds']:.2f} s")
+        for entry in record.get("phases", []):
+            if entry.get("seconds") is not None:
+                print(f"   {'  ' * entry['depth']}{entry['name']}: {entry['seconds']:.2f} s")
+        imports = ", ".join(f"{name} {seconds:.2f} s" for name, seconds in record.get("imports", [])[:5])
+        if imports:
+            print(f"   Importaciones más lentas: {imports}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+import pandas as pd
+from utils.write_behind import write_file_atomic
+
+# Formato anterior: libro Excel con columnas WELL y '1.10 Services'
+LEGACY_EXTENSION = ".xlsx"
+
+
+def load_selected_wells(path: str) -> list:
+    """
+    Lee la selección de pozos guardada: un nombre de pozo por línea (UTF-8).
+
+    Si el archivo de texto no existe pero sí el libro Excel del formato
+    anterior (misma ruta con extensión .xlsx), se leen los pozos de su columna WELL.
+
+    Returns:
+        list: Pozos seleccionados, en el orden guardado (vacía si no hay selección).
+    """
+    if os.path.exists(path) and not path.endswith(LEGACY_EXTENSION):
+        with open(path, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+
+    legacy_path = os.path.splitext(path)[0] + LEGACY_EXTENSION
+    if os.path.exists(legacy_path):
+        try:
+            df = pd.read_excel(legacy_path)
+            return [str(well).strip().upper() for well in df["WELL"].dropna()]
+        except Exception as e:
+            print(f"⚠️ No se pudo cargar pozos seleccionados desde {legacy_path}: {e}")
+    return []
+
+
+def save_selected_wells(path: str, wells):
+    """Guarda la selección de pozos (un nombre por línea) de forma atómica."""
+    def writer(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(f"{well}\n" for well in wells)
+    write_file_atomic(path, writer)
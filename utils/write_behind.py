@@ -0,0 +1,184 @@
+import atexit
+import os
+import tempfile
+import threading
+import time
+
+
+def write_file_atomic(path: str, writer):
+    """
+    Escribe un archivo sin dejarlo nunca a medias.
+
+    writer(tmp_path) escribe el contenido completo en un archivo temporal de la
+    misma carpeta (con la misma extensión, para que pandas/openpyxl elijan el
+    formato correcto); luego el destino se reemplaza con os.replace, que es atómico.
+    """
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=os.path.splitext(path)[1], dir=folder)
+    os.close(fd)
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class WriteBehindQueue:
+    """
+    Cola de escritura diferida para guardados disparados desde la interfaz.
+
+    Cada guardado se encola por ruta: si llega otro guardado del mismo archivo
+    antes de escribirse, reemplaza al anterior y solo se escribe el último. Un
+    único hilo de fondo escribe los archivos en orden con write_file_atomic.
+
+    Mientras un guardado está pendiente, pending_data(ruta) devuelve los datos
+    encolados para que las lecturas vean lo último guardado.
+    """
+    def __init__(self, delay: float = 0.5):
+        """
+        Args:
+            delay (float): Segundos que se espera tras el último guardado de un archivo
+                           antes de escribirlo, para agrupar guardados seguidos.
+        """
+        self.delay = delay
+        self._pending = {}      # ruta -> (writer, data, momento de escritura)
+        self._in_flight = {}    # ruta -> data que se está escribiendo
+        self._generations = {}  # ruta -> número de guardados recibidos
+        self._errors = {}       # ruta -> excepción de la última escritura fallida
+        self._listeners = []
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, path: str, writer, data=None):
+        """
+        Encola el guardado de un archivo.
+
+        Args:
+            path (str): Archivo destino.
+            writer (callable): writer(tmp_path) escribe el contenido completo en tmp_path.
+                               Debe trabajar sobre una copia de los datos, no sobre
+                               objetos que la interfaz siga modificando.
+            data (optional): Datos que se están guardando; se devuelven en pending_data().
+        """
+        with self._cond:
+            self._pending[path] = (writer, data, time.monotonic() + self.delay)
+            self._generations[path] = self._generations.get(path, 0) + 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        self._notify()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Escribe de inmediato todo lo pendiente y espera a que termine.
+
+        Returns:
+            bool: True si no quedó nada pendiente dentro del tiempo indicado.
+        """
+        with self._cond:
+            self._pending = {path: (writer, data, 0.0) for path, (writer, data, _) in self._pending.items()}
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    def wait_for(self, path: str, timeout: float = None) -> bool:
+        """
+        Escribe de inmediato el guardado pendiente de path (si lo hay) y espera a que termine.
+
+        Returns:
+            bool: True si path quedó escrito (o no tenía nada pendiente) dentro del tiempo indicado.
+                  El resultado de la escritura se consulta con last_error(path).
+        """
+        with self._cond:
+            if path in self._pending:
+                writer, data, _ = self._pending[path]
+                self._pending[path] = (writer, data, 0.0)
+                self._cond.notify_all()
+            return self._cond.wait_for(lambda: path not in self._pending and path not in self._in_flight, timeout)
+
+    def pending_data(self, path: str):
+        """Datos del último guardado aún no escrito de path, o None."""
+        with self._cond:
+            if path in self._pending:
+                return self._pending[path][1]
+            return self._in_flight.get(path)
+
+    def generation(self, path: str) -> int:
+        """Número de guardados recibidos para path; sirve para invalidar cachés."""
+        with self._cond:
+            return self._generations.get(path, 0)
+
+    @property
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending) + len(self._in_flight)
+
+    @property
+    def has_pending(self) -> bool:
+        return self.pending_count > 0
+
+    def last_error(self, path: str):
+        """Excepción de la última escritura fallida de path, o None si se guardó bien."""
+        with self._cond:
+            return self._errors.get(path)
+
+    def add_listener(self, callback):
+        """
+        Registra callback(pending_count, errors) que se llama cada vez que cambia el
+        estado de la cola. Puede ejecutarse desde el hilo de escritura.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self):
+        with self._cond:
+            pending_count = len(self._pending) + len(self._in_flight)
+            errors = dict(self._errors)
+        for callback in list(self._listeners):
+            try:
+                callback(pending_count, errors)
+            except Exception as e:
+                print(f"⚠️ Error notificando el estado de guardado: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._pending:
+                        self._cond.wait()
+                        continue
+                    path, (writer, data, due) = min(self._pending.items(), key=lambda item: item[1][2])
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                del self._pending[path]
+                self._in_flight[path] = data
+            try:
+                write_file_atomic(path, writer)
+                with self._cond:
+                    self._errors.pop(path, None)
+            except Exception as e:
+                print(f"❌ Error al guardar '{path}': {e}")
+                with self._cond:
+                    self._errors[path] = e
+            finally:
+                with self._cond:
+                    self._in_flight.pop(path, None)
+                    self._cond.notify_all()
+            self._notify()
+
+
+_queue = WriteBehindQueue()
+
+
+def get_write_behind_queue() -> WriteBehindQueue:
+    """Devuelve la cola de escritura diferida compartida por toda la aplicación."""
+    return _queue
+
+
+@atexit.register
+def _flush_on_exit():
+    _queue.flush(timeout=30)
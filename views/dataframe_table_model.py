@@ -0,0 +1,269 @@
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtWidgets import QTableView
+
+INVALID_BACKGROUND = QColor(Qt.red)
+
+
+def format_value(value) -> str:
+    """Texto por defecto de una celda: vacío para nulos y el valor tal cual para el resto."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    return str(value)
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """
+    Modelo de tabla virtual respaldado por un DataFrame (o un arreglo NumPy).
+
+    Los valores se guardan en una matriz NumPy de objetos y la vista solo pide
+    las celdas visibles, así que el costo de dibujar no depende del tamaño de
+    los datos ni se crea un objeto por celda.
+
+    Configuración por columna (por nombre):
+        formatters: valor -> texto mostrado.
+        parsers: texto editado -> valor. Si lanza ValueError, el texto se
+                 conserva y la celda queda marcada como inválida (fondo rojo).
+        alignments: alineación del texto.
+
+    Estilos: set_row_style / set_column_style / set_cell_style fijan fondo,
+    color de texto y negrita; color_rules son funciones (fila, columna, valor)
+    que devuelven un QColor de texto o None (por ejemplo, negativos en rojo).
+
+    Edición: editable puede ser una lista de columnas o una máscara booleana
+    (filas x columnas). Cada edición emite cell_edited(fila, columna, valor).
+    """
+    cell_edited = pyqtSignal(int, int, object)
+
+    def __init__(self, data=None, columns=None, headers=None, formatters=None, parsers=None,
+                 editable=None, alignments=None, color_rules=None, invalid_tooltip="Valor inválido.", parent=None):
+        super().__init__(parent)
+        self.formatters = dict(formatters or {})
+        self.parsers = dict(parsers or {})
+        self.alignments = dict(alignments or {})
+        self.color_rules = list(color_rules or [])
+        self.invalid_tooltip = invalid_tooltip
+        self._headers = list(headers) if headers is not None else None
+        self._editable_spec = editable
+        self._columns = []
+        self._values = np.empty((0, 0), dtype=object)
+        self._editable = np.zeros((0, 0), dtype=bool)
+        self._styles = {}
+        self._invalid = set()
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+        self.set_data(data if data is not None else pd.DataFrame(), columns)
+
+    # --- Datos ---
+
+    def set_data(self, data, columns=None):
+        """
+        Reemplaza los datos del modelo.
+
+        Si la forma y las columnas no cambian solo se notifica un cambio de
+        datos (la vista conserva selección y scroll); si cambian, se reinicia.
+        Los estilos se descartan: quien llama los vuelve a aplicar.
+        """
+        if isinstance(data, pd.DataFrame):
+            columns = list(data.columns) if columns is None else list(columns)
+            if columns != list(data.columns):
+                data = data.reindex(columns=columns)
+            values = data.to_numpy(dtype=object)
+        else:
+            values = np.asarray(data, dtype=object)
+            if values.ndim != 2:
+                values = values.reshape(len(values), -1) if values.size else np.empty((0, len(columns or [])), dtype=object)
+            columns = list(columns) if columns is not None else list(range(values.shape[1]))
+
+        same_shape = columns == self._columns and values.shape == self._values.shape
+        if not same_shape:
+            self.beginResetModel()
+        self._columns = columns
+        self._values = values
+        self._invalid.clear()
+        self._styles.clear()
+        self._editable = self._build_editable_mask(self._editable_spec)
+        if same_shape:
+            if values.size:
+                self.dataChanged.emit(self.index(0, 0), self.index(values.shape[0] - 1, values.shape[1] - 1))
+        else:
+            self.endResetModel()
+
+    def dataframe(self) -> pd.DataFrame:
+        """Copia de los datos actuales como DataFrame."""
+        return pd.DataFrame(self._values.copy(), columns=self._columns)
+
+    @property
+    def columns(self) -> list:
+        return list(self._columns)
+
+    def column_index(self, column) -> int:
+        return self._columns.index(column)
+
+    def column_name(self, col: int):
+        return self._columns[col]
+
+    def column_values(self, column) -> np.ndarray:
+        """Valores de una columna (por nombre) como arreglo NumPy, sin copiar."""
+        return self._values[:, self.column_index(column)]
+
+    def value(self, row: int, col: int):
+        return self._values[row, col]
+
+    def set_value(self, row: int, col: int, value):
+        """Cambia un valor desde el código; no emite cell_edited."""
+        self._values[row, col] = value
+        self._invalid.discard((row, col))
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index)
+
+    def display_text(self, row: int, col: int) -> str:
+        """Texto mostrado en la celda, con el formateador de su columna."""
+        value = self._values[row, col]
+        if (row, col) in self._invalid:
+            return str(value)
+        formatter = self.formatters.get(self._columns[col], format_value)
+        try:
+            return formatter(value)
+        except (TypeError, ValueError):
+            return format_value(value)
+
+    def is_invalid(self, row: int, col: int) -> bool:
+        return (row, col) in self._invalid
+
+    @property
+    def has_invalid_cells(self) -> bool:
+        return bool(self._invalid)
+
+    # --- Edición y estilos ---
+
+    def set_editable(self, editable):
+        """Cambia qué celdas son editables (lista de columnas o máscara booleana)."""
+        self._editable_spec = editable
+        self._editable = self._build_editable_mask(editable)
+
+    def set_row_style(self, row: int, background=None, foreground=None, bold=None):
+        self._set_style((row, None), background, foreground, bold)
+
+    def set_column_style(self, col: int, background=None, foreground=None, bold=None):
+        self._set_style((None, col), background, foreground, bold)
+
+    def set_cell_style(self, row: int, col: int, background=None, foreground=None, bold=None):
+        self._set_style((row, col), background, foreground, bold)
+
+    def clear_styles(self):
+        self._styles.clear()
+
+    def _set_style(self, key, background, foreground, bold):
+        style = self._styles.setdefault(key, {})
+        if background is not None:
+            style["background"] = QColor(background)
+        if foreground is not None:
+            style["foreground"] = QColor(foreground)
+        if bold is not None:
+            style["bold"] = bold
+
+    def _style_value(self, row, col, name):
+        # Prioridad: celda, fila, columna
+        for key in ((row, col), (row, None), (None, col)):
+            style = self._styles.get(key)
+            if style and name in style:
+                return style[name]
+        return None
+
+    def _build_editable_mask(self, editable):
+        rows, cols = self._values.shape
+        if editable is None:
+            return np.zeros((rows, cols), dtype=bool)
+        if isinstance(editable, np.ndarray):
+            if editable.shape != (rows, cols):
+                return np.zeros((rows, cols), dtype=bool)
+            return editable.astype(bool)
+        mask = np.zeros((rows, cols), dtype=bool)
+        for column in editable:
+            if column in self._columns:
+                mask[:, self._columns.index(column)] = True
+        return mask
+
+    # --- Interfaz de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._values.shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._values.shape[1]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.display_text(row, col)
+        if role == Qt.BackgroundRole:
+            if (row, col) in self._invalid:
+                return INVALID_BACKGROUND
+            return self._style_value(row, col, "background")
+        if role == Qt.ForegroundRole:
+            foreground = self._style_value(row, col, "foreground")
+            if foreground is not None:
+                return foreground
+            for rule in self.color_rules:
+                color = rule(row, self._columns[col], self._values[row, col])
+                if color is not None:
+                    return QColor(color)
+            return None
+        if role == Qt.FontRole:
+            return self._bold_font if self._style_value(row, col, "bold") else None
+        if role == Qt.TextAlignmentRole:
+            return self.alignments.get(self._columns[col])
+        if role == Qt.ToolTipRole and (row, col) in self._invalid:
+            return self.invalid_tooltip
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, col = index.row(), index.column()
+        parser = self.parsers.get(self._columns[col])
+        if parser is not None:
+            try:
+                value = parser(value)
+                self._invalid.discard((row, col))
+            except (TypeError, ValueError):
+                self._invalid.add((row, col))
+        self._values[row, col] = value
+        self.dataChanged.emit(index, index)
+        self.cell_edited.emit(row, col, value)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if self._editable[index.row(), index.column()]:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            headers = self._headers if self._headers is not None else self._columns
+            return str(headers[section]) if section < len(headers) else None
+        return str(section + 1)
+
+
+def create_table_view(model, parent=None, resize_precision=200) -> QTableView:
+    """
+    Crea un QTableView para un DataFrameTableModel.
+
+    resize_precision limita cuántas filas se miden al ajustar columnas al
+    contenido, para que resizeColumnsToContents no recorra tablas grandes.
+    """
+    view = QTableView(parent)
+    view.setModel(model)
+    view.horizontalHeader().setResizeContentsPrecision(resize_precision)
+    view.verticalHeader().setResizeContentsPrecision(resize_precision)
+    return view
@@ -0,0 +1,65 @@
+import pandas as pd
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QPushButton
+from PyQt5.QtCore import Qt
+from views.dataframe_table_model import DataFrameTableModel, create_table_view
+
+
+class DiagnosticsView(QDialog):
+    """
+    Muestra los DataFrames intermedios capturados por el receptor de diagnóstico.
+    """
+    def __init__(self, sink, parent=None):
+        super().__init__(parent)
+        self.sink = sink
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("Diagnóstico - Datos intermedios")
+        self.resize(900, 600)
+
+        layout = QVBoxLayout(self)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Captura:"))
+        self.name_combo = QComboBox()
+        self.name_combo.addItems(self.sink.names())
+        controls_layout.addWidget(self.name_combo, 1)
+        refresh_button = QPushButton("Actualizar")
+        refresh_button.clicked.connect(self.refresh_names)
+        controls_layout.addWidget(refresh_button)
+        layout.addLayout(controls_layout)
+
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+
+        self.model = DataFrameTableModel()
+        self.table = create_table_view(self.model)
+        layout.addWidget(self.table)
+
+        close_button = QPushButton("Cerrar")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button, alignment=Qt.AlignRight)
+
+        self.name_combo.currentTextChanged.connect(self.show_capture)
+        self.show_capture(self.name_combo.currentText())
+
+    def refresh_names(self):
+        current = self.name_combo.currentText()
+        self.name_combo.blockSignals(True)
+        self.name_combo.clear()
+        self.name_combo.addItems(self.sink.names())
+        if current in self.sink.names():
+            self.name_combo.setCurrentText(current)
+        self.name_combo.blockSignals(False)
+        self.show_capture(self.name_combo.currentText())
+
+    def show_capture(self, name):
+        df = self.sink.get(name) if name else None
+        if df is None:
+            status = "activo" if self.sink.enabled else "desactivado"
+            self.info_label.setText(f"No hay capturas (diagnóstico {status}).")
+            self.model.set_data(pd.DataFrame())
+            return
+
+        self.info_label.setText(f"{len(df)} filas x {len(df.columns)} columnas")
+        self.model.set_data(df)
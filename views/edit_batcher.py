@@ -0,0 +1,126 @@
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# Un solo hilo para los recálculos de las grillas: los lotes se procesan en orden
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grid-recalc")
+
+
+class RunningTotal:
+    """
+    Suma de una columna que se mantiene por diferencias.
+
+    set(i, valor) ajusta el total con (valor nuevo - valor anterior) en lugar
+    de volver a sumar todas las filas.
+    """
+    def __init__(self, values=()):
+        self.reset(values)
+
+    def reset(self, values):
+        self._values = [float(v) for v in values]
+        self.total = sum(self._values)
+
+    def set(self, index: int, value: float) -> float:
+        value = float(value)
+        self.total += value - self._values[index]
+        self._values[index] = value
+        return self.total
+
+    def insert(self, index: int, value: float = 0.0):
+        self._values.insert(index, float(value))
+        self.total += float(value)
+
+    def remove(self, index: int):
+        self.total -= self._values.pop(index)
+
+    def __len__(self):
+        return len(self._values)
+
+
+class EditBatcher(QObject):
+    """
+    Agrupa ediciones seguidas de una grilla y recalcula una sola vez.
+
+    Cada submit(clave, valor) registra la celda editada y reinicia un
+    temporizador; cuando pasan delay_ms sin nuevas ediciones se procesa el
+    lote (diccionario clave -> último valor):
+
+    - Sin compute: on_flush(lote) se llama en el hilo de la interfaz.
+    - Con compute: compute(lote) se ejecuta en un hilo de trabajo y su
+      resultado se entrega con on_flush(resultado) en el hilo de la interfaz.
+      Si mientras tanto llegó otro lote, el resultado viejo se descarta; por
+      eso un lote nuevo incluye también las ediciones del lote aún en curso.
+    """
+    _result_ready = pyqtSignal(int, object)
+    _failed = pyqtSignal(int, str)
+
+    def __init__(self, on_flush, delay_ms: int = 250, compute=None, on_error=None, parent=None):
+        super().__init__(parent)
+        self.on_flush = on_flush
+        self.compute = compute
+        self.on_error = on_error
+        self._pending = {}
+        self._in_flight = {}
+        self._generation = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+        self._result_ready.connect(self._deliver)
+        self._failed.connect(self._deliver_error)
+
+    def submit(self, key, value=None):
+        """Registra una edición y pospone el recálculo."""
+        self._pending[key] = value
+        self._timer.start()
+
+    def flush(self):
+        """Procesa de inmediato las ediciones pendientes."""
+        self._timer.stop()
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._generation += 1
+        if self.compute is None:
+            self.on_flush(batch)
+            return
+        self._in_flight = {**self._in_flight, **batch}
+        _executor.submit(self._run, self._generation, dict(self._in_flight))
+
+    def finish(self):
+        """
+        Procesa todo lo pendiente (incluido el lote en curso) en el hilo actual.
+
+        Para usar al cerrar la ventana, cuando ya no se puede esperar al hilo de trabajo.
+        """
+        self._timer.stop()
+        batch = {**self._in_flight, **self._pending}
+        self._pending, self._in_flight = {}, {}
+        self._generation += 1  # Descarta cualquier resultado en camino
+        if not batch:
+            return
+        self.on_flush(batch if self.compute is None else self.compute(batch))
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending) or bool(self._in_flight) or self._timer.isActive()
+
+    def _run(self, generation, batch):
+        try:
+            result = self.compute(batch)
+        except Exception as e:
+            self._failed.emit(generation, str(e))
+            return
+        self._result_ready.emit(generation, result)
+
+    def _deliver(self, generation, result):
+        if generation == self._generation:
+            self._in_flight = {}
+            self.on_flush(result)
+
+    def _deliver_error(self, generation, message):
+        print(f"⚠️ Error recalculando la grilla: {message}")
+        if generation != self._generation:
+            return
+        self._in_flight = {}
+        if self.on_error is not None:
+            self.on_error(message)
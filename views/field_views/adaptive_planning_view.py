@@ -102,7 +102,7 @@ class AdaptivePlanningView(QDialog):
     def on_item_changed(self, row, col, text):
         """Obtiene el nombre de la columna y emite la señal item_edited."""
         # Obtenemos el nombre de la columna a partir de su índice
-        column_name = self.table_widget.table.horizontalHeaderItem(col).text()
+        column_name = self.table_widget.column_name(col)
         self.item_edited.emit(row, column_name, text)
     
     def _setup_combo(self):
@@ -1,17 +1,28 @@
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
+    QHeaderView, QMessageBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
 from datetime import datetime
+import pandas as pd
+from views.dataframe_table_model import DataFrameTableModel, create_table_view
+
+CATALOG_COLUMNS = ["month", "year", "Well", "Cost by Activity", "Category"]
 
 
 class CategorizerExecutedCatalogView(QDialog):
     def __init__(self, service, available_line_titles=None, on_calculate_and_save=None):
+        """
+        Args:
+            on_calculate_and_save (callable, optional): Se llama una sola vez al abrir con
+                el título de la línea; categoriza y guarda todos sus meses y devuelve la
+                tabla larga (Line, Month, Category, Activities, Cost) usada para el resumen.
+        """
         super().__init__()
         self.service = service
         self.on_calculate_and_save = on_calculate_and_save
         self.fixed_line_title = available_line_titles[0]
+        self.category_table = None
         self.months = [
             "January", "February", "March", "April", "May", "June",
             "July", "August", "September", "October", "November", "December"
@@ -41,9 +52,11 @@ class CategorizerExecutedCatalogView(QDialog):
         controls_layout.addStretch()
         layout.addLayout(controls_layout)
           # Tabla para mostrar los datos
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Mes", "Año", "Pozo", "Costo por Actividad", "Categoría"])
+        self.model = DataFrameTableModel(
+            columns=CATALOG_COLUMNS,
+            headers=["Mes", "Año", "Pozo", "Costo por Actividad", "Categoría"]
+        )
+        self.table = create_table_view(self.model)
         
         # Configurar tabla para que se ajuste al contenido
         header = self.table.horizontalHeader()
@@ -61,85 +74,79 @@ class CategorizerExecutedCatalogView(QDialog):
         close_layout.addWidget(close_button)
         layout.addLayout(close_layout)
         
-        # Conectar cambio de mes para calcular automáticamente
+        # Categorizar y guardar todos los meses una sola vez; al cambiar de mes solo se lee el catálogo
+        self.calculate_all_months()
         self.month_combo.currentTextChanged.connect(self.on_month_changed)
           # Cargar datos iniciales
         self.on_month_changed(self.month_combo.currentText())
 
+    def calculate_all_months(self):
+        """Categoriza y guarda de una vez todos los meses antes de mostrar el primero."""
+        if not self.on_calculate_and_save:
+            return
+        try:
+            self.category_table = self.on_calculate_and_save(self.fixed_line_title)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error al categorizar las actividades: {str(e)}")
+            print(f"Error al categorizar las actividades: {str(e)}")
+
     def on_month_changed(self, month):
         """Se ejecuta automáticamente cuando cambia el mes"""
         if not month:
-            self.table.setRowCount(0)
+            self.model.set_data(pd.DataFrame(columns=CATALOG_COLUMNS))
             return
         
         try:
-            # Primero, calcular y guardar nuevos datos
-            if self.on_calculate_and_save:
-                self.on_calculate_and_save(self.fixed_line_title, month)
-            
-            # Luego, cargar y mostrar los datos
+            # Cargar y mostrar los datos ya guardados
             df = self.service.get_records_by_month_and_line(month, self.fixed_line_title)
-            self.show_dataframe_in_table(df)
+            self.show_dataframe_in_table(df, month)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al procesar datos: {str(e)}")
             print(f"Error al procesar datos: {str(e)}")
-            self.table.setRowCount(0)
+            self.model.set_data(pd.DataFrame(columns=CATALOG_COLUMNS))
 
-    def show_dataframe_in_table(self, df):
+    def show_dataframe_in_table(self, df, month=None):
         """Muestra un DataFrame en la tabla"""
         if df.empty:
-            self.table.setRowCount(0)
+            self.model.set_data(pd.DataFrame(columns=CATALOG_COLUMNS))
             return
         
-        # Calcular totales por categoría
-        category_counts = df['Category'].value_counts().sort_index()
-        
-        # Establecer filas: datos + 1 fila de resumen
-        self.table.setRowCount(len(df) + 1)
-        
-        # Mostrar datos normales
-        for row_idx, (_, row) in enumerate(df.iterrows()):
-            for col_idx, col_name in enumerate(["month", "year", "Well", "Cost by Activity", "Category"]):
-                value = str(row.get(col_name, ""))
-                item = QTableWidgetItem(value)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Solo lectura
-                self.table.setItem(row_idx, col_idx, item)
-        
-        # Agregar fila de resumen
-        summary_row_idx = len(df)
-        
-        # Columna "Mes" - mostrar "RESUMEN"
-        summary_item = QTableWidgetItem("Summary")
-        summary_item.setFlags(summary_item.flags() & ~Qt.ItemIsEditable)
-        from PyQt5.QtGui import QFont, QColor
-        font = QFont()
-        font.setBold(True)
-        summary_item.setFont(font)
-        summary_item.setBackground(QColor(220, 220, 220))  # Fondo gris claro
-        self.table.setItem(summary_row_idx, 0, summary_item)
-        
-        # Columna "Año" - mostrar totales por categoría
+        # Calcular totales por categoría (de la tabla calculada al abrir, si la hay)
+        category_counts = self._category_counts(month)
+        if category_counts is None:
+            category_counts = df['Category'].value_counts().sort_index()
         totals_text = []
         for category in [1, 2, 3, 4]:
             count = category_counts.get(category, 0)
             if count > 0:
                 totals_text.append(f"Cat.{category} -> {count}")
-        
         totals_summary = " | ".join(totals_text) if totals_text else "Empty Data"
-        totals_item = QTableWidgetItem(totals_summary)
-        totals_item.setFlags(totals_item.flags() & ~Qt.ItemIsEditable)
-        totals_item.setFont(font)
-        totals_item.setBackground(QColor(220, 220, 220))
-        self.table.setItem(summary_row_idx, 1, totals_item)
-          # Columnas restantes - vacías pero con el mismo formato
-        for col_idx in range(2, 5):
-            empty_item = QTableWidgetItem("")
-            empty_item.setFlags(empty_item.flags() & ~Qt.ItemIsEditable)
-            empty_item.setBackground(QColor(220, 220, 220))
-            self.table.setItem(summary_row_idx, col_idx, empty_item)
+
+        # Datos + 1 fila de resumen
+        summary_row = pd.DataFrame([["Summary", totals_summary, "", "", ""]], columns=CATALOG_COLUMNS)
+        display_df = pd.concat([df.reindex(columns=CATALOG_COLUMNS).astype(str), summary_row], ignore_index=True)
+        self.model.set_data(display_df)
+
+        summary_row_idx = len(df)
+        self.model.set_row_style(summary_row_idx, background=QColor(220, 220, 220))
+        self.model.set_cell_style(summary_row_idx, 0, bold=True)
+        self.model.set_cell_style(summary_row_idx, 1, bold=True)
         
         # Ajustar el ancho de las columnas para que se vea todo el contenido
         self.table.resizeColumnsToContents()
         # Asegurar que la columna de resumen tenga espacio suficiente
         self.table.setColumnWidth(1, max(200, self.table.columnWidth(1)))
+
+    def _category_counts(self, month):
+        """Actividades por categoría de la línea y el mes según category_table, o None si no está."""
+        table = self.category_table
+        if table is None or table.empty or not month:
+            return None
+        rows = table[
+            (table["Line"] == self.fixed_line_title)
+            & (table["Month"].astype(str).str.strip().str.lower() == month.strip().lower())
+        ]
+        if rows.empty:
+            return None
+        return rows.set_index("Category")["Activities"]
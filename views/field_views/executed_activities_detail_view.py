@@ -1,9 +1,11 @@
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QHeaderView
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtGui import QColor
+from views.dataframe_table_model import DataFrameTableModel, create_table_view
+
+DETAIL_COLUMNS = ["Pozo", "Estado", "Mes", "Costo Servicio", "Costo Producto", "Costo B&H", "Total sin B&H", "Total con B&H"]
 
 class ExecutedActivitiesDetailView(QDialog):
     def __init__(self, service, parent=None):
@@ -16,11 +18,8 @@ class ExecutedActivitiesDetailView(QDialog):
     def init_ui(self):
         layout = QVBoxLayout(self)
         # Tabla
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "Pozo", "Estado", "Mes", "Costo Servicio", "Costo Producto", "Costo B&H", "Total sin B&H", "Total con B&H"
-        ])
+        self.model = DataFrameTableModel(columns=DETAIL_COLUMNS)
+        self.table = create_table_view(self.model)
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeToContents)
         header.setSectionResizeMode(6, QHeaderView.Stretch)
@@ -73,19 +72,10 @@ class ExecutedActivitiesDetailView(QDialog):
         self.table.setStyleSheet(f"QHeaderView::section {{ background-color: rgb({color.red()}, {color.green()}, {color.blue()}); }}")
 
     def load_data(self):
-        df = self.service.get_detail_dataframe()
-        self.table.setRowCount(len(df))
-        font = QFont()
-        font.setBold(True)
-        for row_idx, row in df.iterrows():
-            is_total_row = str(row.get("Mes", "")).lower().startswith("total ")
-            for col_idx, col_name in enumerate(["Pozo", "Estado", "Mes", "Costo Servicio", "Costo Producto", "Costo B&H", "Total sin B&H", "Total con B&H"]):
-                value = str(row.get(col_name, ""))
-                item = QTableWidgetItem(value)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                if is_total_row:
-                    item.setFont(font)
-                    item.setBackground(QColor(180, 220, 255))
-                self.table.setItem(row_idx, col_idx, item)
+        df = self.service.get_detail_dataframe().reindex(columns=DETAIL_COLUMNS).fillna("")
+        self.model.set_data(df)
+        is_total_row = df["Mes"].astype(str).str.lower().str.startswith("total ").to_numpy()
+        for row_idx in is_total_row.nonzero()[0]:
+            self.model.set_row_style(int(row_idx), background=QColor(180, 220, 255), bold=True)
         self.table.resizeColumnsToContents()
         self.table.setColumnWidth(6, max(200, self.table.columnWidth(6)))
@@ -1,10 +1,19 @@
+import numpy as np
 import pandas as pd
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
+    QDialog, QVBoxLayout, QPushButton,
     QFileDialog, QMessageBox, QHeaderView, QHBoxLayout, QApplication
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtGui import QColor
+from views.dataframe_table_model import DataFrameTableModel, create_table_view
+
+
+def _negative_in_red(row, column, value):
+    """Regla de color: valores numéricos negativos en rojo suave."""
+    if pd.api.types.is_number(value) and not isinstance(value, bool) and value < 0:
+        return QColor(204, 41, 54)
+    return None
 
 class LeaderSummaryReportView(QDialog):
     def __init__(self, data_df: pd.DataFrame, controller, parent=None):
@@ -18,9 +27,10 @@ class LeaderSummaryReportView(QDialog):
         # La ventana se mostrará maximizada desde el controlador para asegurar que el contenido se expanda correctamente.
         layout = QVBoxLayout(self)
 
-        self.table_widget = QTableWidget()
+        self.model = DataFrameTableModel(color_rules=[_negative_in_red])
+        self.table_view = create_table_view(self.model)
         self.populate_table()
-        layout.addWidget(self.table_widget)
+        layout.addWidget(self.table_view)
 
         # Layout para botones
         button_layout = QHBoxLayout()
@@ -58,57 +68,21 @@ class LeaderSummaryReportView(QDialog):
         numeric_cols = display_df.select_dtypes(include=['number']).columns
         totals = display_df[numeric_cols].sum()
         totals["Resource\nName"] = "Total Rigless" # Etiqueta para la fila de totales
-        # --- 3. Configurar la tabla ---
-        num_rows = display_df.shape[0]
-        self.table_widget.setRowCount(num_rows + 1) # +1 para la fila de totales
-        self.table_widget.setColumnCount(display_df.shape[1])
-        self.table_widget.setHorizontalHeaderLabels(display_df.columns)
-        # Estilo para la cabecera (azul, texto blanco y negrita)
-        header_style = """
-            QHeaderView::section {
-                background-color: #2874A6; /* QColor(40, 116, 166) */
-                color: white;
-                padding: 4px;
-                border: 1px solid #6c757d;
-                font-weight: bold;
-            }
-        """
-        self.table_widget.horizontalHeader().setStyleSheet(header_style)
-        # --- 4. Llenar la tabla con los datos ---
+        # --- 3. Formato de las celdas ---
         money_columns = ["Approved\nBudget", f"Accumulated\nExecuted Cost ({month})", "Forecast\nCost (December)", "Cost\nBalance"]
-        
-        for i in range(num_rows):
-            for j, col in enumerate(display_df.columns):
-                value = display_df.iat[i, j]
-                item_text = ""
-                if isinstance(value, (int, float)):
-                    # Formato con comas y 2 decimales
-                    item_text = f"{value:,.2f}"
+
+        def number_formatter(column):
+            def format_cell(value):
+                # Montos y decimales con comas y 2 decimales; el resto de enteros tal cual
+                is_integer = isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+                if isinstance(value, float) or (is_integer and column in money_columns):
+                    text = f"{value:,.2f}"
                     # Añadir símbolo de dólar si es una columna de dinero
-                    if col in money_columns:
-                        item_text = f"${item_text}"
-                else:
-                    item_text = str(value)
-                
-                item = QTableWidgetItem(item_text)
-
-                # Estilo para la primera columna (azul, texto blanco y negrita)
-                if j == 0:
-                    font = item.font()
-                    font.setBold(True)
-                    item.setFont(font)
-                    item.setBackground(QColor(40, 116, 166))  # Azul oscuro
-                    item.setForeground(Qt.white)
-                # Estilo para valores negativos (rojo suave)
-                elif pd.api.types.is_number(value) and value < 0:
-                    item.setForeground(QColor(204, 41, 54))  # Rojo suave
-
-                self.table_widget.setItem(i, j, item)
-
-        # --- 5. Llenar la fila de totales ---
-        
-        total_row_index = num_rows
+                    return f"${text}" if column in money_columns else text
+                return str(value)
+            return format_cell
 
+        # --- 4. Fila de totales ---
         # Calcular porcentajes para los balances
         total_planned_activities = totals.get("Planned\nActivities", 0)
         total_approved_budget = totals.get("Approved\nBudget", 0)
@@ -123,43 +97,52 @@ class LeaderSummaryReportView(QDialog):
         if total_approved_budget != 0:
             cost_balance_percentage = (total_cost_balance / total_approved_budget) * 100
 
-        for j, col in enumerate(display_df.columns):
-            item_text = ""
+        total_row = {}
+        for col in display_df.columns:
+            text = ""
             if col in totals:
-                value = totals[col]
                 if col == "Resource\nName":
-                    item_text = str(value)
+                    text = str(totals[col])
                 else:
-                    # Formato con comas y 2 decimales
-                    item_text = f"{value:,.2f}"
-                    # Añadir símbolo de dólar si es una columna de dinero
-                    if col in money_columns:
-                        item_text = f"${item_text}"
-
+                    text = number_formatter(col)(float(totals[col]))
             # Añadir el porcentaje a las celdas de balance
             if col == "Activities\nBalance":
-                item_text += f" ({activities_balance_percentage:.2f}%)"
+                text += f" ({activities_balance_percentage:.2f}%)"
             elif col == "Cost\nBalance":
-                item_text += f" ({cost_balance_percentage:.2f}%)"
-
-            item = QTableWidgetItem(item_text)
-            
-            # Estilo para la fila de totales (verde, texto en negrita)
-            font = item.font()
-            font.setBold(True)
-            item.setFont(font)
-            item.setBackground(QColor(212, 239, 223)) # Verde claro
-
-            # Estilo para valores negativos en la fila de totales
+                text += f" ({cost_balance_percentage:.2f}%)"
+            total_row[col] = text
+        table_df = pd.concat([display_df, pd.DataFrame([total_row])], ignore_index=True)
+
+        # --- 5. Cargar el modelo ---
+        self.model.formatters = {col: number_formatter(col) for col in display_df.columns}
+        self.model.set_data(table_df)
+        # Estilo para la primera columna (azul, texto blanco y negrita)
+        self.model.set_column_style(0, background=QColor(40, 116, 166), foreground=Qt.white, bold=True)
+        # Estilo para la fila de totales (verde, texto en negrita)
+        total_row_index = len(display_df)
+        self.model.set_row_style(total_row_index, background=QColor(212, 239, 223), bold=True)
+        for j, col in enumerate(display_df.columns):
+            # Valores negativos en la fila de totales
             if col in totals and pd.api.types.is_number(totals[col]) and totals[col] < 0:
-                item.setForeground(QColor(204, 41, 54)) # Rojo suave
-
-            self.table_widget.setItem(total_row_index, j, item)
+                self.model.set_cell_style(total_row_index, j, foreground=QColor(204, 41, 54))
+            elif j == 0:
+                self.model.set_cell_style(total_row_index, j, foreground=Qt.black)
 
+        # Estilo para la cabecera (azul, texto blanco y negrita)
+        header_style = """
+            QHeaderView::section {
+                background-color: #2874A6; /* QColor(40, 116, 166) */
+                color: white;
+                padding: 4px;
+                border: 1px solid #6c757d;
+                font-weight: bold;
+            }
+        """
+        self.table_view.horizontalHeader().setStyleSheet(header_style)
         # Ajustar el tamaño de las columnas para que se estiren y el texto se divida en dos líneas.
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table_widget.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table_widget.resizeRowsToContents()
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_view.resizeRowsToContents()
 
     def export_to_excel(self):
         file_path, _ = QFileDialog.getSaveFileName(
@@ -168,20 +151,14 @@ class LeaderSummaryReportView(QDialog):
         if file_path:
             try:
                 # Obtener encabezados de la tabla
-                column_headers = []
-                for j in range(self.table_widget.columnCount()):
-                    header_text = self.table_widget.horizontalHeaderItem(j).text()
-                    # Reemplazar saltos de línea para nombres de columna más limpios en Excel
-                    column_headers.append(header_text.replace('\n', ' '))
+                # Reemplazar saltos de línea para nombres de columna más limpios en Excel
+                column_headers = [str(col).replace('\n', ' ') for col in self.model.columns]
 
                 # Extraer datos de la tabla, incluyendo la fila de totales
-                data = []
-                for i in range(self.table_widget.rowCount()):
-                    row_data = []
-                    for j in range(self.table_widget.columnCount()):
-                        item = self.table_widget.item(i, j)
-                        row_data.append(item.text() if item else '')
-                    data.append(row_data)
+                data = [
+                    [self.model.display_text(i, j) for j in range(self.model.columnCount())]
+                    for i in range(self.model.rowCount())
+                ]
 
                 # Crear un DataFrame con los datos visualizados
                 df_to_export = pd.DataFrame(data, columns=column_headers)
@@ -214,7 +191,7 @@ class LeaderSummaryReportView(QDialog):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            self.table_widget.setEnabled(False) # Deshabilitar tabla mientras carga
+            self.table_view.setEnabled(False) # Deshabilitar tabla mientras carga
             QApplication.setOverrideCursor(Qt.WaitCursor)
             
             new_df = self.controller.refresh_leader_summary_data()
@@ -222,5 +199,5 @@ class LeaderSummaryReportView(QDialog):
             self.populate_table() # Redibuja la tabla con los nuevos datos
             
             QApplication.restoreOverrideCursor()
-            self.table_widget.setEnabled(True)
+            self.table_view.setEnabled(True)
             QMessageBox.information(self, "Success", "Report data has been refreshed.")
@@ -1,8 +1,21 @@
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QDialog, QVBoxLayout, QHBoxLayout,
     QPushButton, QMessageBox, QComboBox, QLabel
 )
 from PyQt5.QtCore import Qt
+import pandas as pd
+from views.dataframe_table_model import DataFrameTableModel, create_table_view
+from views.edit_batcher import EditBatcher, RunningTotal
+from views.save_feedback import show_save_result
+
+PLANNED_COLUMN = "Planned Activities"
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
 
 
 class ManualPlanningView(QDialog):
@@ -17,7 +30,13 @@ class ManualPlanningView(QDialog):
 
         # Widgets principales
         self.line_combo = QComboBox()
-        self.table = QTableWidget()
+        self.model = DataFrameTableModel(
+            parsers={PLANNED_COLUMN: lambda text: int(str(text).strip())},
+            editable=[PLANNED_COLUMN],
+            alignments={PLANNED_COLUMN: Qt.AlignmentFlag.AlignCenter},
+            invalid_tooltip="Value must be an integer."
+        )
+        self.table = create_table_view(self.model)
         self.save_button = QPushButton("Save Data")
         self.total_label = QLabel()
         self.approved_label = QLabel()  # NUEVO: Label para mostrar actividades aprobadas
@@ -25,11 +44,14 @@ class ManualPlanningView(QDialog):
         self.total_label.setStyleSheet("font-weight: bold; font-size: 14px; margin: 8px;")
         self.approved_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
         self.approved_label.setStyleSheet("font-weight: bold; font-size: 14px; margin: 8px;")
+        self.planned_total = RunningTotal()
+        self._approved_cache = {}
+        self.label_batcher = EditBatcher(self.update_total_label, delay_ms=150, parent=self)
         
         # Conectar señales
         self.line_combo.currentTextChanged.connect(self.on_line_changed)
         self.save_button.clicked.connect(self.save_changes)
-        self.table.itemChanged.connect(self.update_total_label)
+        self.model.cell_edited.connect(self.on_cell_edited)
         
         # Configurar UI
         layout = QVBoxLayout(self)
@@ -45,13 +67,15 @@ class ManualPlanningView(QDialog):
 
     def get_approved_activities(self, line_title):
         """Obtiene el número de actividades aprobadas para la línea y año actual"""
+        if line_title in self._approved_cache:
+            return self._approved_cache[line_title]
         from datetime import datetime
         year = datetime.now().year
         df = self.approved_service.dataframe
         filtered = df[(df['year'] == year) & (df['line_name'] == line_title)]
-        if not filtered.empty:
-            return int(filtered.iloc[-1]['approved_activities'])
-        return None
+        approved = int(filtered.iloc[-1]['approved_activities']) if not filtered.empty else None
+        self._approved_cache[line_title] = approved
+        return approved
 
     def setup_combo(self):
         """Configura el combobox con las líneas de campo disponibles"""
@@ -78,32 +102,25 @@ class ManualPlanningView(QDialog):
     def setup_table(self):
         data = self.service.get_data_as_list()
         columns = self.service.get_columns()
+        self.model.set_data(pd.DataFrame(data, columns=columns))
+        values = self.model.column_values(PLANNED_COLUMN) if PLANNED_COLUMN in self.model.columns else []
+        self.planned_total.reset(_as_int(value) for value in values)
+        self.update_total_label()
 
-        self.table.setColumnCount(len(columns))
-        self.table.setHorizontalHeaderLabels(columns)
-        self.table.setRowCount(len(data))
-
-        for row_index, row in enumerate(data):
-            # Month (read-only)
-            month_item = QTableWidgetItem(row["Month"])
-            month_item.setFlags(month_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
-            self.table.setItem(row_index, 0, month_item)
+    def on_cell_edited(self, row, col, value):
+        """Ajusta el total con la diferencia de la celda editada y agenda el refresco del label."""
+        if self.model.column_name(col) != PLANNED_COLUMN:
+            return
+        self.planned_total.set(row, 0 if self.model.is_invalid(row, col) else _as_int(value))
+        self.label_batcher.submit(row)
 
-            # Planned Activities (editable)
-            activity_item = QTableWidgetItem(str(row["Planned Activities"]))
-            activity_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row_index, 1, activity_item)
-        self.update_total_label()
+    def get_planned_total(self):
+        """Suma de Planned Activities; los valores no enteros cuentan como 0."""
+        return int(self.planned_total.total)
 
-    def update_total_label(self):
-        """Actualiza el label con la suma total de Planned Activities en tiempo real"""
-        total = 0
-        for row in range(self.table.rowCount()):
-            try:
-                value = int(self.table.item(row, 1).text())
-            except (ValueError, AttributeError):
-                value = 0
-            total += value
+    def update_total_label(self, *args):
+        """Actualiza el label con la suma total de Planned Activities"""
+        total = self.get_planned_total()
         line_title = self.line_combo.currentText()
         approved = self.get_approved_activities(line_title)
         if approved is not None:
@@ -122,47 +139,39 @@ class ManualPlanningView(QDialog):
         if not current_line:
             QMessageBox.warning(self, "No Selection", "Please select a field line first.")
             return
-        total = 0
-        for row in range(self.table.rowCount()):
-            try:
-                value = int(self.table.item(row, 1).text())
-            except (ValueError, AttributeError):
-                value = 0
-            total += value
+        self.label_batcher.flush()
+        total = self.get_planned_total()
         approved = self.get_approved_activities(current_line)
         if approved is not None and total > approved:
             QMessageBox.warning(self, "Warning", f" The total of planned activities({total}) exceeds the approved activities({approved}).")
             return
-        for row in range(self.table.rowCount()):
-            month = self.table.item(row, 0).text()
+        planned_col = self.model.column_index(PLANNED_COLUMN)
+        for row in range(self.model.rowCount()):
+            month = self.model.value(row, 0)
             try:
-                value = int(self.table.item(row, 1).text())
-            except ValueError:
+                value = int(self.model.value(row, planned_col))
+            except (TypeError, ValueError):
                 QMessageBox.warning(self, "Invalid Input", f"Value in row {row + 1} must be an integer.")
                 return
             self.service.update_row(month, value)
         self.service.save_to_csv()
-        QMessageBox.information(self, "Success", f"Manual planning data saved successfully for {current_line}.")
+        show_save_result(self, self.service.CSV_PATH, "Success", f"Manual planning data saved successfully for {current_line}.")
 
     def closeEvent(self, event):
         """Sobrescribe el evento de cierre para validar antes de cerrar"""
         current_line = self.line_combo.currentText()
         if current_line:
             # Validar que todos los valores sean enteros válidos
-            for row in range(self.table.rowCount()):
-                try:
-                    int(self.table.item(row, 1).text())
-                except (ValueError, AttributeError):
-                    reply = QMessageBox.question(
-                        self, 
-                        "Unsaved Changes", 
-                        "There are invalid values in the table. Do you want to close without saving?",
-                        QMessageBox.Yes | QMessageBox.No,
-                        QMessageBox.No
-                    )
-                    if reply == QMessageBox.No:
-                        event.ignore()
-                        return
-                    break
+            if self.model.has_invalid_cells:
+                reply = QMessageBox.question(
+                    self, 
+                    "Unsaved Changes", 
+                    "There are invalid values in the table. Do you want to close without saving?",
+                    QMessageBox.Yes | QMessageBox.No,
+                    QMessageBox.No
+                )
+                if reply == QMessageBox.No:
+                    event.ignore()
+                    return
         
         event.accept()
@@ -1,9 +1,15 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QColor
 from calendar import month_name
 
+import numpy as np
 import pandas as pd
+from views.dataframe_table_model import DataFrameTableModel, create_table_view
+
+READ_ONLY_COLOR = QColor(240, 240, 240)
+REAL_DATA_COLOR = QColor(230, 255, 230)
+
 
 class PlanningTableWidget(QWidget):
     # Señal que se emitirá cuando el usuario edite una celda
@@ -12,8 +18,9 @@ class PlanningTableWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         
-        # El widget principal es la tabla
-        self.table = QTableWidget()
+        # El widget principal es la tabla, respaldada por un modelo virtual
+        self.model = DataFrameTableModel()
+        self.table = create_table_view(self.model)
         
         # --- Configuración inicial de la tabla ---
         self.table.horizontalHeader().setStretchLastSection(True)
@@ -24,160 +31,107 @@ class PlanningTableWidget(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.table)
         
-        # Conectar la señal interna de la tabla a un método nuestro
-        self.table.itemChanged.connect(self._on_item_changed)
+        # Conectar la señal interna del modelo a un método nuestro
+        self.model.cell_edited.connect(self._on_cell_edited)
 
     def update_view(self, view_data: dict):
         """
         Método principal para redibujar toda la tabla con nuevos datos y configuración.
         """
-        # Bloqueamos las señales para evitar que 'itemChanged' se dispare mientras llenamos la tabla
-        self.table.blockSignals(True)
-        
-        # --- Llenado de datos (antes en _setup_table) ---
         data = view_data.get("data_list", [])
         columns = view_data.get("columns", [])
-        
-        self.table.setColumnCount(len(columns))
-        self.table.setRowCount(len(data))
-        self.table.setHorizontalHeaderLabels(columns)
-
-        for row_idx, row_data in enumerate(data):
-            for col_idx, col_name in enumerate(columns):
-                value = row_data.get(col_name, 0)
-                if col_name == "Scheduled Activities":
-                    try:
-                        value = int(float(value))
-                    except (ValueError, TypeError):
-                        value = 0
-                item = QTableWidgetItem(str(value)) # Ahora 'value' ya es un entero
-                if col_name != "Month":
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row_idx, col_idx, item)
-
-        self._apply_real_data(view_data)
 
+        df = pd.DataFrame(data).reindex(columns=columns, fill_value=0)
+        if "Scheduled Activities" in df.columns:
+            df["Scheduled Activities"] = pd.to_numeric(df["Scheduled Activities"], errors="coerce").fillna(0).astype(int)
+        df = df.astype(object)
+        self._apply_real_data(df, view_data)
+
+        self.model.alignments = {col: Qt.AlignmentFlag.AlignCenter for col in columns if col != "Month"}
+        self.model.set_data(df)
         self._configure_all_cells(view_data)
 
         self.table.resizeColumnsToContents()
         self.table.resizeRowsToContents()
         header_height = self.table.horizontalHeader().height()
-        row_height = self.table.rowHeight(0) if self.table.rowCount() > 0 else 20
-        total_height = header_height + (row_height * self.table.rowCount()) + 4
+        row_height = self.table.rowHeight(0) if self.model.rowCount() > 0 else 20
+        total_height = header_height + (row_height * self.model.rowCount()) + 4
         self.setMinimumHeight(total_height)
-        
-        # Desbloqueamos las señales
-        self.table.blockSignals(False)
+
+    def column_name(self, col: int) -> str:
+        """Nombre de la columna en la posición col."""
+        return self.model.column_name(col)
+
+    def get_column_texts(self, column_name: str) -> list:
+        """Textos mostrados en una columna, en el orden de la tabla."""
+        col_idx = self.model.column_index(column_name)
+        return [self.model.display_text(row, col_idx) for row in range(self.model.rowCount())]
+
+    def _numeric_column(self, column_name: str) -> np.ndarray:
+        if column_name not in self.model.columns:
+            return np.zeros(self.model.rowCount())
+        values = pd.to_numeric(pd.Series(self.model.column_values(column_name)), errors="coerce")
+        return values.fillna(0).to_numpy(dtype=float)
 
     def get_column_totals(self, last_month_index: int):
         """
         Calcula los totales. Suma 'Planned Activities' de todas las filas,
         pero 'Scheduled Activities' solo de las filas futuras (editables).
         """
-        planned_total = 0
-        scheduled_total = 0
-        
-        columns = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
-        
-        for row in range(self.table.rowCount()):
-            try:
-                # Planned Activities siempre se suma
-                if "Planned Activities" in columns:
-                    planned_idx = columns.index("Planned Activities")
-                    item = self.table.item(row, planned_idx)
-                    if item and item.text():
-                        planned_total += int(float(item.text()))
-                
-                # Scheduled Activities solo se suma para meses futuros
-                if "Scheduled Activities" in columns:
-                    # --- LÓGICA CORREGIDA ---
-                    if row > last_month_index:
-                        scheduled_idx = columns.index("Scheduled Activities")
-                        item = self.table.item(row, scheduled_idx)
-                        if item and item.text():
-                            scheduled_total += float(item.text())
-            except (ValueError, AttributeError):
-                continue
-                
+        planned = self._numeric_column("Planned Activities")
+        scheduled = self._numeric_column("Scheduled Activities")
+        planned_total = int(planned.astype(int).sum())
+        scheduled_total = scheduled[last_month_index + 1:].sum()
         return planned_total, int(scheduled_total)
 
     def get_column_sum(self, column_name: str) -> float:
         """Suma todos los valores numéricos de una columna específica."""
-        total = 0.0
-        
-        try:
-            columns = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
-            if column_name not in columns:
-                return total
-
-            col_idx = columns.index(column_name)
-            for row in range(self.table.rowCount()):
-                item = self.table.item(row, col_idx)
-                if item and item.text():
-                    total += float(item.text())
-        except (ValueError, TypeError):
-            # Ignorar si un valor no es numérico
-            pass
-            
-        return total
-
-    def _apply_real_data(self, view_data: dict):
+        return float(self._numeric_column(column_name).sum())
+
+    def _apply_real_data(self, df: pd.DataFrame, view_data: dict):
         """Aplica los datos históricos a las columnas de Forecast y Scheduled."""
         last_month_index = view_data.get("last_month_index", -1)
         if last_month_index == -1:
             return
 
-        columns = view_data.get("columns", [])
-        
         # Aplicar costos reales a Forecast
-        if "Forecast" in columns:
+        if "Forecast" in df.columns:
             real_costs = view_data.get("real_costs", pd.Series(dtype=float))
-            col_idx = columns.index("Forecast")
-            for i in range(last_month_index + 1):
-                if i < len(real_costs):
-                    item = self.table.item(i, col_idx)
-                    # Accedemos directamente a la Serie por su índice
-                    item.setText(str(round(real_costs.iloc[i], 2)))
+            rows = min(last_month_index + 1, len(real_costs), len(df))
+            col_idx = df.columns.get_loc("Forecast")
+            for i in range(rows):
+                df.iat[i, col_idx] = round(real_costs.iloc[i], 2)
 
         # Aplicar actividades ejecutadas a Scheduled Activities
-        if "Scheduled Activities" in columns:
+        if "Scheduled Activities" in df.columns:
             executed_activities_df = view_data.get("executed_activities", pd.DataFrame())
-            col_idx = columns.index("Scheduled Activities")
-            # --- LÓGICA CORREGIDA ---
-            for i in range(last_month_index + 1):
-                if i < len(executed_activities_df):
-                    item = self.table.item(i, col_idx)
-                    # Primero accedemos a la columna (que es una Serie) y luego al índice de la fila
-                    activity_value = executed_activities_df['Executed Activities'].iloc[i]
-                    item.setText(str(activity_value))
+            rows = min(last_month_index + 1, len(executed_activities_df), len(df))
+            col_idx = df.columns.get_loc("Scheduled Activities")
+            for i in range(rows):
+                df.iat[i, col_idx] = executed_activities_df['Executed Activities'].iloc[i]
 
     def _configure_all_cells(self, view_data):
-        """Recorre todas las celdas y aplica las reglas de edicion y color."""
+        """Aplica las reglas de edición y color por columna y por fila."""
         last_month_index = view_data.get("last_month_index", -1)
         editable_columns = view_data.get("editable_columns", [])
-        
-        for row_idx in range(self.table.rowCount()):
-            for col_idx in range(self.table.columnCount()):
-                item = self.table.item(row_idx, col_idx)
-                col_name = self.table.horizontalHeaderItem(col_idx).text()
-                
-                # Lógica de configuración
-                if col_name == "Month":
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    item.setBackground(QColor(240, 240, 240))
-                elif col_name in ["Forecast", "Scheduled Activities"]:
-                    if row_idx > last_month_index:
-                        pass 
-                    else:
-                        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                        color = QColor(230, 255, 230)
-                        item.setBackground(color)
-                elif col_name in editable_columns:
-                    pass # Editable
-                else:
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    item.setBackground(QColor(240, 240, 240))
-
-    def _on_item_changed(self, item):
-        """Captura la señal interna y emite nuestra propia señal más limpia."""
-        self.item_edited.emit(item.row(), item.column(), item.text())
\ No newline at end of file
+        rows, cols = self.model.rowCount(), self.model.columnCount()
+        editable = np.zeros((rows, cols), dtype=bool)
+
+        for col_idx, col_name in enumerate(self.model.columns):
+            if col_name == "Month":
+                self.model.set_column_style(col_idx, background=READ_ONLY_COLOR)
+            elif col_name in ["Forecast", "Scheduled Activities"]:
+                # Meses con datos reales: solo lectura; meses futuros: editables
+                editable[last_month_index + 1:, col_idx] = True
+                for row_idx in range(min(last_month_index + 1, rows)):
+                    self.model.set_cell_style(row_idx, col_idx, background=REAL_DATA_COLOR)
+            elif col_name in editable_columns:
+                editable[:, col_idx] = True
+            else:
+                self.model.set_column_style(col_idx, background=READ_ONLY_COLOR)
+
+        self.model.set_editable(editable)
+
+    def _on_cell_edited(self, row, col, value):
+        """Captura la edición del modelo y emite nuestra propia señal más limpia."""
+        self.item_edited.emit(row, col, str(value))
@@ -6,6 +6,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFontMetrics
 from PyQt5.QtCore import Qt, pyqtSignal
 from services.field_lines_services.quote_extractor_service import QuoteExtractorService, MONTHS, VALIDATIONS
+from utils.progress import OperationCancelled
+from views.progress_dialog import CancellableProgressDialog
 from datetime import datetime
 import random
 
@@ -71,24 +73,38 @@ class QuoteExtractorView(QDialog):
 
     def load_pdfs(self):
         rutas, _ = QFileDialog.getOpenFileNames(self, "Select PDF of Quote", "", "PDF Files (*.pdf)")
-        for ruta in rutas:
-            datos = self.service.extract_data_from_pdf(ruta)
+        if not rutas:
+            return
+
+        dialog = CancellableProgressDialog("Reading quotes", self)
+        dialog.show()
+        try:
+            extracted = self.service.extract_data_from_pdfs(rutas, progress=dialog.progress)
+        except OperationCancelled:
+            return
+        finally:
+            dialog.close()
+
+        quotes_in_table = {
+            self.tabla.item(row, 0).text()
+            for row in range(self.tabla.rowCount())
+            if self.tabla.item(row, 0)
+        }
+        for ruta, datos, error in extracted:
+            if error is not None:
+                QMessageBox.warning(self, "Invalid PDF", f"The file '{ruta}' could not be read: {error}")
+                continue
             quote_number = datos.get("Quote Number")
 
             if not quote_number:
                 QMessageBox.warning(self, "Invalid PDF", f"The file '{ruta}' does not have the 'Quote Number' column'. It will be ommited.")
                 continue
 
-            if any(
-                self.tabla.item(row, 0) and self.tabla.item(row, 0).text() == quote_number
-                for row in range(self.tabla.rowCount())
-            ):
-                continue
-
-            if quote_number in self.service.dataframe["Quote Number"].astype(str).values:
+            if quote_number in quotes_in_table or self.service.has_quote(quote_number):
                 continue
 
             self.add_row_to_table(datos)
+            quotes_in_table.add(quote_number)
 
         self.sort_table_by_date()
         self.data_changed.emit() # Notificar al final
@@ -150,9 +166,7 @@ class QuoteExtractorView(QDialog):
                 quote_numbers_a_eliminar.append(item.text())
             self.tabla.removeRow(fila)
 
-        self.service.dataframe = self.service.dataframe[
-            ~self.service.dataframe["Quote Number"].astype(str).isin(quote_numbers_a_eliminar)
-        ].reset_index(drop=True)
+        self.service.delete_quotes(quote_numbers_a_eliminar)
         self.data_changed.emit() # Notificar al final
 
     def save_csv(self):
@@ -185,15 +199,11 @@ class QuoteExtractorView(QDialog):
         except Exception as e:
             print("[WARN] No se pudo ordenar registros para guardar:", e)
 
-        for reg in registros:
-            self.service.add_or_update_entry(reg)
+        self.service.add_or_update_entries(registros)
 
         try:
-            # Guardar como texto, no como datetime
-            df = self.service.dataframe.copy()
-            if "Quote Effective Date" in df.columns:
-                df["Quote Effective Date"] = df["Quote Effective Date"].astype(str)
-            df.to_csv(self.service.CSV_PATH, index=False)
+            # Solo se agregan al diario las filas que cambiaron
+            self.service.save_changes()
             QMessageBox.information(self, "Saved", "Path saved succesfully.")
         except PermissionError:
             QMessageBox.critical(self, "Access Error", "You must close any cotitation file before do any action.")
@@ -132,15 +132,11 @@ class SouthZoneQuoteExtractorView(QuoteExtractorView):
         except Exception as e:
             print("[WARN] No se pudo ordenar registros para guardar:", e)
 
-        for reg in registros:
-            self.service.add_or_update_entry(reg)
+        self.service.add_or_update_entries(registros)
 
         try:
-            # Guardar como texto, no como datetime
-            df = self.service.dataframe.copy()
-            if "Quote Effective Date" in df.columns:
-                df["Quote Effective Date"] = df["Quote Effective Date"].astype(str)
-            df.to_csv(self.service.CSV_PATH, index=False)
+            # Solo se agregan al diario las filas que cambiaron
+            self.service.save_changes()
             QMessageBox.information(self, "Saved", f"Path for {self.current_line} saved successfully.")
         except PermissionError:
             QMessageBox.critical(self, "Access Error", "You must close any quotation file before do any action.")
\ No newline at end of file
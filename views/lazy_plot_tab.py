@@ -0,0 +1,109 @@
+import pickle
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt, pyqtSignal
+
+
+class LazyPlotTab(QWidget):
+    """
+    Pestaña de reporte que crea su PlotView (lienzo y lista de desviaciones)
+    recién cuando se activa por primera vez.
+
+    release() destruye el PlotView y guarda la figura serializada (pickle),
+    de modo que una pestaña oculta no retiene lienzo ni figura en memoria;
+    al volver a activarla se reconstruye desde esos datos, conservando los
+    comentarios escritos.
+    """
+    # Se emite con el PlotView cada vez que se construye
+    view_created = pyqtSignal(object)
+
+    def __init__(self, graph, deviations, controller, title="Plot View", deviation_type="default", parent=None):
+        super().__init__(parent)
+        self.graph = graph
+        self.deviations = deviations
+        self.controller = controller
+        self.title = title
+        self.deviation_type = deviation_type
+        self.plot_view = None
+        self._graph_bytes = None
+        self._comments = None
+        self._reconnect_interactions = False
+
+        self._layout = QVBoxLayout(self)
+        self._placeholder = QLabel(f"{title}\n\nCargando gráfico...")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._layout.addWidget(self._placeholder)
+
+    @property
+    def is_rendered(self) -> bool:
+        return self.plot_view is not None
+
+    def render(self):
+        """Construye el PlotView si aún no existe."""
+        if self.plot_view is not None:
+            return
+        from views.plot_view import PlotView
+
+        if self.graph is None and self._graph_bytes is not None:
+            self.graph = pickle.loads(self._graph_bytes)
+            self._graph_bytes = None
+            self._reconnect_interactions = True
+
+        self.plot_view = PlotView(self, self.graph, self.deviations, self.controller,
+                                  title=self.title, deviation_type=self.deviation_type)
+        # Los eventos del gráfico no se serializan: volver a conectarlos al nuevo lienzo
+        layer = getattr(self.graph, "interactive_layer", None)
+        if self._reconnect_interactions and layer is not None:
+            layer.connect()
+        self._reconnect_interactions = False
+        if self._comments is not None:
+            self.plot_view.comments_edit.setPlainText(self._comments)
+        self._placeholder.setVisible(False)
+        self._layout.addWidget(self.plot_view)
+        self.view_created.emit(self.plot_view)
+
+    def release(self):
+        """
+        Libera el lienzo y la figura; la pestaña vuelve a ser un marcador.
+
+        Si la figura no se puede serializar se conserva en memoria y solo se
+        libera el lienzo.
+        """
+        if self.plot_view is None:
+            return
+        # El PlotView puede haber regenerado el reporte: tomar sus datos actuales
+        self.graph = self.plot_view.graph
+        self.deviations = self.plot_view.deviations
+        self.deviation_type = self.plot_view.deviation_type
+        self._comments = self.plot_view.comments_edit.toPlainText()
+
+        self._layout.removeWidget(self.plot_view)
+        self.plot_view.deleteLater()
+        self.plot_view = None
+        self._placeholder.setVisible(True)
+
+        try:
+            self._graph_bytes = pickle.dumps(self.graph)
+        except Exception as e:
+            print(f"⚠️ No se pudo serializar el gráfico de '{self.title}'; se mantiene en memoria: {e}")
+            return
+        close_figure(self.graph)
+        self.graph = None
+
+    def discard(self):
+        """Libera todo al quitar la pestaña."""
+        if self.plot_view is not None:
+            self.graph = self.plot_view.graph
+        close_figure(self.graph)
+        self.graph = None
+        self._graph_bytes = None
+
+
+def close_figure(figure):
+    """Quita la figura del registro de pyplot para que se pueda liberar."""
+    if figure is None:
+        return
+    try:
+        import matplotlib.pyplot as plt
+        plt.close(figure)
+    except Exception as e:
+        print(f"⚠️ No se pudo cerrar la figura: {e}")
@@ -3,18 +3,36 @@ from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QScrollArea, QAction, QMenu, QMenuBar,
     QDialog, QTableWidget, QTableWidgetItem,
-    QFileDialog, QMessageBox, QTableWidget, QAbstractScrollArea, QGroupBox
+    QFileDialog, QMessageBox, QTableWidget, QAbstractScrollArea, QGroupBox, QInputDialog, QTabWidget
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from views.catalog_viewer import CatalogViewerDialog
+from views.progress_dialog import CancellableProgressDialog
+from views.diagnostics_view import DiagnosticsView
+from utils.write_behind import get_write_behind_queue
+from utils.diagnostics import get_diagnostics_sink
+from utils.capabilities import format_capability_report
+from views.edit_batcher import EditBatcher
+from views.lazy_plot_tab import LazyPlotTab
+
+# Pestañas de reportes que mantienen su gráfico dibujado a la vez
+MAX_RENDERED_PLOTS = 3
 
 class MainWindow(QMainWindow):
+    # Estado de la cola de escritura diferida: (guardados pendientes, escrituras fallidas)
+    save_state_changed = pyqtSignal(int, int)
+
     def __init__(self, controller):
         super().__init__()
         self.controller = controller
         self.comments_by_title = {}  # Para guardar comentarios por título
 
         self.init_ui()
+        self.save_state_changed.connect(self.on_save_state_changed)
+        # La cola notifica desde su hilo; la señal lleva el aviso al hilo de la interfaz
+        get_write_behind_queue().add_listener(
+            lambda pending_count, errors: self.save_state_changed.emit(pending_count, len(errors))
+        )
 
     def init_ui(self):
         self.setWindowTitle("Pronóstico de Presupuesto")
@@ -68,9 +86,14 @@ class MainWindow(QMainWindow):
 
         export_all_button = QPushButton("Exportar todos los slides")
         export_all_button.setMinimumHeight(40)
-        export_all_button.clicked.connect(self.controller.generate_all_slides)
+        export_all_button.clicked.connect(self.on_export_all_slides_clicked)
         button_layout.addWidget(export_all_button)
 
+        multi_year_button = QPushButton("Comparativo multi-año")
+        multi_year_button.setMinimumHeight(40)
+        multi_year_button.clicked.connect(self.on_multi_year_clicked)
+        button_layout.addWidget(multi_year_button)
+
         button_layout.addStretch()
 
         button_group.setLayout(button_layout)
@@ -80,12 +103,41 @@ class MainWindow(QMainWindow):
         self.plot_layout = QVBoxLayout(self.plot_frame)
         self.plot_layout.setContentsMargins(10, 10, 10, 10)
         self.plot_layout.setSpacing(10)
+        # Una pestaña por reporte; cada gráfico se dibuja al abrir su pestaña
+        self.plot_tabs = QTabWidget()
+        self.plot_tabs.currentChanged.connect(self.on_plot_tab_changed)
+        self.plot_layout.addWidget(self.plot_tabs)
+        self._rendered_plot_tabs = []  # Pestañas dibujadas, de la menos a la más reciente
         # 🔽 Ocultar inicialmente
         self.plot_frame.setVisible(False)
         self.scroll_layout.addWidget(self.plot_frame)
 
         self.setCentralWidget(central_widget)
 
+    def on_save_state_changed(self, pending_count, error_count):
+        """Muestra en la barra de estado los guardados pendientes o fallidos."""
+        if error_count:
+            self.statusBar().showMessage(f"⚠️ {error_count} archivo(s) no se pudieron guardar; revise que no estén abiertos.")
+        elif pending_count:
+            self.statusBar().showMessage(f"Guardando {pending_count} archivo(s)...")
+        else:
+            self.statusBar().showMessage("✅ Cambios guardados", 3000)
+
+    def closeEvent(self, event):
+        """Antes de cerrar, escribe los guardados que sigan en cola."""
+        queue = get_write_behind_queue()
+        if queue.has_pending:
+            self.statusBar().showMessage("Guardando cambios pendientes...")
+            if not queue.flush(timeout=30):
+                answer = QMessageBox.question(
+                    self, "Guardado pendiente",
+                    "Algunos cambios todavía no se han guardado. ¿Cerrar de todos modos?"
+                )
+                if answer != QMessageBox.Yes:
+                    event.ignore()
+                    return
+        super().closeEvent(event)
+
     def setup_menu(self):
         menubar = self.menuBar()
 
@@ -155,6 +207,27 @@ class MainWindow(QMainWindow):
         forecast_plan_action.triggered.connect(self.controller.open_forecasted_activity_plan_editor)
         tools_menu.addAction(forecast_plan_action)
 
+        diagnostics_menu = QMenu("Diagnóstico", self)
+        tools_menu.addMenu(diagnostics_menu)
+
+        self.diagnostics_action = QAction("Capturar datos intermedios", self)
+        self.diagnostics_action.setCheckable(True)
+        self.diagnostics_action.setChecked(get_diagnostics_sink().enabled)
+        self.diagnostics_action.toggled.connect(self.on_diagnostics_toggled)
+        diagnostics_menu.addAction(self.diagnostics_action)
+
+        diagnostics_view_action = QAction("Ver datos capturados", self)
+        diagnostics_view_action.triggered.connect(self.open_diagnostics_view)
+        diagnostics_menu.addAction(diagnostics_view_action)
+
+        release_plots_action = QAction("Liberar gráficos ocultos", self)
+        release_plots_action.triggered.connect(self.release_hidden_plots)
+        diagnostics_menu.addAction(release_plots_action)
+
+        capabilities_action = QAction("Dependencias opcionales", self)
+        capabilities_action.triggered.connect(self.show_capabilities)
+        diagnostics_menu.addAction(capabilities_action)
+
         # Nuevo menú Herramientas - Campo
         field_tools_menu = menubar.addMenu("Field Tools")
 
@@ -219,21 +292,53 @@ class MainWindow(QMainWindow):
         field_tools_menu.addAction(lead_summary_report_action)
 
     def show_plot_view(self, graph, deviations, title="Plot View", deviation_type="default"):
-        from views.plot_view import PlotView
-        container = QWidget()
-        layout = QVBoxLayout(container)
-        plot_view = PlotView(container, graph, deviations, self.controller,
-                             title=title, deviation_type=deviation_type)
-        layout.addWidget(plot_view)
+        """Agrega la pestaña del reporte; el gráfico se dibuja cuando se abre."""
+        tab = LazyPlotTab(graph, deviations, self.controller, title=title, deviation_type=deviation_type)
+        tab.view_created.connect(lambda plot_view: self._track_comments(title, plot_view))
         # 👇 Mostrar el plot_frame si está oculto
         self.plot_frame.setVisible(True)
-        self.plot_layout.addWidget(container)
+        self.plot_tabs.addTab(tab, title)
+
+    def _track_comments(self, title, plot_view):
         plot_view.comments_edit.textChanged.connect(
             lambda: self.comments_by_title.update({title: plot_view.comments_edit.toPlainText()})
         )
 
+    def on_plot_tab_changed(self, index):
+        """Dibuja la pestaña activada y libera las ocultas más antiguas si hay demasiadas dibujadas."""
+        tab = self.plot_tabs.widget(index)
+        if tab is None:
+            return
+        tab.render()
+        if tab in self._rendered_plot_tabs:
+            self._rendered_plot_tabs.remove(tab)
+        self._rendered_plot_tabs.append(tab)
+        while len(self._rendered_plot_tabs) > MAX_RENDERED_PLOTS:
+            self._rendered_plot_tabs.pop(0).release()
+
+    def release_hidden_plots(self):
+        """Libera los gráficos de todas las pestañas que no están a la vista."""
+        current = self.plot_tabs.currentWidget()
+        for tab in list(self._rendered_plot_tabs):
+            if tab is not current:
+                tab.release()
+                self._rendered_plot_tabs.remove(tab)
+
+    def clear_plot_tabs(self):
+        """Quita todas las pestañas de reportes y libera sus figuras."""
+        self._rendered_plot_tabs.clear()
+        while self.plot_tabs.count():
+            tab = self.plot_tabs.widget(0)
+            self.plot_tabs.removeTab(0)
+            tab.discard()
+            tab.deleteLater()
+        self.plot_frame.setVisible(False)
+
     def get_comments_for_title(self, title):
-        return self.comments_by_title.get(title, "")
+        # Las pestañas que nunca se abrieron muestran los comentarios guardados
+        if title in self.comments_by_title:
+            return self.comments_by_title[title]
+        return self.controller.get_comments_for_title(title)
 
     def show_table(self, data):
         table_dialog = TableDialog(data, self.controller, self)
@@ -243,47 +348,70 @@ class MainWindow(QMainWindow):
         catalog_dialog = CatalogViewerDialog(self)
         catalog_dialog.exec_()
 
+    def on_diagnostics_toggled(self, checked):
+        sink = get_diagnostics_sink()
+        if checked:
+            # Conserva la carpeta Parquet si se activó desde la línea de comandos
+            sink.enable(sink.output_dir)
+        else:
+            sink.disable()
+
+    def open_diagnostics_view(self):
+        diagnostics_dialog = DiagnosticsView(get_diagnostics_sink(), self)
+        diagnostics_dialog.exec_()
+
+    def show_capabilities(self):
+        """Muestra qué dependencias opcionales están instaladas, cargadas o fueron lentas de importar."""
+        QMessageBox.information(self, "Dependencias opcionales", format_capability_report())
+
     def on_generate_reports_clicked(self):
         """Limpia la UI y luego genera los reportes de oficina."""
         print("Limpiando gráficos anteriores (Oficina)...")
-        self.clear_layout(self.plot_layout)
-        self.plot_frame.setVisible(False)
+        self.clear_plot_tabs()
         self.comments_by_title.clear()
-        self.controller.generate_reports()
+        self._run_with_progress("Generando reportes de oficina", self.controller.generate_reports)
 
     def on_generate_field_reports_clicked(self):
         """Limpia la UI y luego genera los reportes de campo."""
         print("Limpiando gráficos anteriores (Campo)...")
-        self.clear_layout(self.plot_layout)
-        self.plot_frame.setVisible(False)
+        self.clear_plot_tabs()
         self.comments_by_title.clear()
-        self.controller.generate_field_reports()
+        self._run_with_progress("Generating field reports", self.controller.generate_field_reports)
 
     def on_generate_leader_line_report_clicked(self):
         """Limpia la UI y luego genera el reporte de líder de línea."""
         print("Limpiando gráficos anteriores (Líder)...")
-        self.clear_layout(self.plot_layout)
-        self.plot_frame.setVisible(False)
+        self.clear_plot_tabs()
         self.comments_by_title.clear()
-        self.controller.generate_leader_line_report()
+        self._run_with_progress("Generating lead field report", self.controller.generate_leader_line_report)
 
-    def clear_layout(self, layout):
-        """
-        Limpia un layout (QLayout) de todos sus widgets, 
-        eliminándolos de forma segura.
-        """
-        if layout is not None:
-            while layout.count():
-                item = layout.takeAt(0)
-                widget = item.widget()
-                if widget is not None:
-                    # Elimina el widget de forma segura
-                    widget.deleteLater()
-                else:
-                    # Maneja el caso de que sea un layout anidado
-                    nested_layout = item.layout()
-                    if nested_layout is not None:
-                        self.clear_layout(nested_layout)
+    def on_export_all_slides_clicked(self):
+        """Exporta todos los slides mostrando el progreso con opción de cancelar."""
+        self._run_with_progress("Exportando slides", lambda progress: self.controller.generate_all_slides(progress=progress))
+
+    def on_multi_year_clicked(self):
+        """Pide los años a comparar y genera el comparativo multi-año."""
+        text, ok = QInputDialog.getText(self, "Comparativo multi-año", "Años separados por coma (ej. 2024, 2025):")
+        if not ok or not text.strip():
+            return
+        try:
+            years = sorted({int(part) for part in text.replace(";", ",").split(",") if part.strip()})
+        except ValueError:
+            QMessageBox.warning(self, "Años inválidos", "Ingrese años numéricos separados por coma.")
+            return
+        self._run_with_progress(
+            "Generando comparativo multi-año",
+            lambda progress: self.controller.generate_multi_year_reports(years, progress=progress)
+        )
+
+    def _run_with_progress(self, title, action):
+        """Ejecuta una acción larga del controlador con un diálogo de progreso cancelable."""
+        dialog = CancellableProgressDialog(title, self)
+        dialog.show()
+        try:
+            action(dialog.progress)
+        finally:
+            dialog.close()
 
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
@@ -296,6 +424,14 @@ class TableDialog(QDialog):
         self.data = data
         self.controller = controller
         self.total_row_idx = len(self.data)
+        # Las ediciones se agrupan y la tabla se recalcula en un hilo de trabajo
+        self.edit_batcher = EditBatcher(
+            self.apply_recalculated_table,
+            delay_ms=400,
+            compute=self.controller.recalculate_capacity_values,
+            on_error=self.show_recalculation_error,
+            parent=self
+        )
         self.init_ui()
 
     def init_ui(self):
@@ -342,6 +478,9 @@ class TableDialog(QDialog):
         self.table_widget.resizeRowsToContents()
         layout.addWidget(self.table_widget)
 
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
         # Botón para exportar como copia
         save_button = QPushButton("Guardar como archivo nuevo...")
         save_button.clicked.connect(self.save_to_excel_as)
@@ -400,11 +539,30 @@ class TableDialog(QDialog):
             QMessageBox.warning(self, "Valor inválido", f"El valor '{value}' no es válido para la columna '{col_name}'.")
             return
 
-        self.controller.update_capacity_value(row, col_name, value_float)
-        self.controller.save_operative_capacity()
+        self.edit_batcher.submit((row, col_name), value_float)
+        self.status_label.setText("⏳ Recalculando...")
+
+    def apply_recalculated_table(self, df):
+        """
+        Publica la tabla recalculada por el hilo de trabajo, la guarda y refresca la vista.
+        """
+        self.controller.apply_capacity_table(df)
         self.data = self.controller.capacity_manager.df
         self.refresh_table()
-        QMessageBox.information(self, "Guardado automático", "✅ Los cambios se guardaron en el archivo original.")
+        self.status_label.setText("✅ Los cambios se guardaron en el archivo original.")
+
+    def show_recalculation_error(self, message):
+        self.status_label.setText("")
+        QMessageBox.warning(self, "Error", f"No se pudo actualizar la capacidad operativa: {message}")
+
+    def done(self, result):
+        # Aplicar las ediciones pendientes antes de cerrar
+        if self.edit_batcher.has_pending:
+            try:
+                self.edit_batcher.finish()
+            except (IndexError, ValueError) as e:
+                print(f"Error actualizando capacidad operativa: {e}")
+        super().done(result)
 
     def refresh_table(self):
         """
@@ -434,5 +592,6 @@ class TableDialog(QDialog):
             "Excel Files (*.xlsx)"
         )
         if file_path:
+            self.edit_batcher.finish()
             self.controller.save_table_data_to_excel(file_path)
             QMessageBox.information(self, "Guardado", f"Tabla guardada en:\n{file_path}")
@@ -5,6 +5,16 @@ import pandas as pd
 import ast
 import operator as op
 import os
+from views.edit_batcher import EditBatcher, RunningTotal
+
+COST_COLUMN = 2
+
+
+def _cost_value(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return 0.0
 
 
 class OfficePlanningView(QDialog):
@@ -25,6 +35,9 @@ class OfficePlanningView(QDialog):
         self.save_button = QPushButton("Save changes")
         self.auto_calc_button = QPushButton("Calcular automáticamente")
         self.label_total_cost = QLabel()
+        # El total se ajusta por diferencias en cada edición y el label se refresca por ráfaga
+        self.total_cost = RunningTotal()
+        self.total_batcher = EditBatcher(self.update_total_cost_label, delay_ms=150, parent=self)
 
         layout = QVBoxLayout(self)
         layout.addWidget(self.line_combo)
@@ -83,22 +96,38 @@ class OfficePlanningView(QDialog):
             except Exception as e:
                 QMessageBox.information(self, "Error", f"Al leer el archivo de costos: {e}")
 
+        # Llenar la tabla sin disparar cellChanged por cada celda
+        self.table.blockSignals(True)
         self.table.setRowCount(len(df_view))
         self.table.setColumnCount(3)
         self.table.setHorizontalHeaderLabels(["Mes", "Actividades Planificadas", "Costo de Plan"])
-        for row_idx, row in df_view.iterrows():
-            for col_idx, col in enumerate(["Mes", "Actividades Planificadas", "Costo de Plan"]):
-                item = QTableWidgetItem(str(row[col]) if col in row else "")
-                if col == "Mes":
+        costs = []
+        for row_idx, row in enumerate(df_view.itertuples(index=False)):
+            for col_idx, value in enumerate(row):
+                text = str(value)
+                if col_idx == COST_COLUMN:
+                    text = self.normalize_cost_text(text)
+                    costs.append(_cost_value(text))
+                item = QTableWidgetItem(text)
+                if col_idx == 0:
                     item.setFlags(item.flags() ^ Qt.ItemIsEditable)
                 self.table.setItem(row_idx, col_idx, item)
+        self.table.blockSignals(False)
 
         # Calcular y mostrar el costo total planificado
-        try:
-            total_cost = pd.to_numeric(df_view["Costo de Plan"], errors="coerce").fillna(0).sum()
-        except Exception:
-            total_cost = 0
-        self.label_total_cost.setText(f"Costo Planificado Total: <b>{total_cost:,.2f}</b>")
+        self.total_cost.reset(costs)
+        self.update_total_cost_label()
+
+    def update_total_cost_label(self, *args):
+        self.label_total_cost.setText(f"Costo Planificado Total: <b>{self.total_cost.total:,.2f}</b>")
+
+    def normalize_cost_text(self, text):
+        """Evalúa la expresión escrita en una celda de costo y devuelve el texto a mostrar."""
+        expr = text.replace(',', '.')
+        result = self.safe_eval(expr)
+        if isinstance(result, (int, float)):
+            return f"{result:.2f}"
+        return text
 
     def safe_eval(self, expr):
         """
@@ -133,15 +162,16 @@ class OfficePlanningView(QDialog):
             return expr  # Si no es válido, retorna el texto original
     def on_cost_cell_changed(self, row, column):
         # Solo aplicar en la columna 'Costo de Plan' (índice 2)
-        if column == 2:
+        if column == COST_COLUMN:
             item = self.table.item(row, column)
             if item is not None:
-                expr = item.text().replace(',', '.')
-                result = self.safe_eval(expr)
-                if isinstance(result, (int, float)):
-                    item.setText(f"{result:.2f}")
-                elif isinstance(result, str) and result != expr:
-                    item.setText(str(result))
+                text = self.normalize_cost_text(item.text())
+                if text != item.text():
+                    self.table.blockSignals(True)
+                    item.setText(text)
+                    self.table.blockSignals(False)
+                self.total_cost.set(row, _cost_value(text))
+                self.total_batcher.submit(row)
 
     def auto_calculate_cost(self):
         line_title = self.line_combo.currentText()
@@ -166,15 +196,16 @@ class OfficePlanningView(QDialog):
 
         # df_cost tiene columnas MONTH y PLANNED_COST
         # Actualizar la columna "Costo de Plan" en la tabla
+        costos = df_cost.drop_duplicates("MONTH").set_index("MONTH")["PLANNED_COST"]
+        self.table.blockSignals(True)
         for row in range(self.table.rowCount()):
             mes_item = self.table.item(row, 0)
-            if mes_item is not None:
-                mes = mes_item.text()
-                costo_row = df_cost[df_cost["MONTH"] == mes]
-                if not costo_row.empty:
-                    costo = float(costo_row["PLANNED_COST"].values[0])
-                    costo_item = QTableWidgetItem(f"{costo:.2f}")
-                    self.table.setItem(row, 2, costo_item)
+            if mes_item is not None and mes_item.text() in costos.index:
+                costo = float(costos[mes_item.text()])
+                self.table.setItem(row, COST_COLUMN, QTableWidgetItem(f"{costo:.2f}"))
+                self.total_cost.set(row, costo)
+        self.table.blockSignals(False)
+        self.update_total_cost_label()
 
     def save_to_xlsx(self):
         import os
@@ -1,6 +1,19 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHeaderView, QMessageBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHeaderView, QMessageBox
+import numpy as np
 import pandas as pd
+from views.dataframe_table_model import DataFrameTableModel, create_table_view
+from views.edit_batcher import EditBatcher, RunningTotal
+
+TOTAL_LINE = "Total WO OPEX"
+
+
+def _parse_amount(text):
+    return float(str(text).replace(",", "").strip())
+
+
+def _format_amount(value):
+    return f"{value:,.2f}" if isinstance(value, (int, float)) else str(value)
+
 
 class OpexEditorWindow(QWidget):
     def __init__(self, opex_df: pd.DataFrame, on_save_callback):
@@ -10,13 +23,21 @@ class OpexEditorWindow(QWidget):
 
         self.opex_df = opex_df.copy()
         total_row = pd.DataFrame([{
-            "LINE": "Total WO OPEX",
+            "LINE": TOTAL_LINE,
             "OPEX_BUDGET": self.opex_df["OPEX_BUDGET"].sum()
         }])
         self.opex_df = pd.concat([self.opex_df, total_row], ignore_index=True)
 
         layout = QVBoxLayout()
-        self.table = QTableWidget()
+        self.model = DataFrameTableModel(
+            formatters={"OPEX_BUDGET": _format_amount},
+            parsers={"OPEX_BUDGET": _parse_amount},
+            invalid_tooltip="Valor inválido. Ingrese un número como 2,500,000.00."
+        )
+        self.table = create_table_view(self.model)
+        # El total se mantiene por diferencias y la celda se repinta una vez por ráfaga de ediciones
+        self.running_total = RunningTotal()
+        self.total_batcher = EditBatcher(self._refresh_total_cell, delay_ms=150, parent=self)
         self.populate_table()
 
         self.save_button = QPushButton("Guardar cambios")
@@ -26,75 +47,40 @@ class OpexEditorWindow(QWidget):
         layout.addWidget(self.save_button)
         self.setLayout(layout)
 
-        self.table.cellChanged.connect(self.actualizar_total)
-        self.table.cellChanged.connect(self.validar_valor_en_celda)
+        self.model.cell_edited.connect(self.actualizar_total)
         self.adjustSize()
         self.autosize_window()
 
     def populate_table(self):
-        self.table.setRowCount(len(self.opex_df))
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["LINE", "OPEX_BUDGET"])
-
-        for row_idx, (_, row) in enumerate(self.opex_df.iterrows()):
-            item_name = QTableWidgetItem(str(row["LINE"]))
-            if row["LINE"] == "Total WO OPEX":
-                item_name.setFlags(Qt.ItemIsEnabled)
-            else:
-                item_name.setFlags(item_name.flags() & ~Qt.ItemIsEditable)
-
-            item_val = QTableWidgetItem(f"{row['OPEX_BUDGET']:,.2f}")
-            if row["LINE"] == "Total WO OPEX":
-                item_val.setFlags(Qt.ItemIsEnabled)
-            else:
-                item_val.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-
-            self.table.setItem(row_idx, 0, item_name)
-            self.table.setItem(row_idx, 1, item_val)
-
+        self.model.set_data(self.opex_df[["LINE", "OPEX_BUDGET"]])
+        # Solo los montos de las líneas son editables; la fila de total no
+        editable = np.zeros((len(self.opex_df), 2), dtype=bool)
+        editable[:, 1] = self.opex_df["LINE"].to_numpy() != TOTAL_LINE
+        self.model.set_editable(editable)
+        self.running_total.reset(self.opex_df["OPEX_BUDGET"].iloc[:-1].fillna(0))
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-    def validar_valor_en_celda(self, row, column):
-        if column != 1 or self.table.item(row, 0).text() == "Total WO OPEX":
+    def actualizar_total(self, row, column, value):
+        if column != 1 or self.model.value(row, 0) == TOTAL_LINE:
             return
 
-        item = self.table.item(row, column)
-        texto = item.text().replace(",", "").strip()
-
-        try:
-            float(texto)
-            item.setBackground(Qt.white)
-            item.setToolTip("")
-        except ValueError:
-            item.setBackground(Qt.red)
-            item.setToolTip("Valor inválido. Ingrese un número como 2,500,000.00.")
-
-    def actualizar_total(self, row, column):
-        if column != 1:
-            return
-        if self.table.item(row, 0).text() == "Total WO OPEX":
-            return
-
-        total = 0
-        for i in range(self.table.rowCount() - 1):
-            try:
-                val_text = self.table.item(i, 1).text().replace(",", "").strip()
-                total += float(val_text)
-            except:
-                continue
+        # Las celdas inválidas quedan marcadas en rojo por el modelo y no suman
+        amount = value if not self.model.is_invalid(row, 1) and isinstance(value, (int, float)) else 0
+        self.running_total.set(row, amount)
+        self.total_batcher.submit(row)
 
-        self.table.blockSignals(True)
-        self.table.item(self.table.rowCount() - 1, 1).setText(f"{total:,.2f}")
-        self.table.blockSignals(False)
+    def _refresh_total_cell(self, _rows):
+        self.model.set_value(self.model.rowCount() - 1, 1, self.running_total.total)
 
     def guardar_cambios(self):
+        self.total_batcher.flush()
         updated_data = []
         errores = []
-        for row_idx in range(self.table.rowCount() - 1):  # Ignorar total
-            name = self.table.item(row_idx, 0).text()
-            value_text = self.table.item(row_idx, 1).text()
+        for row_idx in range(self.model.rowCount() - 1):  # Ignorar total
+            name = self.model.value(row_idx, 0)
+            value_text = self.model.display_text(row_idx, 1)
             try:
-                value = float(value_text.replace(",", ""))
+                value = _parse_amount(value_text)
                 if value <= 0:
                     raise ValueError()
                 updated_data.append({"LINE": name, "OPEX_BUDGET": value})
@@ -114,12 +100,12 @@ class OpexEditorWindow(QWidget):
         Ajusta el tamaño de la ventana según el contenido de la tabla.
         """
         width = self.table.verticalHeader().width()
-        for col in range(self.table.columnCount()):
+        for col in range(self.model.columnCount()):
             width += self.table.columnWidth(col)
         width += 60  # margen extra para el layout
 
         height = self.table.horizontalHeader().height()
-        for row in range(self.table.rowCount()):
+        for row in range(self.model.rowCount()):
             height += self.table.rowHeight(row)
         height += 100  # espacio para botón y padding
 
@@ -1,55 +1,106 @@
 from PyQt5.QtCore import QAbstractTableModel, Qt
 from PyQt5.QtGui import QColor, QFont
 from PyQt5.QtWidgets import QMessageBox
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+NON_MONTH_COLUMNS = ['No.', 'Tipo de Actividad', 'Total']
+
+
+def _display_text(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
 
 class PandasModel(QAbstractTableModel):
+    """
+    Modelo del plan de actividades (la última fila es la fila TOTAL).
+
+    Los conteos mensuales se mantienen en una matriz NumPy de enteros junto con
+    metadatos precalculados por fila (fila TOTAL, máscara de celdas editables,
+    acumulado de actividades hasta el mes siguiente). Dibujar una celda y
+    editar una fila no recorren el DataFrame; este se actualiza desde la
+    matriz solo al pedirlo con get_dataframe().
+    """
+    # Si es True, un mes editable no puede superar el total planificado de la fila
+    VALIDATE_MONTH_LIMIT = True
+
     def __init__(self, df: pd.DataFrame):
         super().__init__()
         self._df = df
         self.current_month, self.next_month = self.get_current_and_next_months()
         self.invalid_cells = set()
-
-    def rowCount(self, parent=None): return self._df.shape[0]
-    def columnCount(self, parent=None): return self._df.shape[1]
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+        self._build_cache()
+
+    def _build_cache(self):
+        """Precalcula la matriz de valores y los metadatos por fila y columna."""
+        df = self._df
+        self._columns = list(df.columns)
+        self._tipo_col = self._columns.index("Tipo de Actividad")
+        self._total_col = self._columns.index("Total")
+        self._month_cols = np.array([i for i, col in enumerate(self._columns) if col not in NON_MONTH_COLUMNS], dtype=int)
+        self._month_position = {col: pos for pos, col in enumerate(self._month_cols)}
+        month_numbers = np.array([self.get_month_number(self._columns[i]) for i in self._month_cols], dtype=int)
+        self._until_next = month_numbers <= self.get_month_number(self.next_month)
+        self._until_total_limit = month_numbers <= self.get_month_number(self.total_limit_month())
+
+        self._values = df.to_numpy(dtype=object)
+        self._display = np.array([[_display_text(v) for v in row] for row in self._values], dtype=object).reshape(self._values.shape)
+        self._row_labels = [str(label) for label in df.index]
+        self._is_total_row = self._values[:, self._tipo_col] == "TOTAL" if len(self._values) else np.zeros(0, dtype=bool)
+        self._counts = (
+            pd.DataFrame(self._values[:, self._month_cols])
+            .apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=float).astype(np.int64)
+        )
+        self._totals = pd.to_numeric(pd.Series(self._values[:, self._total_col]), errors="coerce").fillna(0).to_numpy(dtype=float).astype(np.int64)
+        # Actividades ya definidas hasta el mes siguiente, por fila
+        self._defined_until_next = (self._counts * self._until_next).sum(axis=1)
+        self._editable = np.array(
+            [[self.is_editable_cell(row, col) for col in range(len(self._columns))] for row in range(len(self._values))],
+            dtype=bool,
+        ).reshape(self._values.shape)
+        self._dirty = False
+
+    def rowCount(self, parent=None): return self._values.shape[0]
+    def columnCount(self, parent=None): return self._values.shape[1]
 
     def data(self, index, role=Qt.DisplayRole):
-        value = self._df.iloc[index.row(), index.column()]
-        col_name = self._df.columns[index.column()]
-        row_tipo = self._df.iloc[index.row(), self._df.columns.get_loc("Tipo de Actividad")]
+        row, col = index.row(), index.column()
 
         if role in (Qt.DisplayRole, Qt.EditRole):
-            if isinstance(value, float) and value.is_integer():
-                return str(int(value))
-            return str(value)
+            return self._display[row, col]
 
-        if role == Qt.ToolTipRole and self.is_editable(index):
-            restante = self.get_restante(index.row(), exclude_col=col_name)
+        if role == Qt.ToolTipRole and self._editable[row, col]:
+            restante = self.get_restante(row, exclude_col=self._columns[col])
             return f"Actividades restantes: {restante}"
 
         if role == Qt.BackgroundRole:
-            if (index.row(), index.column()) in self.invalid_cells:
+            if (row, col) in self.invalid_cells:
                 return QColor("#f2dede")
-            if self.is_editable(index):
+            if self._editable[row, col]:
                 return QColor("#dff0d8")
-            if row_tipo == "TOTAL":
+            if self._is_total_row[row]:
                 return QColor("#e0e0e0")
 
-        if role == Qt.FontRole and row_tipo == "TOTAL":
-            font = QFont()
-            font.setBold(True)
-            return font
+        if role == Qt.FontRole and self._is_total_row[row]:
+            return self._bold_font
 
         return None
+
     def setData(self, index, value, role):
         if role == Qt.EditRole:
             try:
-                col_name = self._df.columns[index.column()]
+                col_name = self._columns[index.column()]
                 row_idx = index.row()
-                row_tipo = self._df.iloc[row_idx, self._df.columns.get_loc("Tipo de Actividad")]
-                if row_tipo == "TOTAL":
+                if self._is_total_row[row_idx]:
                     return False
 
                 # ⚠️ Validación: solo enteros válidos
@@ -59,41 +110,27 @@ class PandasModel(QAbstractTableModel):
                     self.show_warning("Solo se permiten números enteros.")
                     return False
 
-                plan_total = int(self._df.at[row_idx, "Total"])
+                plan_total = int(self._totals[row_idx])
 
                 if col_name in [self.current_month, self.next_month]:
-                    columnas_meses = [col for col in self._df.columns if col not in ['No.', 'Tipo de Actividad', 'Total']]
-                    mes_limite = self.get_month_number(self.next_month)
-
-                    suma_previos = sum(
-                        int(self._df.at[row_idx, col]) for col in columnas_meses
-                        if col != col_name and self.get_month_number(col) <= mes_limite
-                    )
+                    pos = self._month_position[index.column()]
+                    suma_previos = self._defined_until_next[row_idx] - (self._counts[row_idx, pos] if self._until_next[pos] else 0)
                     max_permitido = plan_total - suma_previos
 
-                    if nuevo_valor > max_permitido:
+                    if self.VALIDATE_MONTH_LIMIT and nuevo_valor > max_permitido:
                         self.invalid_cells.add((row_idx, index.column()))
                         self.show_warning(f"No puedes asignar más de {max_permitido} actividades en este mes.")
                         self.dataChanged.emit(index, index)
                         return False
 
-                    self._df.at[row_idx, col_name] = nuevo_valor
+                    self._counts[row_idx, pos] = nuevo_valor
                     self.invalid_cells.discard((row_idx, index.column()))
                     self.redistribuir_restantes(row_idx)
-                    self.recalcular_fila_total()
-                    self.dataChanged.emit(index, index)
+                    self.recalcular_fila_total(row_idx)
                     return True
 
                 elif col_name == "Total":
-                    nuevo_valor = int(float(value))
-                    columnas_meses = [col for col in self._df.columns if col not in ['No.', 'Tipo de Actividad', 'Total']]
-                    mes_limite = self.get_month_number(self.next_month)
-
-                    ya_realizado = sum(
-                        int(self._df.at[row_idx, col]) for col in columnas_meses
-                        if self.get_month_number(col) <= mes_limite
-                    )
-
+                    ya_realizado = int((self._counts[row_idx] * self._until_total_limit).sum())
 
                     if nuevo_valor < ya_realizado:
                         self.invalid_cells.add((row_idx, index.column()))
@@ -101,10 +138,9 @@ class PandasModel(QAbstractTableModel):
                         self.dataChanged.emit(index, index)
                         return False
 
-                    self._df.at[row_idx, "Total"] = nuevo_valor
+                    self._totals[row_idx] = nuevo_valor
                     self.redistribuir_futuros(row_idx, nuevo_valor)
-                    self.recalcular_fila_total()
-                    self.dataChanged.emit(index, index)
+                    self.recalcular_fila_total(row_idx)
                     return True
 
             except Exception as e:
@@ -113,52 +149,54 @@ class PandasModel(QAbstractTableModel):
                 return False
         return False
 
-    def redistribuir_futuros(self, row_idx, nuevo_total):
-        columnas_meses = [col for col in self._df.columns if col not in ['No.', 'Tipo de Actividad', 'Total']]
-        mes_limite = self.get_month_number(self.next_month)
-
-        ya_definidos = sum(
-            int(self._df.at[row_idx, col]) for col in columnas_meses
-            if self.get_month_number(col) <= mes_limite
-        )
-        faltante = max(nuevo_total - ya_definidos, 0)
-
-        meses_futuros = [m for m in columnas_meses if self.get_month_number(m) > mes_limite]
-        n = len(meses_futuros)
+    def _distribute(self, row_idx, faltante, futuros_mask):
+        """Reparte faltante en partes iguales entre los meses de futuros_mask (el resto, a los primeros)."""
+        positions = np.flatnonzero(futuros_mask)
+        n = len(positions)
         if n == 0:
             return
+        base, extra = divmod(int(faltante), n)
+        self._counts[row_idx, positions] = base + (np.arange(n) < extra)
 
-        base = faltante // n
-        extra = faltante % n
-
-        for i, mes in enumerate(meses_futuros):
-            self._df.at[row_idx, mes] = base + (1 if i < extra else 0)
+    def redistribuir_futuros(self, row_idx, nuevo_total):
+        ya_definidos = (self._counts[row_idx] * self._until_total_limit).sum()
+        self._distribute(row_idx, max(nuevo_total - ya_definidos, 0), ~self._until_total_limit)
 
     def flags(self, index):
-        if self.is_editable(index):
+        if self._editable[index.row(), index.column()]:
             return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
         return Qt.ItemIsSelectable | Qt.ItemIsEnabled
 
     def is_editable(self, index):
+        return bool(self._editable[index.row(), index.column()])
+
+    def is_editable_cell(self, row, col):
+        """Regla de edición de una celda; se evalúa una sola vez al construir el modelo."""
         return False
 
+    def total_limit_month(self):
+        """Último mes que se considera ya realizado al editar la columna Total."""
+        return self.next_month
+
     def headerData(self, section, orientation, role):
         if role == Qt.DisplayRole:
-            return self._df.columns[section] if orientation == Qt.Horizontal else str(self._df.index[section])
+            return self._columns[section] if orientation == Qt.Horizontal else self._row_labels[section]
         return None
 
     def get_dataframe(self):
+        """Devuelve el DataFrame con los conteos y totales editados."""
+        if self._dirty:
+            for pos, col in enumerate(self._month_cols):
+                self._df[self._columns[col]] = self._counts[:, pos]
+            self._df["Total"] = self._totals
+            self._dirty = False
         return self._df
 
     def get_current_and_next_months(self):
-        month_names = [
-            "January", "February", "March", "April", "May", "June",
-            "July", "August", "September", "October", "November", "December"
-        ]
         now = datetime.now()
         current_idx = now.month - 1
         next_idx = (current_idx + 1) % 12
-        return month_names[current_idx], month_names[next_idx]
+        return MONTH_NAMES[current_idx], MONTH_NAMES[next_idx]
 
     def get_month_number(self, name):
         try:
@@ -167,89 +205,50 @@ class PandasModel(QAbstractTableModel):
             return 0
 
     def get_restante(self, row_idx, exclude_col=None):
-        columnas_meses = [col for col in self._df.columns if col not in ['No.', 'Tipo de Actividad', 'Total']]
-
-        total = int(self._df.at[row_idx, "Total"])
-        suma = 0
-        for col in columnas_meses:
-            if col == exclude_col:
-                continue
-            if self.get_month_number(col) <= self.get_month_number(self.next_month):
-                try:
-                    suma += int(self._df.at[row_idx, col])
-                except:
-                    pass
-        return max(total - suma, 0)
+        pos = self._month_position.get(self._columns.index(exclude_col)) if exclude_col in self._columns else None
+        suma = self._defined_until_next[row_idx]
+        if pos is not None and self._until_next[pos]:
+            suma -= self._counts[row_idx, pos]
+        return max(int(self._totals[row_idx] - suma), 0)
 
     def redistribuir_restantes(self, row_idx):
-        columnas_meses = [col for col in self._df.columns if col not in ['No.', 'Tipo de Actividad', 'Total']]
-        mes_limite = self.get_month_number(self.next_month)
-
-        definidos = sum(
-            int(self._df.at[row_idx, col]) for col in columnas_meses
-            if self.get_month_number(col) <= mes_limite
-        )
-        total = int(self._df.at[row_idx, "Total"])
-        faltante = max(total - definidos, 0)
-
-        meses_futuros = [col for col in columnas_meses if self.get_month_number(col) > mes_limite]
-        if not meses_futuros:
-            return
-
-        base = faltante // len(meses_futuros)
-        extra = faltante % len(meses_futuros)
-
-        for i, col in enumerate(meses_futuros):
-            self._df.at[row_idx, col] = base + (1 if i < extra else 0)
+        definidos = (self._counts[row_idx] * self._until_next).sum()
+        faltante = max(self._totals[row_idx] - definidos, 0)
+        self._distribute(row_idx, faltante, ~self._until_next)
 
     def redistribuir_row(self, row_idx, nuevo_total):
-        columnas_meses = [col for col in self._df.columns if col not in ['No.', 'Tipo de Actividad', 'Total']]
-        mes_limite = self.get_month_number(self.next_month)
-
-        ya_definidos = sum(
-            self._df.at[row_idx, col] for col in columnas_meses
-            if self.get_month_number(col) <= mes_limite
-        )
-        faltante = max(nuevo_total - ya_definidos, 0)
-        meses_disponibles = [m for m in columnas_meses if self.get_month_number(m) > mes_limite]
-        n = len(meses_disponibles)
-        if n == 0:
-            return
-
-        base = faltante // n
-        extra = faltante % n
-
-        for i, mes in enumerate(meses_disponibles):
-            self._df.at[row_idx, mes] = base + (1 if i < extra else 0)
+        ya_definidos = (self._counts[row_idx] * self._until_next).sum()
+        self._distribute(row_idx, max(nuevo_total - ya_definidos, 0), ~self._until_next)
 
     def recalcular_total(self, row_idx):
-        columnas_meses = [col for col in self._df.columns if col not in ['No.', 'Tipo de Actividad', 'Total']]
-        return sum(float(self._df.at[row_idx, col]) for col in columnas_meses)
-
-    def recalcular_fila_total(self):
-        columnas_meses = [col for col in self._df.columns if col not in ['No.', 'Tipo de Actividad', 'Total']]
-        total_row_idx = self._df.shape[0] - 1
-
-
-        for col in columnas_meses:
-            suma = 0
-            for row in range(total_row_idx):
-                try:
-                    valor = float(self._df.at[row, col])
-                    suma += valor
-                except:
-                    pass
-            self._df.at[total_row_idx, col] = int(suma)
-
-        for row in range(total_row_idx):
-            self._df.at[row, "Total"] = int(self.recalcular_total(row))
-
-        # Recalcular el total sumando solo las columnas de meses y solo en filas anteriores al total
-        self._df.at[total_row_idx, "Total"] = int(
-            self._df.loc[:total_row_idx - 1, columnas_meses].sum(axis=1).sum()
-        )
-
-        self.layoutChanged.emit()
+        return float(self._counts[row_idx].sum())
+
+    def recalcular_fila_total(self, row_idx=None):
+        """
+        Recalcula los totales por fila y la fila TOTAL con operaciones sobre la
+        matriz, y refresca solo las celdas afectadas (fila editada, fila TOTAL
+        y columna Total).
+        """
+        total_row_idx = self._values.shape[0] - 1
+        self._counts[total_row_idx] = self._counts[:total_row_idx].sum(axis=0)
+        self._totals[:total_row_idx] = self._counts[:total_row_idx].sum(axis=1)
+        self._totals[total_row_idx] = self._totals[:total_row_idx].sum()
+        self._defined_until_next = (self._counts * self._until_next).sum(axis=1)
+
+        rows = [total_row_idx] if row_idx is None else [row_idx, total_row_idx]
+        for row in rows:
+            self._refresh_row_display(row)
+        self._display[:, self._total_col] = [str(int(v)) for v in self._totals]
+        self._dirty = True
+
+        last_col = self._values.shape[1] - 1
+        for row in rows:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_col))
+        self.dataChanged.emit(self.index(0, self._total_col), self.index(total_row_idx, self._total_col))
+
+    def _refresh_row_display(self, row):
+        for pos, col in enumerate(self._month_cols):
+            self._display[row, col] = str(int(self._counts[row, pos]))
 
     def show_warning(self, msg):
         QMessageBox.warning(None, "Advertencia", msg)
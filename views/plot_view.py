@@ -4,6 +4,7 @@ from PyQt5.QtWidgets import (
 )
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from utils.dates import normalize_month_names
+import numpy as np
 import pandas as pd
 
 class PlotView(QWidget):
@@ -92,18 +93,36 @@ class PlotView(QWidget):
         main_layout.addLayout(details_layout, 1)
 
     def populate_deviation_list(self, deviations=None):
+        """
+        Llena la lista de desviaciones una sola vez; el filtro por mes solo
+        oculta o muestra los elementos ya creados.
+        """
+        self.deviation_list.setUpdatesEnabled(False)
         self.deviation_list.clear()
+        self._item_months = []  # Mes normalizado de cada elemento de la lista
+        self._normalized_months = None
 
+        self._empty_item = QListWidgetItem("No deviations found.")
         if deviations is None or deviations.empty:
-            self.deviation_list.addItem("No deviations found.")
+            self.deviation_list.addItem(self._empty_item)
+            self.deviation_list.setUpdatesEnabled(True)
             return
 
         if self.deviation_type == "artificial_lift":
             self._populate_artificial_lift_deviations(deviations)
         else:
-            for _, row in deviations.iterrows():
+            months = normalize_month_names(deviations["MONTH"]) if "MONTH" in deviations.columns else None
+            for position, (_, row) in enumerate(deviations.iterrows()):
                 msg = f"Month: {row.get('MONTH', '-')}, Deviation: {row.get('Desviaciones', 0)}"
-                self.deviation_list.addItem(msg)
+                self._add_deviation_item(msg, months.iloc[position] if months is not None else None)
+
+        self.deviation_list.addItem(self._empty_item)
+        self._empty_item.setHidden(True)
+        self.deviation_list.setUpdatesEnabled(True)
+
+    def _add_deviation_item(self, text, month):
+        self.deviation_list.addItem(text)
+        self._item_months.append(month)
 
     def _populate_artificial_lift_deviations(self, deviations):
         deviations = deviations.copy()
@@ -131,7 +150,7 @@ class PlotView(QWidget):
                     deviation_text += f"{group.replace('_Deviation', '')}: {row[group]:+,.2f} $ | "
             deviation_text = deviation_text.rstrip(" | ")
             if not deviation_text.endswith(":"):
-                self.deviation_list.addItem(deviation_text)
+                self._add_deviation_item(deviation_text, row['MONTH'])
 
     def apply_month_filter(self):
         selected_months = [item.text() for item in self.month_filter.selectedItems()]
@@ -139,14 +158,21 @@ class PlotView(QWidget):
             QMessageBox.warning(self, "Sin columna 'MONTH'", "Este reporte no contiene columna 'MONTH'.")
             return
 
-        df = self.deviations.copy()
-        df["MONTH"] = normalize_month_names(df["MONTH"])
-
-        if selected_months:
-            df = df[df["MONTH"].isin(selected_months)]
-
-        self.filtered_deviations = df
-        self.populate_deviation_list(df)
+        # Los meses normalizados se calculan una vez por juego de desviaciones
+        if self._normalized_months is None:
+            self._normalized_months = normalize_month_names(self.deviations["MONTH"])
+
+        selected = set(selected_months) if selected_months else None
+        mask = self._normalized_months.isin(selected).to_numpy() if selected else np.ones(len(self.deviations), dtype=bool)
+        self.filtered_deviations = self.deviations[mask].copy()
+        self.filtered_deviations["MONTH"] = self._normalized_months.to_numpy()[mask]
+
+        # Ocultar/mostrar los elementos existentes en lugar de reconstruir la lista
+        self.deviation_list.setUpdatesEnabled(False)
+        for position, month in enumerate(self._item_months):
+            self.deviation_list.item(position).setHidden(selected is not None and month not in selected)
+        self._empty_item.setHidden(not self.filtered_deviations.empty)
+        self.deviation_list.setUpdatesEnabled(True)
 
     def guardar_comentario(self):
         comentario = self.comments_edit.toPlainText().strip()
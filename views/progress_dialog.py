@@ -0,0 +1,34 @@
+import threading
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QProgressDialog
+from utils.progress import ProgressContext
+
+
+class CancellableProgressDialog(QProgressDialog):
+    """
+    Diálogo de progreso con botón de cancelar enlazado a un ProgressContext.
+
+    Los cálculos se ejecutan en el hilo de la interfaz, así que cada avance
+    informado desde ese hilo procesa los eventos pendientes para que el botón
+    de cancelar responda. Los avances informados desde hilos de trabajo solo
+    se registran en el contexto.
+    """
+    STEPS = 1000
+
+    def __init__(self, title: str, parent=None):
+        super().__init__(title, "Cancel", 0, self.STEPS, parent)
+        self.setWindowTitle(title)
+        self.setWindowModality(Qt.WindowModal)
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.progress = ProgressContext(on_progress=self._on_progress)
+        self.canceled.connect(self.progress.cancel)
+
+    def _on_progress(self, fraction, stage):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        self.setValue(int(fraction * self.STEPS))
+        if stage:
+            self.setLabelText(stage)
+        QApplication.processEvents()
@@ -0,0 +1,45 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from utils.write_behind import get_write_behind_queue
+
+# Segundos que se espera a la escritura antes de avisar que sigue en segundo plano
+SAVE_CONFIRM_TIMEOUT = 15
+
+
+def show_save_result(parent, path, title: str, message: str) -> bool:
+    """
+    Espera a que la cola de escritura diferida termine de escribir path y
+    muestra el resultado: el mensaje de éxito si se guardó, un error si la
+    escritura falló o un aviso si aún no terminó.
+
+    Args:
+        parent: Ventana padre de los mensajes.
+        path (str | None): Archivo guardado; None si el guardado no usó la cola.
+        title (str): Título del mensaje de éxito.
+        message (str): Texto del mensaje de éxito.
+
+    Returns:
+        bool: True si el archivo quedó guardado.
+    """
+    queue = get_write_behind_queue()
+    finished = True
+    if path:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            finished = queue.wait_for(path, SAVE_CONFIRM_TIMEOUT)
+        finally:
+            QApplication.restoreOverrideCursor()
+
+    if not finished:
+        QMessageBox.warning(
+            parent, "Guardado pendiente",
+            f"El archivo sigue guardándose en segundo plano:\n{path}\n\n"
+            "Se confirmará en la barra de estado al terminar."
+        )
+        return False
+    error = queue.last_error(path) if path else None
+    if error is not None:
+        QMessageBox.critical(parent, "Error al guardar", f"No se pudo guardar el archivo:\n{path}\n\n{error}")
+        return False
+    QMessageBox.information(parent, title, message)
+    return True
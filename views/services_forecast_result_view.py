@@ -1,9 +1,35 @@
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QLabel, QHeaderView, QPushButton, QTableWidget, 
-    QTableWidgetItem, QHBoxLayout, QMessageBox, QProgressBar
+    QDialog, QVBoxLayout, QLabel, QHeaderView, QPushButton,
+    QHBoxLayout, QMessageBox, QProgressBar
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
+import numpy as np
 import pandas as pd
+from utils.progress import OperationCancelled, ProgressContext
+from views.dataframe_table_model import DataFrameTableModel, create_table_view
+
+
+def _format_number(value):
+    # Los enteros (p. ej. ID_COSTO, ID_DIA) se muestran sin decimales
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return str(value)
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def _format_money(value):
+    return f"${value:,.2f}" if isinstance(value, (int, float)) else str(value)
+
+
+def _format_count(value):
+    return f"{int(value)}" if isinstance(value, (int, float)) else str(value)
+
+
+RESULT_FORMATTERS = {
+    "FORECAST_COST": _format_money,
+    "CUMULATIVE_FORECAST": _format_money,
+    "PLANNED_ACTIVITIES": _format_count,
+    "EXECUTED_ACTIVITIES": _format_count,
+}
 
 
 class ForecastCalculationThread(QThread):
@@ -12,22 +38,34 @@ class ForecastCalculationThread(QThread):
     """
     result_ready = pyqtSignal(pd.DataFrame)
     error_occurred = pyqtSignal(str)
+    progress_changed = pyqtSignal(int, str)
+    cancelled = pyqtSignal()
     
     def __init__(self, controller, pares_ids):
         super().__init__()
         self.controller = controller
         self.pares_ids = pares_ids
+        self.progress = ProgressContext(
+            on_progress=lambda fraction, stage: self.progress_changed.emit(int(fraction * 100), stage)
+        )
+
+    def cancel(self):
+        """Solicita detener el cálculo en el siguiente par de IDs."""
+        self.progress.cancel()
         
     def run(self):
         try:
             dfs = []
-            for id_costo, id_dia in self.pares_ids:
+            total = len(self.pares_ids)
+            for i, (id_costo, id_dia) in enumerate(self.pares_ids):
+                self.progress.checkpoint(f"Par {i + 1}/{total}: costo {id_costo}, día {id_dia}", i / total)
+                pair_progress = self.progress.subcontext(i / total, (i + 1) / total)
                 # Llama al método del controlador
                 df = None
                 if hasattr(self.controller, "generate_forecast_by_path"):
-                    df = self.controller.generate_forecast_by_path(id_costo, id_dia)
+                    df = self.controller.generate_forecast_by_path(id_costo, id_dia, progress=pair_progress)
                 elif hasattr(self.controller, "services_report"):
-                    df = self.controller.services_report.generate_forecast_by_path(id_costo, id_dia)
+                    df = self.controller.services_report.generate_forecast_by_path(id_costo, id_dia, progress=pair_progress)
                 
                 if df is not None:
                     df = df.copy()
@@ -35,14 +73,22 @@ class ForecastCalculationThread(QThread):
                     df["ID_DIA"] = id_dia
                     dfs.append(df)
             
+            self.progress.report(1.0)
             if dfs:
                 df_final = pd.concat(dfs, ignore_index=True)
                 self.result_ready.emit(df_final)
             else:
                 self.error_occurred.emit("No se pudo generar el forecast para los pares seleccionados.")
                 
+        except OperationCancelled:
+            self.cancelled.emit()
         except Exception as e:
             self.error_occurred.emit(f"Error al calcular el forecast: {str(e)}")
+        finally:
+            # La conexión SQL abierta por este hilo no debe quedar viva
+            data_loader = getattr(self.controller, "data_loader", None)
+            if data_loader is not None and hasattr(data_loader, "close_thread_connection"):
+                data_loader.close_thread_connection()
 
 
 class ServicesForecastResultView(QDialog):
@@ -75,11 +121,12 @@ class ServicesForecastResultView(QDialog):
         
         # Barra de progreso
         self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 0)  # Modo indeterminado
+        self.progress_bar.setRange(0, 100)
         self.layout.addWidget(self.progress_bar)
         
         # Tabla para mostrar resultados
-        self.table = QTableWidget()
+        self.model = DataFrameTableModel()
+        self.table = create_table_view(self.model)
         self.table.setAlternatingRowColors(True)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.layout.addWidget(self.table)
@@ -97,6 +144,10 @@ class ServicesForecastResultView(QDialog):
         # Botones
         button_layout = QHBoxLayout()
         
+        self.cancel_btn = QPushButton("Cancelar cálculo")
+        self.cancel_btn.clicked.connect(self.cancel_calculation)
+        button_layout.addWidget(self.cancel_btn)
+
         self.close_btn = QPushButton("Cerrar")
         self.close_btn.clicked.connect(self.close)
         button_layout.addWidget(self.close_btn)
@@ -108,11 +159,36 @@ class ServicesForecastResultView(QDialog):
         self.calculation_thread = ForecastCalculationThread(self.controller, self.pares_ids)
         self.calculation_thread.result_ready.connect(self.on_calculation_complete)
         self.calculation_thread.error_occurred.connect(self.on_calculation_error)
+        self.calculation_thread.progress_changed.connect(self.on_calculation_progress)
+        self.calculation_thread.cancelled.connect(self.on_calculation_cancelled)
         self.calculation_thread.start()
+
+    def cancel_calculation(self):
+        """Pide al hilo de cálculo que se detenga en el siguiente checkpoint."""
+        if self.calculation_thread.isRunning():
+            self.calculation_thread.cancel()
+            self.cancel_btn.setEnabled(False)
+
+    def on_calculation_progress(self, value, stage):
+        self.progress_bar.setValue(value)
+        self.progress_bar.setFormat(f"%p% - {stage}")
+
+    def on_calculation_cancelled(self):
+        self.progress_bar.hide()
+        self.cancel_btn.setEnabled(False)
+        title_label = self.layout.itemAt(0).widget()
+        title_label.setText("Cálculo del forecast cancelado")
+
+    def closeEvent(self, event):
+        """Cancela el cálculo pendiente al cerrar la ventana."""
+        if self.calculation_thread.isRunning():
+            self.calculation_thread.cancel()
+        super().closeEvent(event)
     
     def on_calculation_complete(self, df_result):
         """Maneja la finalización exitosa del cálculo."""
         self.progress_bar.hide()
+        self.cancel_btn.setEnabled(False)
         self.df_result = df_result
         self.show_dataframe(df_result)
         # Actualizar título
@@ -122,6 +198,7 @@ class ServicesForecastResultView(QDialog):
     def on_calculation_error(self, error_message):
         """Maneja errores durante el cálculo."""
         self.progress_bar.hide()
+        self.cancel_btn.setEnabled(False)
         QMessageBox.critical(self, "Error", error_message)
         
         # Actualizar título
@@ -134,36 +211,14 @@ class ServicesForecastResultView(QDialog):
         columns_to_show = [col for col in df.columns if col not in ["ID_COSTO", "ID_DIA"]]
         df_display = df[columns_to_show]
         
-        self.table.setRowCount(len(df_display))
-        self.table.setColumnCount(len(df_display.columns))
-        self.table.setHorizontalHeaderLabels([str(col) for col in df_display.columns])
-        
-        # Llenar la tabla con los datos
-        for i, row in df_display.iterrows():
-            for j, col in enumerate(df_display.columns):
-                value = row[col]
-                
-                # Formatear números para mejor legibilidad
-                if isinstance(value, (int, float)) and col in ["FORECAST_COST"]:
-                    item_text = f"${value:,.2f}"
-                elif isinstance(value, (int, float)) and col in ["PLANNED_ACTIVITIES"]:
-                    item_text = f"{int(value)}"
-                elif isinstance(value, (int, float)) and col in ["EXECUTED_ACTIVITIES"]:
-                    item_text = f"{int(value)}"
-                elif isinstance(value, (int, float)) and col in ["CUMULATIVE_FORECAST"]:
-                    item_text = f"${value:,.2f}"
-                elif isinstance(value, (int, float)):
-                    item_text = f"{value:.2f}"
-                else:
-                    item_text = str(value)
-                
-                item = QTableWidgetItem(item_text)
-                
-                # Resaltar columnas importantes
-                if col in ["FORECAST_COST"]:
-                    item.setBackground(Qt.lightGray)
-                
-                self.table.setItem(i, j, item)
+        # Formatear números para mejor legibilidad
+        self.model.formatters = {
+            col: RESULT_FORMATTERS.get(col, _format_number) for col in df_display.columns
+        }
+        self.model.set_data(df_display)
+        # Resaltar columnas importantes
+        if "FORECAST_COST" in df_display.columns:
+            self.model.set_column_style(self.model.column_index("FORECAST_COST"), background=Qt.lightGray)
         
         # Ajustar el ancho de las columnas
         self.table.resizeColumnsToContents()
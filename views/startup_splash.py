@@ -0,0 +1,22 @@
+from PyQt5.QtWidgets import QApplication, QSplashScreen
+from PyQt5.QtGui import QPixmap, QColor
+from PyQt5.QtCore import Qt
+
+
+class StartupSplash(QSplashScreen):
+    """
+    Pantalla de inicio que muestra la fase de arranque en curso.
+
+    Se conecta como oyente del medidor de arranque: cada fase nueva actualiza
+    el mensaje y procesa los eventos pendientes para que se vea de inmediato.
+    """
+    def __init__(self, title="Pronóstico de Presupuesto"):
+        pixmap = QPixmap(460, 140)
+        pixmap.fill(QColor("#ffffff"))
+        super().__init__(pixmap, Qt.WindowStaysOnTopHint)
+        self.title = title
+        self.show_phase("Iniciando")
+
+    def show_phase(self, name: str):
+        self.showMessage(f"{self.title}\n\n{name}...", Qt.AlignCenter, QColor("#2c3e50"))
+        QApplication.processEvents()
@@ -3,6 +3,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QTableWidget, QTableWidgetIte
                              QComboBox, QPushButton, QHBoxLayout, QLabel)
 from PyQt5.QtCore import Qt
 import pandas as pd
+from views.edit_batcher import EditBatcher
 
 class TubularsConfigDialog(QDialog):
     def __init__(self, df_config, pipe_catalog, parent=None):
@@ -38,6 +39,9 @@ class TubularsConfigDialog(QDialog):
 
         self.populate_table()
 
+        # Los costos de las filas editadas se recalculan una vez por ráfaga de ediciones
+        self.cost_batcher = EditBatcher(self.update_total_costs, delay_ms=150, parent=self)
+
         # Conectar cambios
         self.table.cellChanged.connect(self.handle_cell_change)
 
@@ -75,10 +79,11 @@ class TubularsConfigDialog(QDialog):
             item_total = QTableWidgetItem(f"{cost:.2f}")
             item_total.setFlags(Qt.ItemIsEnabled)  # Read-only
             self.table.setItem(row_idx, 3, item_total)
-            self.table.resizeColumnsToContents()
-            self.table.resizeRowsToContents()
-            self.adjust_dialog_size()
 
+        # Ajustar tamaños una sola vez, no por cada fila
+        self.table.resizeColumnsToContents()
+        self.table.resizeRowsToContents()
+        self.adjust_dialog_size()
 
     def compute_cost(self, pipe_desc, feet):
         try:
@@ -94,15 +99,26 @@ class TubularsConfigDialog(QDialog):
             feet_item = self.table.item(row_idx, 2)
             feet_val = float(feet_item.text()) if feet_item else 0.0
             cost = self.compute_cost(pipe_desc, feet_val)
-            item_total = QTableWidgetItem(f"{cost:.2f}")
-            item_total.setFlags(Qt.ItemIsEnabled)
-            self.table.setItem(row_idx, 3, item_total)
+            item_total = self.table.item(row_idx, 3)
+            # Reescribir el texto sin volver a disparar cellChanged
+            self.table.blockSignals(True)
+            if item_total is None:
+                item_total = QTableWidgetItem()
+                item_total.setFlags(Qt.ItemIsEnabled)
+                self.table.setItem(row_idx, 3, item_total)
+            item_total.setText(f"{cost:.2f}")
+            self.table.blockSignals(False)
         except Exception as e:
             print(f"Error actualizando total en fila {row_idx}: {e}")
 
+    def update_total_costs(self, rows):
+        for row_idx in rows:
+            if row_idx < self.table.rowCount():
+                self.update_total_cost(row_idx)
+
     def handle_cell_change(self, row, column):
         if column == 2:  # Feet column
-            self.update_total_cost(row)
+            self.cost_batcher.submit(row)
 
     def add_row(self):
         current_rows = self.table.rowCount()
@@ -130,6 +146,8 @@ class TubularsConfigDialog(QDialog):
     def remove_row(self):
         row = self.table.currentRow()
         if row >= 0:
+            # Aplicar los costos pendientes antes de que cambien los índices de fila
+            self.cost_batcher.flush()
             self.table.removeRow(row)
 
     def accept(self):
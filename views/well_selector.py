@@ -1,10 +1,117 @@
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
-    QHeaderView, QAbstractItemView, QMessageBox, QWidget, QHBoxLayout, QCheckBox
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QHeaderView, QAbstractItemView,
+    QMessageBox, QCheckBox, QLineEdit, QLabel
 )
-from PyQt5.QtCore import Qt
-import pandas as pd
-import os
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+import numpy as np
+from utils.search_index import NGramIndex, normalize_search_text
+from utils.well_selection import load_selected_wells, save_selected_wells
+from views.dataframe_table_model import create_table_view
+
+HEADERS = ["", "Pozo", "Costo Services"]
+
+
+class WellSelectionModel(QAbstractTableModel):
+    """
+    Modelo de pozos con casilla de selección y filtro por texto.
+
+    La selección es un conjunto de nombres de pozo: marcar una fila marca
+    todas las filas del mismo pozo, y marcar o desmarcar las filas visibles
+    es una operación de conjuntos que solo notifica a la vista.
+    """
+    selection_changed = pyqtSignal()
+
+    def __init__(self, wells, costs, selected=(), parent=None):
+        super().__init__(parent)
+        self._wells = np.array([normalize_search_text(well) for well in wells], dtype=object)
+        self._cost_texts = [f"{float(cost):.2f}" for cost in costs]
+        self._index = NGramIndex(self._wells)
+        self._visible = np.arange(len(self._wells))
+        self._known = set(self._wells)
+        self.selected = set(normalize_search_text(well) for well in selected)
+
+    def set_filter(self, text: str):
+        self.beginResetModel()
+        self._visible = self._index.search(text)
+        self.endResetModel()
+
+    def selected_wells(self) -> list:
+        """Pozos marcados que están en la lista, ordenados."""
+        return sorted(self.selected & self._known)
+
+    def visible_wells(self) -> set:
+        return set(self._wells[self._visible])
+
+    def visible_check_state(self):
+        """Estado de la casilla general según cuántos pozos visibles están marcados."""
+        visible = self.visible_wells()
+        marked = len(visible & self.selected)
+        if not visible or marked == 0:
+            return Qt.Unchecked
+        return Qt.Checked if marked == len(visible) else Qt.PartiallyChecked
+
+    def set_visible_checked(self, checked: bool):
+        visible = self.visible_wells()
+        if checked:
+            self.selected |= visible
+        else:
+            self.selected -= visible
+        self._emit_check_column_changed()
+
+    def _emit_check_column_changed(self):
+        if len(self._visible):
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._visible) - 1, 0), [Qt.CheckStateRole])
+        self.selection_changed.emit()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        position = self._visible[index.row()]
+        col = index.column()
+        if role == Qt.CheckStateRole and col == 0:
+            return Qt.Checked if self._wells[position] in self.selected else Qt.Unchecked
+        if role == Qt.DisplayRole:
+            if col == 1:
+                return self._wells[position]
+            if col == 2:
+                return self._cost_texts[position]
+        if role == Qt.TextAlignmentRole:
+            if col == 1:
+                return Qt.AlignCenter
+            if col == 2:
+                return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() != 0 or role != Qt.CheckStateRole:
+            return False
+        well = self._wells[self._visible[index.row()]]
+        if value == Qt.Checked:
+            self.selected.add(well)
+        else:
+            self.selected.discard(well)
+        # Otras filas del mismo pozo pueden estar visibles
+        self._emit_check_column_changed()
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
 
 
 class WellSelectorDialog(QDialog):
@@ -13,105 +120,74 @@ class WellSelectorDialog(QDialog):
         self.setWindowTitle("Selector de Pozos - Services")
         self.resize(700, 400)
 
-        self.wells_df = wells_df.copy()
         self.save_path = save_path
-        self.selected = set()
-
-        if os.path.exists(self.save_path):
-            try:
-                prev_df = pd.read_excel(self.save_path)
-                self.selected = set(str(p).strip().upper() for p in prev_df["WELL"])
-            except Exception as e:
-                print(f"No se pudo cargar pozos seleccionados: {e}")
+        self.model = WellSelectionModel(
+            wells_df["WELL"].tolist(),
+            wells_df["1.10 Services"].tolist(),
+            load_selected_wells(save_path)
+        )
 
-        self.checkbox_list = []  # Lista para acceder a todos los QCheckBox
         layout = QVBoxLayout(self)
 
+        # Filtro mientras se escribe
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Buscar pozo...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.apply_filter)
+        layout.addWidget(self.search_edit)
+
         # Tabla
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["", "Pozo", "Costo Services"])
-        self.table.setRowCount(len(self.wells_df))
+        self.table = create_table_view(self.model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setAlternatingRowColors(True)
-
         self.table.setColumnWidth(0, 50)
         self.table.setColumnWidth(2, 120)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.table.verticalHeader().setDefaultSectionSize(28)
-
-        for row, (_, data) in enumerate(self.wells_df.iterrows()):
-            pozo_val = str(data["WELL"]).strip().upper()
-            costo_val = float(data["1.10 Services"])
-
-            # Columna 0: CheckBox centrado
-            check_widget, checkbox = self.create_checkbox_cell(pozo_val in self.selected)
-            self.table.setCellWidget(row, 0, check_widget)
-            self.checkbox_list.append(checkbox)
-
-            # Columna 1: Pozo
-            pozo_item = QTableWidgetItem(pozo_val)
-            pozo_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 1, pozo_item)
-
-            # Columna 2: Costo
-            costo_item = QTableWidgetItem(f"{costo_val:.2f}")
-            costo_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.table.setItem(row, 2, costo_item)
-
         layout.addWidget(self.table)
 
-        # Botones
-        self.toggle_btn = QPushButton("Seleccionar todos")
-        self.toggle_btn.clicked.connect(self.toggle_all_checkboxes)
-        layout.addWidget(self.toggle_btn)
+        # Selección general (de los pozos visibles) y contador
+        bulk_layout = QHBoxLayout()
+        self.toggle_check = QCheckBox("Seleccionar todos")
+        self.toggle_check.setTristate(True)
+        self.toggle_check.clicked.connect(self.toggle_all_checkboxes)
+        bulk_layout.addWidget(self.toggle_check)
+        bulk_layout.addStretch(1)
+        self.count_label = QLabel()
+        bulk_layout.addWidget(self.count_label)
+        layout.addLayout(bulk_layout)
 
         guardar_btn = QPushButton("Guardar selección")
         guardar_btn.clicked.connect(self.guardar_seleccion)
         layout.addWidget(guardar_btn)
 
+        self.model.selection_changed.connect(self.update_selection_state)
+        self.update_selection_state()
         self.setLayout(layout)
 
-    def create_checkbox_cell(self, checked):
-        widget = QWidget()
-        checkbox = QCheckBox()
-        checkbox.setChecked(checked)
+    def apply_filter(self, text):
+        self.model.set_filter(text)
+        self.update_selection_state()
 
-        layout = QHBoxLayout()
-        layout.addWidget(checkbox)
-        layout.setAlignment(Qt.AlignCenter)
-        layout.setContentsMargins(0, 0, 0, 0)
-        widget.setLayout(layout)
-
-        return widget, checkbox
+    def update_selection_state(self):
+        state = self.model.visible_check_state()
+        self.toggle_check.setCheckState(state)
+        self.toggle_check.setText("Deseleccionar todos" if state == Qt.Checked else "Seleccionar todos")
+        self.count_label.setText(f"{len(self.model.selected_wells())} pozos seleccionados")
 
     def toggle_all_checkboxes(self):
-        todos_seleccionados = all(cb.isChecked() for cb in self.checkbox_list)
-        nuevo_estado = not todos_seleccionados
-
-        for cb in self.checkbox_list:
-            cb.setChecked(nuevo_estado)
-
-        self.toggle_btn.setText("Deseleccionar todos" if nuevo_estado else "Seleccionar todos")
+        # Con la casilla parcial o vacía se marcan todos los visibles; con todos marcados, se desmarcan
+        self.model.set_visible_checked(self.model.visible_check_state() != Qt.Checked)
 
     def guardar_seleccion(self):
-        seleccionados = []
-        for row in range(self.table.rowCount()):
-            checkbox_widget = self.table.cellWidget(row, 0)
-            checkbox = checkbox_widget.findChild(QCheckBox)
-            if checkbox and checkbox.isChecked():
-                pozo = self.table.item(row, 1).text()
-                costo = float(self.table.item(row, 2).text())
-                seleccionados.append({"WELL": pozo, "1.10 Services": costo})
-
+        seleccionados = self.model.selected_wells()
         if not seleccionados:
             QMessageBox.warning(self, "Advertencia", "No se ha seleccionado ningún pozo.")
             return
 
-        df_selected = pd.DataFrame(seleccionados)
         try:
-            df_selected.to_excel(self.save_path, index=False)
+            save_selected_wells(self.save_path, seleccionados)
             QMessageBox.information(self, "Éxito", f"Pozos guardados correctamente en:\n{self.save_path}")
             self.accept()
         except Exception as e: